@@ -7,8 +7,13 @@ This package contains all core functionality for Marcus AGI including:
 - Learning loops
 - Social interaction
 - Advanced reasoning
+
+Subpackages and the main entry points are imported on first attribute access
+(PEP 562), so ``import core`` and imports of single modules stay cheap.
 """
 
+import importlib
+
 __version__ = "2.0.0"
 __author__ = "Marcus AGI Development Team"
 
@@ -29,3 +34,38 @@ def get_system_status():
         "reasoning": REASONING_AVAILABLE,
         "version": __version__
     }
+
+_SUBPACKAGES = ("consciousness", "learning", "memory", "reasoning", "social")
+
+# Entry points re-exported from core, mapped to the module that defines them
+_LAZY_ATTRIBUTES = {
+    "MarcusMemorySystem": "core.memory.memory_system",
+    "Concept": "core.memory.memory_system",
+    "SM2Scheduler": "core.memory.sm2_scheduler",
+    "get_connection_manager": "core.memory.connection_manager",
+    "VectorIndex": "core.memory.vector_index",
+    "SessionStore": "core.learning.session_store",
+    "run_daily_learning_loop": "core.learning.daily_learning_loop",
+    "SimulationRunner": "core.learning.simulation_runner",
+    "GradeProgressionSystem": "core.learning.grade_progression_system",
+    "AdvancedReasoningEngine": "core.reasoning.advanced_reasoning_engine",
+    "NeuralSymbolicIntegration": "core.reasoning.neural_symbolic_integration",
+    "KeywordMatcher": "core.reasoning.keyword_matcher",
+    "ConsciousnessIntegrationFramework": "core.consciousness.consciousness_integration_framework",
+    "PeerInteractionSimulator": "core.social.peer_interaction_simulation",
+}
+
+def __getattr__(name: str):
+    """Import a subpackage or entry point the first time it is used"""
+    if name in _SUBPACKAGES:
+        value = importlib.import_module(f"{__name__}.{name}")
+    elif name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBPACKAGES) | set(_LAZY_ATTRIBUTES))
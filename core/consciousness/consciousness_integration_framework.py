@@ -20,7 +20,6 @@ Timeline: 3 weeks (2025-10-25 to 2025-11-15)
 Depends on: All Level 2.0 systems (Autobiographical Memory, Personal Narrative, Intrinsic Motivation, Value Learning)
 """
 
-import sqlite3
 import json
 import logging
 from datetime import datetime, timedelta
@@ -31,12 +30,14 @@ import uuid
 import statistics
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 
 # Import all Level 2.0 systems
 from ..memory.autobiographical_memory_system import AutobiographicalMemorySystem, AutobiographicalMemory
 from .personal_narrative_constructor import PersonalNarrativeConstructor, PersonalNarrative
 from .intrinsic_motivation_engine import IntrinsicMotivationEngine, IntrinsicGoal
 from .value_learning_system import ValueLearningSystem, PersonalValue, ValueDecision
+from ..memory.state_store import register_schema, ensure_schema, state_transaction, state_db_path
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -92,6 +93,53 @@ class ConsciousDecision:
     confidence: float
     timestamp: datetime
 
+CONSCIOUSNESS_SCHEMA = register_schema("consciousness", 1, [
+    # Consciousness snapshots
+    """
+        CREATE TABLE IF NOT EXISTS consciousness_snapshots (
+            snapshot_id TEXT PRIMARY KEY,
+            timestamp TEXT NOT NULL,
+            consciousness_state TEXT NOT NULL,
+            cognitive_focus TEXT,  -- JSON array
+            self_awareness_level REAL DEFAULT 0.0,
+            integration_score REAL DEFAULT 0.0,
+            active_memories TEXT,  -- JSON array
+            current_narrative_theme TEXT,
+            active_goals TEXT,  -- JSON array
+            dominant_values TEXT,  -- JSON array
+            metacognitive_insights TEXT,  -- JSON array
+            emotional_undertone TEXT,  -- JSON object
+            cognitive_load REAL DEFAULT 0.0
+        )
+    """,
+    # Conscious decisions
+    """
+        CREATE TABLE IF NOT EXISTS conscious_decisions (
+            decision_id TEXT PRIMARY KEY,
+            decision_context TEXT NOT NULL,
+            options_considered TEXT,  -- JSON array
+            chosen_option TEXT NOT NULL,
+            reasoning_process TEXT,  -- JSON object
+            consciousness_level REAL DEFAULT 0.0,
+            systems_consulted TEXT,  -- JSON array
+            integration_quality REAL DEFAULT 0.0,
+            confidence REAL DEFAULT 0.0,
+            timestamp TEXT NOT NULL
+        )
+    """,
+    # System integration events
+    """
+        CREATE TABLE IF NOT EXISTS integration_events (
+            event_id TEXT PRIMARY KEY,
+            event_type TEXT NOT NULL,
+            systems_involved TEXT,  -- JSON array
+            integration_quality REAL DEFAULT 0.0,
+            outcome_description TEXT,
+            timestamp TEXT NOT NULL
+        )
+    """,
+])
+
 class ConsciousnessIntegrationFramework:
     """
     Unified consciousness framework integrating all Level 2.0 systems.
@@ -104,86 +152,57 @@ class ConsciousnessIntegrationFramework:
     5. Enabling conscious experience and self-understanding
     """
 
-    def __init__(self):
+    def __init__(self, db_path: Optional[str] = None):
         """Initialize the consciousness integration framework."""
-        # Initialize all component systems
-        self.memory_system = AutobiographicalMemorySystem()
-        self.narrative_constructor = PersonalNarrativeConstructor(self.memory_system)
-        self.motivation_engine = IntrinsicMotivationEngine(self.memory_system, self.narrative_constructor)
-        self.value_system = ValueLearningSystem(self.memory_system, self.narrative_constructor, self.motivation_engine)
+        # Component systems, the database and the thread pool are created on first use
+        self._initialized = False
         
         # Consciousness state
         self.current_state = ConsciousnessState.EMERGING
         self.consciousness_level = 0.0  # Current consciousness intensity
         self.integration_score = 0.0  # System integration quality
         
-        # Database for consciousness tracking
-        self.db_path = "marcus_consciousness.db"
-        self.setup_database()
+        # Shared state database for consciousness tracking and every component system
+        self.db_path = db_path or state_db_path()
         
         # Processing history
         self.recent_snapshots = []
         self.active_processes = {}
         
-        # Thread pool for parallel processing
-        self.executor = ThreadPoolExecutor(max_workers=4)
-        
-        self._initialize_consciousness()
         logger.info("✅ Consciousness Integration Framework initialized")
 
+    @cached_property
+    def memory_system(self) -> AutobiographicalMemorySystem:
+        return AutobiographicalMemorySystem(self.db_path)
+
+    @cached_property
+    def narrative_constructor(self) -> PersonalNarrativeConstructor:
+        return PersonalNarrativeConstructor(self.memory_system, self.db_path)
+
+    @cached_property
+    def motivation_engine(self) -> IntrinsicMotivationEngine:
+        return IntrinsicMotivationEngine(self.memory_system, self.narrative_constructor, self.db_path)
+
+    @cached_property
+    def value_system(self) -> ValueLearningSystem:
+        return ValueLearningSystem(self.memory_system, self.narrative_constructor, self.motivation_engine,
+                                  self.db_path)
+
+    @cached_property
+    def executor(self) -> ThreadPoolExecutor:
+        """Thread pool for parallel processing"""
+        return ThreadPoolExecutor(max_workers=4)
+
+    def _ensure_initialized(self):
+        """Create the database and record the initial snapshot before the first cycle, decision or report"""
+        if not self._initialized:
+            self._initialized = True
+            self.setup_database()
+            self._initialize_consciousness()
+
     def setup_database(self):
         """Set up the consciousness tracking database."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Consciousness snapshots
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS consciousness_snapshots (
-                    snapshot_id TEXT PRIMARY KEY,
-                    timestamp TEXT NOT NULL,
-                    consciousness_state TEXT NOT NULL,
-                    cognitive_focus TEXT,  -- JSON array
-                    self_awareness_level REAL DEFAULT 0.0,
-                    integration_score REAL DEFAULT 0.0,
-                    active_memories TEXT,  -- JSON array
-                    current_narrative_theme TEXT,
-                    active_goals TEXT,  -- JSON array
-                    dominant_values TEXT,  -- JSON array
-                    metacognitive_insights TEXT,  -- JSON array
-                    emotional_undertone TEXT,  -- JSON object
-                    cognitive_load REAL DEFAULT 0.0
-                )
-            ''')
-            
-            # Conscious decisions
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS conscious_decisions (
-                    decision_id TEXT PRIMARY KEY,
-                    decision_context TEXT NOT NULL,
-                    options_considered TEXT,  -- JSON array
-                    chosen_option TEXT NOT NULL,
-                    reasoning_process TEXT,  -- JSON object
-                    consciousness_level REAL DEFAULT 0.0,
-                    systems_consulted TEXT,  -- JSON array
-                    integration_quality REAL DEFAULT 0.0,
-                    confidence REAL DEFAULT 0.0,
-                    timestamp TEXT NOT NULL
-                )
-            ''')
-            
-            # System integration events
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS integration_events (
-                    event_id TEXT PRIMARY KEY,
-                    event_type TEXT NOT NULL,
-                    systems_involved TEXT,  -- JSON array
-                    integration_quality REAL DEFAULT 0.0,
-                    outcome_description TEXT,
-                    timestamp TEXT NOT NULL
-                )
-            ''')
-            
-            conn.commit()
+        return ensure_schema(self.db_path, CONSCIOUSNESS_SCHEMA)
 
     def _initialize_consciousness(self):
         """Initialize consciousness state and begin emergence process."""
@@ -203,8 +222,14 @@ class ConsciousnessIntegrationFramework:
         Returns:
             Current consciousness snapshot after processing
         """
+        self._ensure_initialized()
         logger.info("🔄 Running conscious processing cycle...")
         
+        # Every subsystem write of the cycle commits together, or not at all
+        with state_transaction(self.db_path):
+            return self._run_processing_cycle()
+
+    def _run_processing_cycle(self) -> ConsciousnessSnapshot:
         # Step 1: Memory integration and awareness
         memory_insights = self._integrate_memory_awareness()
         
@@ -467,6 +492,7 @@ class ConsciousnessIntegrationFramework:
         Returns:
             ConsciousDecision with integrated reasoning
         """
+        self._ensure_initialized()
         logger.info(f"🎯 Making conscious decision: {context}")
         
         reasoning_process = {}
@@ -642,7 +668,7 @@ class ConsciousnessIntegrationFramework:
 
     def _store_consciousness_snapshot(self, snapshot: ConsciousnessSnapshot):
         """Store consciousness snapshot to database."""
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO consciousness_snapshots
@@ -666,11 +692,10 @@ class ConsciousnessIntegrationFramework:
                 json.dumps(snapshot.emotional_undertone),
                 snapshot.cognitive_load
             ))
-            conn.commit()
 
     def _store_conscious_decision(self, decision: ConsciousDecision):
         """Store conscious decision to database."""
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO conscious_decisions
@@ -690,11 +715,11 @@ class ConsciousnessIntegrationFramework:
                 decision.confidence,
                 decision.timestamp.isoformat()
             ))
-            conn.commit()
 
     def get_consciousness_metrics(self) -> Dict[str, Any]:
         """Get comprehensive consciousness development metrics."""
-        with sqlite3.connect(self.db_path) as conn:
+        self._ensure_initialized()
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             
             # Recent snapshots
@@ -19,7 +19,6 @@ Timeline: 3 weeks (2025-09-06 to 2025-09-27)
 Depends on: Autobiographical Memory System, Personal Narrative Constructor
 """
 
-import sqlite3
 import json
 import logging
 from datetime import datetime, timedelta
@@ -29,6 +28,7 @@ import uuid
 import random
 from ..memory.autobiographical_memory_system import AutobiographicalMemorySystem
 from .personal_narrative_constructor import PersonalNarrativeConstructor
+from ..memory.state_store import register_schema, ensure_schema, state_transaction, state_db_path
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -68,6 +68,72 @@ class InterestProfile:
     related_concepts: List[str]
     motivation_triggers: List[str]
 
+MOTIVATION_SCHEMA = register_schema("intrinsic_motivation", 1, [
+    # Intrinsic goals table
+    """
+        CREATE TABLE IF NOT EXISTS intrinsic_goals (
+            goal_id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL,
+            motivation_source TEXT NOT NULL,
+            goal_type TEXT NOT NULL,
+            priority_score REAL DEFAULT 0.5,
+            interest_alignment REAL DEFAULT 0.5,
+            difficulty_level REAL DEFAULT 0.5,
+            time_horizon TEXT DEFAULT 'short_term',
+            success_criteria TEXT,  -- JSON array
+            related_concepts TEXT,  -- JSON array
+            emotional_drivers TEXT,  -- JSON array
+            generated_at TEXT NOT NULL,
+            status TEXT DEFAULT 'active',
+            completion_satisfaction REAL,
+            completed_at TEXT
+        )
+    """,
+    # Interest profiles table
+    """
+        CREATE TABLE IF NOT EXISTS interest_profiles (
+            interest_id TEXT PRIMARY KEY,
+            interest_name TEXT NOT NULL,
+            domain TEXT NOT NULL,
+            strength REAL DEFAULT 0.5,
+            growth_rate REAL DEFAULT 0.0,
+            stability REAL DEFAULT 0.5,
+            last_engaged TEXT,
+            engagement_count INTEGER DEFAULT 0,
+            satisfaction_history TEXT,  -- JSON array
+            related_concepts TEXT,  -- JSON array
+            motivation_triggers TEXT,  -- JSON array
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    # Motivation patterns table
+    """
+        CREATE TABLE IF NOT EXISTS motivation_patterns (
+            pattern_id TEXT PRIMARY KEY,
+            pattern_name TEXT NOT NULL,
+            motivation_type TEXT NOT NULL,  -- 'curiosity', 'mastery', 'autonomy', etc.
+            trigger_conditions TEXT,  -- JSON array
+            goal_templates TEXT,  -- JSON array
+            effectiveness_score REAL DEFAULT 0.5,
+            usage_count INTEGER DEFAULT 0
+        )
+    """,
+    # Goal achievements table
+    """
+        CREATE TABLE IF NOT EXISTS goal_achievements (
+            achievement_id TEXT PRIMARY KEY,
+            goal_id TEXT NOT NULL,
+            achievement_type TEXT NOT NULL,  -- 'milestone', 'completion', 'breakthrough'
+            description TEXT NOT NULL,
+            satisfaction_score REAL,
+            learning_outcome TEXT,
+            achieved_at TEXT NOT NULL,
+            FOREIGN KEY (goal_id) REFERENCES intrinsic_goals (goal_id)
+        )
+    """,
+])
+
 class IntrinsicMotivationEngine:
     """
     System for generating internal goals and managing intrinsic motivation.
@@ -77,88 +143,20 @@ class IntrinsicMotivationEngine:
     """
 
     def __init__(self, memory_system: AutobiographicalMemorySystem = None, 
-                 narrative_constructor: PersonalNarrativeConstructor = None):
+                 narrative_constructor: PersonalNarrativeConstructor = None,
+                 db_path: Optional[str] = None):
         """Initialize the intrinsic motivation engine."""
-        self.memory_system = memory_system or AutobiographicalMemorySystem()
-        self.narrative_constructor = narrative_constructor or PersonalNarrativeConstructor(self.memory_system)
-        self.db_path = "marcus_intrinsic_motivation.db"
-        self.setup_database()
-        self._initialize_motivation_profiles()
+        self.db_path = db_path or state_db_path()
+        self.memory_system = memory_system or AutobiographicalMemorySystem(self.db_path)
+        self.narrative_constructor = narrative_constructor or PersonalNarrativeConstructor(self.memory_system, self.db_path)
+        # Motivation patterns are reference rows, seeded when the schema is first applied
+        if self.setup_database():
+            self._initialize_motivation_profiles()
         logger.info("✅ Intrinsic Motivation Engine initialized")
 
     def setup_database(self):
         """Set up the intrinsic motivation database schema."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Intrinsic goals table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS intrinsic_goals (
-                    goal_id TEXT PRIMARY KEY,
-                    title TEXT NOT NULL,
-                    description TEXT NOT NULL,
-                    motivation_source TEXT NOT NULL,
-                    goal_type TEXT NOT NULL,
-                    priority_score REAL DEFAULT 0.5,
-                    interest_alignment REAL DEFAULT 0.5,
-                    difficulty_level REAL DEFAULT 0.5,
-                    time_horizon TEXT DEFAULT 'short_term',
-                    success_criteria TEXT,  -- JSON array
-                    related_concepts TEXT,  -- JSON array
-                    emotional_drivers TEXT,  -- JSON array
-                    generated_at TEXT NOT NULL,
-                    status TEXT DEFAULT 'active',
-                    completion_satisfaction REAL,
-                    completed_at TEXT
-                )
-            ''')
-            
-            # Interest profiles table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS interest_profiles (
-                    interest_id TEXT PRIMARY KEY,
-                    interest_name TEXT NOT NULL,
-                    domain TEXT NOT NULL,
-                    strength REAL DEFAULT 0.5,
-                    growth_rate REAL DEFAULT 0.0,
-                    stability REAL DEFAULT 0.5,
-                    last_engaged TEXT,
-                    engagement_count INTEGER DEFAULT 0,
-                    satisfaction_history TEXT,  -- JSON array
-                    related_concepts TEXT,  -- JSON array
-                    motivation_triggers TEXT,  -- JSON array
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Motivation patterns table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS motivation_patterns (
-                    pattern_id TEXT PRIMARY KEY,
-                    pattern_name TEXT NOT NULL,
-                    motivation_type TEXT NOT NULL,  -- 'curiosity', 'mastery', 'autonomy', etc.
-                    trigger_conditions TEXT,  -- JSON array
-                    goal_templates TEXT,  -- JSON array
-                    effectiveness_score REAL DEFAULT 0.5,
-                    usage_count INTEGER DEFAULT 0
-                )
-            ''')
-            
-            # Goal achievements table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS goal_achievements (
-                    achievement_id TEXT PRIMARY KEY,
-                    goal_id TEXT NOT NULL,
-                    achievement_type TEXT NOT NULL,  -- 'milestone', 'completion', 'breakthrough'
-                    description TEXT NOT NULL,
-                    satisfaction_score REAL,
-                    learning_outcome TEXT,
-                    achieved_at TEXT NOT NULL,
-                    FOREIGN KEY (goal_id) REFERENCES intrinsic_goals (goal_id)
-                )
-            ''')
-            
-            conn.commit()
+        return ensure_schema(self.db_path, MOTIVATION_SCHEMA)
 
     def _initialize_motivation_profiles(self):
         """Initialize basic motivation patterns and interest domains."""
@@ -220,7 +218,7 @@ class IntrinsicMotivationEngine:
             }
         ]
         
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             for pattern in motivation_patterns:
                 cursor.execute('''
@@ -234,7 +232,6 @@ class IntrinsicMotivationEngine:
                     json.dumps(pattern['trigger_conditions']),
                     json.dumps(pattern['goal_templates'])
                 ))
-            conn.commit()
 
     def analyze_interest_patterns(self, days_back: int = 14) -> Dict[str, InterestProfile]:
         """
@@ -580,7 +577,7 @@ class IntrinsicMotivationEngine:
 
     def _store_interest_profile(self, profile: InterestProfile):
         """Store interest profile in database."""
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT OR REPLACE INTO interest_profiles
@@ -601,11 +598,10 @@ class IntrinsicMotivationEngine:
                 json.dumps(profile.related_concepts),
                 json.dumps(profile.motivation_triggers)
             ))
-            conn.commit()
 
     def _store_intrinsic_goal(self, goal: IntrinsicGoal):
         """Store intrinsic goal in database."""
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO intrinsic_goals
@@ -629,11 +625,10 @@ class IntrinsicMotivationEngine:
                 goal.generated_at.isoformat(),
                 goal.status
             ))
-            conn.commit()
 
     def get_active_goals(self) -> List[IntrinsicGoal]:
         """Get all active intrinsic goals."""
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT goal_id, title, description, motivation_source, goal_type,
@@ -669,7 +664,7 @@ class IntrinsicMotivationEngine:
 
     def get_motivation_statistics(self) -> Dict[str, Any]:
         """Get comprehensive statistics about intrinsic motivation."""
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             
             # Basic goal counts
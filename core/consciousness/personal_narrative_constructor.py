@@ -19,7 +19,6 @@ Timeline: 3 weeks (2025-08-16 to 2025-09-06)
 Depends on: Autobiographical Memory System
 """
 
-import sqlite3
 import json
 import logging
 from datetime import datetime, timedelta
@@ -28,6 +27,7 @@ from dataclasses import dataclass
 import uuid
 import re
 from ..memory.autobiographical_memory_system import AutobiographicalMemorySystem, AutobiographicalMemory
+from ..memory.state_store import register_schema, ensure_schema, state_transaction, state_db_path
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -58,6 +58,49 @@ class NarrativeTemplate:
     temporal_patterns: List[str]  # Temporal transition phrases
     growth_indicators: List[str]  # Signs of development to look for
 
+NARRATIVE_SCHEMA = register_schema("personal_narrative", 1, [
+    # Personal narratives table
+    """
+        CREATE TABLE IF NOT EXISTS personal_narratives (
+            narrative_id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            narrative_text TEXT NOT NULL,
+            theme TEXT NOT NULL,
+            start_date TEXT NOT NULL,
+            end_date TEXT NOT NULL,
+            memory_sources TEXT,  -- JSON array of memory IDs
+            coherence_score REAL DEFAULT 0.5,
+            growth_indicators TEXT,  -- JSON array
+            temporal_markers TEXT,  -- JSON array
+            emotional_arc TEXT,  -- JSON object
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    # Narrative templates table
+    """
+        CREATE TABLE IF NOT EXISTS narrative_templates (
+            template_id TEXT PRIMARY KEY,
+            template_name TEXT NOT NULL,
+            theme TEXT NOT NULL,
+            structure TEXT,  -- JSON array
+            temporal_patterns TEXT,  -- JSON array
+            growth_indicators TEXT,  -- JSON array
+            usage_count INTEGER DEFAULT 0,
+            effectiveness_score REAL DEFAULT 0.5
+        )
+    """,
+    # Narrative coherence patterns
+    """
+        CREATE TABLE IF NOT EXISTS coherence_patterns (
+            pattern_id TEXT PRIMARY KEY,
+            pattern_type TEXT NOT NULL,  -- 'temporal', 'causal', 'thematic'
+            pattern_text TEXT NOT NULL,
+            coherence_weight REAL DEFAULT 1.0,
+            usage_frequency INTEGER DEFAULT 0
+        )
+    """,
+])
+
 class PersonalNarrativeConstructor:
     """
     System for generating coherent personal growth narratives from memories.
@@ -66,63 +109,18 @@ class PersonalNarrativeConstructor:
     meaningful stories about Marcus's personal development over time.
     """
 
-    def __init__(self, memory_system: AutobiographicalMemorySystem = None):
+    def __init__(self, memory_system: AutobiographicalMemorySystem = None, db_path: Optional[str] = None):
         """Initialize the personal narrative construction system."""
-        self.memory_system = memory_system or AutobiographicalMemorySystem()
-        self.db_path = "marcus_personal_narratives.db"
-        self.setup_database()
-        self._initialize_narrative_templates()
+        self.db_path = db_path or state_db_path()
+        self.memory_system = memory_system or AutobiographicalMemorySystem(self.db_path)
+        # Templates are reference rows, seeded when the schema is first applied
+        if self.setup_database():
+            self._initialize_narrative_templates()
         logger.info("✅ Personal Narrative Construction System initialized")
 
     def setup_database(self):
         """Set up the narrative construction database schema."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Personal narratives table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS personal_narratives (
-                    narrative_id TEXT PRIMARY KEY,
-                    title TEXT NOT NULL,
-                    narrative_text TEXT NOT NULL,
-                    theme TEXT NOT NULL,
-                    start_date TEXT NOT NULL,
-                    end_date TEXT NOT NULL,
-                    memory_sources TEXT,  -- JSON array of memory IDs
-                    coherence_score REAL DEFAULT 0.5,
-                    growth_indicators TEXT,  -- JSON array
-                    temporal_markers TEXT,  -- JSON array
-                    emotional_arc TEXT,  -- JSON object
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Narrative templates table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS narrative_templates (
-                    template_id TEXT PRIMARY KEY,
-                    template_name TEXT NOT NULL,
-                    theme TEXT NOT NULL,
-                    structure TEXT,  -- JSON array
-                    temporal_patterns TEXT,  -- JSON array
-                    growth_indicators TEXT,  -- JSON array
-                    usage_count INTEGER DEFAULT 0,
-                    effectiveness_score REAL DEFAULT 0.5
-                )
-            ''')
-            
-            # Narrative coherence patterns
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS coherence_patterns (
-                    pattern_id TEXT PRIMARY KEY,
-                    pattern_type TEXT NOT NULL,  -- 'temporal', 'causal', 'thematic'
-                    pattern_text TEXT NOT NULL,
-                    coherence_weight REAL DEFAULT 1.0,
-                    usage_frequency INTEGER DEFAULT 0
-                )
-            ''')
-            
-            conn.commit()
+        return ensure_schema(self.db_path, NARRATIVE_SCHEMA)
 
     def _initialize_narrative_templates(self):
         """Initialize narrative templates for different growth themes."""
@@ -220,7 +218,7 @@ class PersonalNarrativeConstructor:
             )
         ]
         
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             for template in templates:
                 cursor.execute('''
@@ -235,7 +233,6 @@ class PersonalNarrativeConstructor:
                     json.dumps(template.temporal_patterns),
                     json.dumps(template.growth_indicators)
                 ))
-            conn.commit()
 
     def identify_narrative_themes(self, memories: List[AutobiographicalMemory]) -> Dict[str, List[AutobiographicalMemory]]:
         """
@@ -344,7 +341,7 @@ class PersonalNarrativeConstructor:
 
     def _get_narrative_template(self, theme: str) -> NarrativeTemplate:
         """Get narrative template for specified theme."""
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT template_id, template_name, theme, structure, temporal_patterns, growth_indicators
@@ -544,7 +541,7 @@ class PersonalNarrativeConstructor:
 
     def _store_narrative(self, narrative: PersonalNarrative):
         """Store narrative in database."""
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO personal_narratives 
@@ -566,7 +563,6 @@ class PersonalNarrativeConstructor:
                 json.dumps(narrative.emotional_arc),
                 narrative.created_at.isoformat()
             ))
-            conn.commit()
 
     def generate_personal_growth_story(self, days_back: int = 7) -> Dict[str, PersonalNarrative]:
         """
@@ -612,7 +608,7 @@ class PersonalNarrativeConstructor:
 
     def get_narrative_statistics(self) -> Dict[str, Any]:
         """Get statistics about personal narratives."""
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             
             # Basic counts
@@ -19,7 +19,6 @@ Timeline: 4 weeks (2025-09-27 to 2025-10-25)
 Depends on: Autobiographical Memory, Personal Narrative Constructor, Intrinsic Motivation Engine
 """
 
-import sqlite3
 import json
 import logging
 from datetime import datetime, timedelta
@@ -31,6 +30,8 @@ import statistics
 from ..memory.autobiographical_memory_system import AutobiographicalMemorySystem
 from .personal_narrative_constructor import PersonalNarrativeConstructor
 from .intrinsic_motivation_engine import IntrinsicMotivationEngine
+from ..reasoning.keyword_matcher import KeywordMatcher
+from ..memory.state_store import register_schema, ensure_schema, state_transaction, state_db_path
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -49,6 +50,43 @@ class ValueType(Enum):
     FRIENDSHIP = "friendship"  # Relationships, loyalty, connection
     CURIOSITY = "curiosity"  # Wonder, exploration, questioning
 
+# Option alignment per value: (phrases, score, all phrases required), first match wins
+OPTION_ALIGNMENT_RULES = {
+    ValueType.LEARNING: [
+        (('learn', 'study', 'understand', 'explore', 'discover'), 0.9, False),
+        (('practice', 'improve', 'develop'), 0.7, False),
+        (('dive deep', 'exploration'), 0.95, True),  # Perfect match for learning value
+    ],
+    ValueType.KINDNESS: [
+        (('help', 'support', 'care', 'assist', 'comfort'), 0.9, False),
+        (('share', 'give', 'cooperate'), 0.7, False),
+    ],
+    ValueType.HONESTY: [
+        (('honest', 'truthful', 'authentic', 'genuine', 'correct'), 0.9, False),
+        (('correct the error honestly',), 0.95, False),  # Perfect match
+        (('lie', 'deceive', 'fake', 'hide', 'blame'), -0.8, False),  # Negative alignment
+    ],
+    ValueType.FAIRNESS: [
+        (('fair', 'equal', 'just', 'equitable'), 0.9, False),
+        (('share', 'take_turns', 'include'), 0.7, False),
+    ],
+    ValueType.PERSEVERANCE: [
+        (('persist', 'continue', 'keep_trying', 'overcome'), 0.8, False),
+        (('give_up', 'quit', 'abandon'), -0.7, False),
+    ],
+    ValueType.CURIOSITY: [
+        (('explore', 'investigate', 'question', 'wonder'), 0.8, False),
+        (('discover', 'find_out', 'research'), 0.7, False),
+        (('dive deep', 'exploration'), 0.9, True),  # Strong match for curiosity
+    ],
+}
+
+# One matcher per value finds every rule phrase in a single pass over the option
+OPTION_ALIGNMENT_MATCHERS = {
+    value_type: KeywordMatcher(phrase for phrases, _, _ in rules for phrase in phrases)
+    for value_type, rules in OPTION_ALIGNMENT_RULES.items()
+}
+
 @dataclass
 class PersonalValue:
     """Represents a personal value with strength and development history."""
@@ -91,6 +129,68 @@ class ValueConflict:
     learning_outcome: str
     timestamp: datetime
 
+VALUE_SYSTEM_SCHEMA = register_schema("value_system", 1, [
+    # Personal values table
+    """
+        CREATE TABLE IF NOT EXISTS personal_values (
+            value_id TEXT PRIMARY KEY,
+            value_type TEXT NOT NULL,
+            strength REAL DEFAULT 0.5,
+            confidence REAL DEFAULT 0.5,
+            stability REAL DEFAULT 0.5,
+            development_history TEXT,  -- JSON array
+            supporting_experiences TEXT,  -- JSON array of memory IDs
+            value_statements TEXT,  -- JSON array
+            behavioral_patterns TEXT,  -- JSON array
+            last_reinforced TEXT,
+            conflicts_resolved INTEGER DEFAULT 0,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    # Value decisions table
+    """
+        CREATE TABLE IF NOT EXISTS value_decisions (
+            decision_id TEXT PRIMARY KEY,
+            decision_context TEXT NOT NULL,
+            options_considered TEXT,  -- JSON array
+            chosen_option TEXT NOT NULL,
+            values_involved TEXT,  -- JSON array
+            value_reasoning TEXT NOT NULL,
+            confidence_in_decision REAL DEFAULT 0.5,
+            outcome_satisfaction REAL,
+            moral_reasoning TEXT,
+            timestamp TEXT NOT NULL
+        )
+    """,
+    # Value conflicts table
+    """
+        CREATE TABLE IF NOT EXISTS value_conflicts (
+            conflict_id TEXT PRIMARY KEY,
+            conflicting_values TEXT NOT NULL,  -- JSON array
+            context TEXT NOT NULL,
+            resolution_strategy TEXT NOT NULL,
+            chosen_value_priority TEXT NOT NULL,
+            reasoning TEXT NOT NULL,
+            satisfaction_with_resolution REAL DEFAULT 0.5,
+            learning_outcome TEXT,
+            timestamp TEXT NOT NULL
+        )
+    """,
+    # Value reinforcement events
+    """
+        CREATE TABLE IF NOT EXISTS value_reinforcements (
+            reinforcement_id TEXT PRIMARY KEY,
+            value_type TEXT NOT NULL,
+            reinforcement_type TEXT NOT NULL,  -- 'positive', 'negative', 'conflict'
+            experience_context TEXT NOT NULL,
+            strength_change REAL DEFAULT 0.0,
+            confidence_change REAL DEFAULT 0.0,
+            memory_id TEXT,
+            timestamp TEXT NOT NULL
+        )
+    """,
+])
+
 class ValueLearningSystem:
     """
     System for developing and applying personal values through experience.
@@ -104,85 +204,21 @@ class ValueLearningSystem:
 
     def __init__(self, memory_system: AutobiographicalMemorySystem = None,
                  narrative_constructor: PersonalNarrativeConstructor = None,
-                 motivation_engine: IntrinsicMotivationEngine = None):
+                 motivation_engine: IntrinsicMotivationEngine = None,
+                 db_path: Optional[str] = None):
         """Initialize the value learning system."""
-        self.memory_system = memory_system or AutobiographicalMemorySystem()
-        self.narrative_constructor = narrative_constructor or PersonalNarrativeConstructor(self.memory_system)
-        self.motivation_engine = motivation_engine or IntrinsicMotivationEngine(self.memory_system, self.narrative_constructor)
-        self.db_path = "marcus_value_system.db"
+        self.db_path = db_path or state_db_path()
+        self.memory_system = memory_system or AutobiographicalMemorySystem(self.db_path)
+        self.narrative_constructor = narrative_constructor or PersonalNarrativeConstructor(self.memory_system, self.db_path)
+        self.motivation_engine = motivation_engine or IntrinsicMotivationEngine(
+            self.memory_system, self.narrative_constructor, self.db_path)
         self.setup_database()
         self._initialize_core_values()
         logger.info("✅ Value Learning System initialized")
 
     def setup_database(self):
         """Set up the value learning database schema."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Personal values table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS personal_values (
-                    value_id TEXT PRIMARY KEY,
-                    value_type TEXT NOT NULL,
-                    strength REAL DEFAULT 0.5,
-                    confidence REAL DEFAULT 0.5,
-                    stability REAL DEFAULT 0.5,
-                    development_history TEXT,  -- JSON array
-                    supporting_experiences TEXT,  -- JSON array of memory IDs
-                    value_statements TEXT,  -- JSON array
-                    behavioral_patterns TEXT,  -- JSON array
-                    last_reinforced TEXT,
-                    conflicts_resolved INTEGER DEFAULT 0,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Value decisions table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS value_decisions (
-                    decision_id TEXT PRIMARY KEY,
-                    decision_context TEXT NOT NULL,
-                    options_considered TEXT,  -- JSON array
-                    chosen_option TEXT NOT NULL,
-                    values_involved TEXT,  -- JSON array
-                    value_reasoning TEXT NOT NULL,
-                    confidence_in_decision REAL DEFAULT 0.5,
-                    outcome_satisfaction REAL,
-                    moral_reasoning TEXT,
-                    timestamp TEXT NOT NULL
-                )
-            ''')
-            
-            # Value conflicts table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS value_conflicts (
-                    conflict_id TEXT PRIMARY KEY,
-                    conflicting_values TEXT NOT NULL,  -- JSON array
-                    context TEXT NOT NULL,
-                    resolution_strategy TEXT NOT NULL,
-                    chosen_value_priority TEXT NOT NULL,
-                    reasoning TEXT NOT NULL,
-                    satisfaction_with_resolution REAL DEFAULT 0.5,
-                    learning_outcome TEXT,
-                    timestamp TEXT NOT NULL
-                )
-            ''')
-            
-            # Value reinforcement events
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS value_reinforcements (
-                    reinforcement_id TEXT PRIMARY KEY,
-                    value_type TEXT NOT NULL,
-                    reinforcement_type TEXT NOT NULL,  -- 'positive', 'negative', 'conflict'
-                    experience_context TEXT NOT NULL,
-                    strength_change REAL DEFAULT 0.0,
-                    confidence_change REAL DEFAULT 0.0,
-                    memory_id TEXT,
-                    timestamp TEXT NOT NULL
-                )
-            ''')
-            
-            conn.commit()
+        return ensure_schema(self.db_path, VALUE_SYSTEM_SCHEMA)
 
     def _initialize_core_values(self):
         """Initialize core value system with basic values."""
@@ -219,7 +255,7 @@ class ValueLearningSystem:
 
     def _value_exists(self, value_type: ValueType) -> bool:
         """Check if a value already exists in the system."""
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT COUNT(*) FROM personal_values WHERE value_type = ?', (value_type.value,))
             return cursor.fetchone()[0] > 0
@@ -335,7 +371,7 @@ class ValueLearningSystem:
 
     def _get_personal_value(self, value_type: ValueType) -> Optional[PersonalValue]:
         """Get a personal value by type."""
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT value_id, value_type, strength, confidence, stability,
@@ -479,51 +515,12 @@ class ValueLearningSystem:
 
     def _calculate_option_value_alignment(self, option: str, value: PersonalValue, context: str) -> float:
         """Calculate how well an option aligns with a specific value."""
-        option_lower = option.lower()
-        context_lower = context.lower()
-        
-        # Value-specific alignment calculations
-        if value.value_type == ValueType.LEARNING:
-            if any(word in option_lower for word in ['learn', 'study', 'understand', 'explore', 'discover']):
-                return 0.9
-            elif any(word in option_lower for word in ['practice', 'improve', 'develop']):
-                return 0.7
-            elif 'dive deep' in option_lower and 'exploration' in option_lower:
-                return 0.95  # Perfect match for learning value
-        
-        elif value.value_type == ValueType.KINDNESS:
-            if any(word in option_lower for word in ['help', 'support', 'care', 'assist', 'comfort']):
-                return 0.9
-            elif any(word in option_lower for word in ['share', 'give', 'cooperate']):
-                return 0.7
-        
-        elif value.value_type == ValueType.HONESTY:
-            if any(word in option_lower for word in ['honest', 'truthful', 'authentic', 'genuine', 'correct']):
-                return 0.9
-            elif 'correct the error honestly' in option_lower:
-                return 0.95  # Perfect match
-            elif any(word in option_lower for word in ['lie', 'deceive', 'fake', 'hide', 'blame']):
-                return -0.8  # Negative alignment
-        
-        elif value.value_type == ValueType.FAIRNESS:
-            if any(word in option_lower for word in ['fair', 'equal', 'just', 'equitable']):
-                return 0.9
-            elif any(word in option_lower for word in ['share', 'take_turns', 'include']):
-                return 0.7
-        
-        elif value.value_type == ValueType.PERSEVERANCE:
-            if any(word in option_lower for word in ['persist', 'continue', 'keep_trying', 'overcome']):
-                return 0.8
-            elif any(word in option_lower for word in ['give_up', 'quit', 'abandon']):
-                return -0.7
-        
-        elif value.value_type == ValueType.CURIOSITY:
-            if any(word in option_lower for word in ['explore', 'investigate', 'question', 'wonder']):
-                return 0.8
-            elif any(word in option_lower for word in ['discover', 'find_out', 'research']):
-                return 0.7
-            elif 'dive deep' in option_lower and 'exploration' in option_lower:
-                return 0.9  # Strong match for curiosity
+        rules = OPTION_ALIGNMENT_RULES.get(value.value_type, [])
+        if rules:
+            hits = OPTION_ALIGNMENT_MATCHERS[value.value_type].found(option)
+            for phrases, score, require_all in rules:
+                if (all if require_all else any)(phrase in hits for phrase in phrases):
+                    return score
         
         # Default neutral alignment
         return 0.0
@@ -560,7 +557,7 @@ class ValueLearningSystem:
 
     def _get_all_personal_values(self) -> List[PersonalValue]:
         """Get all personal values."""
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT value_id, value_type, strength, confidence, stability,
@@ -592,7 +589,7 @@ class ValueLearningSystem:
 
     def _store_personal_value(self, value: PersonalValue):
         """Store or update a personal value."""
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT OR REPLACE INTO personal_values
@@ -613,11 +610,10 @@ class ValueLearningSystem:
                 value.last_reinforced.isoformat(),
                 value.conflicts_resolved
             ))
-            conn.commit()
 
     def _store_value_decision(self, decision: ValueDecision):
         """Store a value-based decision."""
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO value_decisions
@@ -637,12 +633,11 @@ class ValueLearningSystem:
                 decision.moral_reasoning,
                 decision.timestamp.isoformat()
             ))
-            conn.commit()
 
     def _record_value_reinforcement(self, value_type: ValueType, reinforcement_type: str, 
                                   memory, strength_change: float):
         """Record a value reinforcement event."""
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO value_reinforcements
@@ -658,7 +653,6 @@ class ValueLearningSystem:
                 memory.memory_id,
                 datetime.now().isoformat()
             ))
-            conn.commit()
 
     def evaluate_value_consistency(self, days_back: int = 14) -> Dict[str, Any]:
         """
@@ -673,7 +667,7 @@ class ValueLearningSystem:
         # Get recent decisions
         cutoff_date = datetime.now() - timedelta(days=days_back)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT decision_id, decision_context, chosen_option, values_involved,
@@ -763,7 +757,7 @@ class ValueLearningSystem:
         """Get comprehensive statistics about the value system."""
         personal_values = self._get_all_personal_values()
         
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             
             # Decision counts
@@ -19,7 +19,8 @@ metrics for monitoring learning progress.
 import logging
 import pathlib
 import sys
-from typing import List, Dict, Any, Tuple, Optional, NewType
+import threading
+from typing import List, Dict, Any, Tuple, Optional, NewType, Callable
 from dataclasses import dataclass, field, asdict
 from collections import defaultdict
 
@@ -46,18 +47,16 @@ BASE_DIR = pathlib.Path(__file__).parent.resolve()
 OUTPUT_DIR = BASE_DIR / "output" / "sessions"
 ANALYTICS_DIR = BASE_DIR / "output" / "analytics"
 SUMMARIES_DIR = BASE_DIR / "output" / "summaries"
+SESSION_DB_PATH = BASE_DIR / "output" / "sessions.db"
+EMBODIED_DB_PATH = "marcus_embodied.db"
 
 # Import your existing systems
-from core.reasoning.reflection_system import generate_reflection  # This import might fail
-from core.learning.concept_graph_system import learn_new_concepts, review_previous_concepts  # This import might fail
+from core.memory.sm2_scheduler import SM2Scheduler, SM2State, SM2Policy
+from core.learning.session_store import SessionStore
+from core.learning.mastery_aggregate import MasteryAggregate, MASTERY_WINDOW
 
-# Import enhanced reflection system for Issue #4 completion
-try:
-    from core.reasoning.reflection_journal_system import create_enhanced_reflection_system, enhance_session_with_journal
-    ENHANCED_REFLECTION_AVAILABLE = True
-except ImportError:
-    ENHANCED_REFLECTION_AVAILABLE = False
-    print("Enhanced reflection system not available - using basic reflection")
+# Number of past sessions the daily loop needs for mastery and trend metrics
+RECENT_SESSION_WINDOW = MASTERY_WINDOW
 
 def get_due_reviews(session_history: List[Dict], today: str) -> List[Dict]:
     """
@@ -94,6 +93,15 @@ LEARNING_CONFIG = {
     'sm2_min_ease': 1.3
 }
 
+# Shared SM-2 engine for scheduling reviews
+SM2_SCHEDULER = SM2Scheduler(SM2Policy(
+    min_ease=LEARNING_CONFIG['sm2_min_ease'],
+    ease_decimals=2,
+    # Quality 3 shortens mature intervals, quality 5 earns the easy bonus
+    quality_multipliers=(1.0, 1.0, 1.0, 0.6, 1.0, LEARNING_CONFIG['sm2_easy_bonus']),
+    round_intervals=True
+))
+
 # Default concept pool for testing
 DEFAULT_CONCEPT_POOL = [
     {'subject': 'math', 'content': 'counting to 10', 'difficulty': 0.2},
@@ -106,6 +114,29 @@ DEFAULT_CONCEPT_POOL = [
 # Initialize concept pool
 concept_pool = DEFAULT_CONCEPT_POOL.copy()
 
+@dataclass(frozen=True)
+class LearningLoopPaths:
+    """Where one learner's sessions, reports and databases are written"""
+    output_dir: pathlib.Path = OUTPUT_DIR
+    analytics_dir: pathlib.Path = ANALYTICS_DIR
+    summaries_dir: pathlib.Path = SUMMARIES_DIR
+    session_db_path: pathlib.Path = SESSION_DB_PATH
+    embodied_db_path: str = EMBODIED_DB_PATH
+
+    @classmethod
+    def under(cls, root) -> 'LearningLoopPaths':
+        """Lay out a learner's files under ``root`` the same way as the default output tree"""
+        root = pathlib.Path(root)
+        return cls(
+            output_dir=root / "output" / "sessions",
+            analytics_dir=root / "output" / "analytics",
+            summaries_dir=root / "output" / "summaries",
+            session_db_path=root / "output" / "sessions.db",
+            embodied_db_path=str(root / EMBODIED_DB_PATH)
+        )
+
+DEFAULT_PATHS = LearningLoopPaths()
+
 @dataclass
 class ConceptReview:
     """Track review data for SM-2 algorithm"""
@@ -204,33 +235,13 @@ def calculate_sm2_interval(review: ConceptReview, quality: int) -> Tuple[float,
     
     Returns: (next_interval_days, new_ease_factor)
     """
-    # Update ease factor
-    new_ease = review.ease_factor + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
-    new_ease = max(LEARNING_CONFIG['sm2_min_ease'], new_ease)
-    
-    # Calculate next interval
-    if quality < 3:
-        # Failed - reset
-        next_interval = 1
-        repetitions = 0
-    else:
-        repetitions = review.repetitions + 1
-        if repetitions == 1:
-            next_interval = 1
-        elif repetitions == 2:
-            next_interval = 6
-        else:
-            next_interval = review.interval_days * new_ease
-            
-            # Apply quality-based multiplier
-            if quality == 3:
-                next_interval *= 0.6
-            elif quality == 4:
-                next_interval *= 1.0
-            else:  # quality == 5
-                next_interval *= LEARNING_CONFIG['sm2_easy_bonus']
-    
-    return round(next_interval), round(new_ease, 2)
+    result = SM2_SCHEDULER.schedule_one(
+        ease_factor=review.ease_factor,
+        interval_days=review.interval_days,
+        repetitions=review.repetitions,
+        quality=quality
+    )
+    return result['interval_days'], result['ease_factor']
 
 def generate_adaptive_lessons(session_history: List[Dict], mastery_levels: Dict[str, float]) -> List[Dict]:
     """
@@ -283,6 +294,7 @@ def generate_adaptive_lessons(session_history: List[Dict], mastery_levels: Dict[
 
 def conduct_sm2_reviews(concepts_to_review: List[Dict], session_history: List[Dict], today: str) -> List[ConceptReview]:
     reviews = []
+    qualities = []
 
     for concept_data in concepts_to_review:
         review = ConceptReview(
@@ -307,62 +319,47 @@ def conduct_sm2_reviews(concepts_to_review: List[Dict], session_history: List[Di
         review.quality = quality
         review.success = quality >= 3
 
-        next_interval, new_ease = calculate_sm2_interval(review, quality)
+        reviews.append(review)
+        qualities.append(quality)
+
+    if not reviews:
+        return reviews
+
+    # Schedule every review in one vectorized SM-2 step
+    state = SM2State(
+        ease_factor=[r.ease_factor for r in reviews],
+        interval_days=[r.interval_days for r in reviews],
+        repetitions=[r.repetitions for r in reviews],
+        success_streak=[0] * len(reviews)
+    )
+    scheduled = SM2_SCHEDULER.schedule(state, qualities)
+
+    for i, review in enumerate(reviews):
+        next_interval = int(scheduled.interval_days[i])
         review.interval_days = next_interval
-        review.ease_factor = new_ease
+        review.ease_factor = float(scheduled.ease_factor[i])
+        review.repetitions = int(scheduled.repetitions[i])
         review.last_review = today
-        review.next_review = str(date.today() + timedelta(days=next_interval))
+        review.next_review = str(datetime.strptime(today, "%Y-%m-%d").date() + timedelta(days=next_interval))
 
-        reviews.append(review)
         content_preview = str(review.content)[:50] if review.content else "Unknown concept"
-        print(f"  📖 Reviewed: {content_preview}... Quality: {quality}/5")
+        print(f"  📖 Reviewed: {content_preview}... Quality: {review.quality}/5")
 
     return reviews
 
 
-def calculate_mastery_levels(session_history: List[Dict]) -> Dict[str, float]:
+def calculate_mastery_levels(session_history: List[Dict], total_sessions: Optional[int] = None) -> Dict[str, float]:
     """
     Calculate current mastery level for each subject
     Required for curriculum progression (Issue #3)
-    """
-    if not session_history:
-        return {subj: 0.2 for subj in ['math', 'reading', 'science', 'social', 'art']}
-    
-    subject_scores = {'math': [], 'reading': [], 'science': [], 'social': [], 'art': []}
     
-    # Analyze recent sessions
-    recent_sessions = session_history[-10:]  # Last 10 sessions
-    
-    for session in recent_sessions:
-        # Check review performance
-        for review in session.get('review_results', []):
-            # Extract subject from concept
-            for subject in subject_scores.keys():
-                if subject in str(review.get('concept_id', '')).lower():
-                    if review.get('success', False):
-                        subject_scores[subject].append(1.0)
-                    else:
-                        subject_scores[subject].append(0.5)
-        
-        # Check new concepts learned
-        for concept in session.get('concepts_learned', []):
-            for subject in subject_scores.keys():
-                if subject in concept.lower():
-                    subject_scores[subject].append(0.1)  # Small boost for learning
-    
-    # Calculate mastery as average score
-    mastery_levels = {}
-    for subject, scores in subject_scores.items():
-        if scores:
-            mastery = sum(scores) / len(scores)
-            # Add time-based progression
-            mastery += len(session_history) * 0.01
-            mastery = min(mastery, 1.0)  # Cap at 100%
-        else:
-            mastery = 0.2  # Base level
-        mastery_levels[subject] = mastery
-    
-    return mastery_levels
+    ``total_sessions`` is the full history length when only recent sessions are passed.
+    The session store keeps the same figures up to date in a MasteryAggregate.
+    """
+    if total_sessions is None:
+        total_sessions = len(session_history)
+    aggregate = MasteryAggregate.from_sessions(session_history[-MASTERY_WINDOW:])
+    return aggregate.mastery_levels(total_sessions)
 
 def check_curriculum_progression(mastery_levels: Dict[str, float], current_unit: str = "Kindergarten Basics") -> Dict[str, Any]:
     """
@@ -397,7 +394,8 @@ def check_curriculum_progression(mastery_levels: Dict[str, float], current_unit:
             'weakest_subject': min(mastery_levels, key=mastery_levels.get)
         }
 
-def calculate_learning_metrics(session: Dict[str, Any], session_history: List[Dict]) -> Dict[str, Any]:
+def calculate_learning_metrics(session: Dict[str, Any], session_history: List[Dict],
+                               aggregate: Optional[MasteryAggregate] = None) -> Dict[str, Any]:
     """Calculate comprehensive learning metrics with AGI enhancements"""
     
     # Calculate basic metrics
@@ -435,7 +433,9 @@ def calculate_learning_metrics(session: Dict[str, Any], session_history: List[Di
     metrics.engagement_score = min(1.0, (review_success_rate + (concepts_learned / 10)) / 2)
     
     # Add session history analysis
-    if len(session_history) > 1:
+    if aggregate is not None:
+        metrics.learning_trend = aggregate.learning_trend(pending=session)
+    elif len(session_history) > 1:
         recent_sessions = session_history[-5:]  # Last 5 sessions
         recent_concepts = sum(len(s.get('concepts_learned', [])) for s in recent_sessions)
         metrics.learning_trend = recent_concepts / len(recent_sessions)
@@ -511,7 +511,7 @@ def calculate_adaptation_rate(session: Dict[str, Any]) -> float:
     concepts_learned = len(session.get('concepts_learned', []))
     return min(1.0, concepts_learned / 5)  # Placeholder
 
-def generate_daily_reasoning_problems(current_session: Dict[str, Any], all_sessions: List[Dict]) -> List:
+def generate_daily_reasoning_problems(current_session: Dict[str, Any], total_sessions: int) -> List:
     """Generate reasoning problems based on Marcus's current learning state"""
     
     try:
@@ -526,7 +526,7 @@ def generate_daily_reasoning_problems(current_session: Dict[str, Any], all_sessi
         key_insights = current_session.get('key_insights', [])
         if key_insights:
             problems.append(ReasoningProblem(
-                id=f"physical_reasoning_{len(all_sessions)}",
+                id=f"physical_reasoning_{total_sessions}",
                 description=f"Apply physical insight: {key_insights[0]}",
                 domain="physics",
                 goal="use physical understanding to solve abstract problem",
@@ -539,7 +539,7 @@ def generate_daily_reasoning_problems(current_session: Dict[str, Any], all_sessi
     if mastery_levels:
         weakest_subject = min(mastery_levels, key=mastery_levels.get)
         problems.append(ReasoningProblem(
-            id=f"learning_reasoning_{len(all_sessions)}",
+            id=f"learning_reasoning_{total_sessions}",
             description=f"How to improve performance in {weakest_subject}",
             domain="learning",
             goal=f"increase {weakest_subject} mastery from {mastery_levels[weakest_subject]:.1%} to 80%",
@@ -548,10 +548,9 @@ def generate_daily_reasoning_problems(current_session: Dict[str, Any], all_sessi
         ))
     
     # Problem 3: Meta-learning problem
-    total_sessions = len(all_sessions)
     if total_sessions > 5:
         problems.append(ReasoningProblem(
-            id=f"meta_reasoning_{len(all_sessions)}",
+            id=f"meta_reasoning_{total_sessions}",
             description="How to optimize learning strategy based on past performance",
             domain="meta-learning",
             goal="design optimal learning approach",
@@ -589,59 +588,72 @@ def review_previous_concepts(num_reviews: int) -> List[Dict]:
     ]
     return sample_concepts[:num_reviews]
 
+# One open store per database, so its schema is checked and its aggregate loaded once
+_session_stores: Dict[str, SessionStore] = {}
+_session_stores_lock = threading.Lock()
+
+def get_session_store(paths: LearningLoopPaths = DEFAULT_PATHS) -> SessionStore:
+    """Return the indexed session store for ``paths``, opening it on first use"""
+    key = os.path.abspath(paths.session_db_path)
+    with _session_stores_lock:
+        store = _session_stores.get(key)
+        if store is None:
+            os.makedirs(paths.session_db_path.parent, exist_ok=True)
+            store = _session_stores[key] = SessionStore(paths.session_db_path)
+        return store
+
 def load_all_sessions() -> List[Dict]:
-    """Load all previous sessions from files"""
-    all_sessions = []
-    
-    if os.path.exists(OUTPUT_DIR):
-        for fname in sorted(os.listdir(OUTPUT_DIR)):
-            if fname.endswith(".json") and ("session" in fname or "marcus_session" in fname):
-                try:
-                    with open(os.path.join(OUTPUT_DIR, fname)) as f:
-                        session_data = json.load(f)
-                        # Handle both single session and list of sessions
-                        if isinstance(session_data, list):
-                            all_sessions.extend(session_data)
-                        else:
-                            all_sessions.append(session_data)
-                except Exception as e:
-                    print(f"Warning: Could not load {fname}: {e}")
-    
-    # Sort sessions by timestamp if available
-    all_sessions.sort(key=lambda x: x.get('timestamp', x.get('date', '')))
-    return all_sessions
-
-def save_current_session_only(current_session: Dict) -> None:
+    """Load all previous sessions from the session store"""
+    return get_session_store().all_sessions()
+
+def load_recent_sessions(limit: int = RECENT_SESSION_WINDOW) -> List[Dict]:
+    """Load only the most recent sessions, oldest first"""
+    return get_session_store().recent_sessions(limit)
+
+def save_current_session_only(current_session: Dict, paths: LearningLoopPaths = DEFAULT_PATHS,
+                              now: Optional[datetime] = None) -> None:
     """Save only the current session to a unique file with detailed timestamp"""
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")  # More detailed: YYYYMMDD_HHMMSS
+    now = now or datetime.now()
+    timestamp = now.strftime("%Y-%m-%d_%H%M%S")  # More detailed: YYYYMMDD_HHMMSS
     session_id = f"marcus_session_{timestamp}"
     filename = f"{session_id}.json"
     
     # Add session metadata
     current_session['session_id'] = session_id
-    current_session['timestamp'] = datetime.now().isoformat()
+    current_session['timestamp'] = now.isoformat()
     current_session['session_duration_minutes'] = random.randint(15, 45)  # Simulated duration
     
     try:
-        with open(OUTPUT_DIR / filename, "w") as f:
+        get_session_store(paths).save_session(current_session)
+        with open(paths.output_dir / filename, "w") as f:
             json.dump(current_session, f, indent=4, default=str)
         print(f"✅ Session saved: {session_id}")
     except Exception as e:
         print(f"🚨 Error saving session: {e}")
 
-def run_daily_learning_loop(run_date: date = date.today()) -> Dict[str, Any]:
-    """Enhanced daily learning loop with advanced reasoning capabilities"""
+def run_daily_learning_loop(run_date: date = date.today(), paths: LearningLoopPaths = DEFAULT_PATHS,
+                            clock: Optional[Callable[[], datetime]] = None) -> Dict[str, Any]:
+    """
+    Enhanced daily learning loop with advanced reasoning capabilities
+    
+    ``paths`` keeps a learner's files apart from other learners and ``clock``
+    supplies session timestamps, so simulations never patch module globals.
+    """
     print("🌸 Marcus AGI - Daily Learning Session")
     print("=" * 50)
     TODAY = str(run_date)
+    clock = clock or datetime.now
 
     # Create output directories
-    for directory in [OUTPUT_DIR, ANALYTICS_DIR, SUMMARIES_DIR]:
+    for directory in [paths.output_dir, paths.analytics_dir, paths.summaries_dir]:
         os.makedirs(directory, exist_ok=True)
     
-    # Step 1: Load ALL previous sessions (not overwriting)
-    all_previous_sessions = load_all_sessions()
-    print(f"📚 Loaded {len(all_previous_sessions)} previous sessions")
+    # Step 1: Load running mastery statistics and due reviews from the session store
+    session_store = get_session_store(paths)
+    mastery_aggregate = session_store.aggregate
+    total_previous_sessions = mastery_aggregate.total_sessions
+    due_reviews = session_store.get_due_reviews(TODAY)
+    print(f"📚 {total_previous_sessions} previous sessions, {len(due_reviews)} reviews due")
     
     # Step 2: Initialize Advanced Reasoning Engine
     try:
@@ -719,7 +731,7 @@ def run_daily_learning_loop(run_date: date = date.today()) -> Dict[str, Any]:
             # Initialize physical world
             world = MarcusGridWorld()
             embodied = EmbodiedLearning(world)
-            memory_system = MarcusMemorySystem("marcus_embodied.db")
+            memory_system = MarcusMemorySystem(paths.embodied_db_path)
             
             # Conduct physical exploration - QUIET MODE
             physical_learnings = embodied.explore_and_learn(20)
@@ -764,7 +776,7 @@ def run_daily_learning_loop(run_date: date = date.today()) -> Dict[str, Any]:
         print("\n🎯 Advanced Reasoning Challenge...")
         
         # Generate reasoning problems based on current session
-        daily_problems = generate_daily_reasoning_problems(current_session, all_previous_sessions)
+        daily_problems = generate_daily_reasoning_problems(current_session, total_previous_sessions)
         
         for problem in daily_problems[:2]:  # Solve 2 problems per session
             result = reasoning_engine.solve_problem_with_reasoning(problem)
@@ -786,15 +798,22 @@ def run_daily_learning_loop(run_date: date = date.today()) -> Dict[str, Any]:
         ]
         current_session['reasoning_insights'] = reasoning_insights
     
-    # Step 5: Academic Learning (use all previous sessions for context)
-    session_history_for_learning = all_previous_sessions + [current_session]
-    learning_results = run_learning_session(session_history_for_learning, TODAY)
+    # Step 5: Academic Learning (the session store supplies history aggregates and due reviews)
+    learning_results = run_learning_session([current_session], TODAY,
+                                            due_reviews=due_reviews,
+                                            aggregate=mastery_aggregate)
     
     # Update current session with learning results
     current_session.update(learning_results)
     
     # Step 6: Enhanced Reflection & Learning Journal (Issue #4 completion)
-    if ENHANCED_REFLECTION_AVAILABLE:
+    try:
+        from core.reasoning.reflection_journal_system import create_enhanced_reflection_system, enhance_session_with_journal
+        enhanced_reflection_available = True
+    except ImportError:
+        enhanced_reflection_available = False
+        print("Enhanced reflection system not available - using basic reflection")
+    if enhanced_reflection_available:
         print("\n📖 Creating Learning Journal Entry...")
         try:
             # Initialize journal system (could be persistent in real implementation)
@@ -821,20 +840,30 @@ def run_daily_learning_loop(run_date: date = date.today()) -> Dict[str, Any]:
             print(f"  ⚠️ Enhanced reflection error: {str(e)[:50]}...")
     
     # Step 7: Save ONLY current session (no overwriting)
-    save_current_session_only(current_session)
+    now = clock()
+    save_current_session_only(current_session, paths, now)
     
     # Step 8: Generate report for current session
-    generate_reports([current_session], TODAY)
+    generate_reports([current_session], TODAY, paths, now)
     
     print("\n✅ Learning session complete!")
     return current_session
 
-def run_learning_session(session_history: List[Dict], today: str) -> Dict[str, Any]:
+def run_learning_session(session_history: List[Dict], today: str,
+                         due_reviews: Optional[List[Dict]] = None,
+                         total_sessions: Optional[int] = None,
+                         aggregate: Optional[MasteryAggregate] = None) -> Dict[str, Any]:
     """
     Run the core learning session: generate lessons, conduct reviews, and update metrics
+    
+    Pass ``due_reviews`` and the store's ``aggregate`` to skip scanning ``session_history``;
+    the last entry of ``session_history`` is then the only one needed.
     """
     # 1. Calculate mastery levels
-    mastery_levels = calculate_mastery_levels(session_history)
+    if aggregate is not None:
+        mastery_levels = aggregate.mastery_levels(total_sessions, pending=session_history[-1])
+    else:
+        mastery_levels = calculate_mastery_levels(session_history, total_sessions)
     
     # 2. Check curriculum progression
     progression_report = check_curriculum_progression(mastery_levels, session_history[-1].get('current_unit', "Kindergarten Basics"))
@@ -843,7 +872,8 @@ def run_learning_session(session_history: List[Dict], today: str) -> Dict[str, A
     new_lessons = generate_adaptive_lessons(session_history, mastery_levels)
     
     # 4. Conduct SM-2 reviews for spaced repetition
-    due_reviews = get_due_reviews(session_history, today)
+    if due_reviews is None:
+        due_reviews = get_due_reviews(session_history, today)
     review_results = conduct_sm2_reviews(due_reviews, session_history, today)
     
     # 5. Update session history
@@ -856,7 +886,7 @@ def run_learning_session(session_history: List[Dict], today: str) -> Dict[str, A
     })
     
     # 6. Generate learning metrics - QUIET
-    metrics = calculate_learning_metrics(session_history[-1], session_history)
+    metrics = calculate_learning_metrics(session_history[-1], session_history, aggregate)
     
     return {
         'reviews_completed': len(review_results),
@@ -883,13 +913,15 @@ def save_session_history(session_history: List[Dict]) -> None:
     except Exception as e:
         print(f"🚨 Error saving session history: {e}")
 
-def generate_reports(session_history: List[Dict], today: str) -> None:
+def generate_reports(session_history: List[Dict], today: str, paths: LearningLoopPaths = DEFAULT_PATHS,
+                     now: Optional[datetime] = None) -> None:
     """Generate and save progress reports with detailed timestamps"""
     if not session_history:
         return
     
     # Create detailed timestamp for reports
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+    now = now or datetime.now()
+    timestamp = now.strftime("%Y-%m-%d_%H%M%S")
     report_id = f"marcus_report_{timestamp}"
     report_filename = f"{report_id}.txt"
     
@@ -900,11 +932,11 @@ def generate_reports(session_history: List[Dict], today: str) -> None:
     
     # Save detailed text report
     try:
-        with open(SUMMARIES_DIR / report_filename, "w") as f:
+        with open(paths.summaries_dir / report_filename, "w") as f:
             f.write("🌟 Marcus AGI Learning Report\n")
             f.write("=" * 40 + "\n")
             f.write(f"Report ID: {report_id}\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d at %H:%M:%S')}\n")
+            f.write(f"Generated: {now.strftime('%Y-%m-%d at %H:%M:%S')}\n")
             f.write(f"Session Date: {today}\n\n")
             f.write(f"📊 Session Summary:\n")
             f.write(f"  • Total Sessions: {total_sessions}\n")
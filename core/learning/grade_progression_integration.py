@@ -26,7 +26,7 @@ from .grade_progression_system import (
 from .daily_learning_loop import DailyLearningLoop, LEARNING_CONFIG
 from .kindergarten_curriculum_expansion import KindergartenCurriculumExpansion
 from ..social.emotional_intelligence_assessment import EmotionalIntelligenceAssessment
-from ..memory.memory_system import MarcusMemorySystem, LearningConcept
+from ..memory.memory_system import MarcusMemorySystem, Concept
 
 logger = logging.getLogger(__name__)
 
@@ -258,15 +258,15 @@ class GradeProgressionIntegration:
         logger.info("💾 Updating grade progression tracking...")
         
         # Store progression data in memory system
-        progression_concept = LearningConcept(
+        progression_concept = Concept(
             id=f"grade_progression_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-            content=json.dumps(progression_assessment),
+            content=json.dumps(progression_assessment, default=str),
             subject="grade_progression",
             grade_level=progression_assessment.get('current_grade', 'kindergarten'),
             emotional_context="progressive_learning"
         )
         
-        self.memory_system.store_concept(progression_concept)
+        self.memory_system.learn_concepts_bulk([progression_concept])
         
         # Check if advancement should be triggered
         if progression_assessment.get('advancement_recommendation', {}).get('should_advance', False):
@@ -32,6 +32,8 @@ from .kindergarten_curriculum_expansion import (
 )
 from ..social.emotional_intelligence_assessment import EmotionalIntelligenceAssessment
 from ..memory.memory_system import MarcusMemorySystem, Concept
+from ..memory.learners import DEFAULT_LEARNER_ID
+from ..memory.state_store import register_schema, ensure_schema
 
 logger = logging.getLogger(__name__)
 
@@ -125,13 +127,69 @@ class PlacementAssessment:
     recommended_interventions: List[str]
     timeline_for_reassessment: Optional[date] = None
 
+GRADE_PROGRESSION_SCHEMA = register_schema("grade_progression", 1, [
+    # Grade progression history table
+    """
+        CREATE TABLE IF NOT EXISTS grade_progressions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id TEXT NOT NULL DEFAULT 'marcus',
+            from_grade TEXT NOT NULL,
+            to_grade TEXT NOT NULL,
+            progression_date TEXT NOT NULL,
+            readiness_score REAL NOT NULL,
+            assessment_data TEXT NOT NULL,
+            intervention_plan TEXT,
+            success_metrics TEXT
+        )
+    """,
+    # Current grade status table
+    """
+        CREATE TABLE IF NOT EXISTS current_grade_status (
+            student_id TEXT PRIMARY KEY DEFAULT 'marcus',
+            current_grade TEXT NOT NULL,
+            grade_entry_date TEXT NOT NULL,
+            days_in_grade INTEGER NOT NULL DEFAULT 0,
+            subject_mastery_levels TEXT NOT NULL DEFAULT '{}',
+            developmental_progress TEXT NOT NULL DEFAULT '{}',
+            last_assessment_date TEXT,
+            next_assessment_due TEXT
+        )
+    """,
+    # Subject mastery tracking
+    """
+        CREATE TABLE IF NOT EXISTS subject_mastery_tracking (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id TEXT NOT NULL DEFAULT 'marcus',
+            grade_level TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            concept_id TEXT NOT NULL,
+            mastery_level REAL NOT NULL,
+            assessment_date TEXT NOT NULL,
+            growth_trajectory TEXT,
+            intervention_notes TEXT
+        )
+    """,
+    # Per-student history and mastery lookups
+    """
+        CREATE INDEX IF NOT EXISTS idx_grade_progressions_student_date
+        ON grade_progressions(student_id, progression_date)
+    """,
+    """
+        CREATE INDEX IF NOT EXISTS idx_subject_mastery_student_grade
+        ON subject_mastery_tracking(student_id, grade_level, subject)
+    """,
+])
+
 class GradeProgressionSystem:
     """Comprehensive grade progression system for Marcus AGI"""
     
     def __init__(self, memory_system: MarcusMemorySystem = None, 
                  eq_system: EmotionalIntelligenceAssessment = None,
-                 kindergarten_curriculum: KindergartenCurriculumExpansion = None):
-        self.memory_system = memory_system or MarcusMemorySystem()
+                 kindergarten_curriculum: KindergartenCurriculumExpansion = None,
+                 learner_id: Optional[str] = None):
+        self.memory_system = memory_system or MarcusMemorySystem(learner_id=learner_id or DEFAULT_LEARNER_ID)
+        # Student assessed when callers don't name one
+        self.learner_id = learner_id or self.memory_system.learner_id
         self.eq_system = eq_system or EmotionalIntelligenceAssessment()
         self.kindergarten_curriculum = kindergarten_curriculum or KindergartenCurriculumExpansion()
         
@@ -146,54 +204,7 @@ class GradeProgressionSystem:
     
     def _init_progression_database(self):
         """Initialize database tables for grade progression tracking"""
-        with sqlite3.connect(self.memory_system.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Grade progression history table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS grade_progressions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    student_id TEXT NOT NULL DEFAULT 'marcus',
-                    from_grade TEXT NOT NULL,
-                    to_grade TEXT NOT NULL,
-                    progression_date TEXT NOT NULL,
-                    readiness_score REAL NOT NULL,
-                    assessment_data TEXT NOT NULL,
-                    intervention_plan TEXT,
-                    success_metrics TEXT
-                )
-            """)
-            
-            # Current grade status table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS current_grade_status (
-                    student_id TEXT PRIMARY KEY DEFAULT 'marcus',
-                    current_grade TEXT NOT NULL,
-                    grade_entry_date TEXT NOT NULL,
-                    days_in_grade INTEGER NOT NULL DEFAULT 0,
-                    subject_mastery_levels TEXT NOT NULL DEFAULT '{}',
-                    developmental_progress TEXT NOT NULL DEFAULT '{}',
-                    last_assessment_date TEXT,
-                    next_assessment_due TEXT
-                )
-            """)
-            
-            # Subject mastery tracking
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS subject_mastery_tracking (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    student_id TEXT NOT NULL DEFAULT 'marcus',
-                    grade_level TEXT NOT NULL,
-                    subject TEXT NOT NULL,
-                    concept_id TEXT NOT NULL,
-                    mastery_level REAL NOT NULL,
-                    assessment_date TEXT NOT NULL,
-                    growth_trajectory TEXT,
-                    intervention_notes TEXT
-                )
-            """)
-            
-            conn.commit()
+        return ensure_schema(self.memory_system.db_path, GRADE_PROGRESSION_SCHEMA)
     
     def _load_grade_standards(self) -> Dict[GradeLevel, GradeStandards]:
         """Load academic standards for each grade level"""
@@ -530,8 +541,9 @@ class GradeProgressionSystem:
         
         return scalings
     
-    def assess_grade_readiness(self, student_id: str = "marcus") -> PlacementAssessment:
+    def assess_grade_readiness(self, student_id: Optional[str] = None) -> PlacementAssessment:
         """Conduct comprehensive grade readiness assessment"""
+        student_id = student_id or self.learner_id
         logger.info(f"Conducting grade readiness assessment for {student_id}")
         
         # Get current grade status
@@ -587,8 +599,9 @@ class GradeProgressionSystem:
         
         return assessment
     
-    def advance_grade(self, student_id: str = "marcus", assessment: PlacementAssessment = None) -> Dict[str, Any]:
+    def advance_grade(self, student_id: Optional[str] = None, assessment: PlacementAssessment = None) -> Dict[str, Any]:
         """Advance student to next grade if ready"""
+        student_id = student_id or (assessment.student_id if assessment else self.learner_id)
         if not assessment:
             assessment = self.assess_grade_readiness(student_id)
         
@@ -634,7 +647,7 @@ class GradeProgressionSystem:
     
     def _get_current_grade(self, student_id: str) -> GradeLevel:
         """Get student's current grade level"""
-        with sqlite3.connect(self.memory_system.db_path) as conn:
+        with self.memory_system.connections.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT current_grade FROM current_grade_status 
@@ -651,7 +664,7 @@ class GradeProgressionSystem:
     
     def _initialize_student_grade_status(self, student_id: str, grade: GradeLevel):
         """Initialize student's grade status in database"""
-        with sqlite3.connect(self.memory_system.db_path) as conn:
+        with self.memory_system.connections.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT OR REPLACE INTO current_grade_status
@@ -659,14 +672,13 @@ class GradeProgressionSystem:
                  subject_mastery_levels, developmental_progress)
                 VALUES (?, ?, ?, ?, ?, ?)
             """, (student_id, grade.value, datetime.now().isoformat(), 0, '{}', '{}'))
-            conn.commit()
     
     def _assess_academic_subjects(self, student_id: str, current_grade: GradeLevel) -> Dict[AcademicSubject, float]:
         """Assess proficiency in core academic subjects"""
         subject_scores = {}
         
         # Get mastery levels from memory system for different subjects
-        with sqlite3.connect(self.memory_system.db_path) as conn:
+        with self.memory_system.connections.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT subject, AVG(mastery_level) as avg_mastery
@@ -724,7 +736,7 @@ class GradeProgressionSystem:
         """Evaluate achievement level for a specific developmental milestone"""
         try:
             # Get all concepts from memory and filter for relevant ones
-            all_concepts = self.memory_system.fetch_all_concepts()
+            all_concepts = self.memory_system.for_learner(student_id).fetch_all_concepts()
             concepts = [c for c in all_concepts if milestone_id.lower() in str(c.get('content', '')).lower()]
             
             if not concepts:
@@ -941,7 +953,7 @@ class GradeProgressionSystem:
     
     def _get_days_in_current_grade(self, student_id: str) -> int:
         """Get number of days student has been in current grade"""
-        with sqlite3.connect(self.memory_system.db_path) as conn:
+        with self.memory_system.connections.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT grade_entry_date FROM current_grade_status 
@@ -970,7 +982,7 @@ class GradeProgressionSystem:
                                  to_grade: GradeLevel, assessment: PlacementAssessment) -> Dict[str, Any]:
         """Execute the grade advancement process"""
         try:
-            with sqlite3.connect(self.memory_system.db_path) as conn:
+            with self.memory_system.connections.transaction() as conn:
                 cursor = conn.cursor()
                 
                 # Record the progression
@@ -999,8 +1011,6 @@ class GradeProgressionSystem:
                     (date.today() + timedelta(days=45)).isoformat(),  # Next assessment in 45 days
                     student_id
                 ))
-                
-                conn.commit()
             
             logger.info(f"Successfully advanced {student_id} from {from_grade.value} to {to_grade.value}")
             
@@ -1055,17 +1065,17 @@ class GradeProgressionSystem:
     
     def _store_assessment_results(self, assessment: PlacementAssessment):
         """Store assessment results in database for tracking"""
-        with sqlite3.connect(self.memory_system.db_path) as conn:
+        with self.memory_system.connections.transaction() as conn:
             cursor = conn.cursor()
             
             # Store in subject mastery tracking
-            for subject, score in assessment.subject_scores.items():
-                cursor.execute("""
-                    INSERT INTO subject_mastery_tracking
-                    (student_id, grade_level, subject, concept_id, mastery_level, 
-                     assessment_date, growth_trajectory)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
+            cursor.executemany("""
+                INSERT INTO subject_mastery_tracking
+                (student_id, grade_level, subject, concept_id, mastery_level, 
+                 assessment_date, growth_trajectory)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (
                     assessment.student_id,
                     assessment.current_grade.value,
                     subject.value,
@@ -1073,17 +1083,18 @@ class GradeProgressionSystem:
                     score / 100.0,  # Convert percentage back to decimal
                     assessment.assessment_date.isoformat(),
                     json.dumps({'readiness_status': assessment.overall_readiness.value})
-                ))
-            
-            conn.commit()
+                )
+                for subject, score in assessment.subject_scores.items()
+            ])
     
-    def get_grade_progression_report(self, student_id: str = "marcus") -> Dict[str, Any]:
+    def get_grade_progression_report(self, student_id: Optional[str] = None) -> Dict[str, Any]:
         """Generate comprehensive grade progression report"""
+        student_id = student_id or self.learner_id
         # Get current status
         current_grade = self._get_current_grade(student_id)
         
         # Get progression history
-        with sqlite3.connect(self.memory_system.db_path) as conn:
+        with self.memory_system.connections.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT from_grade, to_grade, progression_date, readiness_score
@@ -1160,11 +1171,10 @@ class GradeProgressionSystem:
         return recommendations
 
 # Factory function for easy integration
-def create_grade_progression_system() -> GradeProgressionSystem:
+def create_grade_progression_system(learner_id: str = DEFAULT_LEARNER_ID) -> GradeProgressionSystem:
     """Create and initialize the grade progression system"""
-    # Create a memory system with a specific database path for the grade progression system
-    memory_system = MarcusMemorySystem(db_path="grade_progression_memory.db")
-    return GradeProgressionSystem(memory_system=memory_system)
+    # Progression tables live in the shared state database next to the learner's memory
+    return GradeProgressionSystem(learner_id=learner_id)
 
 # Demo function
 def demo_grade_progression_system():
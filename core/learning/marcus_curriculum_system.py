@@ -190,18 +190,21 @@ class MarcusCurriculumSystem:
         
         successful_learnings = 0
         
-        # Process each learning objective
-        for objective in lesson.objectives:
-            concept = Concept(
+        # Learn every objective's concept in one transaction
+        learn_result = self.memory_system.learn_concepts_bulk(
+            Concept(
                 id=objective.id,
                 content=objective.description,
                 subject=objective.subject,
                 grade_level=objective.grade_level,
                 emotional_context=objective.emotional_component
             )
-            
-            # Attempt to learn the concept
-            if self.memory_system.learn_concept(concept):
+            for objective in lesson.objectives
+        )
+        
+        # Process each learning objective
+        for objective in lesson.objectives:
+            if 'error' not in learn_result and objective.id and objective.description:
                 session_results["concepts_learned"].append(objective.title)
                 successful_learnings += 1
                 
@@ -472,21 +475,21 @@ class MrRogersEpisodeProcessor:
         episode_data = self.essential_episodes[episode_title]
         
         # Create concepts from the episode
-        concepts_created = []
+        episode_concepts = []
         for concept_id in episode_data["primary_concepts"]:
             # Find appropriate message for this concept
             concept_content = episode_data["key_messages"][0]  # Simplified - would map better in full implementation
             
-            concept = Concept(
+            episode_concepts.append(Concept(
                 id=f"mr_rogers_{concept_id}",
                 content=concept_content,
                 subject="social_emotional",
                 grade_level="kindergarten",
                 emotional_context=episode_data["emotional_journey"][-1]  # End emotional state
-            )
-            
-            if self.curriculum_system.memory_system.learn_concept(concept):
-                concepts_created.append(concept.id)
+            ))
+        
+        learn_result = self.curriculum_system.memory_system.learn_concepts_bulk(episode_concepts)
+        concepts_created = [] if 'error' in learn_result else [concept.id for concept in episode_concepts]
         
         # Simulate Marcus's experience watching the episode
         marcus_experience = {
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Marcus Mastery Aggregate - Running per-subject statistics over recent sessions
+
+Keeps sliding-window counts of review successes, review failures and newly
+learned concepts for every subject, plus a shorter window of concepts learned
+per session. Each session is folded in once as it is recorded and the oldest
+one is subtracted as it leaves the window, so mastery, learning-trend and
+progression queries never rescan session history.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+MASTERY_SUBJECTS = ['math', 'reading', 'science', 'social', 'art']
+
+# Sessions that feed subject mastery and the learning trend
+MASTERY_WINDOW = 10
+TREND_WINDOW = 5
+
+# Score each event contributes to a subject's mastery average
+SUCCESS_SCORE = 1.0
+FAILURE_SCORE = 0.5
+LEARNED_SCORE = 0.1
+BASE_MASTERY = 0.2
+SESSION_PROGRESS_BONUS = 0.01
+
+@dataclass
+class SessionContribution:
+    """Per-subject event counts one session adds to the window"""
+    session_id: str
+    successes: Dict[str, int] = field(default_factory=dict)
+    failures: Dict[str, int] = field(default_factory=dict)
+    learned: Dict[str, int] = field(default_factory=dict)
+    concepts_learned: int = 0
+
+    @classmethod
+    def from_session(cls, session: Dict[str, Any], session_id: str = "") -> 'SessionContribution':
+        contribution = cls(session_id=session_id)
+        for review in session.get('review_results', []) or []:
+            concept_id = str(review.get('concept_id', '')).lower()
+            counts = contribution.successes if review.get('success', False) else contribution.failures
+            for subject in MASTERY_SUBJECTS:
+                if subject in concept_id:
+                    counts[subject] = counts.get(subject, 0) + 1
+        concepts = session.get('concepts_learned', []) or []
+        for concept in concepts:
+            concept = str(concept).lower()
+            for subject in MASTERY_SUBJECTS:
+                if subject in concept:
+                    contribution.learned[subject] = contribution.learned.get(subject, 0) + 1
+        contribution.concepts_learned = len(concepts)
+        return contribution
+
+class MasteryAggregate:
+    """Sliding-window running totals behind subject mastery and learning trend"""
+
+    def __init__(self, window: int = MASTERY_WINDOW, trend_window: int = TREND_WINDOW):
+        self.window = window
+        self.trend_window = trend_window
+        self.total_sessions = 0
+        self.last_sort_key = ""
+        self._entries: Deque[SessionContribution] = deque()
+        self._successes = dict.fromkeys(MASTERY_SUBJECTS, 0)
+        self._failures = dict.fromkeys(MASTERY_SUBJECTS, 0)
+        self._learned = dict.fromkeys(MASTERY_SUBJECTS, 0)
+        self._trend_sum = 0
+
+    @classmethod
+    def from_sessions(cls, sessions: Iterable[Dict[str, Any]], **kwargs) -> 'MasteryAggregate':
+        """Build an aggregate by recording ``sessions`` in order"""
+        aggregate = cls(**kwargs)
+        for session in sessions:
+            aggregate.record_session(session)
+        return aggregate
+
+    def _apply(self, entry: SessionContribution, sign: int):
+        for totals, counts in ((self._successes, entry.successes),
+                               (self._failures, entry.failures),
+                               (self._learned, entry.learned)):
+            for subject, count in counts.items():
+                totals[subject] += sign * count
+
+    @property
+    def latest_session_id(self) -> Optional[str]:
+        return self._entries[-1].session_id if self._entries else None
+
+    def _trend_entries(self) -> List[SessionContribution]:
+        return list(self._entries)[-self.trend_window:]
+
+    def record_session(self, session: Dict[str, Any], session_id: str = "", sort_key: str = ""):
+        """Fold one newly recorded session into the window"""
+        entry = SessionContribution.from_session(session, session_id)
+        if session_id and self._entries and self._entries[-1].session_id == session_id:
+            # Re-saving the latest session replaces its contribution
+            self._remove_last()
+            self.total_sessions -= 1
+
+        if len(self._entries) >= self.trend_window:
+            self._trend_sum -= self._entries[-self.trend_window].concepts_learned
+        self._entries.append(entry)
+        self._apply(entry, 1)
+        self._trend_sum += entry.concepts_learned
+        if len(self._entries) > self.window:
+            self._apply(self._entries.popleft(), -1)
+
+        self.total_sessions += 1
+        self.last_sort_key = max(self.last_sort_key, sort_key)
+
+    def _remove_last(self):
+        entry = self._entries.pop()
+        self._apply(entry, -1)
+        self._trend_sum -= entry.concepts_learned
+        if len(self._entries) >= self.trend_window:
+            self._trend_sum += self._entries[-self.trend_window].concepts_learned
+
+    def mastery_levels(self, total_sessions: Optional[int] = None,
+                       pending: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+        """
+        Subject mastery over the window
+
+        ``pending`` is an in-progress session that takes the newest slot, pushing
+        the oldest recorded session out, as if it had already been recorded.
+        """
+        if total_sessions is None:
+            total_sessions = self.total_sessions + (1 if pending is not None else 0)
+        successes, failures, learned = self._successes, self._failures, self._learned
+        if pending is not None:
+            successes, failures, learned = dict(successes), dict(failures), dict(learned)
+            extra = SessionContribution.from_session(pending)
+            for totals, counts in ((successes, extra.successes), (failures, extra.failures),
+                                   (learned, extra.learned)):
+                for subject, count in counts.items():
+                    totals[subject] += count
+            if len(self._entries) >= self.window:
+                oldest = self._entries[0]
+                for totals, counts in ((successes, oldest.successes), (failures, oldest.failures),
+                                       (learned, oldest.learned)):
+                    for subject, count in counts.items():
+                        totals[subject] -= count
+
+        if not self._entries and pending is None:
+            return dict.fromkeys(MASTERY_SUBJECTS, BASE_MASTERY)
+
+        mastery_levels = {}
+        for subject in MASTERY_SUBJECTS:
+            count = successes[subject] + failures[subject] + learned[subject]
+            if count:
+                score = (successes[subject] * SUCCESS_SCORE + failures[subject] * FAILURE_SCORE
+                         + learned[subject] * LEARNED_SCORE)
+                mastery = min(score / count + total_sessions * SESSION_PROGRESS_BONUS, 1.0)
+            else:
+                mastery = BASE_MASTERY
+            mastery_levels[subject] = mastery
+        return mastery_levels
+
+    def average_mastery(self, total_sessions: Optional[int] = None,
+                        pending: Optional[Dict[str, Any]] = None) -> float:
+        """Mean subject mastery, the figure curriculum progression is judged on"""
+        levels = self.mastery_levels(total_sessions, pending)
+        return sum(levels.values()) / len(levels)
+
+    def learning_trend(self, pending: Optional[Dict[str, Any]] = None) -> float:
+        """Average concepts learned per session over the trend window"""
+        if pending is None:
+            count = min(len(self._entries), self.trend_window)
+            return self._trend_sum / count if count else 0.0
+        trend_sum = self._trend_sum + len(pending.get('concepts_learned', []) or [])
+        count = min(len(self._entries), self.trend_window)
+        if count >= self.trend_window:
+            trend_sum -= self._entries[-self.trend_window].concepts_learned
+        else:
+            count += 1
+        return trend_sum / count
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'window': self.window,
+            'trend_window': self.trend_window,
+            'total_sessions': self.total_sessions,
+            'last_sort_key': self.last_sort_key,
+            'entries': [
+                {
+                    'session_id': e.session_id,
+                    'successes': e.successes,
+                    'failures': e.failures,
+                    'learned': e.learned,
+                    'concepts_learned': e.concepts_learned
+                }
+                for e in self._entries
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MasteryAggregate':
+        aggregate = cls(window=data['window'], trend_window=data['trend_window'])
+        for item in data['entries']:
+            entry = SessionContribution(**item)
+            aggregate._entries.append(entry)
+            aggregate._apply(entry, 1)
+        aggregate._trend_sum = sum(e.concepts_learned for e in aggregate._trend_entries())
+        aggregate.total_sessions = data['total_sessions']
+        aggregate.last_sort_key = data['last_sort_key']
+        return aggregate
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Marcus Session Store - Indexed storage for daily learning sessions
+
+Replaces scanning every ``output/sessions/*.json`` file on each run. Sessions
+are kept in SQLite keyed by date and ordered by timestamp, and the latest SM-2
+review of every concept is indexed by ``next_review`` so the daily loop only
+reads the recent sessions and due reviews it needs. A MasteryAggregate is
+updated and persisted alongside every write.
+"""
+
+import os
+import copy
+import json
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.memory.connection_manager import get_connection_manager
+from core.learning.mastery_aggregate import MasteryAggregate
+
+logger = logging.getLogger(__name__)
+
+INSERT_SESSION_SQL = """
+    INSERT OR REPLACE INTO sessions (session_id, session_date, sort_key, data)
+    VALUES (?, ?, ?, ?)
+"""
+
+# Only a review from the same or a later session replaces a concept's schedule
+UPSERT_REVIEW_SQL = """
+    INSERT INTO review_schedule
+    (concept_id, session_id, sort_key, content, interval_days, ease_factor, repetitions, next_review)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(concept_id) DO UPDATE SET
+        session_id = excluded.session_id,
+        sort_key = excluded.sort_key,
+        content = excluded.content,
+        interval_days = excluded.interval_days,
+        ease_factor = excluded.ease_factor,
+        repetitions = excluded.repetitions,
+        next_review = excluded.next_review
+    WHERE excluded.sort_key >= review_schedule.sort_key
+"""
+
+SAVE_AGGREGATE_SQL = """
+    INSERT OR REPLACE INTO session_aggregates (name, state) VALUES (?, ?)
+"""
+
+MASTERY_AGGREGATE = 'mastery'
+
+def session_sort_key(session: Dict[str, Any]) -> str:
+    """Chronological key used to order sessions, as load_all_sessions did"""
+    return str(session.get('timestamp', session.get('date', '')))
+
+def session_key(session: Dict[str, Any]) -> str:
+    """Stable id for a session; sessions without one are keyed by content hash"""
+    if session.get('session_id'):
+        return str(session['session_id'])
+    payload = json.dumps(session, sort_keys=True, default=str).encode()
+    return f"session_{hashlib.sha1(payload).hexdigest()[:16]}"
+
+def _is_review_date(value: Any) -> bool:
+    # Malformed dates were always skipped by the due-review scan
+    try:
+        datetime.strptime(str(value), "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
+class SessionStore:
+    """SQLite-backed session history with a next_review index over review results"""
+
+    def __init__(self, db_path: str):
+        self.db_path = str(db_path)
+        self.connections = get_connection_manager(self.db_path)
+        self._aggregate: Optional[MasteryAggregate] = None
+        self.init_database()
+
+    def init_database(self):
+        """Create the session tables and indexes"""
+        with self.connections.transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    session_id TEXT PRIMARY KEY,
+                    session_date TEXT,
+                    sort_key TEXT NOT NULL,
+                    data TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS review_schedule (
+                    concept_id TEXT PRIMARY KEY,
+                    session_id TEXT NOT NULL,
+                    sort_key TEXT NOT NULL,
+                    content TEXT,
+                    interval_days REAL,
+                    ease_factor REAL,
+                    repetitions INTEGER,
+                    next_review TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS session_aggregates (
+                    name TEXT PRIMARY KEY,
+                    state TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_sort_key ON sessions(sort_key)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions(session_date)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_review_schedule_next_review ON review_schedule(next_review)")
+
+    def save_session(self, session: Dict[str, Any]) -> str:
+        """Store one session and index its review results; returns the session id"""
+        return self.save_sessions([session])[0]
+
+    def save_sessions(self, sessions: Iterable[Dict[str, Any]]) -> List[str]:
+        """Store many sessions in a single transaction"""
+        session_rows, review_rows, recorded = [], [], []
+        for session in sessions:
+            session_id = session_key(session)
+            sort_key = session_sort_key(session)
+            session_rows.append((session_id, session.get('date'), sort_key, json.dumps(session, default=str)))
+            recorded.append(session)
+            for review in session.get('review_results', []) or []:
+                if not review.get('concept_id') or not _is_review_date(review.get('next_review')):
+                    continue
+                review_rows.append((
+                    review['concept_id'], session_id, sort_key, review.get('content'),
+                    review.get('interval_days', 1), review.get('ease_factor', 2.5),
+                    review.get('repetitions', 0), str(review['next_review'])
+                ))
+
+        # Apply reviews oldest first so the upsert keeps the latest schedule
+        review_rows.sort(key=lambda row: row[2])
+        with self.connections.transaction() as conn:
+            # Update a copy; the cached aggregate only changes once the sessions are stored
+            aggregate = copy.deepcopy(self.aggregate)
+            rebuild = False
+            for row, session in zip(session_rows, recorded):
+                session_id, sort_key = row[0], row[2]
+                if not rebuild:
+                    exists = conn.execute("SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+                    # Out-of-order or rewritten history is recomputed from the table instead
+                    rebuild = sort_key < aggregate.last_sort_key or (
+                        exists is not None and aggregate.latest_session_id != session_id)
+                if not rebuild:
+                    aggregate.record_session(session, session_id, sort_key)
+                conn.execute(INSERT_SESSION_SQL, row)
+            conn.executemany(UPSERT_REVIEW_SQL, review_rows)
+            if rebuild:
+                aggregate = self._rebuild_aggregate(conn)
+            conn.execute(SAVE_AGGREGATE_SQL, (MASTERY_AGGREGATE, json.dumps(aggregate.to_dict())))
+            # Nested in a caller's transaction, the sessions are only stored once that commits
+            self.connections.after_commit(lambda: setattr(self, '_aggregate', aggregate))
+        return [row[0] for row in session_rows]
+
+    @property
+    def aggregate(self) -> MasteryAggregate:
+        """Running mastery statistics for the stored sessions"""
+        if self._aggregate is None:
+            conn = self.connections.get_connection()
+            row = conn.execute("SELECT state FROM session_aggregates WHERE name = ?",
+                               (MASTERY_AGGREGATE,)).fetchone()
+            if row is not None:
+                self._aggregate = MasteryAggregate.from_dict(json.loads(row[0]))
+            else:
+                self._aggregate = self._rebuild_aggregate(conn)
+        return self._aggregate
+
+    def _rebuild_aggregate(self, conn) -> MasteryAggregate:
+        aggregate = MasteryAggregate()
+        rows = conn.execute("""
+            SELECT session_id, sort_key, data FROM sessions ORDER BY sort_key DESC LIMIT ?
+        """, (aggregate.window,)).fetchall()
+        for session_id, sort_key, data in reversed(rows):
+            aggregate.record_session(json.loads(data), session_id, sort_key)
+        aggregate.total_sessions = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        return aggregate
+
+    def count_sessions(self) -> int:
+        """Total number of stored sessions"""
+        conn = self.connections.get_connection()
+        return conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def recent_sessions(self, limit: int) -> List[Dict[str, Any]]:
+        """The ``limit`` most recent sessions, oldest first"""
+        conn = self.connections.get_connection()
+        rows = conn.execute("""
+            SELECT data FROM sessions ORDER BY sort_key DESC LIMIT ?
+        """, (limit,)).fetchall()
+        return [json.loads(row[0]) for row in reversed(rows)]
+
+    def all_sessions(self) -> List[Dict[str, Any]]:
+        """Every stored session in chronological order"""
+        conn = self.connections.get_connection()
+        rows = conn.execute("SELECT data FROM sessions ORDER BY sort_key").fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def sessions_on(self, session_date: str) -> List[Dict[str, Any]]:
+        """Sessions recorded for one ``YYYY-MM-DD`` date"""
+        conn = self.connections.get_connection()
+        rows = conn.execute("""
+            SELECT data FROM sessions WHERE session_date = ? ORDER BY sort_key
+        """, (str(session_date),)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get_due_reviews(self, today: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Concepts whose latest review is due on or before ``today`` (``YYYY-MM-DD``)"""
+        conn = self.connections.get_connection()
+        rows = conn.execute("""
+            SELECT concept_id, content, interval_days, ease_factor, repetitions
+            FROM review_schedule
+            WHERE next_review <= ?
+            ORDER BY next_review
+            LIMIT ?
+        """, (str(today), -1 if limit is None else limit)).fetchall()
+        return [
+            {
+                'id': row[0],
+                'content': row[1],
+                'interval_days': row[2],
+                'ease_factor': row[3],
+                'repetitions': row[4]
+            }
+            for row in rows
+        ]
+
+def import_session_files(store: SessionStore, directory: str) -> int:
+    """Import the legacy ``*.json`` session files in ``directory``; returns sessions imported"""
+    sessions = []
+    if not os.path.exists(directory):
+        return 0
+    for fname in sorted(os.listdir(directory)):
+        if not (fname.endswith(".json") and "session" in fname):
+            continue
+        try:
+            with open(os.path.join(directory, fname)) as f:
+                session_data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load {fname}: {e}")
+            continue
+        # Files hold either a single session or a list of sessions
+        if isinstance(session_data, list):
+            sessions.extend(s for s in session_data if isinstance(s, dict))
+        elif isinstance(session_data, dict):
+            sessions.append(session_data)
+
+    sessions.sort(key=session_sort_key)
+    store.save_sessions(sessions)
+    return len(sessions)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Marcus Simulation Runner - Parallel multi-day, multi-learner simulations
+
+Runs ``run_daily_learning_loop`` for a cohort of independent learners over a
+date range. Every learner gets its own directory, session store and
+databases, and runs in a fresh worker process of a ``ProcessPoolExecutor``
+seeded from the cohort seed, so the same seed always reproduces the same
+cohort. Per-day results stream back to the parent as they finish and the
+learners' summaries are merged at the end.
+"""
+
+import os
+import sys
+import random
+import logging
+import multiprocessing
+from contextlib import redirect_stdout, redirect_stderr
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from queue import Empty
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = str(Path(__file__).resolve().parents[2])
+
+# Simulated sessions are stamped at this time of day
+SESSION_TIME = time(hour=9)
+
+@dataclass
+class DayResult:
+    """Outcome of one learner's simulated day"""
+    learner_id: str
+    day: str
+    reviews_completed: int
+    concepts_learned: int
+    review_success_rate: float
+    mastery_levels: Dict[str, float]
+
+@dataclass
+class LearnerSummary:
+    """Totals for one learner over the whole simulation"""
+    learner_id: str
+    seed: int
+    output_dir: str
+    days: int = 0
+    total_reviews: int = 0
+    total_concepts: int = 0
+    final_mastery: Dict[str, float] = field(default_factory=dict)
+
+def learner_seed(seed: int, index: int) -> int:
+    """Independent, reproducible seed for learner ``index`` of a cohort"""
+    return random.Random(f"{seed}:{index}").getrandbits(32)
+
+def date_range(start: date, end: date) -> List[date]:
+    """Every date from ``start`` to ``end`` inclusive"""
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+def _seed_process(seed: int):
+    # Workers are single-use processes, so seeding their global RNGs cannot leak between learners
+    random.seed(seed)
+    try:
+        import numpy as np
+        np.random.seed(seed)
+    except ImportError:
+        pass
+
+def _run_learner(learner_id: str, seed: int, days: List[date], learner_dir: str, results) -> LearnerSummary:
+    """Worker entry point: simulate every day for one learner"""
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    os.makedirs(learner_dir, exist_ok=True)
+    # Subsystems that write relative paths land in the learner's own directory
+    os.chdir(learner_dir)
+    _seed_process(seed)
+
+    summary = LearnerSummary(learner_id=learner_id, seed=seed, output_dir=learner_dir)
+    with open(os.path.join(learner_dir, "simulation.log"), "w") as log, \
+            redirect_stdout(log), redirect_stderr(log):
+        # Imported here so console log handlers created at import write to the learner's log
+        from core.learning.daily_learning_loop import run_daily_learning_loop, LearningLoopPaths
+
+        paths = LearningLoopPaths.under(learner_dir)
+        for day in days:
+            session = run_daily_learning_loop(day, paths=paths,
+                                              clock=lambda day=day: datetime.combine(day, SESSION_TIME))
+            day_result = DayResult(
+                learner_id=learner_id,
+                day=str(day),
+                reviews_completed=session.get('reviews_completed', 0),
+                concepts_learned=len(session.get('concepts_learned', [])),
+                review_success_rate=session.get('metrics', {}).get('review_success_rate', 0.0),
+                mastery_levels=session.get('mastery_levels', {})
+            )
+            results.put(asdict(day_result))
+
+            summary.days += 1
+            summary.total_reviews += day_result.reviews_completed
+            summary.total_concepts += day_result.concepts_learned
+            summary.final_mastery = day_result.mastery_levels
+    return summary
+
+def merge_summaries(summaries: List[LearnerSummary]) -> Dict[str, Any]:
+    """Combine learner summaries into cohort totals and mean final mastery"""
+    summaries = sorted(summaries, key=lambda s: s.learner_id)
+    subjects = sorted({subject for s in summaries for subject in s.final_mastery})
+    return {
+        'learners': len(summaries),
+        'learner_days': sum(s.days for s in summaries),
+        'total_reviews': sum(s.total_reviews for s in summaries),
+        'total_concepts': sum(s.total_concepts for s in summaries),
+        'mean_final_mastery': {
+            subject: sum(s.final_mastery.get(subject, 0.0) for s in summaries) / len(summaries)
+            for subject in subjects
+        },
+        'learner_summaries': [asdict(s) for s in summaries]
+    }
+
+class SimulationRunner:
+    """Shard a cohort of independent learners across a process pool"""
+
+    def __init__(self, seed: int, start_date: date, end_date: date, learners: int,
+                 output_root: str, max_workers: Optional[int] = None):
+        if end_date < start_date:
+            raise ValueError("end_date must not be before start_date")
+        self.seed = seed
+        self.days = date_range(start_date, end_date)
+        self.learners = learners
+        self.output_root = os.path.abspath(output_root)
+        self.max_workers = max_workers or min(learners, os.cpu_count() or 1)
+        self.summaries: List[LearnerSummary] = []
+
+    @staticmethod
+    def learner_id(index: int) -> str:
+        return f"learner_{index:04d}"
+
+    def learner_dir(self, learner_id: str) -> str:
+        return os.path.join(self.output_root, learner_id)
+
+    def iter_results(self) -> Iterator[DayResult]:
+        """Run the cohort, yielding each learner-day as soon as it completes"""
+        self.summaries = []
+        # Each learner's seed travels with its task and seeds the worker's RNGs;
+        # the parent's environment is never touched
+        context = multiprocessing.get_context("spawn")
+        with context.Manager() as manager, ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=context, max_tasks_per_child=1
+        ) as pool:
+            results = manager.Queue()
+            futures = []
+            for index in range(self.learners):
+                learner_id = self.learner_id(index)
+                futures.append(pool.submit(_run_learner, learner_id, learner_seed(self.seed, index),
+                                           self.days, self.learner_dir(learner_id), results))
+
+            pending = set(futures)
+            while pending or not results.empty():
+                try:
+                    yield DayResult(**results.get(timeout=0.1))
+                except Empty:
+                    pass
+                for future in [f for f in pending if f.done()]:
+                    pending.discard(future)
+                    self.summaries.append(future.result())
+
+    def run(self) -> Dict[str, Any]:
+        """Run the cohort to completion and return the merged summary"""
+        for _ in self.iter_results():
+            pass
+        return merge_summaries(self.summaries)
@@ -17,14 +17,21 @@ Target: Marcus can recall specific past experiences with 'I' statements
 Timeline: 2 weeks (2025-08-02 to 2025-08-16)
 """
 
-import sqlite3
+import os
 import json
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
+from functools import cached_property
 import uuid
 
+from .connection_manager import get_connection_manager
+from .state_store import register_schema, ensure_schema, state_transaction, state_db_path
+from .write_behind import WriteBehindBuffer, DEFAULT_MAX_PENDING, DEFAULT_MAX_DELAY
+from .vector_index import VectorIndex
+from ..reasoning.keyword_matcher import KeywordMatcher
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -44,6 +51,174 @@ class AutobiographicalMemory:
     retrieval_count: int = 0  # How often this memory has been accessed
     importance_score: float = 0.5  # Memory importance (0.0-1.0)
 
+# Side table, its value column and the memory attribute (and JSON column) it indexes
+SIDE_TABLES = (
+    ("autobiographical_memory_markers", "marker", "temporal_markers"),
+    ("autobiographical_memory_concepts", "concept", "related_concepts"),
+)
+
+def _index_legacy_memories(cursor):
+    """Fill primary_emotion, the side tables and the text index of memories stored before version 2"""
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(autobiographical_memories)")}
+    if 'primary_emotion' in columns:
+        return
+    
+    logger.info("Indexing autobiographical memories stored before schema v2")
+    cursor.execute("ALTER TABLE autobiographical_memories ADD COLUMN primary_emotion TEXT COLLATE NOCASE")
+    cursor.execute("""
+        UPDATE autobiographical_memories
+        SET primary_emotion = json_extract(emotional_context, '$.primary_emotion')
+        WHERE json_valid(emotional_context)
+    """)
+    for table, column, source in SIDE_TABLES:
+        cursor.execute(f"""
+            INSERT OR IGNORE INTO {table} ({column}, memory_id, importance_score, timestamp)
+            SELECT item.value, m.memory_id, COALESCE(m.importance_score, 0.5), m.timestamp
+            FROM autobiographical_memories m, json_each(m.{source}) item
+            WHERE json_valid(m.{source})
+        """)
+    cursor.execute("INSERT INTO autobiographical_memories_fts (autobiographical_memories_fts) VALUES ('rebuild')")
+
+# Version 2 indexes recall: primary emotion as a column, markers and concepts in
+# side tables and an FTS5 index over the narrative text. Tables from version 1
+# or before the registry are filled by _index_legacy_memories.
+AUTOBIOGRAPHICAL_SCHEMA = register_schema("autobiographical_memory", 2, [
+    # Enhanced autobiographical memories table
+    """
+        CREATE TABLE IF NOT EXISTS autobiographical_memories (
+            memory_id TEXT PRIMARY KEY,
+            timestamp TEXT NOT NULL,
+            experience_type TEXT NOT NULL,
+            self_reference_context TEXT NOT NULL,
+            temporal_markers TEXT,  -- JSON array
+            emotional_context TEXT,  -- JSON object
+            narrative_summary TEXT NOT NULL,
+            related_concepts TEXT,  -- JSON array
+            confidence_level REAL DEFAULT 0.8,
+            retrieval_count INTEGER DEFAULT 0,
+            importance_score REAL DEFAULT 0.5,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            primary_emotion TEXT COLLATE NOCASE
+        )
+    """,
+    # Memories by temporal marker and by related concept. Each row repeats the
+    # memory's recall order, so the top matches of a common marker are read
+    # straight from the index instead of sorting every match.
+    """
+        CREATE TABLE IF NOT EXISTS autobiographical_memory_markers (
+            marker TEXT NOT NULL COLLATE NOCASE,
+            memory_id TEXT NOT NULL,
+            importance_score REAL NOT NULL,
+            timestamp TEXT NOT NULL,
+            PRIMARY KEY (marker, memory_id)
+        ) WITHOUT ROWID
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS autobiographical_memory_concepts (
+            concept TEXT NOT NULL COLLATE NOCASE,
+            memory_id TEXT NOT NULL,
+            importance_score REAL NOT NULL,
+            timestamp TEXT NOT NULL,
+            PRIMARY KEY (concept, memory_id)
+        ) WITHOUT ROWID
+    """,
+    # Full-text index over the narrative, kept in sync by triggers
+    """
+        CREATE VIRTUAL TABLE IF NOT EXISTS autobiographical_memories_fts USING fts5(
+            self_reference_context, narrative_summary,
+            content='autobiographical_memories', content_rowid='rowid'
+        )
+    """,
+    """
+        CREATE TRIGGER IF NOT EXISTS autobiographical_memories_ai AFTER INSERT ON autobiographical_memories BEGIN
+            INSERT INTO autobiographical_memories_fts (rowid, self_reference_context, narrative_summary)
+            VALUES (new.rowid, new.self_reference_context, new.narrative_summary);
+        END
+    """,
+    """
+        CREATE TRIGGER IF NOT EXISTS autobiographical_memories_ad AFTER DELETE ON autobiographical_memories BEGIN
+            INSERT INTO autobiographical_memories_fts
+            (autobiographical_memories_fts, rowid, self_reference_context, narrative_summary)
+            VALUES ('delete', old.rowid, old.self_reference_context, old.narrative_summary);
+            DELETE FROM autobiographical_memory_markers WHERE memory_id = old.memory_id;
+            DELETE FROM autobiographical_memory_concepts WHERE memory_id = old.memory_id;
+        END
+    """,
+    # Only narrative edits touch the text index; retrieval count bumps do not
+    """
+        CREATE TRIGGER IF NOT EXISTS autobiographical_memories_au
+        AFTER UPDATE OF self_reference_context, narrative_summary ON autobiographical_memories BEGIN
+            INSERT INTO autobiographical_memories_fts
+            (autobiographical_memories_fts, rowid, self_reference_context, narrative_summary)
+            VALUES ('delete', old.rowid, old.self_reference_context, old.narrative_summary);
+            INSERT INTO autobiographical_memories_fts (rowid, self_reference_context, narrative_summary)
+            VALUES (new.rowid, new.self_reference_context, new.narrative_summary);
+        END
+    """,
+    _index_legacy_memories,
+    # Recall orders by importance then recency, optionally within one type or emotion
+    """
+        CREATE INDEX IF NOT EXISTS idx_autobiographical_importance
+        ON autobiographical_memories(importance_score DESC, timestamp DESC)
+    """,
+    """
+        CREATE INDEX IF NOT EXISTS idx_autobiographical_type_importance
+        ON autobiographical_memories(experience_type, importance_score DESC, timestamp DESC)
+    """,
+    """
+        CREATE INDEX IF NOT EXISTS idx_autobiographical_emotion_importance
+        ON autobiographical_memories(primary_emotion, importance_score DESC, timestamp DESC)
+    """,
+    """
+        CREATE INDEX IF NOT EXISTS idx_autobiographical_timestamp
+        ON autobiographical_memories(timestamp)
+    """,
+    """
+        CREATE INDEX IF NOT EXISTS idx_autobiographical_markers_importance
+        ON autobiographical_memory_markers(marker, importance_score DESC, timestamp DESC)
+    """,
+    """
+        CREATE INDEX IF NOT EXISTS idx_autobiographical_concepts_importance
+        ON autobiographical_memory_concepts(concept, importance_score DESC, timestamp DESC)
+    """,
+    # Self-reference patterns for 'I' statement generation
+    """
+        CREATE TABLE IF NOT EXISTS self_reference_patterns (
+            pattern_id TEXT PRIMARY KEY,
+            pattern_template TEXT NOT NULL,
+            experience_type TEXT NOT NULL,
+            usage_count INTEGER DEFAULT 0,
+            effectiveness_score REAL DEFAULT 0.5
+        )
+    """,
+    # Temporal reference markers
+    """
+        CREATE TABLE IF NOT EXISTS temporal_markers (
+            marker_id TEXT PRIMARY KEY,
+            marker_text TEXT NOT NULL,
+            temporal_type TEXT NOT NULL,  -- 'past', 'present', 'future'
+            relative_timeframe TEXT,  -- 'yesterday', 'today', 'last_week'
+            usage_frequency INTEGER DEFAULT 0
+        )
+    """,
+])
+
+# Recalled columns; RETURNING reports retrieval counts as they were before the recall
+RECALL_COLUMNS = '''memory_id, timestamp, experience_type, self_reference_context,
+                    temporal_markers, emotional_context, narrative_summary,
+                    related_concepts, confidence_level, retrieval_count - 1, importance_score'''
+
+def _parse_day(text: str) -> Optional[datetime]:
+    """The day named by a YYYY-MM-DD string, or None for anything else"""
+    try:
+        return datetime.strptime(text, "%Y-%m-%d")
+    except ValueError:
+        return None
+
+def _fts_phrases(text: str) -> str:
+    """FTS5 query requiring every word of ``text``, with FTS syntax quoted away"""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
 class AutobiographicalMemorySystem:
     """
     Advanced memory system with self-referential structure and temporal awareness.
@@ -55,61 +230,23 @@ class AutobiographicalMemorySystem:
     4. Memory-to-narrative conversion for personal growth stories
     """
 
-    def __init__(self, db_path: str = "marcus_autobiographical_memory.db"):
+    def __init__(self, db_path: Optional[str] = None,
+                 max_pending: int = DEFAULT_MAX_PENDING, max_delay: float = DEFAULT_MAX_DELAY):
         """Initialize the autobiographical memory system."""
-        self.db_path = db_path
+        self.db_path = db_path or state_db_path()
         self.setup_database()
+        # New memories are written in batches; reads flush first so they see every store
+        self.write_buffer = WriteBehindBuffer(self._insert_memories, max_pending, max_delay)
         logger.info("✅ Autobiographical Memory System initialized")
 
     def setup_database(self):
         """Set up the enhanced memory database schema."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Enhanced autobiographical memories table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS autobiographical_memories (
-                    memory_id TEXT PRIMARY KEY,
-                    timestamp TEXT NOT NULL,
-                    experience_type TEXT NOT NULL,
-                    self_reference_context TEXT NOT NULL,
-                    temporal_markers TEXT,  -- JSON array
-                    emotional_context TEXT,  -- JSON object
-                    narrative_summary TEXT NOT NULL,
-                    related_concepts TEXT,  -- JSON array
-                    confidence_level REAL DEFAULT 0.8,
-                    retrieval_count INTEGER DEFAULT 0,
-                    importance_score REAL DEFAULT 0.5,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Self-reference patterns for 'I' statement generation
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS self_reference_patterns (
-                    pattern_id TEXT PRIMARY KEY,
-                    pattern_template TEXT NOT NULL,
-                    experience_type TEXT NOT NULL,
-                    usage_count INTEGER DEFAULT 0,
-                    effectiveness_score REAL DEFAULT 0.5
-                )
-            ''')
-            
-            # Temporal reference markers
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS temporal_markers (
-                    marker_id TEXT PRIMARY KEY,
-                    marker_text TEXT NOT NULL,
-                    temporal_type TEXT NOT NULL,  -- 'past', 'present', 'future'
-                    relative_timeframe TEXT,  -- 'yesterday', 'today', 'last_week'
-                    usage_frequency INTEGER DEFAULT 0
-                )
-            ''')
-            
-            conn.commit()
-            
+        # Patterns and markers are reference rows, seeded when the schema is first applied
+        if not ensure_schema(self.db_path, AUTOBIOGRAPHICAL_SCHEMA):
+            return False
         self._initialize_self_reference_patterns()
         self._initialize_temporal_markers()
+        return True
 
     def _initialize_self_reference_patterns(self):
         """Initialize common self-reference patterns for 'I' statement generation."""
@@ -139,7 +276,7 @@ class AutobiographicalMemorySystem:
             ("achievement_progress", "I'm getting better at {skill} - I can now {new_ability}", "achievement"),
         ]
         
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             for pattern_id, template, exp_type in patterns:
                 cursor.execute('''
@@ -147,7 +284,6 @@ class AutobiographicalMemorySystem:
                     (pattern_id, pattern_template, experience_type) 
                     VALUES (?, ?, ?)
                 ''', (pattern_id, template, exp_type))
-            conn.commit()
 
     def _initialize_temporal_markers(self):
         """Initialize temporal reference markers."""
@@ -173,7 +309,7 @@ class AutobiographicalMemorySystem:
             ("want_to", "I want to", "future", "aspirational"),
         ]
         
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             for marker_id, text, temp_type, timeframe in markers:
                 cursor.execute('''
@@ -181,7 +317,6 @@ class AutobiographicalMemorySystem:
                     (marker_id, marker_text, temporal_type, relative_timeframe) 
                     VALUES (?, ?, ?, ?)
                 ''', (marker_id, text, temp_type, timeframe))
-            conn.commit()
 
     def store_autobiographical_memory(
         self,
@@ -234,32 +369,79 @@ class AutobiographicalMemorySystem:
             importance_score=importance
         )
         
-        # Store in database
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO autobiographical_memories 
-                (memory_id, timestamp, experience_type, self_reference_context,
-                 temporal_markers, emotional_context, narrative_summary,
-                 related_concepts, confidence_level, importance_score)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                memory_id,
-                timestamp.isoformat(),
-                experience_type,
-                self_ref_context,
-                json.dumps(temporal_markers),
-                json.dumps(emotional_state),
-                narrative_summary,
-                json.dumps(concepts_involved or []),
-                0.8,
-                importance
-            ))
-            conn.commit()
+        if get_connection_manager(self.db_path).in_transaction:
+            # Inside a caller's transaction the memory commits (or rolls back) with it
+            self._insert_memories([memory])
+        else:
+            self.write_buffer.add(memory)
         
         logger.info(f"📝 Stored autobiographical memory: {experience_type} - {self_ref_context[:50]}...")
         return memory_id
 
+    def _insert_memories(self, memories: List[AutobiographicalMemory]):
+        """Write a batch of buffered memories and their index rows in one transaction"""
+        with state_transaction(self.db_path) as conn:
+            conn.executemany('''
+                INSERT INTO autobiographical_memories 
+                (memory_id, timestamp, experience_type, self_reference_context,
+                 temporal_markers, emotional_context, narrative_summary,
+                 related_concepts, confidence_level, importance_score, primary_emotion)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(
+                memory.memory_id,
+                memory.timestamp.isoformat(),
+                memory.experience_type,
+                memory.self_reference_context,
+                json.dumps(memory.temporal_markers),
+                json.dumps(memory.emotional_context),
+                memory.narrative_summary,
+                json.dumps(memory.related_concepts),
+                memory.confidence_level,
+                memory.importance_score,
+                memory.emotional_context.get('primary_emotion')
+            ) for memory in memories])
+            for table, column, attribute in SIDE_TABLES:
+                conn.executemany(f'''
+                    INSERT OR IGNORE INTO {table} ({column}, memory_id, importance_score, timestamp)
+                    VALUES (?, ?, ?, ?)
+                ''', [(value, memory.memory_id, memory.importance_score, memory.timestamp.isoformat())
+                      for memory in memories for value in getattr(memory, attribute)])
+
+    def flush(self) -> int:
+        """Write buffered memories now; returns how many were written"""
+        return self.write_buffer.flush()
+
+    def close(self):
+        """Flush buffered memories and save the similarity index before shutdown"""
+        self.write_buffer.close()
+        if 'vector_index' in self.__dict__:
+            self.vector_index.save()
+
+    @cached_property
+    def vector_index(self) -> VectorIndex:
+        """Embeddings of every memory's narrative, stored beside the database"""
+        return VectorIndex(path=os.path.splitext(self.db_path)[0] + '_vectors')
+
+    def _update_vector_index(self):
+        """Embed memories stored since the index was last brought up to date"""
+        index = self.vector_index
+        last_rowid = index.metadata.get('last_rowid', 0)
+        with state_transaction(self.db_path) as conn:
+            if last_rowid > (conn.execute('SELECT MAX(rowid) FROM autobiographical_memories').fetchone()[0] or 0):
+                # The index outlived its database; start again
+                index.delete(index.ids())
+                last_rowid = 0
+            rows = conn.execute('''
+                SELECT rowid, memory_id, self_reference_context, narrative_summary, related_concepts
+                FROM autobiographical_memories WHERE rowid > ? ORDER BY rowid
+            ''', (last_rowid,)).fetchall()
+        if not rows:
+            return
+        index.add_texts([row[1] for row in rows],
+                        [f"{row[2]} {row[3]} {' '.join(json.loads(row[4]) if row[4] else [])}" for row in rows])
+        index.metadata['last_rowid'] = rows[-1][0]
+        index.save()
+
     def _generate_self_reference_context(
         self, 
         experience_type: str, 
@@ -311,18 +493,21 @@ class AutobiographicalMemorySystem:
             # Fallback generic self-reference
             return f"I had a {experience_type} experience and felt {primary_emotion} about it"
 
+    @cached_property
+    def _temporal_marker_texts(self) -> List[str]:
+        """Temporal marker texts in table order, loaded once"""
+        with state_transaction(self.db_path) as conn:
+            return [row[0] for row in conn.execute('SELECT marker_text FROM temporal_markers')]
+
+    @cached_property
+    def temporal_marker_matcher(self) -> KeywordMatcher:
+        """Compiled matcher over every temporal marker"""
+        return KeywordMatcher(self._temporal_marker_texts)
+
     def _extract_temporal_markers(self, context: str) -> List[str]:
         """Extract temporal reference markers from context."""
-        markers = []
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT marker_text FROM temporal_markers')
-            temporal_texts = [row[0] for row in cursor.fetchall()]
-        
-        for marker_text in temporal_texts:
-            if marker_text.lower() in context.lower():
-                markers.append(marker_text)
+        found = self.temporal_marker_matcher.found(context)
+        markers = [text for text in self._temporal_marker_texts if text.lower() in found]
         
         # Add default temporal context
         if not markers:
@@ -362,81 +547,136 @@ class AutobiographicalMemorySystem:
         temporal_context: Optional[str] = None,
         experience_type: Optional[str] = None,
         emotion_filter: Optional[str] = None,
-        limit: int = 10
+        limit: int = 10,
+        text_query: Optional[str] = None,
+        concept: Optional[str] = None
     ) -> List[AutobiographicalMemory]:
         """
         Recall autobiographical memories with self-referential context.
         
         Args:
-            temporal_context: Filter by temporal context ('yesterday', 'today', etc.)
+            temporal_context: Temporal marker ('yesterday', 'today', etc.) or a YYYY-MM-DD day
             experience_type: Filter by experience type
             emotion_filter: Filter by primary emotion
             limit: Maximum number of memories to return
+            text_query: Words that must all appear in the narrative
+            concept: Filter by related concept
             
         Returns:
             List of matching autobiographical memories
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            query = '''
-                SELECT memory_id, timestamp, experience_type, self_reference_context,
-                       temporal_markers, emotional_context, narrative_summary,
-                       related_concepts, confidence_level, retrieval_count, importance_score
-                FROM autobiographical_memories
-                WHERE 1=1
-            '''
-            params = []
-            
-            if temporal_context:
-                query += ' AND temporal_markers LIKE ?'
-                params.append(f'%{temporal_context}%')
-            
-            if experience_type:
-                query += ' AND experience_type = ?'
-                params.append(experience_type)
-            
-            if emotion_filter:
-                query += ' AND emotional_context LIKE ?'
-                params.append(f'%{emotion_filter}%')
-            
-            query += ' ORDER BY importance_score DESC, timestamp DESC LIMIT ?'
-            params.append(limit)
-            
-            cursor.execute(query, params)
-            results = cursor.fetchall()
-            
-            # Update retrieval counts
-            memory_ids = [result[0] for result in results]
-            if memory_ids:
-                cursor.execute(f'''
-                    UPDATE autobiographical_memories 
-                    SET retrieval_count = retrieval_count + 1 
-                    WHERE memory_id IN ({','.join(['?'] * len(memory_ids))})
-                ''', memory_ids)
-                conn.commit()
-        
-        # Convert to AutobiographicalMemory objects
-        memories = []
-        for row in results:
-            memory = AutobiographicalMemory(
-                memory_id=row[0],
-                timestamp=datetime.fromisoformat(row[1]),
-                experience_type=row[2],
-                self_reference_context=row[3],
-                temporal_markers=json.loads(row[4]) if row[4] else [],
-                emotional_context=json.loads(row[5]) if row[5] else {},
-                narrative_summary=row[6],
-                related_concepts=json.loads(row[7]) if row[7] else [],
-                confidence_level=row[8],
-                retrieval_count=row[9],
-                importance_score=row[10]
-            )
-            memories.append(memory)
+        self.flush()
+        # The first marker or concept filter drives the query through its side
+        # table's (value, importance, timestamp) index; the rest filter its rows
+        source = 'autobiographical_memories m'
+        order = 'm.importance_score DESC, m.timestamp DESC'
+        conditions = []
+        params: List[Any] = []
+        join_params: List[Any] = []
+        
+        side_filters = []
+        if temporal_context:
+            day = _parse_day(temporal_context)
+            if day:
+                conditions.append('m.timestamp >= ? AND m.timestamp < ?')
+                params.extend([day.isoformat(), (day + timedelta(days=1)).isoformat()])
+            else:
+                side_filters.append(('autobiographical_memory_markers', 'marker', temporal_context))
+        if concept:
+            side_filters.append(('autobiographical_memory_concepts', 'concept', concept))
+        
+        for i, (table, column, value) in enumerate(side_filters):
+            if i == 0:
+                source = f'{table} s JOIN autobiographical_memories m ON m.memory_id = s.memory_id AND s.{column} = ?'
+                order = 's.importance_score DESC, s.timestamp DESC'
+                join_params.append(value)
+            else:
+                conditions.append(f'm.memory_id IN (SELECT memory_id FROM {table} WHERE {column} = ?)')
+                params.append(value)
+        
+        if experience_type:
+            conditions.append('m.experience_type = ?')
+            params.append(experience_type)
+        
+        if emotion_filter:
+            conditions.append('m.primary_emotion = ?')
+            params.append(emotion_filter)
+        
+        if text_query:
+            conditions.append('m.rowid IN (SELECT rowid FROM autobiographical_memories_fts '
+                              'WHERE autobiographical_memories_fts MATCH ?)')
+            params.append(_fts_phrases(text_query))
+        
+        where = ' AND '.join(conditions) or '1=1'
+        
+        # Select the matches and bump their retrieval counts in one statement
+        with state_transaction(self.db_path) as conn:
+            results = conn.execute(f'''
+                UPDATE autobiographical_memories
+                SET retrieval_count = retrieval_count + 1
+                WHERE rowid IN (
+                    SELECT m.rowid FROM {source}
+                    WHERE {where}
+                    ORDER BY {order} LIMIT ?
+                )
+                RETURNING {RECALL_COLUMNS}
+            ''', join_params + params + [limit]).fetchall()
+        # RETURNING rows come back in no particular order
+        results.sort(key=lambda row: (row[10], row[1]), reverse=True)
+        
+        memories = [self._row_to_memory(row) for row in results]
         
         logger.info(f"🧠 Recalled {len(memories)} autobiographical memories")
         return memories
 
+    def recall_similar_memories(self, text: str, limit: int = 10) -> List[AutobiographicalMemory]:
+        """
+        Recall the memories whose narrative is most similar to ``text``.
+        
+        Args:
+            text: Description of the experience to be reminded of
+            limit: Maximum number of memories to return
+            
+        Returns:
+            Memories ordered from most to least similar
+        """
+        self.flush()
+        self._update_vector_index()
+        matches = self.vector_index.recall([text], limit)[0]
+        if not matches:
+            return []
+        
+        rank = {memory_id: i for i, (memory_id, _) in enumerate(matches)}
+        with state_transaction(self.db_path) as conn:
+            results = conn.execute(f'''
+                UPDATE autobiographical_memories
+                SET retrieval_count = retrieval_count + 1
+                WHERE memory_id IN ({','.join('?' * len(rank))})
+                RETURNING {RECALL_COLUMNS}
+            ''', list(rank)).fetchall()
+        results.sort(key=lambda row: rank[row[0]])
+        
+        memories = [self._row_to_memory(row) for row in results]
+        logger.info(f"🧠 Recalled {len(memories)} similar autobiographical memories")
+        return memories
+
+    @staticmethod
+    def _row_to_memory(row: tuple) -> AutobiographicalMemory:
+        """Build a memory from a row of RECALL_COLUMNS"""
+        return AutobiographicalMemory(
+            memory_id=row[0],
+            timestamp=datetime.fromisoformat(row[1]),
+            experience_type=row[2],
+            self_reference_context=row[3],
+            temporal_markers=json.loads(row[4]) if row[4] else [],
+            emotional_context=json.loads(row[5]) if row[5] else {},
+            narrative_summary=row[6],
+            related_concepts=json.loads(row[7]) if row[7] else [],
+            confidence_level=row[8],
+            retrieval_count=row[9],
+            importance_score=row[10]
+        )
+
     def generate_i_statement(self, memory_cluster: List[AutobiographicalMemory]) -> str:
         """
         Generate an 'I' statement from a cluster of related memories.
@@ -538,7 +778,8 @@ class AutobiographicalMemorySystem:
 
     def get_memory_statistics(self) -> Dict[str, Any]:
         """Get comprehensive statistics about autobiographical memories."""
-        with sqlite3.connect(self.db_path) as conn:
+        self.flush()
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             
             # Basic counts
@@ -555,20 +796,11 @@ class AutobiographicalMemorySystem:
             
             # Temporal marker usage
             cursor.execute('''
-                SELECT temporal_markers 
-                FROM autobiographical_memories 
-                WHERE temporal_markers IS NOT NULL
+                SELECT marker, COUNT(*)
+                FROM autobiographical_memory_markers
+                GROUP BY marker
             ''')
-            temporal_data = cursor.fetchall()
-            
-            all_markers = []
-            for row in temporal_data:
-                markers = json.loads(row[0]) if row[0] else []
-                all_markers.extend(markers)
-            
-            temporal_usage = {}
-            for marker in all_markers:
-                temporal_usage[marker] = temporal_usage.get(marker, 0) + 1
+            temporal_usage = dict(cursor.fetchall())
             
             # Average confidence and importance
             cursor.execute('''
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Marcus Connection Manager - Shared SQLite connections for the memory database
+
+Every subsystem that shares a ``db_path`` with ``MarcusMemorySystem`` can ask
+for the manager of that path and reuse its long-lived connections instead of
+opening a fresh ``sqlite3.connect`` per call. Connections are kept per thread,
+run in WAL mode with tuned pragmas and cache their prepared statements. A
+thread's connection is closed when the thread exits. Caches of committed
+state register ``after_commit`` hooks, so a write nested in a caller's
+transaction only reaches them if that transaction commits.
+"""
+
+import os
+import sqlite3
+import threading
+import weakref
+import logging
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+# Pragmas applied to every pooled connection
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'temp_store': 'MEMORY',
+    'cache_size': -16000,        # ~16MB page cache
+    'mmap_size': 64 * 1024 * 1024,
+    'busy_timeout': 5000,
+}
+
+# Number of prepared statements sqlite3 keeps per connection
+STATEMENT_CACHE_SIZE = 256
+
+class _ThreadExit:
+    """Kept in thread-local storage, so it is freed when its thread exits"""
+
+class ConnectionManager:
+    """Per-thread pool of long-lived SQLite connections for one database file"""
+
+    def __init__(self, db_path: str, pragmas: Dict[str, object] = None):
+        self.db_path = db_path
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        # In-process state shared by every subsystem using this database
+        self.cache: Dict[str, object] = {}
+
+    def _open(self) -> sqlite3.Connection:
+        """Open and configure a new connection for the calling thread"""
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        for name, value in self.pragmas.items():
+            if name == 'journal_mode' and self.db_path == ':memory:':
+                continue
+            conn.execute(f"PRAGMA {name} = {value}")
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def _discard(self, conn: sqlite3.Connection):
+        """Close and forget one thread's connection"""
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Error closing connection to {self.db_path}: {e}")
+
+    def get_connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            self._local.depth = 0
+            self._local.after_commit = []
+            # Short-lived threads (timers, workers) must not leave their connection open
+            self._local.exit = _ThreadExit()
+            weakref.finalize(self._local.exit, self._discard, conn)
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run a block in a transaction
+
+        Nested blocks run in a savepoint of the outer transaction: if one fails,
+        only its own writes are rolled back, even when the caller catches the
+        error and the outer block goes on to commit.
+        """
+        conn = self.get_connection()
+        depth = self._local.depth
+        pending = self._local.after_commit
+        mark = len(pending)
+        savepoint = f"marcus_savepoint_{depth}"
+        if depth:
+            conn.execute(f"SAVEPOINT {savepoint}")
+        elif not conn.in_transaction:
+            # Begin explicitly so releasing a nested savepoint never commits
+            conn.execute("BEGIN")
+        self._local.depth = depth + 1
+        try:
+            yield conn
+        except BaseException:
+            self._local.depth = depth
+            # Hooks registered by the rolled-back writes are dropped with them
+            del pending[mark:]
+            if depth:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+            else:
+                conn.rollback()
+            raise
+        else:
+            self._local.depth = depth
+            if depth:
+                conn.execute(f"RELEASE {savepoint}")
+            else:
+                conn.commit()
+                self._run_after_commit()
+
+    def after_commit(self, callback: Callable[[], None]):
+        """
+        Run ``callback`` once the calling thread's outermost transaction commits
+
+        Use it to update in-process caches of committed state. Outside a
+        transaction the callback runs at once; if the transaction, or the
+        savepoint it was registered in, rolls back, the callback is dropped.
+        """
+        if self.in_transaction:
+            self._local.after_commit.append(callback)
+        else:
+            callback()
+
+    def _run_after_commit(self):
+        callbacks, self._local.after_commit = self._local.after_commit, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"After-commit hook for {self.db_path} failed: {e}")
+
+    @property
+    def in_transaction(self) -> bool:
+        """Whether the calling thread is inside a ``transaction()`` block"""
+        return getattr(self._local, 'depth', 0) > 0
+
+    def close_all(self):
+        """Close every connection opened by this manager"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing connection to {self.db_path}: {e}")
+        # Threads re-open lazily on their next call
+        self._local = threading.local()
+        self.cache.clear()
+
+
+_managers: Dict[str, ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+def _registry_key(db_path: str) -> str:
+    return db_path if db_path == ':memory:' else os.path.abspath(db_path)
+
+def get_connection_manager(db_path: str) -> ConnectionManager:
+    """Return the shared ConnectionManager for ``db_path``"""
+    key = _registry_key(db_path)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = ConnectionManager(db_path)
+            _managers[key] = manager
+        return manager
+
+def close_connection_manager(db_path: str):
+    """Close and forget the shared manager for ``db_path`` if one exists"""
+    with _managers_lock:
+        manager = _managers.pop(_registry_key(db_path), None)
+    if manager is not None:
+        manager.close_all()
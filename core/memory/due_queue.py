@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Marcus Due Queue - In-memory priority queue of concepts due for review
+
+Keeps every concept's next review time as an integer epoch in a min-heap so
+"what is due next" never has to scan and sort ``memory_records``. A Fenwick
+tree over day buckets answers "how many are due before T" without walking
+the heap. The queue is loaded once from SQLite and then kept in sync as
+reviews are recorded.
+"""
+
+import heapq
+import logging
+import threading
+import datetime
+from bisect import bisect_right, insort
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .learners import due_queue_cache_key
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400
+
+def to_epoch(value: Union[datetime.datetime, str, int, float, None]) -> Optional[int]:
+    """Convert a datetime, ISO string or number to integer epoch seconds"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    elif isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time())
+    return int(value.timestamp())
+
+def ensure_next_review_ts(cursor):
+    """Add and backfill the integer next_review_ts column on older memory_records tables"""
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(memory_records)")}
+    if 'next_review_ts' in columns:
+        return
+    
+    logger.info("Adding next_review_ts column to memory_records")
+    cursor.execute("ALTER TABLE memory_records ADD COLUMN next_review_ts INTEGER")
+    rows = cursor.execute("""
+        SELECT rowid, concept_id, next_review FROM memory_records WHERE next_review IS NOT NULL
+    """).fetchall()
+    updates = []
+    for rowid, concept_id, next_review in rows:
+        try:
+            updates.append((to_epoch(next_review), rowid))
+        except ValueError:
+            logger.warning(f"Unparseable next_review for {concept_id}: {next_review}")
+    # rowid addresses a record whether or not the table is partitioned by learner
+    cursor.executemany("UPDATE memory_records SET next_review_ts = ? WHERE rowid = ?", updates)
+
+def sync_due_queue(connections, learner_id: str, items: Iterable[Tuple[str, int]]):
+    """Push new review times into a learner's cached due queue, if loaded, once the surrounding transaction commits"""
+    key = due_queue_cache_key(learner_id)
+    items = list(items)
+    
+    def sync():
+        queue = connections.cache.get(key)
+        if queue is not None:
+            queue.update_many(items)
+    
+    connections.after_commit(sync)
+
+class _DayCounter:
+    """Fenwick tree of per-day counts with exact sorted epochs inside each day"""
+
+    def __init__(self, base_day: int, size: int = 64):
+        self.base_day = base_day
+        self.tree = [0] * (size + 1)
+        self.days: Dict[int, List[int]] = {}
+
+    def _slot(self, day: int) -> int:
+        # Anything before the base day shares slot 0 with it
+        return max(0, day - self.base_day)
+
+    def _grow(self, slot: int):
+        size = len(self.tree) - 1
+        if slot < size:
+            return
+        while size <= slot:
+            size *= 2
+        counts = [0] * size
+        for day, epochs in self.days.items():
+            counts[self._slot(day)] += len(epochs)
+        self.tree = [0] * (size + 1)
+        for i, count in enumerate(counts):
+            if count:
+                self._update(i, count)
+
+    def _update(self, slot: int, delta: int):
+        i = slot + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, slot: int) -> int:
+        """Count of entries in slots [0, slot)"""
+        total, i = 0, min(slot, len(self.tree) - 1)
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def add(self, epoch: int):
+        day = epoch // SECONDS_PER_DAY
+        slot = self._slot(day)
+        self._grow(slot)
+        insort(self.days.setdefault(self._day_key(day), []), epoch)
+        self._update(slot, 1)
+
+    def remove(self, epoch: int):
+        day = epoch // SECONDS_PER_DAY
+        key = self._day_key(day)
+        epochs = self.days[key]
+        epochs.pop(bisect_right(epochs, epoch) - 1)
+        if not epochs:
+            del self.days[key]
+        self._update(self._slot(day), -1)
+
+    def _day_key(self, day: int) -> int:
+        return max(day, self.base_day)
+
+    def count_before(self, epoch: int) -> int:
+        """Number of entries with an epoch <= ``epoch``"""
+        day = epoch // SECONDS_PER_DAY
+        if day < self.base_day:
+            # Only slot 0 can hold such early entries
+            return bisect_right(self.days.get(self.base_day, []), epoch)
+        slot = self._slot(day)
+        return self._prefix(slot) + bisect_right(self.days.get(day, []), epoch)
+
+class DueReviewQueue:
+    """Min-heap of (next_review epoch, concept_id) with lazy invalidation"""
+
+    def __init__(self, entries: Iterable[Tuple[str, Optional[int]]] = ()):
+        self._lock = threading.RLock()
+        self._heap: List[Tuple[int, str]] = []
+        self._current: Dict[str, int] = {}
+        self._counter = _DayCounter(base_day=int(datetime.datetime.now().timestamp()) // SECONDS_PER_DAY)
+
+        entries = [(cid, ts) for cid, ts in entries if ts is not None]
+        if entries:
+            self._counter = _DayCounter(base_day=min(ts for _, ts in entries) // SECONDS_PER_DAY)
+        for concept_id, epoch in entries:
+            self._current[concept_id] = epoch
+            self._counter.add(epoch)
+        self._heap = [(epoch, cid) for cid, epoch in self._current.items()]
+        heapq.heapify(self._heap)
+
+    @classmethod
+    def from_connection(cls, conn, learner_id: Optional[str] = None) -> 'DueReviewQueue':
+        """Load the queue from a memory database connection, optionally for one learner"""
+        if learner_id is None:
+            rows = conn.execute("SELECT concept_id, next_review_ts FROM memory_records").fetchall()
+        else:
+            rows = conn.execute("""
+                SELECT concept_id, next_review_ts FROM memory_records WHERE learner_id = ?
+            """, (learner_id,)).fetchall()
+        return cls(rows)
+
+    def __len__(self) -> int:
+        return len(self._current)
+
+    def __contains__(self, concept_id: str) -> bool:
+        return concept_id in self._current
+
+    def update(self, concept_id: str, epoch: int):
+        """Insert a concept or move it to a new review time"""
+        with self._lock:
+            old = self._current.get(concept_id)
+            if old == epoch:
+                return
+            if old is not None:
+                self._counter.remove(old)
+            self._current[concept_id] = epoch
+            self._counter.add(epoch)
+            heapq.heappush(self._heap, (epoch, concept_id))
+            self._compact_if_needed()
+
+    def update_many(self, items: Iterable[Tuple[str, int]]):
+        with self._lock:
+            for concept_id, epoch in items:
+                self.update(concept_id, epoch)
+
+    def remove(self, concept_id: str):
+        """Drop a concept from the queue"""
+        with self._lock:
+            old = self._current.pop(concept_id, None)
+            if old is not None:
+                self._counter.remove(old)
+
+    def next_due(self, limit: int, before: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Return up to ``limit`` (concept_id, epoch) pairs due at or before ``before``, earliest first"""
+        with self._lock:
+            found = []
+            seen = set()
+            while self._heap and len(found) < limit:
+                epoch, concept_id = self._heap[0]
+                if self._current.get(concept_id) != epoch or concept_id in seen:
+                    heapq.heappop(self._heap)   # stale or duplicate entry
+                    continue
+                if before is not None and epoch > before:
+                    break
+                heapq.heappop(self._heap)
+                found.append((concept_id, epoch))
+                seen.add(concept_id)
+            for concept_id, epoch in found:
+                heapq.heappush(self._heap, (epoch, concept_id))
+            return found
+
+    def count_due(self, before: int) -> int:
+        """Number of concepts due at or before ``before``"""
+        with self._lock:
+            return self._counter.count_before(before)
+
+    def _compact_if_needed(self):
+        # Rebuild once stale entries outnumber live ones to bound memory
+        if len(self._heap) > 2 * len(self._current) + 64:
+            self._heap = [(epoch, cid) for cid, epoch in self._current.items()]
+            heapq.heapify(self._heap)
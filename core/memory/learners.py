@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Marcus Learners - Learner partitioning for the shared memory database
+
+Every memory table is keyed by ``learner_id`` first, so one database can hold
+any number of students and each learner's queries stay on their own slice of
+the composite indexes. Databases written before learners existed belong to
+the original student, ``DEFAULT_LEARNER_ID``, and are rebuilt in place.
+"""
+
+import logging
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEARNER_ID = "marcus"
+
+def table_columns(cursor, table: str) -> List[str]:
+    """Column names of ``table`` in declaration order"""
+    return [row[1] for row in cursor.execute(f"PRAGMA table_info({table})")]
+
+def partition_legacy_tables(cursor, schemas: Dict[str, str], learner_id: str = DEFAULT_LEARNER_ID):
+    """
+    Rebuild tables that predate ``learner_id`` with the learner-partitioned schema
+
+    ``schemas`` maps each table name to a ``CREATE TABLE {table} (...)`` template.
+    Existing rows are copied into the new table and assigned to ``learner_id``.
+    """
+    for table, create_sql in schemas.items():
+        columns = table_columns(cursor, table)
+        if not columns or 'learner_id' in columns:
+            continue
+
+        logger.info(f"Partitioning {table} by learner_id")
+        # Build under a temporary name and rename last, so foreign keys that
+        # reference ``table`` keep pointing at it
+        staging = f"{table}_partitioned"
+        cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+        cursor.execute(create_sql.format(table=staging))
+        kept = [c for c in columns if c in table_columns(cursor, staging)]
+        column_list = ", ".join(kept)
+        cursor.execute(f"""
+            INSERT INTO {staging} (learner_id, {column_list})
+            SELECT ?, {column_list} FROM {table}
+        """, (learner_id,))
+        cursor.execute(f"DROP TABLE {table}")
+        cursor.execute(f"ALTER TABLE {staging} RENAME TO {table}")
+
+def due_queue_cache_key(learner_id: str) -> str:
+    """Key of a learner's DueReviewQueue in the shared ConnectionManager cache"""
+    return f"due_queue:{learner_id}"
+
+def concept_index_cache_key(learner_id: str) -> str:
+    """Key of a learner's concept VectorIndex in the shared ConnectionManager cache"""
+    return f"concept_index:{learner_id}"
@@ -3,6 +3,10 @@ import sqlite3
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+from .connection_manager import get_connection_manager
+from .state_store import state_db_path
+from .learners import DEFAULT_LEARNER_ID
+
 @dataclass
 class MemoryRecord:
     concept: str
@@ -13,12 +17,14 @@ class MemoryRecord:
     next_review: Optional[str] = None
 
 class MemoryManager:
-    def __init__(self, db_path: str = "marcus_memory.db"):
-        self.db_path = db_path
+    def __init__(self, db_path: Optional[str] = None, learner_id: str = DEFAULT_LEARNER_ID):
+        self.db_path = db_path or state_db_path()
+        self.learner_id = learner_id
+        self.connections = get_connection_manager(self.db_path)
 
     def get_due_reviews(self) -> List[MemoryRecord]:
         """Get concepts due for review"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connections.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT 
@@ -29,18 +35,18 @@ class MemoryManager:
                     m.last_reviewed,
                     m.next_review
                 FROM memory_records m
-                JOIN concepts c ON c.id = m.concept_id
-                WHERE m.next_review <= ?
-                ORDER BY m.next_review ASC
-            """, (datetime.now().isoformat(),))
+                JOIN concepts c ON c.learner_id = m.learner_id AND c.id = m.concept_id
+                WHERE m.learner_id = ? AND m.next_review_ts <= ?
+                ORDER BY m.next_review_ts ASC
+            """, (self.learner_id, int(datetime.now().timestamp())))
             
             return [MemoryRecord(*row) for row in cursor.fetchall()]
 
     def strengthen_memory(self, concept_id: str, quality: int) -> bool:
         """Update memory strength based on review quality (1-5)"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            try:
+        try:
+            with self.connections.transaction() as conn:
+                cursor = conn.cursor()
                 # Calculate new values based on review quality
                 cursor.execute("""
                     UPDATE memory_records
@@ -49,15 +55,15 @@ class MemoryManager:
                         success_streak = CASE WHEN ? >= 4 THEN success_streak + 1 ELSE 0 END,
                         last_reviewed = ?,
                         total_attempts = total_attempts + 1
-                    WHERE concept_id = ?
+                    WHERE learner_id = ? AND concept_id = ?
                 """, (
                     1 if quality >= 4 else -1,
                     quality,
                     datetime.now().isoformat(),
+                    self.learner_id,
                     concept_id
                 ))
-                conn.commit()
                 return True
-            except Exception as e:
-                print(f"Error strengthening memory: {e}")
-                return False
\ No newline at end of file
+        except Exception as e:
+            print(f"Error strengthening memory: {e}")
+            return False
\ No newline at end of file
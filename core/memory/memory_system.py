@@ -5,18 +5,157 @@ Marcus Memory System - Core memory implementation for developmental AGI
 Handles both episodic memories and concept learning with spaced repetition
 """
 
+import os
 import sqlite3
 import json
+import copy
 import datetime
-from typing import Dict, List, Optional, Any
+from itertools import islice
+from typing import Dict, List, Optional, Any, Iterable, Tuple
 from dataclasses import dataclass, asdict, field
 from pathlib import Path
 import logging
 
+from .connection_manager import get_connection_manager, close_connection_manager
+from .sm2_scheduler import SM2Scheduler, SM2State, SM2Policy
+from .due_queue import DueReviewQueue, to_epoch, ensure_next_review_ts, sync_due_queue
+from .learners import DEFAULT_LEARNER_ID, partition_legacy_tables, due_queue_cache_key, concept_index_cache_key
+from .vector_index import VectorIndex
+from .state_store import register_schema, ensure_schema, state_db_path
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Default number of rows sent per executemany call by learn_concepts_bulk
+BULK_BATCH_SIZE = 500
+
+# Table templates take the table name so legacy tables can be rebuilt under a staging name
+MEMORY_RECORDS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        learner_id TEXT NOT NULL,
+        concept_id TEXT NOT NULL,
+        memory_type TEXT NOT NULL DEFAULT 'semantic',
+        context_vector TEXT NOT NULL DEFAULT '[]',
+        related_concepts TEXT NOT NULL DEFAULT '{{}}',
+        emotional_strength REAL NOT NULL DEFAULT 0.0,
+        mastery_level INTEGER NOT NULL DEFAULT 0,
+        ease_factor REAL NOT NULL DEFAULT 2.5,
+        interval_days INTEGER NOT NULL DEFAULT 1,
+        repetitions INTEGER NOT NULL DEFAULT 0,
+        last_reviewed TEXT,
+        next_review TEXT,
+        next_review_ts INTEGER,
+        success_streak INTEGER NOT NULL DEFAULT 0,
+        total_attempts INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (learner_id, concept_id),
+        FOREIGN KEY (learner_id, concept_id) REFERENCES concepts (learner_id, id) ON DELETE CASCADE
+    )
+"""
+
+CONCEPTS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        learner_id TEXT NOT NULL,
+        id TEXT NOT NULL,
+        content TEXT NOT NULL,
+        subject TEXT NOT NULL DEFAULT 'general',
+        grade_level TEXT NOT NULL DEFAULT 'kindergarten',
+        emotional_context TEXT DEFAULT 'neutral',
+        created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (learner_id, id)
+    )
+"""
+
+CONCEPT_RELATIONSHIPS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        learner_id TEXT NOT NULL,
+        concept_id TEXT,
+        related_id TEXT,
+        strength REAL DEFAULT 1.0,
+        PRIMARY KEY (learner_id, concept_id, related_id),
+        FOREIGN KEY (learner_id, concept_id) REFERENCES concepts (learner_id, id) ON DELETE CASCADE,
+        FOREIGN KEY (learner_id, related_id) REFERENCES concepts (learner_id, id) ON DELETE CASCADE
+    )
+"""
+
+MEMORY_TABLES = {
+    'concepts': CONCEPTS_TABLE_SQL,
+    'memory_records': MEMORY_RECORDS_TABLE_SQL,
+    'concept_relationships': CONCEPT_RELATIONSHIPS_TABLE_SQL,
+}
+
+# Every index leads with learner_id so per-learner queries never touch other learners' rows
+MEMORY_INDEXES = {
+    'idx_memory_learner_next_review': 'memory_records(learner_id, next_review)',
+    'idx_memory_learner_next_review_ts': 'memory_records(learner_id, next_review_ts)',
+    'idx_memory_learner_next_review_mastery': 'memory_records(learner_id, next_review, mastery_level)',
+    'idx_memory_learner_mastery': 'memory_records(learner_id, mastery_level)',
+    'idx_concepts_learner_subject_grade': 'concepts(learner_id, subject, grade_level)',
+    'idx_concepts_learner_emotion_grade': 'concepts(learner_id, emotional_context, grade_level)',
+}
+
+def _create_memory_tables(cursor: sqlite3.Cursor):
+    for table, create_sql in MEMORY_TABLES.items():
+        cursor.execute(create_sql.format(table=table))
+
+# Version 1 also upgrades databases from before the registry: next_review_ts is
+# backfilled and tables from before learners existed go to the default learner
+MEMORY_SCHEMA = register_schema("memory", 1, [
+    _create_memory_tables,
+    ensure_next_review_ts,
+    lambda cursor: partition_legacy_tables(cursor, MEMORY_TABLES),
+    *(f"CREATE INDEX IF NOT EXISTS {name} ON {target}" for name, target in MEMORY_INDEXES.items()),
+])
+
+INSERT_CONCEPT_SQL = """
+    INSERT OR REPLACE INTO concepts 
+    (learner_id, id, content, subject, grade_level, emotional_context, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_MEMORY_RECORD_SQL = """
+    INSERT OR REPLACE INTO memory_records 
+    (learner_id, concept_id, memory_type, context_vector, related_concepts, emotional_strength, 
+     mastery_level, ease_factor, interval_days, repetitions, next_review, 
+     next_review_ts, success_streak, total_attempts)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPDATE_SCHEDULE_SQL = """
+    UPDATE memory_records SET
+        mastery_level = ?, ease_factor = ?, interval_days = ?,
+        repetitions = ?, last_reviewed = ?, next_review = ?,
+        next_review_ts = ?, success_streak = ?, total_attempts = ?
+    WHERE learner_id = ? AND concept_id = ?
+"""
+
+RECALL_CONCEPT_SQL = """
+    SELECT c.id, c.content, c.subject, c.grade_level, c.emotional_context,
+           c.created_at, m.mastery_level, m.success_streak
+    FROM concepts c
+    JOIN memory_records m ON c.learner_id = m.learner_id AND c.id = m.concept_id
+    WHERE c.learner_id = ? AND c.id IN ({placeholders})
+"""
+
+# SM-2 qualities used when a review only reports success or failure
+SUCCESS_QUALITY = 4
+FAILURE_QUALITY = 2
+
+# Failed reviews drop the ease factor by a fixed 0.2 rather than the SM-2 formula
+MEMORY_SYSTEM_POLICY = SM2Policy(fail_ease_penalty=0.2)
+
+def _split_repeats(outcomes: List[Tuple[str, int]]) -> List[List[Tuple[str, int]]]:
+    """Split outcomes into ordered waves in which each concept appears once"""
+    waves = []
+    counts = {}
+    for concept_id, quality in outcomes:
+        n = counts.get(concept_id, 0)
+        counts[concept_id] = n + 1
+        if n == len(waves):
+            waves.append([])
+        waves[n].append((concept_id, quality))
+    return waves
+
 @dataclass
 class MemoryRecord:
     """Enhanced memory record with types"""
@@ -47,306 +186,338 @@ class Concept:
 class MarcusMemorySystem:
     """Core memory system for Marcus AGI with spaced repetition learning"""
     
-    def __init__(self, db_path: str = "marcus_memory.db"):
-        self.db_path = db_path
+    def __init__(self, db_path: Optional[str] = None, learner_id: str = DEFAULT_LEARNER_ID):
+        self.db_path = db_path or state_db_path()
+        self.learner_id = learner_id
+        self.connections = get_connection_manager(self.db_path)
+        self.scheduler = SM2Scheduler(MEMORY_SYSTEM_POLICY)
         self.init_database()
     
+    def for_learner(self, learner_id: str) -> 'MarcusMemorySystem':
+        """View of the same database scoped to another learner"""
+        view = copy.copy(self)
+        view.learner_id = learner_id
+        return view
+    
+    def learner_ids(self) -> List[str]:
+        """Every learner with at least one concept in this database"""
+        conn = self.connections.get_connection()
+        return [row[0] for row in conn.execute("SELECT DISTINCT learner_id FROM concepts ORDER BY learner_id")]
+    
+    def close(self):
+        """Close the pooled connections shared by every user of this db_path"""
+        close_connection_manager(self.db_path)
+    
     def init_database(self):
         """Initialize the database with proper schema"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Create memory_records table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS memory_records (
-                    concept_id TEXT PRIMARY KEY,
-                    memory_type TEXT NOT NULL DEFAULT 'semantic',
-                    context_vector TEXT NOT NULL DEFAULT '[]',
-                    related_concepts TEXT NOT NULL DEFAULT '{}',
-                    emotional_strength REAL NOT NULL DEFAULT 0.0,
-                    mastery_level INTEGER NOT NULL DEFAULT 0,
-                    ease_factor REAL NOT NULL DEFAULT 2.5,
-                    interval_days INTEGER NOT NULL DEFAULT 1,
-                    repetitions INTEGER NOT NULL DEFAULT 0,
-                    last_reviewed TEXT,
-                    next_review TEXT,
-                    success_streak INTEGER NOT NULL DEFAULT 0,
-                    total_attempts INTEGER NOT NULL DEFAULT 0,
-                    FOREIGN KEY (concept_id) REFERENCES concepts (id) ON DELETE CASCADE
-                )
-            """)
-            
-            # Create concepts table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS concepts (
-                    id TEXT PRIMARY KEY,
-                    content TEXT NOT NULL,
-                    subject TEXT NOT NULL DEFAULT 'general',
-                    grade_level TEXT NOT NULL DEFAULT 'kindergarten',
-                    emotional_context TEXT DEFAULT 'neutral',
-                    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Create concept_relationships table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS concept_relationships (
-                    concept_id TEXT,
-                    related_id TEXT,
-                    strength REAL DEFAULT 1.0,
-                    PRIMARY KEY (concept_id, related_id),
-                    FOREIGN KEY (concept_id) REFERENCES concepts (id) ON DELETE CASCADE,
-                    FOREIGN KEY (related_id) REFERENCES concepts (id) ON DELETE CASCADE
-                )
-            """)
-            
-            # Create indexes for better performance
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_memory_next_review 
-                ON memory_records(next_review)
-            """)
-            
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_concepts_subject_grade 
-                ON concepts(subject, grade_level)
-            """)
-            
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_next_review_mastery
-                ON memory_records(next_review, mastery_level)
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_concepts_emotion_grade
-                ON concepts(emotional_context, grade_level)
-            """)
-
-            conn.commit()
-        
+        ensure_schema(self.db_path, MEMORY_SCHEMA)
         logger.info(f"Database initialized at {self.db_path}")
     
     def learn_concept(self, concept: Concept) -> bool:
         """Add a new concept to Marcus's knowledge base"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.connections.transaction() as conn:
                 cursor = conn.cursor()
+                now = datetime.datetime.now().isoformat()
                 
                 # Insert concept
-                cursor.execute("""
-                    INSERT OR REPLACE INTO concepts 
-                    (id, content, subject, grade_level, emotional_context, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    concept.id,
-                    concept.content,
-                    concept.subject,
-                    concept.grade_level,
-                    concept.emotional_context,
-                    concept.created_at or datetime.datetime.now().isoformat()
-                ))
+                cursor.execute(INSERT_CONCEPT_SQL, self._concept_row(concept, now))
                 
                 # Initialize memory record
-                memory_record = MemoryRecord(
-                    concept_id=concept.id,
-                    next_review=datetime.datetime.now().isoformat()
-                )
-                
-                cursor.execute("""
-                    INSERT OR REPLACE INTO memory_records 
-                    (concept_id, memory_type, context_vector, related_concepts, emotional_strength, 
-                     mastery_level, ease_factor, interval_days, repetitions, next_review, 
-                     success_streak, total_attempts)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    memory_record.concept_id,
-                    memory_record.memory_type,
-                    json.dumps(memory_record.context_vector),
-                    json.dumps(memory_record.related_concepts),
-                    memory_record.emotional_strength,
-                    memory_record.mastery_level,
-                    memory_record.ease_factor,
-                    memory_record.interval_days,
-                    memory_record.repetitions,
-                    memory_record.next_review,
-                    memory_record.success_streak,
-                    memory_record.total_attempts
-                ))
-                
-                conn.commit()
-                logger.info(f"Learned new concept: {concept.id}")
-                return True
+                cursor.execute(INSERT_MEMORY_RECORD_SQL, self._initial_memory_row(concept.id, now))
+            
+            self._sync_due_queue([(concept.id, to_epoch(now))])
+            logger.info(f"Learned new concept: {concept.id}")
+            return True
                 
         except Exception as e:
             logger.error(f"Error learning concept {concept.id}: {e}")
             return False
+    
+    def learn_concepts_bulk(self, concepts: Iterable[Concept], batch_size: int = BULK_BATCH_SIZE,
+                            replace: bool = True) -> Dict[str, int]:
+        """
+        Learn many concepts in a single transaction
+        
+        Concepts are streamed from ``concepts`` and written with ``executemany``
+        in batches of ``batch_size``. Concepts without an id or content are
+        skipped, as are concepts that already exist when ``replace`` is False.
+        
+        Returns counts of rows inserted, replaced and skipped.
+        """
+        counts = {'inserted': 0, 'replaced': 0, 'skipped': 0}
+        seen = set()
+        written = []
+        concepts = iter(concepts)
+        now = datetime.datetime.now().isoformat()
+        
+        try:
+            with self.connections.transaction() as conn:
+                cursor = conn.cursor()
+                
+                while True:
+                    batch = list(islice(concepts, batch_size))
+                    if not batch:
+                        break
+                    
+                    valid = [c for c in batch if c.id and c.content]
+                    counts['skipped'] += len(batch) - len(valid)
+                    
+                    # ``seen`` holds ids already in the db or written earlier in this call
+                    ids = list({c.id for c in valid} - seen)
+                    for start in range(0, len(ids), 900):
+                        chunk = ids[start:start + 900]
+                        placeholders = ",".join("?" * len(chunk))
+                        cursor.execute(f"""
+                            SELECT id FROM concepts WHERE learner_id = ? AND id IN ({placeholders})
+                        """, [self.learner_id, *chunk])
+                        seen.update(row[0] for row in cursor.fetchall())
+                    
+                    to_write = []
+                    for concept in valid:
+                        if concept.id in seen:
+                            if not replace:
+                                counts['skipped'] += 1
+                                continue
+                            counts['replaced'] += 1
+                        else:
+                            counts['inserted'] += 1
+                            seen.add(concept.id)
+                        to_write.append(concept)
+                    
+                    cursor.executemany(INSERT_CONCEPT_SQL, [self._concept_row(c, now) for c in to_write])
+                    cursor.executemany(INSERT_MEMORY_RECORD_SQL,
+                                       [self._initial_memory_row(c.id, now) for c in to_write])
+                    written.extend(c.id for c in to_write)
+            
+            now_ts = to_epoch(now)
+            self._sync_due_queue((concept_id, now_ts) for concept_id in written)
+            logger.info(f"Bulk learned concepts: {counts}")
+            return counts
+            
+        except Exception as e:
+            logger.error(f"Error bulk learning concepts: {e}")
+            return {'inserted': 0, 'replaced': 0, 'skipped': 0, 'error': str(e)}
+    
+    def _concept_row(self, concept: Concept, now: str) -> tuple:
+        return (
+            self.learner_id,
+            concept.id,
+            concept.content,
+            concept.subject,
+            concept.grade_level,
+            concept.emotional_context,
+            concept.created_at or now
+        )
+    
+    def _initial_memory_row(self, concept_id: str, now: str) -> tuple:
+        memory_record = MemoryRecord(concept_id=concept_id, next_review=now)
+        return (
+            self.learner_id,
+            memory_record.concept_id,
+            memory_record.memory_type,
+            json.dumps(memory_record.context_vector),
+            json.dumps(memory_record.related_concepts),
+            memory_record.emotional_strength,
+            memory_record.mastery_level,
+            memory_record.ease_factor,
+            memory_record.interval_days,
+            memory_record.repetitions,
+            memory_record.next_review,
+            to_epoch(memory_record.next_review),
+            memory_record.success_streak,
+            memory_record.total_attempts
+        )
         
         
     def fetch_all_concepts(self):
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connections.transaction() as conn:
             cursor = conn.cursor()
             rows = cursor.execute("""
                 SELECT id, content, subject, grade_level, emotional_context, created_at
-                FROM concepts
-            """).fetchall()
+                FROM concepts WHERE learner_id = ?
+            """, (self.learner_id,)).fetchall()
             return [Concept(*row) for row in rows]
 
     def review_concept(self, concept_id: str, success: bool) -> bool:
         """Review a concept and update spaced repetition parameters"""
+        quality = SUCCESS_QUALITY if success else FAILURE_QUALITY
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Get current memory record
-                cursor.execute("""
-                    SELECT * FROM memory_records WHERE concept_id = ?
-                """, (concept_id,))
-                
-                row = cursor.fetchone()
-                if not row:
-                    logger.error(f"No memory record found for concept: {concept_id}")
-                    return False
-                
-                # Parse current state
-                memory = MemoryRecord(
-                    concept_id=row[0],
-                    memory_type=row[1],
-                    context_vector=json.loads(row[2]),
-                    related_concepts=json.loads(row[3]),
-                    emotional_strength=row[4],
-                    mastery_level=row[5],
-                    ease_factor=row[6],
-                    interval_days=row[7],
-                    repetitions=row[8],
-                    last_reviewed=row[9],
-                    next_review=row[10],
-                    success_streak=row[11],
-                    total_attempts=row[12]
-                )
-                
-                # Update based on SuperMemo-2 algorithm
-                memory.total_attempts += 1
-                memory.last_reviewed = datetime.datetime.now().isoformat()
-                
-                if success:
-                    memory.success_streak += 1
-                    memory.repetitions += 1
-                    
-                    if memory.repetitions == 1:
-                        memory.interval_days = 1
-                    elif memory.repetitions == 2:
-                        memory.interval_days = 6
-                    else:
-                        memory.interval_days = int(memory.interval_days * memory.ease_factor)
-                    
-                    memory.ease_factor = max(1.3, memory.ease_factor + (0.1 - (5 - 4) * (0.08 + (5 - 4) * 0.02)))
-                    memory.mastery_level = min(10, memory.mastery_level + 1)
-                    
-                else:
-                    memory.success_streak = 0
-                    memory.repetitions = 0
-                    memory.interval_days = 1
-                    memory.ease_factor = max(1.3, memory.ease_factor - 0.2)
-                    memory.mastery_level = max(0, memory.mastery_level - 1)
-                
-                # Calculate next review date
-                next_review_date = datetime.datetime.now() + datetime.timedelta(days=memory.interval_days)
-                memory.next_review = next_review_date.isoformat()
-                
-                # Update database
-                cursor.execute("""
-                    UPDATE memory_records SET
-                        mastery_level = ?, ease_factor = ?, interval_days = ?,
-                        repetitions = ?, last_reviewed = ?, next_review = ?,
-                        success_streak = ?, total_attempts = ?
-                    WHERE concept_id = ?
-                """, (
-                    memory.mastery_level, memory.ease_factor, memory.interval_days,
-                    memory.repetitions, memory.last_reviewed, memory.next_review,
-                    memory.success_streak, memory.total_attempts, concept_id
-                ))
-                
-                conn.commit()
-                logger.info(f"Updated memory for concept: {concept_id} (success: {success})")
-                return True
-                
+            if self.review_concepts_batch([(concept_id, quality)]) == 0:
+                logger.error(f"No memory record found for concept: {concept_id}")
+                return False
+            logger.info(f"Updated memory for concept: {concept_id} (success: {success})")
+            return True
         except Exception as e:
             logger.error(f"Error reviewing concept {concept_id}: {e}")
             return False
     
+    def review_concepts_batch(self, outcomes: Iterable[Tuple[str, int]]) -> int:
+        """
+        Apply a batch of (concept_id, quality) review outcomes
+        
+        Quality uses the SM-2 0-5 scale. Every schedule is computed in one
+        vectorized step by the SM-2 scheduler and written back with a single
+        executemany UPDATE. Returns the number of memory records updated.
+        """
+        outcomes = list(outcomes)
+        if not outcomes:
+            return 0
+        
+        updated = 0
+        scheduled = []
+        with self.connections.transaction() as conn:
+            cursor = conn.cursor()
+            
+            # A concept reviewed several times in one batch is applied in order,
+            # one pass per repeat
+            for wave in _split_repeats(outcomes):
+                records = self._load_schedule_state(cursor, [cid for cid, _ in wave])
+                wave = [(cid, q) for cid, q in wave if cid in records]
+                if not wave:
+                    continue
+                
+                rows = [records[cid] for cid, _ in wave]
+                state = SM2State(
+                    ease_factor=[r[1] for r in rows],
+                    interval_days=[r[2] for r in rows],
+                    repetitions=[r[3] for r in rows],
+                    success_streak=[r[4] for r in rows],
+                    mastery_level=[r[5] for r in rows]
+                )
+                new_state = self.scheduler.schedule(state, [q for _, q in wave])
+                
+                now = datetime.datetime.now()
+                last_reviewed = now.isoformat()
+                next_reviews = [now + datetime.timedelta(days=int(days)) for days in new_state.interval_days]
+                next_review_ts = [to_epoch(next_review) for next_review in next_reviews]
+                cursor.executemany(UPDATE_SCHEDULE_SQL, [
+                    (
+                        int(new_state.mastery_level[i]), float(new_state.ease_factor[i]),
+                        int(new_state.interval_days[i]), int(new_state.repetitions[i]),
+                        last_reviewed, next_reviews[i].isoformat(), next_review_ts[i],
+                        int(new_state.success_streak[i]), rows[i][6] + 1, self.learner_id, cid
+                    )
+                    for i, (cid, _) in enumerate(wave)
+                ])
+                scheduled.extend((cid, next_review_ts[i]) for i, (cid, _) in enumerate(wave))
+                updated += len(wave)
+        
+        self._sync_due_queue(scheduled)
+        return updated
+    
+    def _load_schedule_state(self, cursor, concept_ids: List[str]) -> Dict[str, tuple]:
+        """Fetch the SM-2 columns for ``concept_ids`` keyed by concept id"""
+        records = {}
+        unique_ids = list(dict.fromkeys(concept_ids))
+        for start in range(0, len(unique_ids), 900):
+            chunk = unique_ids[start:start + 900]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(f"""
+                SELECT concept_id, ease_factor, interval_days, repetitions,
+                       success_streak, mastery_level, total_attempts
+                FROM memory_records WHERE learner_id = ? AND concept_id IN ({placeholders})
+            """, [self.learner_id, *chunk])
+            for row in cursor.fetchall():
+                records[row[0]] = row
+        return records
+    
+    @property
+    def due_queue(self) -> DueReviewQueue:
+        """This learner's priority queue of review times, loaded once and shared per database"""
+        key = due_queue_cache_key(self.learner_id)
+        queue = self.connections.cache.get(key)
+        if queue is None:
+            queue = DueReviewQueue.from_connection(self.connections.get_connection(), self.learner_id)
+            # Loaded inside a transaction it holds uncommitted rows, so it is only shared once they commit
+            self.connections.after_commit(lambda: self.connections.cache.setdefault(key, queue))
+            queue = self.connections.cache.get(key, queue)
+        return queue
+    
+    def _sync_due_queue(self, items: Iterable[Tuple[str, int]]):
+        """Push new review times into the due queue, if loaded, once the surrounding transaction commits"""
+        sync_due_queue(self.connections, self.learner_id, items)
+    
     def get_due_reviews(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get concepts that are due for review"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            due = self.due_queue.next_due(limit, before=to_epoch(datetime.datetime.now()))
+            if not due:
+                return []
+            
+            with self.connections.transaction() as conn:
                 cursor = conn.cursor()
-                
-                current_time = datetime.datetime.now().isoformat()
-                
-                cursor.execute("""
+                placeholders = ",".join("?" * len(due))
+                cursor.execute(f"""
                     SELECT c.id, c.content, c.subject, c.grade_level,
                            m.mastery_level, m.next_review
                     FROM concepts c
-                    JOIN memory_records m ON c.id = m.concept_id
-                    WHERE m.next_review <= ?
-                    ORDER BY m.next_review ASC
-                    LIMIT ?
-                """, (current_time, limit))
-                
-                rows = cursor.fetchall()
-                due_concepts = []
-                
-                for row in rows:
-                    due_concepts.append({
-                        'id': row[0],
-                        'content': row[1],
-                        'subject': row[2],
-                        'grade_level': row[3],
-                        'mastery_level': row[4],
-                        'next_review': row[5]
-                    })
+                    JOIN memory_records m ON c.learner_id = m.learner_id AND c.id = m.concept_id
+                    WHERE c.learner_id = ? AND c.id IN ({placeholders})
+                """, [self.learner_id, *(concept_id for concept_id, _ in due)])
                 
-                return due_concepts
+                rows = {row[0]: row for row in cursor.fetchall()}
+            
+            due_concepts = []
+            for concept_id, _ in due:
+                row = rows.get(concept_id)
+                if row is None:
+                    continue
+                due_concepts.append({
+                    'id': row[0],
+                    'content': row[1],
+                    'subject': row[2],
+                    'grade_level': row[3],
+                    'mastery_level': row[4],
+                    'next_review': row[5]
+                })
+            
+            return due_concepts
                 
         except Exception as e:
             logger.error(f"Error getting due reviews: {e}")
             return []
     
+    def count_due_reviews(self, before: Optional[datetime.datetime] = None) -> int:
+        """Count concepts due for review at or before ``before`` (default: now)"""
+        return self.due_queue.count_due(to_epoch(before or datetime.datetime.now()))
+    
     def get_learning_stats(self) -> Dict[str, Any]:
         """Get comprehensive learning statistics"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.connections.transaction() as conn:
                 cursor = conn.cursor()
                 
                 # Total concepts learned
-                cursor.execute("SELECT COUNT(*) FROM concepts")
+                cursor.execute("SELECT COUNT(*) FROM concepts WHERE learner_id = ?", (self.learner_id,))
                 total_concepts = cursor.fetchone()[0]
                 
                 # Mastery level distribution
                 cursor.execute("""
                     SELECT mastery_level, COUNT(*) 
                     FROM memory_records 
+                    WHERE learner_id = ?
                     GROUP BY mastery_level
                     ORDER BY mastery_level
-                """)
+                """, (self.learner_id,))
                 mastery_distribution = dict(cursor.fetchall())
                 
                 # Subject breakdown
                 cursor.execute("""
                     SELECT subject, COUNT(*) 
                     FROM concepts 
+                    WHERE learner_id = ?
                     GROUP BY subject
-                """)
+                """, (self.learner_id,))
                 subject_breakdown = dict(cursor.fetchall())
                 
                 # Average mastery level
-                cursor.execute("SELECT AVG(mastery_level) FROM memory_records")
+                cursor.execute("SELECT AVG(mastery_level) FROM memory_records WHERE learner_id = ?",
+                               (self.learner_id,))
                 avg_mastery = cursor.fetchone()[0] or 0
                 
                 # Due for review count
-                current_time = datetime.datetime.now().isoformat()
-                cursor.execute("""
-                    SELECT COUNT(*) FROM memory_records 
-                    WHERE next_review <= ?
-                """, (current_time,))
-                due_count = cursor.fetchone()[0]
+                due_count = self.count_due_reviews()
                 
                 return {
                     'total_concepts': total_concepts,
@@ -363,34 +534,83 @@ class MarcusMemorySystem:
     def recall_concept(self, concept_id: str) -> Optional[Dict[str, Any]]:
         """Recall a specific concept from memory"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.connections.transaction() as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute("""
-                    SELECT c.*, m.mastery_level, m.success_streak
-                    FROM concepts c
-                    JOIN memory_records m ON c.id = m.concept_id
-                    WHERE c.id = ?
-                """, (concept_id,))
+                cursor.execute(RECALL_CONCEPT_SQL.format(placeholders='?'), (self.learner_id, concept_id))
                 
                 row = cursor.fetchone()
                 if row:
-                    return {
-                        'id': row[0],
-                        'content': row[1],
-                        'subject': row[2],
-                        'grade_level': row[3],
-                        'emotional_context': row[4],
-                        'created_at': row[5],
-                        'mastery_level': row[6],
-                        'success_streak': row[7]
-                    }
+                    return self._recalled_concept(row)
                 return None
                 
         except Exception as e:
             logger.error(f"Error recalling concept {concept_id}: {e}")
             return None
     
+    @staticmethod
+    def _recalled_concept(row: tuple) -> Dict[str, Any]:
+        """Build a recalled concept from a row of RECALL_CONCEPT_SQL"""
+        return {
+            'id': row[0],
+            'content': row[1],
+            'subject': row[2],
+            'grade_level': row[3],
+            'emotional_context': row[4],
+            'created_at': row[5],
+            'mastery_level': row[6],
+            'success_streak': row[7]
+        }
+    
+    @property
+    def concept_index(self) -> VectorIndex:
+        """This learner's concept embeddings, stored beside the database and shared per database"""
+        key = concept_index_cache_key(self.learner_id)
+        index = self.connections.cache.get(key)
+        if index is None:
+            path = None
+            if self.db_path != ':memory:':
+                path = os.path.join(os.path.splitext(self.db_path)[0] + '_concept_vectors', self.learner_id)
+            index = self.connections.cache.setdefault(key, VectorIndex(path=path))
+        return index
+    
+    def _update_concept_index(self) -> VectorIndex:
+        """Embed this learner's concepts stored or rewritten since the index was last updated"""
+        index = self.concept_index
+        last_rowid = index.metadata.get('last_rowid', 0)
+        conn = self.connections.get_connection()
+        if last_rowid > (conn.execute("SELECT MAX(rowid) FROM concepts").fetchone()[0] or 0):
+            # The index outlived its database; start again
+            index.delete(index.ids())
+            last_rowid = 0
+        # INSERT OR REPLACE gives a rewritten concept a new rowid, so it is re-embedded
+        rows = conn.execute("""
+            SELECT rowid, id, content, subject FROM concepts
+            WHERE learner_id = ? AND rowid > ? ORDER BY rowid
+        """, (self.learner_id, last_rowid)).fetchall()
+        if rows:
+            index.add_texts([row[1] for row in rows], [f"{row[2]} {row[3]}" for row in rows])
+            index.metadata['last_rowid'] = rows[-1][0]
+            index.save()
+        return index
+    
+    def recall_similar_concepts(self, text: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Recall the concepts whose content is most similar to ``text``, most similar first"""
+        try:
+            matches = self._update_concept_index().recall([text], limit)[0]
+            if not matches:
+                return []
+            similarity = dict(matches)
+            conn = self.connections.get_connection()
+            rows = conn.execute(RECALL_CONCEPT_SQL.format(placeholders=','.join('?' * len(similarity))),
+                                [self.learner_id, *similarity]).fetchall()
+            concepts = [dict(self._recalled_concept(row), similarity=float(similarity[row[0]])) for row in rows]
+            concepts.sort(key=lambda concept: concept['similarity'], reverse=True)
+            return concepts
+        except Exception as e:
+            logger.error(f"Error recalling concepts similar to {text!r}: {e}")
+            return []
+    
     def reflect_on_learning(self) -> str:
         """Generate a reflection on Marcus's learning progress"""
         stats = self.get_learning_stats()
@@ -414,14 +634,14 @@ class MarcusMemorySystem:
 
     def strengthen_connections(self, concept_id: str, related_ids: List[str], strength: float):
         """Build neural-like memory connections"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connections.transaction() as conn:
             cursor = conn.cursor()
             for related_id in related_ids:
                 cursor.execute("""
                     INSERT OR REPLACE INTO concept_relationships
-                    (concept_id, related_id, strength)
-                    VALUES (?, ?, ?)
-                """, (concept_id, related_id, strength))
+                    (learner_id, concept_id, related_id, strength)
+                    VALUES (?, ?, ?, ?)
+                """, (self.learner_id, concept_id, related_id, strength))
 
     def deep_reflection(self) -> Dict[str, Any]:
         """Generate deeper learning insights"""
@@ -439,13 +659,13 @@ class MarcusMemorySystem:
     ) -> bool:
         """Process and store emotional context of memories"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.connections.transaction() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     UPDATE concepts 
                     SET emotional_context = ?
-                    WHERE id = ?
-                """, (json.dumps(emotional_context), concept_id))
+                    WHERE learner_id = ? AND id = ?
+                """, (json.dumps(emotional_context), self.learner_id, concept_id))
                 return True
         except Exception as e:
             logger.error(f"Error processing emotional memory: {e}")
@@ -453,7 +673,7 @@ class MarcusMemorySystem:
 
     def consolidate_memories(self) -> None:
         """Daily memory consolidation process"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connections.transaction() as conn:
             cursor = conn.cursor()
             today = datetime.datetime.now().date()
             
@@ -461,9 +681,10 @@ class MarcusMemorySystem:
             cursor.execute("""
                 UPDATE memory_records 
                 SET strength = strength * 1.2
-                WHERE last_accessed >= ? 
+                WHERE learner_id = ?
+                AND last_accessed >= ? 
                 AND access_count > 5
-            """, (today - datetime.timedelta(days=1),))
+            """, (self.learner_id, today - datetime.timedelta(days=1)))
 
 # Example usage and testing functions
 def test_marcus_memory():
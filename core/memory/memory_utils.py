@@ -2,53 +2,64 @@ from datetime import datetime, timedelta
 import sqlite3
 from typing import Dict, List, Optional
 
+from .connection_manager import get_connection_manager
+from .state_store import state_db_path
+from .learners import DEFAULT_LEARNER_ID, due_queue_cache_key
+
 class MemoryManager:
-    def __init__(self, db_path: str = "marcus_memory.db"):
-        self.db_path = db_path
+    def __init__(self, db_path: Optional[str] = None, learner_id: str = DEFAULT_LEARNER_ID):
+        self.db_path = db_path or state_db_path()
+        self.learner_id = learner_id
+        self.connections = get_connection_manager(self.db_path)
     
     def update_mastery(self, concept_id: str, quality: int) -> bool:
         """Update mastery level based on review quality (1-5)"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
-            # Get current values
-            cursor.execute("""
-                SELECT mastery_level, ease_factor, success_streak
-                FROM memory_records 
-                WHERE concept_id = ?
-            """, (concept_id,))
-            mastery, ease, streak = cursor.fetchone()
-            
-            # Calculate new values
-            new_mastery = min(10, mastery + (1 if quality >= 4 else -1))
-            new_ease = max(1.3, ease + (0.1 if quality >= 4 else -0.15))
-            new_streak = streak + 1 if quality >= 4 else 0
-            
-            # Update record
-            cursor.execute("""
-                UPDATE memory_records
-                SET mastery_level = ?,
-                    ease_factor = ?,
-                    success_streak = ?,
-                    last_reviewed = ?,
-                    next_review = ?,
-                    total_attempts = total_attempts + 1
-                WHERE concept_id = ?
-            """, (
-                new_mastery,
-                new_ease,
-                new_streak,
-                datetime.now().isoformat(),
-                (datetime.now() + timedelta(days=int(new_ease * new_streak))).isoformat(),
-                concept_id
-            ))
+            with self.connections.transaction() as conn:
+                cursor = conn.cursor()
+                
+                # Get current values
+                cursor.execute("""
+                    SELECT mastery_level, ease_factor, success_streak
+                    FROM memory_records 
+                    WHERE learner_id = ? AND concept_id = ?
+                """, (self.learner_id, concept_id))
+                mastery, ease, streak = cursor.fetchone()
+                
+                # Calculate new values
+                new_mastery = min(10, mastery + (1 if quality >= 4 else -1))
+                new_ease = max(1.3, ease + (0.1 if quality >= 4 else -0.15))
+                new_streak = streak + 1 if quality >= 4 else 0
+                next_review = datetime.now() + timedelta(days=int(new_ease * new_streak))
+                
+                # Update record
+                cursor.execute("""
+                    UPDATE memory_records
+                    SET mastery_level = ?,
+                        ease_factor = ?,
+                        success_streak = ?,
+                        last_reviewed = ?,
+                        next_review = ?,
+                        next_review_ts = ?,
+                        total_attempts = total_attempts + 1
+                    WHERE learner_id = ? AND concept_id = ?
+                """, (
+                    new_mastery,
+                    new_ease,
+                    new_streak,
+                    datetime.now().isoformat(),
+                    next_review.isoformat(),
+                    int(next_review.timestamp()),
+                    self.learner_id,
+                    concept_id
+                ))
             
-            conn.commit()
+            # Keep the shared due queue in step with the new review time
+            queue = self.connections.cache.get(due_queue_cache_key(self.learner_id))
+            if queue is not None:
+                queue.update(concept_id, int(next_review.timestamp()))
             return True
             
         except Exception as e:
             print(f"Error updating mastery: {e}")
-            return False
-        finally:
-            conn.close()
\ No newline at end of file
+            return False
\ No newline at end of file
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Marcus SM-2 Scheduler - Vectorized SuperMemo-2 spaced repetition engine
+
+One implementation of SM-2 shared by the memory system, the daily learning
+loop and the retention engine. Review state is held in NumPy arrays so a
+whole batch of (concept, quality) outcomes is scheduled in a single step.
+Each caller describes its flavour of SM-2 with an ``SM2Policy``. NumPy is
+imported on the first schedule, so importing the scheduler stays cheap.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+@dataclass(frozen=True)
+class SM2Policy:
+    """Parameters describing one flavour of the SM-2 algorithm"""
+    max_quality: int = 5                    # Top of the quality scale (SM-2 uses 0-5)
+    pass_threshold: int = 3                 # Quality at or above this is a successful recall
+    min_ease: float = 1.3
+    max_ease: Optional[float] = None
+    fail_ease_penalty: Optional[float] = None   # Fixed ease drop on failure; None applies the SM-2 formula
+    ease_decimals: Optional[int] = None     # Round ease factors to this many decimals
+    reset_repetitions_on_fail: bool = True
+    first_intervals: Optional[Tuple[int, ...]] = None   # Per-quality interval for a concept's first review
+    second_interval: int = 6
+    quality_multipliers: Optional[Tuple[float, ...]] = None  # Per-quality factor on mature intervals
+    round_intervals: bool = False           # Round mature intervals instead of truncating them
+    interval_jitter: float = 0.0            # +/- fraction of random jitter on successful intervals
+    mastery_step: int = 1
+    max_mastery: int = 10
+
+@dataclass
+class SM2State:
+    """Column-oriented review state for a batch of concepts"""
+    ease_factor: np.ndarray
+    interval_days: np.ndarray
+    repetitions: np.ndarray
+    success_streak: np.ndarray
+    mastery_level: np.ndarray = None
+
+    def __post_init__(self):
+        import numpy as np
+        self.ease_factor = np.asarray(self.ease_factor, dtype=np.float64)
+        self.interval_days = np.asarray(self.interval_days, dtype=np.float64)
+        self.repetitions = np.asarray(self.repetitions, dtype=np.int64)
+        self.success_streak = np.asarray(self.success_streak, dtype=np.int64)
+        if self.mastery_level is None:
+            self.mastery_level = np.zeros(len(self.ease_factor), dtype=np.int64)
+        else:
+            self.mastery_level = np.asarray(self.mastery_level, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.ease_factor)
+
+    def row(self, i: int) -> Dict[str, float]:
+        """Return one concept's state as plain Python values"""
+        return {
+            'ease_factor': float(self.ease_factor[i]),
+            'interval_days': int(self.interval_days[i]),
+            'repetitions': int(self.repetitions[i]),
+            'success_streak': int(self.success_streak[i]),
+            'mastery_level': int(self.mastery_level[i])
+        }
+
+class SM2Scheduler:
+    """Vectorized SM-2 scheduling engine"""
+
+    def __init__(self, policy: SM2Policy = None, rng: np.random.Generator = None):
+        self.policy = policy or SM2Policy()
+        self._rng = rng
+
+    @property
+    def rng(self) -> np.random.Generator:
+        if self._rng is None:
+            import numpy as np
+            self._rng = np.random.default_rng()
+        return self._rng
+
+    def schedule(self, state: SM2State, quality: Sequence[int]) -> SM2State:
+        """Compute the next schedule for every concept in ``state`` at once"""
+        import numpy as np
+        p = self.policy
+        quality = np.asarray(quality, dtype=np.int64)
+        if len(quality) != len(state):
+            raise ValueError("quality must have one entry per concept in state")
+        if quality.size and (quality.min() < 0 or quality.max() > p.max_quality):
+            raise ValueError(f"quality must be between 0 and {p.max_quality}")
+
+        passed = quality >= p.pass_threshold
+
+        # Ease factor: SM-2 formula, optionally replaced by a fixed penalty on failure
+        gap = p.max_quality - quality
+        ease = state.ease_factor + (0.1 - gap * (0.08 + gap * 0.02))
+        if p.fail_ease_penalty is not None:
+            ease = np.where(passed, ease, state.ease_factor - p.fail_ease_penalty)
+        ease = np.maximum(ease, p.min_ease)
+        if p.max_ease is not None:
+            ease = np.minimum(ease, p.max_ease)
+
+        # Repetitions and streak
+        if p.reset_repetitions_on_fail:
+            repetitions = np.where(passed, state.repetitions + 1, 0)
+        else:
+            repetitions = state.repetitions + 1
+        streak = np.where(passed, state.success_streak + 1, 0)
+
+        # Interval: 1 day, then second_interval, then previous interval * ease
+        mature = state.interval_days * ease
+        if p.quality_multipliers is not None:
+            mature = mature * np.asarray(p.quality_multipliers, dtype=np.float64)[quality]
+        interval = np.where(repetitions <= 1, 1.0,
+                            np.where(repetitions == 2, float(p.second_interval), mature))
+        if p.interval_jitter:
+            jitter = self.rng.uniform(1 - p.interval_jitter, 1 + p.interval_jitter, len(state))
+            interval = np.where(repetitions >= 2, interval * jitter, interval)
+        interval = np.rint(interval) if p.round_intervals else np.floor(interval)
+        interval = np.where(passed, np.maximum(interval, 1.0), 1.0)
+        if p.first_intervals is not None:
+            first = np.asarray(p.first_intervals, dtype=np.float64)[quality]
+            interval = np.where(state.repetitions == 0, first, interval)
+
+        if p.ease_decimals is not None:
+            ease = np.round(ease, p.ease_decimals)
+
+        mastery = np.clip(state.mastery_level + np.where(passed, p.mastery_step, -p.mastery_step),
+                          0, p.max_mastery)
+
+        return SM2State(
+            ease_factor=ease,
+            interval_days=interval,
+            repetitions=repetitions,
+            success_streak=streak,
+            mastery_level=mastery
+        )
+
+    def schedule_one(self, ease_factor: float, interval_days: float, repetitions: int,
+                     quality: int, success_streak: int = 0, mastery_level: int = 0) -> Dict[str, float]:
+        """Schedule a single concept; convenience wrapper around ``schedule``"""
+        state = SM2State([ease_factor], [interval_days], [repetitions], [success_streak], [mastery_level])
+        return self.schedule(state, [quality]).row(0)
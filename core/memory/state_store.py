@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Marcus State Store - One database and schema registry for every subsystem
+
+Subsystems used to write their own SQLite files from hard-coded relative paths
+and re-run ``CREATE TABLE IF NOT EXISTS`` on every construction. Now each one
+registers a versioned ``SubsystemSchema`` and opens the shared state database
+(``state_db_path()``, configurable with ``MARCUS_STATE_DB`` or
+``configure_state_db``). ``ensure_schema`` applies a schema and its migrations
+once per database, records the version in ``schema_versions`` and afterwards
+costs a dictionary lookup. Every subsystem shares the pooled connections of
+``ConnectionManager``, so ``state_transaction()`` blocks nest across
+subsystems and a whole daily cycle commits or rolls back together.
+"""
+
+import os
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterator, Optional, Sequence, Union
+
+from .connection_manager import ConnectionManager, get_connection_manager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_DB = "marcus_state.db"
+STATE_DB_ENV = "MARCUS_STATE_DB"
+
+# A schema step is SQL to execute or a function run against the cursor
+SchemaStep = Union[str, Callable[[sqlite3.Cursor], None]]
+
+SCHEMA_VERSIONS_SQL = """
+    CREATE TABLE IF NOT EXISTS schema_versions (
+        subsystem TEXT PRIMARY KEY,
+        version INTEGER NOT NULL,
+        applied_at TEXT NOT NULL
+    )
+"""
+
+class SchemaVersionError(RuntimeError):
+    """Raised when a database holds a newer schema than the running code"""
+
+@dataclass(frozen=True)
+class SubsystemSchema:
+    """
+    Versioned schema of one subsystem
+
+    ``steps`` build the current version and must be idempotent (``IF NOT
+    EXISTS``), since databases from before the registry already hold the
+    tables. ``migrations[n]`` upgrades version ``n`` to ``n + 1`` and runs
+    before ``steps``.
+    """
+    name: str
+    version: int
+    steps: Sequence[SchemaStep]
+    migrations: Dict[int, Sequence[SchemaStep]] = field(default_factory=dict)
+
+SCHEMA_REGISTRY: Dict[str, SubsystemSchema] = {}
+
+_state_db_override: Optional[str] = None
+_schema_lock = threading.Lock()
+
+def register_schema(name: str, version: int, steps: Sequence[SchemaStep],
+                    migrations: Optional[Dict[int, Sequence[SchemaStep]]] = None) -> SubsystemSchema:
+    """Add a subsystem's schema to the registry"""
+    schema = SubsystemSchema(name, version, tuple(steps), dict(migrations or {}))
+    SCHEMA_REGISTRY[name] = schema
+    return schema
+
+def configure_state_db(db_path: Optional[str]):
+    """Point every subsystem without an explicit db_path at ``db_path``; None restores the default"""
+    global _state_db_override
+    _state_db_override = db_path
+
+def state_db_path() -> str:
+    """Path of the shared state database"""
+    return _state_db_override or os.environ.get(STATE_DB_ENV) or DEFAULT_STATE_DB
+
+def _run_step(cursor: sqlite3.Cursor, step: SchemaStep):
+    if callable(step):
+        step(cursor)
+    else:
+        cursor.execute(step)
+
+def applied_versions(manager: ConnectionManager) -> Dict[str, int]:
+    """Schema versions recorded in a database, cached on its connection manager"""
+    versions = manager.cache.get('schema_versions')
+    if versions is None:
+        with manager.transaction() as conn:
+            conn.execute(SCHEMA_VERSIONS_SQL)
+            versions = dict(conn.execute("SELECT subsystem, version FROM schema_versions"))
+        manager.cache['schema_versions'] = versions
+    return versions
+
+def ensure_schema(db_path: Optional[str], schema: SubsystemSchema) -> bool:
+    """
+    Bring ``schema`` up to date in ``db_path`` (default: the state database)
+
+    Returns True when anything was applied, so callers can seed reference
+    rows only when their tables are new or upgraded.
+    """
+    manager = get_connection_manager(db_path or state_db_path())
+    versions = manager.cache.get('schema_versions')
+    if versions is not None and versions.get(schema.name) == schema.version:
+        return False
+
+    with _schema_lock:
+        versions = applied_versions(manager)
+        current = versions.get(schema.name)
+        if current == schema.version:
+            return False
+        if current is not None and current > schema.version:
+            raise SchemaVersionError(
+                f"{manager.db_path} has {schema.name} schema v{current}, code supports v{schema.version}")
+
+        # Inside a caller's transaction the schema is only final once that commits
+        nested = manager.in_transaction
+        with manager.transaction() as conn:
+            cursor = conn.cursor()
+            if current is not None:
+                for version in range(current, schema.version):
+                    for step in schema.migrations.get(version, ()):
+                        _run_step(cursor, step)
+            for step in schema.steps:
+                _run_step(cursor, step)
+            cursor.execute(
+                "INSERT OR REPLACE INTO schema_versions (subsystem, version, applied_at) VALUES (?, ?, ?)",
+                (schema.name, schema.version, datetime.now().isoformat())
+            )
+        if not nested:
+            versions[schema.name] = schema.version
+
+    logger.info(f"Applied {schema.name} schema v{schema.version} to {manager.db_path}"
+                + (f" (from v{current})" if current is not None else ""))
+    return True
+
+@contextmanager
+def state_transaction(db_path: Optional[str] = None) -> Iterator[sqlite3.Connection]:
+    """Transaction on the shared connection; subsystem writes inside it commit together"""
+    with get_connection_manager(db_path or state_db_path()).transaction() as conn:
+        yield conn
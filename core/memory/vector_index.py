@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Marcus Vector Index - Cosine similarity recall over fixed-size embeddings
+
+Concepts, episodes and autobiographical memories are embedded as unit-length
+float32 rows of one contiguous matrix, memory-mapped from disk when the index
+has a path. Queries are answered in batches with a single matrix product per
+block of rows. Deleted rows are masked and their slots reused by later adds.
+
+Large stores can train an IVF-style coarse quantizer: rows are grouped under
+their nearest k-means centroid and a query only scores the rows of its
+``nprobe`` closest groups. Rows added after training join their nearest group.
+
+Text is embedded with signed feature hashing of words and word pairs, so any
+process produces the same vector for the same text without a trained model.
+NumPy is imported on first use, so importing the index stays cheap.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import json
+import logging
+import threading
+import hashlib
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIM = 256
+DEFAULT_CAPACITY = 1024
+SEARCH_BLOCK_ROWS = 65536   # Rows scored per matrix product in an exact search
+
+MATRIX_FILE = "vectors.npy"
+METADATA_FILE = "index.json"
+CENTROIDS_FILE = "centroids.npy"
+LISTS_FILE = "lists.npy"
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+@lru_cache(maxsize=65536)
+def _feature_slot(feature: str, dim: int) -> Tuple[int, float]:
+    """Bucket and sign of one hashed feature"""
+    digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), 'little')
+    return digest % dim, 1.0 if digest >> 63 else -1.0
+
+def content_text(value: Any) -> str:
+    """Flatten the string values of nested dicts and lists into one text"""
+    if isinstance(value, dict):
+        return " ".join(content_text(v) for v in value.values())
+    if isinstance(value, (list, tuple, set)):
+        return " ".join(content_text(v) for v in value)
+    return "" if value is None else str(value)
+
+def embed_texts(texts: Sequence[str], dim: int = DEFAULT_DIM) -> np.ndarray:
+    """Unit-length hashed bag-of-words embeddings, one row per text"""
+    import numpy as np
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for i, text in enumerate(texts):
+        words = _WORD_RE.findall(text.lower())
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        for feature in features:
+            slot, sign = _feature_slot(feature, dim)
+            matrix[i, slot] += sign
+    return _normalize(matrix)
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    import numpy as np
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+def _top_k(scores: np.ndarray, rows: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """The k best (scores, rows) of one query, best first"""
+    import numpy as np
+    if len(scores) > k:
+        keep = np.argpartition(-scores, k - 1)[:k]
+        scores, rows = scores[keep], rows[keep]
+    order = np.argsort(-scores, kind='stable')
+    return scores[order], rows[order]
+
+class VectorIndex:
+    """Top-k cosine search over id-keyed embeddings"""
+
+    def __init__(self, dim: int = DEFAULT_DIM, path: Optional[str] = None,
+                 capacity: int = DEFAULT_CAPACITY, nprobe: int = 8):
+        """
+        Args:
+            dim: Embedding width; fixed for the life of a stored index
+            path: Directory holding the memory-mapped index; None keeps it in memory
+            capacity: Initial row capacity, doubled as the index grows
+            nprobe: Groups searched per query once a quantizer is trained
+        """
+        self.dim = dim
+        self.path = path
+        self.nprobe = nprobe
+        # Owner-defined bookkeeping saved with the index, e.g. what has been indexed
+        self.metadata: Dict[str, Any] = {}
+        self._ids: List[Optional[str]] = []     # Row -> id, None for a free slot
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._lock = threading.RLock()
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: Optional[np.ndarray] = None    # Row -> quantizer group
+        self._list_order: Optional[np.ndarray] = None
+        self._list_offsets: Optional[np.ndarray] = None
+        self._trained_rows = 0
+        self._moved: set = set()   # Rows re-grouped since the lists were built
+
+        if path and os.path.exists(os.path.join(path, METADATA_FILE)):
+            self._load()
+        else:
+            self._matrix = self._allocate(max(capacity, 1))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    def ids(self) -> List[str]:
+        """Every indexed id"""
+        return list(self._rows)
+
+    # Storage
+
+    def _allocate(self, capacity: int, copy_rows: int = 0) -> np.ndarray:
+        """A zeroed (capacity, dim) matrix holding the first ``copy_rows`` rows of the current one"""
+        import numpy as np
+        if not self.path:
+            matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+            if copy_rows:
+                matrix[:copy_rows] = self._matrix[:copy_rows]
+            return matrix
+
+        os.makedirs(self.path, exist_ok=True)
+        target = os.path.join(self.path, MATRIX_FILE)
+        temp = target + ".tmp"
+        matrix = np.lib.format.open_memmap(temp, mode='w+', dtype=np.float32, shape=(capacity, self.dim))
+        if copy_rows:
+            matrix[:copy_rows] = self._matrix[:copy_rows]
+        matrix.flush()
+        del matrix
+        self._matrix = None
+        os.replace(temp, target)
+        return np.load(target, mmap_mode='r+')
+
+    def _grow(self, needed: int):
+        capacity = len(self._matrix)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        self._matrix = self._allocate(capacity, len(self._ids))
+        if self._lists is not None:
+            import numpy as np
+            lists = np.full(capacity, -1, dtype=np.int32)
+            lists[:len(self._lists)] = self._lists
+            self._lists = lists
+
+    def _load(self):
+        import numpy as np
+        with open(os.path.join(self.path, METADATA_FILE)) as f:
+            state = json.load(f)
+        if state['dim'] != self.dim:
+            raise ValueError(f"{self.path} holds {state['dim']}-d vectors, not {self.dim}-d")
+        self._ids = state['ids']
+        self._rows = {item_id: row for row, item_id in enumerate(self._ids) if item_id is not None}
+        self._free = [row for row, item_id in enumerate(self._ids) if item_id is None]
+        self.metadata = state.get('metadata', {})
+        self._matrix = np.load(os.path.join(self.path, MATRIX_FILE), mmap_mode='r+')
+        if state.get('trained'):
+            self.centroids = np.load(os.path.join(self.path, CENTROIDS_FILE))
+            self._lists = np.load(os.path.join(self.path, LISTS_FILE))
+            self._build_lists()
+
+    def save(self):
+        """Flush the matrix and write ids, metadata and the quantizer beside it"""
+        if not self.path:
+            return
+        import numpy as np
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            self._matrix.flush()
+            if self.trained:
+                np.save(os.path.join(self.path, CENTROIDS_FILE), self.centroids)
+                np.save(os.path.join(self.path, LISTS_FILE), self._lists)
+            target = os.path.join(self.path, METADATA_FILE)
+            with open(target + ".tmp", 'w') as f:
+                json.dump({'dim': self.dim, 'ids': self._ids, 'metadata': self.metadata,
+                           'trained': self.trained}, f)
+            os.replace(target + ".tmp", target)
+
+    def close(self):
+        self.save()
+
+    # Updates
+
+    def add(self, ids: Sequence[str], vectors: Any):
+        """Add or replace the vectors of ``ids``"""
+        import numpy as np
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim))
+        with self._lock:
+            rows = []
+            for item_id in ids:
+                row = self._rows.get(item_id)
+                if row is None:
+                    if self._free:
+                        row = self._free.pop()
+                        self._ids[row] = item_id
+                    else:
+                        row = len(self._ids)
+                        self._grow(row + 1)
+                        self._ids.append(item_id)
+                    self._rows[item_id] = row
+                rows.append(row)
+            rows = np.asarray(rows, dtype=np.int64)
+            self._matrix[rows] = vectors
+            if self.trained:
+                self._lists[rows] = self._nearest_centroid(vectors)
+                self._moved.update(int(row) for row in rows if row < self._trained_rows)
+                # Re-sort once the unsorted rows are a sizeable share of the index
+                if len(self._moved) + len(self._ids) - self._trained_rows > self._trained_rows // 4:
+                    self._build_lists()
+
+    def add_texts(self, ids: Sequence[str], texts: Sequence[str]):
+        """Embed ``texts`` and add them under ``ids``"""
+        self.add(ids, embed_texts(texts, self.dim))
+
+    def delete(self, ids: Iterable[str]) -> int:
+        """Remove ``ids``; returns how many were indexed"""
+        removed = 0
+        with self._lock:
+            for item_id in ids:
+                row = self._rows.pop(item_id, None)
+                if row is None:
+                    continue
+                self._ids[row] = None
+                self._matrix[row] = 0
+                if self._lists is not None:
+                    self._lists[row] = -1
+                self._free.append(row)
+                removed += 1
+        return removed
+
+    def vectors(self, ids: Sequence[str]) -> np.ndarray:
+        """Stored vectors of ``ids``, one row each"""
+        return self._matrix[[self._rows[item_id] for item_id in ids]]
+
+    # Coarse quantizer
+
+    def train_quantizer(self, nlist: int, iterations: int = 10,
+                        sample_size: int = 65536, seed: int = 0):
+        """Group rows under ``nlist`` spherical k-means centroids for probed search"""
+        import numpy as np
+        with self._lock:
+            rows = np.fromiter(self._rows.values(), dtype=np.int64, count=len(self._rows))
+            if len(rows) < nlist:
+                raise ValueError(f"Need at least {nlist} vectors to train {nlist} groups, have {len(rows)}")
+            rng = np.random.default_rng(seed)
+            sample = self._matrix[np.sort(rng.choice(rows, min(sample_size, len(rows)), replace=False))]
+            centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+            for _ in range(iterations):
+                assignment = np.argmax(sample @ centroids.T, axis=1)
+                order = np.argsort(assignment, kind='stable')
+                groups, starts = np.unique(assignment[order], return_index=True)
+                sums = np.zeros_like(centroids)
+                sums[groups] = np.add.reduceat(sample[order], starts)
+                # Groups left empty keep their previous centroid
+                empty = ~np.linalg.norm(sums, axis=1).astype(bool)
+                sums[empty] = centroids[empty]
+                centroids = _normalize(sums)
+
+            self.centroids = centroids.astype(np.float32)
+            self._lists = np.full(len(self._matrix), -1, dtype=np.int32)
+            for start in range(0, len(rows), SEARCH_BLOCK_ROWS):
+                block = np.sort(rows[start:start + SEARCH_BLOCK_ROWS])
+                self._lists[block] = self._nearest_centroid(self._matrix[block])
+            self._build_lists()
+        logger.info(f"Trained {nlist}-group quantizer over {len(rows)} vectors")
+
+    def _nearest_centroid(self, vectors: np.ndarray) -> np.ndarray:
+        import numpy as np
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def _build_lists(self):
+        """Sort rows by group so each group's rows are one slice"""
+        import numpy as np
+        used = len(self._ids)
+        self._list_order = np.argsort(self._lists[:used], kind='stable')
+        # Free rows (group -1) sort first and fall before group 0's offset
+        self._list_offsets = np.searchsorted(self._lists[:used][self._list_order],
+                                             np.arange(len(self.centroids) + 1))
+        self._trained_rows = used
+        self._moved = set()
+
+    def _candidate_rows(self, probe: np.ndarray) -> np.ndarray:
+        """Current rows of the probed groups"""
+        import numpy as np
+        rows = np.concatenate([self._list_order[self._list_offsets[g]:self._list_offsets[g + 1]]
+                               for g in probe])
+        # Rows deleted or re-grouped since the lists were built have a new group
+        # (-1 when deleted) and are dropped; re-grouped rows are added back below
+        if self._moved:
+            moved = np.fromiter(self._moved, dtype=np.int64, count=len(self._moved))
+            rows = rows[~np.isin(rows, moved)]
+        else:
+            moved = np.empty(0, dtype=np.int64)
+        rows = rows[self._lists[rows] >= 0]
+        extra = np.concatenate((moved, np.arange(self._trained_rows, len(self._ids))))
+        if len(extra):
+            rows = np.concatenate((rows, extra[np.isin(self._lists[extra], probe)]))
+        return rows
+
+    # Queries
+
+    def search(self, queries: Any, k: int = 10,
+               nprobe: Optional[int] = None) -> List[List[Tuple[str, float]]]:
+        """
+        Top-k ids by cosine similarity for each query vector
+
+        Args:
+            queries: One vector or a (n, dim) batch
+            k: Results per query
+            nprobe: Groups to search when a quantizer is trained (default ``self.nprobe``)
+
+        Returns:
+            One list of (id, similarity) per query, most similar first
+        """
+        import numpy as np
+        queries = _normalize(np.asarray(queries, dtype=np.float32).reshape(-1, self.dim))
+        with self._lock:
+            if not self._rows or k <= 0:
+                return [[] for _ in range(len(queries))]
+            if self.trained:
+                found = self._search_probed(queries, k, nprobe or self.nprobe)
+            else:
+                found = self._search_exact(queries, k)
+            return [[(self._ids[row], float(score)) for score, row in zip(scores, rows)]
+                    for scores, rows in found]
+
+    def _search_exact(self, queries: np.ndarray, k: int):
+        import numpy as np
+        used = len(self._ids)
+        best_scores = [np.empty(0, dtype=np.float32)] * len(queries)
+        best_rows = [np.empty(0, dtype=np.int64)] * len(queries)
+        for start in range(0, used, SEARCH_BLOCK_ROWS):
+            stop = min(start + SEARCH_BLOCK_ROWS, used)
+            scores = queries @ self._matrix[start:stop].T
+            free = [row - start for row in self._free if start <= row < stop]
+            if free:
+                scores[:, free] = -np.inf
+            block_rows = np.arange(start, stop)
+            for i in range(len(queries)):
+                top_scores, top_rows = _top_k(scores[i], block_rows, k)
+                best_scores[i], best_rows[i] = _top_k(
+                    np.concatenate((best_scores[i], top_scores)),
+                    np.concatenate((best_rows[i], top_rows)), k)
+        return [(s[np.isfinite(s)], r[np.isfinite(s)]) for s, r in zip(best_scores, best_rows)]
+
+    def _search_probed(self, queries: np.ndarray, k: int, nprobe: int):
+        import numpy as np
+        nprobe = min(nprobe, len(self.centroids))
+        group_scores = queries @ self.centroids.T
+        probes = np.argpartition(-group_scores, nprobe - 1, axis=1)[:, :nprobe]
+        found = []
+        for query, probe in zip(queries, probes):
+            rows = self._candidate_rows(probe)
+            found.append(_top_k(self._matrix[rows] @ query, rows, k))
+        return found
+
+    def recall(self, texts: Sequence[str], k: int = 10,
+               nprobe: Optional[int] = None) -> List[List[Tuple[str, float]]]:
+        """Top-k ids most similar to each text"""
+        return self.search(embed_texts(texts, self.dim), k, nprobe)
+
+    def similarity(self, query: Any, ids: Sequence[str]) -> np.ndarray:
+        """Cosine similarity of one query vector to each of ``ids``"""
+        import numpy as np
+        query = _normalize(np.asarray(query, dtype=np.float32).reshape(1, self.dim))[0]
+        with self._lock:
+            return self.vectors(ids) @ query if ids else np.empty(0, dtype=np.float32)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Marcus Write-Behind Buffer - Batched persistence for high-frequency writes
+
+Rows are queued in memory and written in one transaction when the buffer
+reaches ``max_pending`` rows, ``max_delay`` seconds after the first queued
+row, on an explicit ``flush()`` and at interpreter shutdown. Owners call
+``flush()`` before reading so queries see every write. A background flush
+that fails puts its rows back at the front of the queue to be retried.
+
+Timed and background flushes all run on one long-lived flusher thread per
+buffer, which sleeps on the buffer's condition until a flush is due. Writers
+therefore always run on the same thread and reuse its pooled connection,
+rather than opening a new one on every flush.
+
+With ``max_queued`` set, the buffer is bounded and stays off the caller's
+path: size-triggered flushes run on a background thread, and ``add()``
+blocks while ``max_queued`` rows are waiting, so a slow disk slows producers
+down instead of growing the queue without limit.
+"""
+
+import atexit
+import time
+import logging
+import threading
+import weakref
+from typing import Any, Callable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PENDING = 256
+DEFAULT_MAX_DELAY = 1.0
+
+# Longest an idle flusher sleeps before checking whether its buffer is gone
+IDLE_WAIT = 5.0
+
+# Every live buffer, flushed once at shutdown
+_live_buffers: "weakref.WeakSet[WriteBehindBuffer]" = weakref.WeakSet()
+
+class WriteBehindBuffer:
+    """Queue of rows handed to ``write_rows`` in batches"""
+
+    def __init__(self, write_rows: Callable[[Sequence[Any]], None],
+                 max_pending: int = DEFAULT_MAX_PENDING, max_delay: float = DEFAULT_MAX_DELAY,
+                 max_queued: Optional[int] = None):
+        self.write_rows = write_rows
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+        self.max_queued = max_queued
+        self._pending: List[Any] = []
+        self._lock = threading.Lock()
+        # Signalled whenever a flush takes rows off the queue
+        self._drained = threading.Condition(self._lock)
+        # Signalled to wake the flusher thread when a flush may be due
+        self._wake = threading.Condition(self._lock)
+        # Held for a whole flush, so a reader's flush waits for a background one in progress
+        self._flush_lock = threading.Lock()
+        # When the oldest queued row is due for a timed flush, and when a failed flush is retried
+        self._due: Optional[float] = None
+        self._retry_at: Optional[float] = None
+        self._closed = False
+        self._flusher: Optional[threading.Thread] = None
+        _live_buffers.add(self)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, row: Any):
+        """Queue a row; flushes when the size threshold is reached"""
+        with self._lock:
+            if self.max_queued is not None:
+                # Backpressure: wait for a background flush to make room
+                while len(self._pending) >= self.max_queued:
+                    self._start_flusher()
+                    self._drained.wait(self.max_delay or DEFAULT_MAX_DELAY)
+            self._pending.append(row)
+            full = len(self._pending) >= self.max_pending
+            if full and self.max_queued is not None:
+                self._start_flusher()
+                full = False
+            if not full and self._due is None and self.max_delay > 0:
+                self._due = time.monotonic() + self.max_delay
+                self._start_flusher()
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write every queued row now; returns how many were written"""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._pending = self._pending, []
+                self._due = None
+                self._drained.notify_all()
+            if not rows:
+                return 0
+            try:
+                self.write_rows(rows)
+            except Exception:
+                with self._lock:
+                    self._pending[:0] = rows
+                    self._retry_at = time.monotonic() + (self.max_delay or DEFAULT_MAX_DELAY)
+                    if self._due is None:
+                        self._due = self._retry_at
+                raise
+            with self._lock:
+                self._retry_at = None
+            return len(rows)
+
+    def _backlogged(self) -> bool:
+        return self.max_queued is not None and len(self._pending) >= min(self.max_pending, self.max_queued)
+
+    def _start_flusher(self):
+        """Wake the flusher thread, starting it on first use; called with the lock held"""
+        self._closed = False
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(target=_run_flusher, args=(weakref.ref(self), self._wake),
+                                             name="write-behind-flusher", daemon=True)
+            self._flusher.start()
+        self._wake.notify()
+
+    def _seconds_until_flush(self) -> float:
+        """How long the flusher may sleep before its next flush; called with the lock held"""
+        now = time.monotonic()
+        if not self._pending:
+            return IDLE_WAIT
+        if self._retry_at is not None and self._retry_at > now:
+            return self._retry_at - now
+        if self._backlogged():
+            return 0.0
+        if self._due is not None:
+            return max(self._due - now, 0.0)
+        return IDLE_WAIT
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Write-behind flush failed, {len(self)} rows kept for retry: {e}")
+
+    def close(self):
+        """Flush remaining rows and stop the flusher thread"""
+        self.flush()
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
+            flusher = self._flusher
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join()
+        _live_buffers.discard(self)
+
+def _run_flusher(buffer_ref: "weakref.ref[WriteBehindBuffer]", wake: threading.Condition):
+    """Flusher thread body; holds only a weak reference while asleep so idle buffers can be collected"""
+    while True:
+        with wake:
+            buffer = buffer_ref()
+            if buffer is None or buffer._closed:
+                return
+            timeout = buffer._seconds_until_flush()
+            if timeout > 0:
+                del buffer
+                wake.wait(timeout)
+                continue
+        buffer._flush_in_background()
+        del buffer
+
+def flush_all_buffers():
+    """Flush every live buffer; runs at interpreter shutdown"""
+    for buffer in list(_live_buffers):
+        try:
+            buffer.flush()
+        except Exception as e:
+            logger.error(f"Write-behind flush at shutdown failed: {e}")
+
+atexit.register(flush_all_buffers)
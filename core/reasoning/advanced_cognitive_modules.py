@@ -26,10 +26,11 @@ import re
 from typing import Dict, List, Optional, Tuple, Any, Set, Union, Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from collections import defaultdict, deque
+from collections import defaultdict, deque, OrderedDict, Counter
 import uuid
 import statistics
 import math
+import itertools
 from abc import ABC, abstractmethod
 
 # Import base classes
@@ -37,9 +38,13 @@ from .enhanced_cognitive_architecture import (
     CognitiveModule, CognitiveModuleType, CognitiveTask, 
     ProcessingPriority, MemoryTrace, AttentionState
 )
+from .graph_store import GraphStore
 
 logger = logging.getLogger(__name__)
 
+TEXT_EMBEDDING_CACHE_SIZE = 1024  # Texts whose averaged embedding is kept
+MONTE_CARLO_CHUNK = 1_000_000     # Samples drawn per pass of the batched sampler
+
 
 class TransformerNLPModule(CognitiveModule):
     """
@@ -47,6 +52,9 @@ class TransformerNLPModule(CognitiveModule):
     language understanding and generation capabilities.
     """
     
+    DEFAULT_OPERATION = 'understand'
+    CACHEABLE_OPERATIONS = frozenset({'generate', 'analyze_sentiment', 'extract_concepts', 'semantic_similarity'})
+    
     def __init__(self):
         super().__init__(CognitiveModuleType.TRANSFORMER_NLP)
         self.vocabulary = set()
@@ -55,7 +63,10 @@ class TransformerNLPModule(CognitiveModule):
         self.max_sequence_length = 1024
         self.context_window = deque(maxlen=self.max_sequence_length)
         self.attention_patterns = {}
-        self.semantic_embeddings = {}
+        # Unit-length word embeddings, one row per word, and each word's row
+        self.embedding_matrix = np.zeros((0, self.hidden_size))
+        self.token_index: Dict[str, int] = {}
+        self._text_embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
         
         # Initialize with basic vocabulary
         self._initialize_vocabulary()
@@ -77,12 +88,29 @@ class TransformerNLPModule(CognitiveModule):
         self.vocabulary.update(basic_vocab)
         
         # Create simple embeddings (in production, would use pre-trained embeddings)
-        for word in self.vocabulary:
-            self.semantic_embeddings[word] = np.random.normal(0, 1, self.hidden_size)
+        self._add_embeddings(self.vocabulary)
+    
+    def _add_embeddings(self, words):
+        """Give each new word a random unit-length embedding row"""
+        new_words = [word for word in dict.fromkeys(words) if word not in self.token_index]
+        if not new_words:
+            return
+        vectors = np.random.normal(0, 1, (len(new_words), self.hidden_size))
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        for word in new_words:
+            self.token_index[word] = len(self.token_index)
+        self.embedding_matrix = np.vstack([self.embedding_matrix, vectors])
+        # Cached text embeddings may now include the new words
+        self._text_embedding_cache.clear()
+    
+    @property
+    def semantic_embeddings(self) -> Dict[str, np.ndarray]:
+        """Word -> embedding row, for callers that want a mapping"""
+        return {word: self.embedding_matrix[row] for word, row in self.token_index.items()}
     
     def process(self, task: CognitiveTask) -> Dict[str, Any]:
         """Process NLP tasks using transformer-like architecture."""
-        operation = task.input_data.get('operation', 'understand')
+        operation = task.input_data.get('operation', self.DEFAULT_OPERATION)
         
         if operation == 'understand':
             return self._understand_text(task.input_data.get('text', ''))
@@ -238,19 +266,41 @@ class TransformerNLPModule(CognitiveModule):
     
     def _compute_attention(self, tokens: List[str]) -> Dict[str, float]:
         """Simulate multi-head attention computation."""
-        attention_scores = {}
-        
+        if len(tokens) < 2:
+            return {token: 0.0 for token in tokens}
+        
+        # Each token's mean similarity to every other position; repeated tokens
+        # share a row, so the pairwise matrix is over distinct tokens only
+        unique = list(dict.fromkeys(tokens))
+        counts = Counter(tokens)
+        weights = np.array([counts[token] for token in unique], dtype=float)
+        similarity = self._similarity_matrix(unique)
+        # Drop each token's similarity to its own position (always 1.0)
+        totals = similarity @ weights - 1.0
+        scores = totals / (len(tokens) - 1)
+        return {token: float(score) for token, score in zip(unique, scores)}
+    
+    def _similarity_matrix(self, tokens: List[str]) -> np.ndarray:
+        """Pairwise _token_similarity of distinct tokens, computed as matrix products"""
+        rows = np.array([self.token_index.get(token, -1) for token in tokens])
+        known = rows >= 0
+        
+        # Character-set Jaccard, used for any pair with an unknown token
+        alphabet = {char: i for i, char in enumerate(sorted(set(''.join(tokens))))}
+        chars = np.zeros((len(tokens), len(alphabet)))
         for i, token in enumerate(tokens):
-            scores = []
-            for j, other_token in enumerate(tokens):
-                if i != j:
-                    # Simple attention based on semantic similarity
-                    similarity = self._token_similarity(token, other_token)
-                    scores.append(similarity)
-            
-            attention_scores[token] = statistics.mean(scores) if scores else 0.0
-        
-        return attention_scores
+            chars[i, [alphabet[char] for char in set(token)]] = 1.0
+        shared = chars @ chars.T
+        sizes = chars.sum(axis=1)
+        union = sizes[:, None] + sizes[None, :] - shared
+        similarity = np.divide(shared, union, out=np.zeros_like(shared), where=union > 0)
+        
+        # Embedding cosine for pairs of known tokens
+        if known.any():
+            vectors = self.embedding_matrix[rows[known]]
+            similarity[np.ix_(known, known)] = vectors @ vectors.T
+        np.fill_diagonal(similarity, 1.0)
+        return similarity
     
     def _extract_key_concepts(self, tokens: List[str], attention_scores: Dict[str, float]) -> List[str]:
         """Extract key concepts based on attention scores."""
@@ -350,17 +400,23 @@ class TransformerNLPModule(CognitiveModule):
     
     def _get_text_embedding(self, text: str) -> np.ndarray:
         """Get embedding representation of text."""
-        tokens = self._tokenize(text)
-        embeddings = []
-        
-        for token in tokens:
-            if token in self.semantic_embeddings:
-                embeddings.append(self.semantic_embeddings[token])
-        
-        if embeddings:
-            return np.mean(embeddings, axis=0)
+        cached = self._text_embedding_cache.get(text)
+        if cached is not None:
+            self._text_embedding_cache.move_to_end(text)
+            return cached
+        
+        rows = [self.token_index[token] for token in self._tokenize(text) if token in self.token_index]
+        if rows:
+            embedding = self.embedding_matrix[rows].mean(axis=0)
         else:
-            return np.zeros(self.hidden_size)
+            embedding = np.zeros(self.hidden_size)
+        # Shared between callers, so guard it against in-place changes
+        embedding.flags.writeable = False
+        
+        self._text_embedding_cache[text] = embedding
+        if len(self._text_embedding_cache) > TEXT_EMBEDDING_CACHE_SIZE:
+            self._text_embedding_cache.popitem(last=False)
+        return embedding
     
     def _cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
         """Calculate cosine similarity between two vectors."""
@@ -381,11 +437,10 @@ class TransformerNLPModule(CognitiveModule):
         if token1 == token2:
             return 1.0
         
-        if token1 in self.semantic_embeddings and token2 in self.semantic_embeddings:
-            return self._cosine_similarity(
-                self.semantic_embeddings[token1],
-                self.semantic_embeddings[token2]
-            )
+        if token1 in self.token_index and token2 in self.token_index:
+            # Rows are unit length, so the dot product is the cosine
+            return float(self.embedding_matrix[self.token_index[token1]] @
+                         self.embedding_matrix[self.token_index[token2]])
         
         # Fallback to simple string similarity
         common_chars = set(token1) & set(token2)
@@ -399,9 +454,7 @@ class TransformerNLPModule(CognitiveModule):
             self.vocabulary.update(new_words)
             
             # Create embeddings for new words
-            for word in new_words:
-                if word not in self.semantic_embeddings:
-                    self.semantic_embeddings[word] = np.random.normal(0, 1, self.hidden_size)
+            self._add_embeddings(new_words)
         
         if 'attention_feedback' in feedback:
             # Update attention patterns based on feedback
@@ -420,23 +473,52 @@ class GraphNeuralNetworkModule(CognitiveModule):
     and structured knowledge representation.
     """
     
+    DEFAULT_OPERATION = 'query'
+    CACHEABLE_OPERATIONS = frozenset({'query_relationships', 'find_path', 'graph_reasoning'})
+    
     def __init__(self):
         super().__init__(CognitiveModuleType.GRAPH_NEURAL_NET)
-        self.knowledge_graph = {}
-        self.node_embeddings = {}
-        self.edge_types = set()
-        self.adjacency_matrix = {}
-        self.node_features = {}
+        # Nodes, typed edges and 128-d node embeddings in array form
+        self.graph = GraphStore(embedding_dim=128)
         
         # Initialize with basic relationship types
         self._initialize_graph_structure()
     
+    @property
+    def edge_types(self) -> Set[str]:
+        return set(self.graph.edge_type_names)
+    
+    @property
+    def node_features(self) -> Dict[str, Dict[str, Any]]:
+        """Node -> its (mutable) feature dict"""
+        return dict(zip(self.graph.node_names, self.graph.node_features))
+    
+    @property
+    def node_embeddings(self) -> Dict[str, np.ndarray]:
+        """Node -> view of its embedding row"""
+        return {name: self.graph.embeddings[node] for node, name in enumerate(self.graph.node_names)}
+    
+    @property
+    def knowledge_graph(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Node -> outgoing edges as dicts, built from the graph store on access"""
+        graph = {name: [] for name in self.graph.node_names}
+        for source, target, edge_type in self.graph.iter_edges():
+            graph[source].append({"target": target, "type": edge_type, "weight": 1.0})
+        return graph
+    
+    @property
+    def adjacency_matrix(self) -> Dict[str, Set[str]]:
+        """Node -> set of nodes it has an edge to"""
+        adjacency = {name: set() for name in self.graph.node_names}
+        for source, target, _ in self.graph.iter_edges():
+            adjacency[source].add(target)
+        return adjacency
+    
     def _initialize_graph_structure(self):
         """Initialize basic graph structure and relationships."""
-        self.edge_types.update([
-            "is_a", "part_of", "related_to", "causes", "enables",
-            "requires", "similar_to", "opposite_of", "example_of"
-        ])
+        for edge_type in ["is_a", "part_of", "related_to", "causes", "enables",
+                          "requires", "similar_to", "opposite_of", "example_of"]:
+            self.graph.edge_type_id(edge_type)
         
         # Add some basic nodes and relationships
         basic_concepts = [
@@ -455,7 +537,7 @@ class GraphNeuralNetworkModule(CognitiveModule):
     
     def process(self, task: CognitiveTask) -> Dict[str, Any]:
         """Process graph-based reasoning tasks."""
-        operation = task.input_data.get('operation', 'query')
+        operation = task.input_data.get('operation', self.DEFAULT_OPERATION)
         
         if operation == 'add_node':
             return self._add_node_task(task.input_data)
@@ -485,7 +567,7 @@ class GraphNeuralNetworkModule(CognitiveModule):
         return {
             "success": success,
             "node_id": node_id,
-            "total_nodes": len(self.knowledge_graph)
+            "total_nodes": len(self.graph)
         }
     
     def _add_edge_task(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -510,7 +592,7 @@ class GraphNeuralNetworkModule(CognitiveModule):
         node_id = data.get('node_id')
         max_depth = data.get('max_depth', 2)
         
-        if not node_id or node_id not in self.knowledge_graph:
+        if not node_id or node_id not in self.graph:
             return {"success": False, "error": f"Node {node_id} not found"}
         
         relationships = self._get_node_relationships(node_id, max_depth)
@@ -531,7 +613,7 @@ class GraphNeuralNetworkModule(CognitiveModule):
         if not source or not target:
             return {"success": False, "error": "Source and target required"}
         
-        if source not in self.knowledge_graph or target not in self.knowledge_graph:
+        if source not in self.graph or target not in self.graph:
             return {"success": False, "error": "Source or target node not found"}
         
         path = self._breadth_first_search(source, target, max_length)
@@ -561,96 +643,19 @@ class GraphNeuralNetworkModule(CognitiveModule):
     
     def _add_node(self, node_id: str, features: Dict[str, Any]) -> bool:
         """Add a node to the knowledge graph."""
-        if node_id not in self.knowledge_graph:
-            self.knowledge_graph[node_id] = []
-            self.node_features[node_id] = features
-            self.adjacency_matrix[node_id] = set()
-            
-            # Create node embedding
-            self.node_embeddings[node_id] = np.random.normal(0, 1, 128)
-            
-            return True
-        return False
+        return self.graph.add_node(node_id, features)
     
     def _add_edge(self, source: str, target: str, edge_type: str) -> bool:
-        """Add an edge between two nodes."""
-        # Ensure both nodes exist
-        if source not in self.knowledge_graph:
-            self._add_node(source, {"type": "auto_created"})
-        if target not in self.knowledge_graph:
-            self._add_node(target, {"type": "auto_created"})
-        
-        # Add edge
-        edge_data = {"target": target, "type": edge_type, "weight": 1.0}
-        
-        # Check if edge already exists
-        for existing_edge in self.knowledge_graph[source]:
-            if existing_edge["target"] == target and existing_edge["type"] == edge_type:
-                return False  # Edge already exists
-        
-        self.knowledge_graph[source].append(edge_data)
-        self.adjacency_matrix[source].add(target)
-        self.edge_types.add(edge_type)
-        
-        return True
+        """Add an edge between two nodes, creating missing nodes."""
+        return self.graph.add_edge(source, target, edge_type)
     
     def _get_node_relationships(self, node_id: str, max_depth: int) -> List[Dict[str, Any]]:
         """Get all relationships for a node up to max_depth."""
-        relationships = []
-        visited = set()
-        queue = [(node_id, 0)]
-        
-        while queue:
-            current_node, depth = queue.pop(0)
-            
-            if current_node in visited or depth > max_depth:
-                continue
-            
-            visited.add(current_node)
-            
-            if current_node in self.knowledge_graph:
-                for edge in self.knowledge_graph[current_node]:
-                    relationship = {
-                        "source": current_node,
-                        "target": edge["target"],
-                        "type": edge["type"],
-                        "depth": depth
-                    }
-                    relationships.append(relationship)
-                    
-                    if depth < max_depth:
-                        queue.append((edge["target"], depth + 1))
-        
-        return relationships
+        return self.graph.relationships(node_id, max_depth)
     
     def _breadth_first_search(self, source: str, target: str, max_length: int) -> Optional[List[str]]:
         """Find shortest path between two nodes using BFS."""
-        if source == target:
-            return [source]
-        
-        queue = [(source, [source])]
-        visited = set()
-        
-        while queue:
-            current_node, path = queue.pop(0)
-            
-            if current_node in visited or len(path) > max_length:
-                continue
-            
-            visited.add(current_node)
-            
-            if current_node in self.knowledge_graph:
-                for edge in self.knowledge_graph[current_node]:
-                    next_node = edge["target"]
-                    new_path = path + [next_node]
-                    
-                    if next_node == target:
-                        return new_path
-                    
-                    if next_node not in visited:
-                        queue.append((next_node, new_path))
-        
-        return None
+        return self.graph.shortest_path(source, target, max_length)
     
     def _associative_reasoning(self, query: str) -> Dict[str, Any]:
         """Perform associative reasoning based on graph connections."""
@@ -658,7 +663,7 @@ class GraphNeuralNetworkModule(CognitiveModule):
         query_tokens = query.lower().split()
         relevant_nodes = []
         
-        for node_id in self.knowledge_graph:
+        for node_id in self.graph.node_names:
             if any(token in node_id.lower() for token in query_tokens):
                 relevant_nodes.append(node_id)
         
@@ -680,16 +685,10 @@ class GraphNeuralNetworkModule(CognitiveModule):
         """Perform causal reasoning using graph relationships."""
         # Find causal chains
         causal_edges = ["causes", "enables", "requires"]
-        causal_chains = []
-        
-        for node_id in self.knowledge_graph:
-            for edge in self.knowledge_graph[node_id]:
-                if edge["type"] in causal_edges:
-                    causal_chains.append({
-                        "cause": node_id,
-                        "effect": edge["target"],
-                        "relationship": edge["type"]
-                    })
+        causal_chains = [
+            {"cause": source, "effect": target, "relationship": edge_type}
+            for source, target, edge_type in self.graph.iter_edges(causal_edges)
+        ]
         
         return {
             "success": True,
@@ -703,12 +702,13 @@ class GraphNeuralNetworkModule(CognitiveModule):
         # Find structural patterns
         patterns = []
         
-        for node_id in self.knowledge_graph:
+        for node, node_id in enumerate(self.graph.node_names):
+            _, edge_types = self.graph.edges_from(node)
             node_pattern = {
                 "node": node_id,
-                "outgoing_edges": len(self.knowledge_graph[node_id]),
-                "edge_types": [edge["type"] for edge in self.knowledge_graph[node_id]],
-                "features": self.node_features.get(node_id, {})
+                "outgoing_edges": len(edge_types),
+                "edge_types": [self.graph.edge_type_names[t] for t in edge_types.tolist()],
+                "features": self.graph.node_features[node]
             }
             patterns.append(node_pattern)
         
@@ -738,35 +738,18 @@ class GraphNeuralNetworkModule(CognitiveModule):
     
     def _update_node_embeddings(self) -> Dict[str, Any]:
         """Update node embeddings based on graph structure."""
-        updated_count = 0
-        
-        for node_id in self.knowledge_graph:
-            # Simple embedding update based on neighbors
-            neighbor_embeddings = []
-            
-            for edge in self.knowledge_graph[node_id]:
-                neighbor_id = edge["target"]
-                if neighbor_id in self.node_embeddings:
-                    neighbor_embeddings.append(self.node_embeddings[neighbor_id])
-            
-            if neighbor_embeddings:
-                # Update embedding as average of neighbors
-                avg_neighbor_embedding = np.mean(neighbor_embeddings, axis=0)
-                self.node_embeddings[node_id] = (
-                    0.8 * self.node_embeddings[node_id] + 
-                    0.2 * avg_neighbor_embedding
-                )
-                updated_count += 1
+        # Every node with neighbours moves 20% toward their average, all at once
+        updated_count = self.graph.propagate(self_weight=0.8)
         
         return {
             "success": True,
             "updated_nodes": updated_count,
-            "total_nodes": len(self.node_embeddings)
+            "total_nodes": len(self.graph)
         }
     
     def _count_edges(self) -> int:
         """Count total number of edges in the graph."""
-        return sum(len(edges) for edges in self.knowledge_graph.values())
+        return self.graph.num_edges
     
     def update_state(self, feedback: Dict[str, Any]):
         """Update graph state based on feedback."""
@@ -781,8 +764,8 @@ class GraphNeuralNetworkModule(CognitiveModule):
         
         if 'node_importance_updates' in feedback:
             for node_id, importance in feedback['node_importance_updates'].items():
-                if node_id in self.node_features:
-                    self.node_features[node_id]['importance'] = importance
+                if node_id in self.graph:
+                    self.graph.node_features[self.graph.node_ids[node_id]]['importance'] = importance
 
 
 class ProbabilisticReasoningModule(CognitiveModule):
@@ -791,6 +774,9 @@ class ProbabilisticReasoningModule(CognitiveModule):
     making decisions under incomplete information.
     """
     
+    DEFAULT_OPERATION = 'inference'
+    CACHEABLE_OPERATIONS = frozenset({'inference', 'uncertainty_assessment', 'decision_making'})
+    
     def __init__(self):
         super().__init__(CognitiveModuleType.PROBABILISTIC_REASONING)
         self.belief_network = {}
@@ -842,7 +828,7 @@ class ProbabilisticReasoningModule(CognitiveModule):
     
     def process(self, task: CognitiveTask) -> Dict[str, Any]:
         """Process probabilistic reasoning tasks."""
-        operation = task.input_data.get('operation', 'inference')
+        operation = task.input_data.get('operation', self.DEFAULT_OPERATION)
         
         if operation == 'inference':
             return self._bayesian_inference(task.input_data)
@@ -996,34 +982,144 @@ class ProbabilisticReasoningModule(CognitiveModule):
         """Perform Monte Carlo simulation for complex probabilistic inference."""
         num_samples = data.get('num_samples', 1000)
         query_variable = data.get('query_variable')
+        evidence = data.get('evidence', {})
         
         if not query_variable:
             return {"success": False, "error": "Query variable required"}
+        for variable, state in evidence.items():
+            if state not in self.belief_network.get(variable, {}).get("states", []):
+                return {"success": False, "error": f"Unknown evidence: {variable}={state}"}
+        if query_variable not in self.belief_network:
+            return {
+                "success": True,
+                "query_variable": query_variable,
+                "num_samples": 0,
+                "empirical_distribution": {},
+                "most_frequent": None
+            }
         
-        samples = []
-        
-        for _ in range(num_samples):
-            sample = self._generate_sample()
-            if query_variable in sample:
-                samples.append(sample[query_variable])
+        # Likelihood-weighted counts of each query state, drawn in chunks
+        rng = np.random.default_rng(data.get('seed'))
+        states = self.belief_network[query_variable]["states"]
+        weighted_counts = np.zeros(len(states))
+        sampled = 0
+        remaining = num_samples
+        while remaining > 0:
+            batch = min(remaining, MONTE_CARLO_CHUNK)
+            samples, weights = self._sample_network(batch, evidence, rng)
+            values = samples[query_variable]
+            # Samples whose parents have no CPT row leave the variable unsampled (-1)
+            drawn = values >= 0
+            weighted_counts += np.bincount(values[drawn], weights=weights[drawn], minlength=len(states))
+            sampled += int(np.count_nonzero(drawn))
+            remaining -= batch
         
         # Compute empirical distribution
-        if samples:
-            unique_values = list(set(samples))
-            empirical_distribution = {}
-            
-            for value in unique_values:
-                empirical_distribution[value] = samples.count(value) / len(samples)
+        total = weighted_counts.sum()
+        if total > 0:
+            empirical_distribution = {
+                state: float(count / total) for state, count in zip(states, weighted_counts) if count > 0
+            }
         else:
             empirical_distribution = {}
         
-        return {
+        result = {
             "success": True,
             "query_variable": query_variable,
-            "num_samples": len(samples),
+            "num_samples": sampled,
             "empirical_distribution": empirical_distribution,
             "most_frequent": max(empirical_distribution, key=empirical_distribution.get) if empirical_distribution else None
         }
+        if evidence:
+            result["evidence"] = evidence
+        return result
+    
+    def _topological_order(self) -> List[str]:
+        """Belief network variables with every parent before its children"""
+        order, placed = [], set()
+        def visit(variable):
+            if variable not in placed:
+                placed.add(variable)
+                for parent in self.belief_network[variable]["parents"]:
+                    visit(parent)
+                order.append(variable)
+        for variable in self.belief_network:
+            visit(variable)
+        return order
+    
+    def _cumulative_table(self, variable: str) -> np.ndarray:
+        """
+        Cumulative CPT of ``variable``: one row per parent configuration, in
+        mixed-radix order of the parents' state indices. Rows are normalized
+        so they end at 1.0; configurations with no CPT entry are NaN.
+        """
+        node = self.belief_network[variable]
+        states = node["states"]
+        parents = node["parents"]
+        cpt = self.conditional_probabilities.get(variable, {})
+        parent_states = [self.belief_network[parent]["states"] for parent in parents]
+        
+        configurations = list(itertools.product(*parent_states)) if parents else [()]
+        table = np.full((len(configurations), len(states)), np.nan)
+        for row, configuration in enumerate(configurations):
+            distribution = cpt.get(configuration) if parents else cpt
+            if distribution:
+                table[row] = [distribution.get(state, 0.0) for state in states]
+        totals = table.sum(axis=1, keepdims=True)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            table = np.cumsum(table / totals, axis=1)
+        table[:, -1] = np.where(np.isnan(table[:, -1]), np.nan, 1.0)
+        return table
+    
+    def _sample_network(self, num_samples: int, evidence: Dict[str, Any],
+                        rng: np.random.Generator) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """
+        Draw ``num_samples`` ancestral samples of the whole network at once.
+        
+        Evidence variables are clamped to their observed state and each
+        sample is weighted by the likelihood of the evidence given its
+        parents (likelihood weighting). Returns state indices per variable
+        (-1 where no CPT row applies) and the sample weights.
+        """
+        samples: Dict[str, np.ndarray] = {}
+        weights = np.ones(num_samples)
+        
+        for variable in self._topological_order():
+            node = self.belief_network[variable]
+            num_states = len(node["states"])
+            table = self._cumulative_table(variable)
+            
+            # Mixed-radix index of each sample's parent configuration
+            configuration = np.zeros(num_samples, dtype=np.int64)
+            valid = np.ones(num_samples, dtype=bool)
+            for parent in node["parents"]:
+                parent_values = samples[parent]
+                valid &= parent_values >= 0
+                configuration = configuration * len(self.belief_network[parent]["states"]) + parent_values
+            configuration[~valid] = 0
+            valid &= ~np.isnan(table[configuration, -1])
+            
+            if variable in evidence:
+                state = node["states"].index(evidence[variable])
+                values = np.full(num_samples, state, dtype=np.int64)
+                # P(observed state | parents) from the cumulative row
+                probability = table[configuration, state] - (table[configuration, state - 1] if state else 0.0)
+                weights *= np.where(valid, probability, 0.0)
+            else:
+                # Offset row r by r so one searchsorted over the flattened table
+                # finds every sample's state in its own row. Rows without a CPT
+                # entry get a uniform placeholder to keep the table sorted; their
+                # samples are already masked by ``valid``
+                offsets = np.arange(len(table))[:, None]
+                placeholder = np.arange(1, num_states + 1) / num_states
+                filled = np.where(np.isnan(table[:, -1:]), placeholder, table)
+                flat = (filled + offsets).ravel()
+                positions = np.searchsorted(flat, configuration + rng.random(num_samples), side='right')
+                values = np.minimum(positions - configuration * num_states, num_states - 1)
+            values[~valid] = -1
+            samples[variable] = values
+        
+        return samples, weights
     
     def _compute_learning_success_posterior(self, evidence: Dict[str, Any]) -> Dict[str, float]:
         """Compute posterior distribution for learning success."""
@@ -1120,29 +1216,6 @@ class ProbabilisticReasoningModule(CognitiveModule):
         
         return min(1.0, impact_score)
     
-    def _generate_sample(self) -> Dict[str, Any]:
-        """Generate a sample from the belief network."""
-        sample = {}
-        
-        # Sample from prior distributions
-        att_states = ["focused", "distracted"]
-        att_probs = [0.7, 0.3]
-        sample["attention_level"] = np.random.choice(att_states, p=att_probs)
-        
-        know_states = ["extensive", "moderate", "limited"]
-        know_probs = [0.2, 0.5, 0.3]
-        sample["prior_knowledge"] = np.random.choice(know_states, p=know_probs)
-        
-        # Sample learning success given parents
-        key = (sample["attention_level"], sample["prior_knowledge"])
-        if key in self.conditional_probabilities["learning_success"]:
-            success_dist = self.conditional_probabilities["learning_success"][key]
-            success_states = list(success_dist.keys())
-            success_probs = list(success_dist.values())
-            sample["learning_success"] = np.random.choice(success_states, p=success_probs)
-        
-        return sample
-    
     def update_state(self, feedback: Dict[str, Any]):
         """Update probabilistic reasoning state based on feedback."""
         if 'observed_outcomes' in feedback:
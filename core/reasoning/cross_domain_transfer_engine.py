@@ -21,7 +21,6 @@ Timeline: 3 weeks implementation + 2 weeks validation
 Depends on: Advanced Reasoning Engine, Consciousness Integration Framework
 """
 
-import sqlite3
 import json
 import logging
 import numpy as np
@@ -34,6 +33,8 @@ import re
 from collections import defaultdict, Counter
 import statistics
 
+from ..memory.state_store import register_schema, ensure_schema, state_transaction, state_db_path
+
 # Import existing systems for integration
 try:
     from .advanced_reasoning_engine import AdvancedReasoningEngine, CausalRelation, ReasoningResult
@@ -137,6 +138,68 @@ class AnalogicalMapping:
     validation_score: float = 0.0
 
 
+CROSS_DOMAIN_SCHEMA = register_schema("cross_domain_transfer", 1, [
+    # Abstract patterns table
+    """
+        CREATE TABLE IF NOT EXISTS abstract_patterns (
+            pattern_id TEXT PRIMARY KEY,
+            pattern_type TEXT NOT NULL,
+            source_domain TEXT NOT NULL,
+            abstract_structure TEXT NOT NULL,  -- JSON
+            concrete_examples TEXT NOT NULL,  -- JSON
+            transfer_rules TEXT NOT NULL,  -- JSON
+            confidence REAL DEFAULT 0.0,
+            usage_count INTEGER DEFAULT 0,
+            success_rate REAL DEFAULT 0.0,
+            created_at TEXT NOT NULL
+        )
+    """,
+    # Knowledge abstractions table
+    """
+        CREATE TABLE IF NOT EXISTS knowledge_abstractions (
+            abstraction_id TEXT PRIMARY KEY,
+            original_knowledge TEXT NOT NULL,  -- JSON
+            abstract_form TEXT NOT NULL,  -- JSON
+            generalization_level REAL NOT NULL,
+            applicable_domains TEXT NOT NULL,  -- JSON
+            abstraction_rules TEXT NOT NULL,  -- JSON
+            validation_examples TEXT NOT NULL,  -- JSON
+            confidence REAL DEFAULT 0.0,
+            created_at TEXT NOT NULL
+        )
+    """,
+    # Transfer attempts table
+    """
+        CREATE TABLE IF NOT EXISTS transfer_attempts (
+            attempt_id TEXT PRIMARY KEY,
+            source_domain TEXT NOT NULL,
+            target_domain TEXT NOT NULL,
+            source_knowledge TEXT NOT NULL,  -- JSON
+            transfer_pattern_id TEXT NOT NULL,
+            target_application TEXT NOT NULL,  -- JSON
+            success BOOLEAN NOT NULL,
+            confidence REAL NOT NULL,
+            validation_results TEXT NOT NULL,  -- JSON
+            timestamp TEXT NOT NULL,
+            FOREIGN KEY (transfer_pattern_id) REFERENCES abstract_patterns (pattern_id)
+        )
+    """,
+    # Analogical mappings table
+    """
+        CREATE TABLE IF NOT EXISTS analogical_mappings (
+            mapping_id TEXT PRIMARY KEY,
+            source_domain TEXT NOT NULL,
+            target_domain TEXT NOT NULL,
+            element_mappings TEXT NOT NULL,  -- JSON
+            structural_alignment REAL NOT NULL,
+            functional_alignment REAL NOT NULL,
+            confidence REAL NOT NULL,
+            validation_score REAL DEFAULT 0.0,
+            created_at TEXT NOT NULL
+        )
+    """,
+])
+
 class CrossDomainTransferEngine:
     """
     Neural-symbolic reasoning system for cross-domain knowledge transfer.
@@ -147,7 +210,8 @@ class CrossDomainTransferEngine:
 
     def __init__(self, reasoning_engine: AdvancedReasoningEngine = None,
                  consciousness_framework: ConsciousnessIntegrationFramework = None,
-                 memory_system: AutobiographicalMemorySystem = None):
+                 memory_system: AutobiographicalMemorySystem = None,
+                 db_path: Optional[str] = None):
         """Initialize the cross-domain transfer learning engine."""
         
         # Integration with existing systems
@@ -169,8 +233,8 @@ class CrossDomainTransferEngine:
         self.transfer_success_rates: Dict[str, float] = {}
         self.pattern_effectiveness: Dict[str, float] = {}
         
-        # Database for persistence
-        self.db_path = "marcus_cross_domain_transfer.db"
+        # Shared state database for persistence
+        self.db_path = db_path or state_db_path()
         self.setup_database()
         
         # Initialize with foundational patterns
@@ -180,73 +244,7 @@ class CrossDomainTransferEngine:
 
     def setup_database(self):
         """Set up the cross-domain transfer database schema."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Abstract patterns table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS abstract_patterns (
-                    pattern_id TEXT PRIMARY KEY,
-                    pattern_type TEXT NOT NULL,
-                    source_domain TEXT NOT NULL,
-                    abstract_structure TEXT NOT NULL,  -- JSON
-                    concrete_examples TEXT NOT NULL,  -- JSON
-                    transfer_rules TEXT NOT NULL,  -- JSON
-                    confidence REAL DEFAULT 0.0,
-                    usage_count INTEGER DEFAULT 0,
-                    success_rate REAL DEFAULT 0.0,
-                    created_at TEXT NOT NULL
-                )
-            ''')
-            
-            # Knowledge abstractions table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS knowledge_abstractions (
-                    abstraction_id TEXT PRIMARY KEY,
-                    original_knowledge TEXT NOT NULL,  -- JSON
-                    abstract_form TEXT NOT NULL,  -- JSON
-                    generalization_level REAL NOT NULL,
-                    applicable_domains TEXT NOT NULL,  -- JSON
-                    abstraction_rules TEXT NOT NULL,  -- JSON
-                    validation_examples TEXT NOT NULL,  -- JSON
-                    confidence REAL DEFAULT 0.0,
-                    created_at TEXT NOT NULL
-                )
-            ''')
-            
-            # Transfer attempts table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS transfer_attempts (
-                    attempt_id TEXT PRIMARY KEY,
-                    source_domain TEXT NOT NULL,
-                    target_domain TEXT NOT NULL,
-                    source_knowledge TEXT NOT NULL,  -- JSON
-                    transfer_pattern_id TEXT NOT NULL,
-                    target_application TEXT NOT NULL,  -- JSON
-                    success BOOLEAN NOT NULL,
-                    confidence REAL NOT NULL,
-                    validation_results TEXT NOT NULL,  -- JSON
-                    timestamp TEXT NOT NULL,
-                    FOREIGN KEY (transfer_pattern_id) REFERENCES abstract_patterns (pattern_id)
-                )
-            ''')
-            
-            # Analogical mappings table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS analogical_mappings (
-                    mapping_id TEXT PRIMARY KEY,
-                    source_domain TEXT NOT NULL,
-                    target_domain TEXT NOT NULL,
-                    element_mappings TEXT NOT NULL,  -- JSON
-                    structural_alignment REAL NOT NULL,
-                    functional_alignment REAL NOT NULL,
-                    confidence REAL NOT NULL,
-                    validation_score REAL DEFAULT 0.0,
-                    created_at TEXT NOT NULL
-                )
-            ''')
-            
-            conn.commit()
+        return ensure_schema(self.db_path, CROSS_DOMAIN_SCHEMA)
 
     def _initialize_foundational_patterns(self):
         """Initialize foundational abstract patterns from physical world knowledge."""
@@ -741,7 +739,7 @@ class CrossDomainTransferEngine:
 
     def _store_abstract_pattern(self, pattern: AbstractPattern):
         """Store an abstract pattern to the database."""
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT OR REPLACE INTO abstract_patterns 
@@ -760,13 +758,12 @@ class CrossDomainTransferEngine:
                 pattern.success_rate,
                 pattern.created_at.isoformat()
             ))
-            conn.commit()
 
     def _store_transfer_attempt(self, attempt: TransferAttempt):
         """Store a transfer attempt to the database."""
         self.transfer_history.append(attempt)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO transfer_attempts 
@@ -785,7 +782,6 @@ class CrossDomainTransferEngine:
                 json.dumps(attempt.validation_results),
                 attempt.timestamp.isoformat()
             ))
-            conn.commit()
 
     def _update_pattern_statistics(self, pattern: AbstractPattern, success: bool):
         """Update pattern usage statistics."""
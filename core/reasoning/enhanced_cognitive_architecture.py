@@ -36,8 +36,9 @@ Integration Points:
 - Multi-level explainability mechanisms
 """
 
-import sqlite3
 import json
+import hashlib
+import functools
 import logging
 import numpy as np
 from datetime import datetime, timedelta
@@ -47,12 +48,19 @@ from enum import Enum
 import uuid
 import statistics
 import re
-from collections import defaultdict, Counter, deque
+from collections import defaultdict, Counter, deque, OrderedDict
 import threading
 import queue
 import time
+import itertools
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from abc import ABC, abstractmethod
 
+from ..memory.state_store import register_schema, ensure_schema, state_db_path, state_transaction
+from ..memory.write_behind import WriteBehindBuffer
+from ..memory.vector_index import VectorIndex, content_text, embed_texts
+from .episodic_store import EpisodicStore, words
+
 # Import our existing neural-symbolic system
 try:
     from .neural_symbolic_integration import (
@@ -73,6 +81,21 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Scheduler defaults: worker threads draining the task queue, and how long a
+# single module may run on a task before its result is given up on
+DEFAULT_TASK_WORKERS = 4
+DEFAULT_MODULE_TIMEOUT = 30.0
+
+# Result cache bounds: entries kept, and seconds before an entry goes stale
+RESULT_CACHE_SIZE = 1024
+RESULT_CACHE_TTL = 3600.0
+
+# Rows waiting for the background writer before producers block
+PERSISTENCE_QUEUE_SIZE = 4096
+
+# Episodes returned by a retrieval unless the query sets 'limit'
+EPISODE_RETRIEVAL_LIMIT = 10
+
 
 class CognitiveModuleType(Enum):
     """Types of cognitive modules in the enhanced architecture."""
@@ -147,6 +170,12 @@ class AttentionState:
 class CognitiveModule(ABC):
     """Abstract base class for cognitive modules."""
     
+    # Operations whose result depends only on the task input and the module
+    # state. Any other operation, and every update_state call, may change the
+    # state and bumps state_version.
+    DEFAULT_OPERATION: Optional[str] = None
+    CACHEABLE_OPERATIONS: frozenset = frozenset()
+    
     def __init__(self, module_type: CognitiveModuleType):
         self.module_type = module_type
         self.is_active = True
@@ -154,6 +183,18 @@ class CognitiveModule(ABC):
         self.resource_usage = 0.0
         self.performance_metrics = {}
         self.last_update = datetime.now()
+        self.state_version = 0
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'process' in cls.__dict__:
+            cls.process = _versioned_process(cls.__dict__['process'])
+        if 'update_state' in cls.__dict__:
+            cls.update_state = _versioned_update(cls.__dict__['update_state'])
+    
+    def is_cacheable(self, task: CognitiveTask) -> bool:
+        """Whether processing the task leaves the module state unchanged."""
+        return task.input_data.get('operation', self.DEFAULT_OPERATION) in self.CACHEABLE_OPERATIONS
     
     @abstractmethod
     def process(self, task: CognitiveTask) -> Dict[str, Any]:
@@ -177,6 +218,84 @@ class CognitiveModule(ABC):
         }
 
 
+def _versioned_process(process):
+    @functools.wraps(process)
+    def wrapper(self, task):
+        try:
+            return process(self, task)
+        finally:
+            if not self.is_cacheable(task):
+                self.state_version += 1
+    return wrapper
+
+
+def _versioned_update(update_state):
+    @functools.wraps(update_state)
+    def wrapper(self, feedback):
+        try:
+            return update_state(self, feedback)
+        finally:
+            self.state_version += 1
+    return wrapper
+
+
+class ResultCache:
+    """Bounded LRU cache of task results whose entries expire after ``ttl`` seconds."""
+    
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE, ttl: float = RESULT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """A copy of the cached result, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[1])
+    
+    def put(self, key: str, result: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, dict(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
+
+
 class WorkingMemoryModule(CognitiveModule):
     """Working memory module with attention-based buffer management."""
     
@@ -312,10 +431,16 @@ class EpisodicMemoryModule(CognitiveModule):
     
     def __init__(self):
         super().__init__(CognitiveModuleType.EPISODIC_MEMORY)
-        self.episodes = {}
-        self.temporal_index = defaultdict(list)
-        self.context_index = defaultdict(list)
-        self.emotional_index = defaultdict(list)
+        # Episodes with time, context, emotion and content-word indices
+        self.store = EpisodicStore()
+        # Episode content embeddings for 'similar_to' queries
+        self.vector_index = VectorIndex()
+        # Called with every stored or changed episode, e.g. to persist it
+        self.trace_sink: Optional[Callable[[MemoryTrace], None]] = None
+    
+    @property
+    def episodes(self) -> Dict[str, MemoryTrace]:
+        return self.store.episodes
         
     def process(self, task: CognitiveTask) -> Dict[str, Any]:
         """Process episodic memory operations."""
@@ -346,90 +471,108 @@ class EpisodicMemoryModule(CognitiveModule):
             }
         )
         
-        self.episodes[episode_id] = episode
-        
-        # Update indices
-        time_key = episode.temporal_context['timestamp'].strftime('%Y-%m-%d')
-        self.temporal_index[time_key].append(episode_id)
-        
-        for context_key, context_value in episode_data.get('context', {}).items():
-            self.context_index[f"{context_key}:{context_value}"].append(episode_id)
-        
-        emotional_range = self._get_emotional_range(episode.emotional_valence)
-        self.emotional_index[emotional_range].append(episode_id)
+        self.store.add(episode, self._get_emotional_range(episode.emotional_valence))
+        self.vector_index.add_texts([episode_id], [content_text(episode_data)])
+        self._trace_changed(episode)
         
         return {"success": True, "episode_id": episode_id}
     
+    def restore_episodes(self, episodes: List[MemoryTrace]) -> int:
+        """Load previously persisted episodes without reporting them as changes."""
+        new_episodes = [episode for episode in episodes if episode.trace_id not in self.store]
+        for episode in new_episodes:
+            self.store.add(episode, self._get_emotional_range(episode.emotional_valence), changed=False)
+        self.vector_index.add_texts([episode.trace_id for episode in new_episodes],
+                                    [content_text(episode.content) for episode in new_episodes])
+        return len(new_episodes)
+    
+    def _trace_changed(self, episode: MemoryTrace):
+        if self.trace_sink is not None:
+            self.trace_sink(episode)
+    
     def _retrieve_episodes(self, query: Dict[str, Any]) -> Dict[str, Any]:
         """Retrieve episodes based on query criteria."""
-        candidate_episodes = set(self.episodes.keys())
+        candidate_episodes = None  # every episode until a filter applies
+        
+        def narrow(episode_ids):
+            return set(episode_ids) if candidate_episodes is None else candidate_episodes & set(episode_ids)
         
         # Filter by temporal criteria
         if 'time_range' in query:
-            time_candidates = set()
-            start_date = query['time_range'].get('start')
-            end_date = query['time_range'].get('end')
-            
-            for date_key, episode_ids in self.temporal_index.items():
-                date_obj = datetime.strptime(date_key, '%Y-%m-%d').date()
-                if (not start_date or date_obj >= start_date) and (not end_date or date_obj <= end_date):
-                    time_candidates.update(episode_ids)
-            
-            candidate_episodes &= time_candidates
+            candidate_episodes = narrow(self.store.between(query['time_range'].get('start'),
+                                                           query['time_range'].get('end')))
         
         # Filter by context
         if 'context' in query:
-            context_candidates = set()
-            for context_key, context_value in query['context'].items():
-                context_candidates.update(self.context_index.get(f"{context_key}:{context_value}", []))
-            
+            context_candidates = self.store.with_context(query['context'])
             if context_candidates:
-                candidate_episodes &= context_candidates
+                candidate_episodes = narrow(context_candidates)
         
         # Filter by emotional valence
         if 'emotional_range' in query:
-            emotional_candidates = set()
-            for emotion_range in query['emotional_range']:
-                emotional_candidates.update(self.emotional_index.get(emotion_range, []))
-            
+            emotional_candidates = self.store.with_emotion(query['emotional_range'])
             if emotional_candidates:
-                candidate_episodes &= emotional_candidates
-        
-        # Retrieve and rank episodes
+                candidate_episodes = narrow(emotional_candidates)
+        
+        # Filter by content keywords
+        keywords = [words(keyword) for keyword in query.get('content_keywords', [])]
+        if keywords:
+            keyword_candidates = self.store.with_keywords(keywords)
+            if keyword_candidates:
+                candidate_episodes = narrow(keyword_candidates)
+        
+        if candidate_episodes is None:
+            candidate_episodes = self.store.episodes.keys()
+        
+        # Score every candidate against the query text in one pass
+        similarity = {}
+        if query.get('similar_to'):
+            candidate_ids = list(candidate_episodes)
+            scores = self.vector_index.similarity(embed_texts([query['similar_to']])[0], candidate_ids)
+            similarity = dict(zip(candidate_ids, scores.tolist()))
+        
+        # Rank by relevance, then encoding strength, keeping only the best few
+        now = datetime.now()
+        episodes = self.store.episodes
+        
+        def rank(episode_id):
+            episode = episodes[episode_id]
+            relevance = self._calculate_episode_relevance(episode, query, similarity.get(episode_id),
+                                                          keywords, now)
+            return relevance, episode.encoding_strength
+        
+        top_ids = self.store.top_k(candidate_episodes, rank, query.get('limit', EPISODE_RETRIEVAL_LIMIT))
         retrieved_episodes = []
-        for episode_id in candidate_episodes:
-            episode = self.episodes[episode_id]
+        for episode_id in top_ids:
+            episode = episodes[episode_id]
             episode.retrieval_count += 1
-            episode.last_accessed = datetime.now()
-            
-            relevance = self._calculate_episode_relevance(episode, query)
-            retrieved_episodes.append({
-                'episode': episode,
-                'relevance': relevance
-            })
-        
-        # Sort by relevance and recency
-        retrieved_episodes.sort(key=lambda x: (x['relevance'], x['episode'].encoding_strength), reverse=True)
+            episode.last_accessed = now
+            self.store.mark_changed(episode)
+            self._trace_changed(episode)
+            retrieved_episodes.append(episode)
         
         return {
             "success": True,
-            "episodes": [ep['episode'] for ep in retrieved_episodes[:10]],  # Top 10
-            "total_found": len(retrieved_episodes)
+            "episodes": retrieved_episodes,
+            "total_found": len(candidate_episodes)
         }
     
     def _consolidate_memories(self) -> Dict[str, Any]:
-        """Consolidate episodic memories by strengthening important ones."""
+        """Consolidate the episodic memories stored or changed since the last pass."""
         consolidated_count = 0
         
-        for episode in self.episodes.values():
+        for episode_id in self.store.take_changed():
+            episode = self.store.episodes[episode_id]
             # Strengthen memories that are frequently accessed or emotionally significant
             if episode.retrieval_count > 3 or abs(episode.emotional_valence) > 0.7:
                 episode.encoding_strength = min(1.0, episode.encoding_strength * 1.1)
                 consolidated_count += 1
+                self._trace_changed(episode)
             
             # Weaken rarely accessed memories
             elif episode.retrieval_count == 0 and episode.encoding_strength < 0.3:
                 episode.encoding_strength *= 0.9
+                self._trace_changed(episode)
         
         return {"success": True, "consolidated_episodes": consolidated_count}
     
@@ -446,27 +589,32 @@ class EpisodicMemoryModule(CognitiveModule):
         else:
             return "very_negative"
     
-    def _calculate_episode_relevance(self, episode: MemoryTrace, query: Dict[str, Any]) -> float:
+    def _calculate_episode_relevance(self, episode: MemoryTrace, query: Dict[str, Any],
+                                     similarity: Optional[float] = None,
+                                     keywords: Optional[List[frozenset]] = None,
+                                     now: Optional[datetime] = None) -> float:
         """Calculate relevance of episode to query."""
         relevance_factors = []
         
-        # Content similarity
+        # Embedding similarity to the 'similar_to' text
+        if similarity is not None:
+            relevance_factors.append(max(0.0, similarity))
+        
+        # Content similarity: share of the keywords whose words all occur in the episode
         if 'content_keywords' in query:
-            content_text = json.dumps(episode.content).lower()
-            keyword_matches = sum(1 for keyword in query['content_keywords'] 
-                                if keyword.lower() in content_text)
-            content_relevance = keyword_matches / len(query['content_keywords']) if query['content_keywords'] else 0
-            relevance_factors.append(content_relevance)
+            if keywords is None:
+                keywords = [words(keyword) for keyword in query['content_keywords']]
+            relevance_factors.append(self.store.keyword_overlap(episode.trace_id, keywords))
         
         # Temporal relevance (more recent = more relevant, unless specifically querying old memories)
-        time_since = (datetime.now() - episode.temporal_context['timestamp']).total_seconds()
+        time_since = ((now or datetime.now()) - episode.temporal_context['timestamp']).total_seconds()
         temporal_relevance = 1.0 / (1.0 + time_since / 86400)  # Decay over days
         relevance_factors.append(temporal_relevance * 0.3)  # Lower weight for temporal
         
         # Encoding strength
         relevance_factors.append(episode.encoding_strength)
         
-        return statistics.mean(relevance_factors) if relevance_factors else 0.0
+        return sum(relevance_factors) / len(relevance_factors)
     
     def update_state(self, feedback: Dict[str, Any]):
         """Update episodic memory state based on feedback."""
@@ -476,6 +624,8 @@ class EpisodicMemoryModule(CognitiveModule):
                     episode = self.episodes[episode_id]
                     episode.encoding_strength = max(0.1, min(1.0, 
                         episode.encoding_strength + strength_change))
+                    self.store.mark_changed(episode)
+                    self._trace_changed(episode)
 
 
 class MetacognitiveMonitor(CognitiveModule):
@@ -706,6 +856,115 @@ class MetacognitiveMonitor(CognitiveModule):
             )
 
 
+ENHANCED_COGNITIVE_SCHEMA = register_schema("enhanced_cognitive", 1, [
+    # Cognitive tasks table
+    """
+        CREATE TABLE IF NOT EXISTS cognitive_tasks (
+            task_id TEXT PRIMARY KEY,
+            task_type TEXT,
+            input_data TEXT,
+            priority INTEGER,
+            required_modules TEXT,
+            context TEXT,
+            created TEXT,
+            started TEXT,
+            completed TEXT,
+            result TEXT,
+            error TEXT
+        )
+    """,
+    # Memory traces table
+    """
+        CREATE TABLE IF NOT EXISTS memory_traces (
+            trace_id TEXT PRIMARY KEY,
+            content TEXT,
+            memory_type TEXT,
+            encoding_strength REAL,
+            retrieval_count INTEGER,
+            last_accessed TEXT,
+            associations TEXT,
+            emotional_valence REAL,
+            temporal_context TEXT
+        )
+    """,
+    # Cognitive performance table
+    """
+        CREATE TABLE IF NOT EXISTS cognitive_performance (
+            session_id TEXT PRIMARY KEY,
+            timestamp TEXT,
+            module_type TEXT,
+            performance_metrics TEXT,
+            resource_usage REAL
+        )
+    """,
+])
+
+def _json_default(value: Any) -> Any:
+    """JSON fallback for datetimes, enums, dataclasses and numpy values in stored rows."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, '__dataclass_fields__'):
+        return value.__dict__
+    return str(value)
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=_json_default)
+
+
+def _task_row(task: CognitiveTask) -> Tuple:
+    return (
+        task.task_id,
+        task.task_type,
+        _dumps(task.input_data),
+        task.priority.value,
+        _dumps([m.value for m in task.required_modules]),
+        _dumps(task.context),
+        task.created.isoformat(),
+        task.started.isoformat() if task.started else None,
+        task.completed.isoformat() if task.completed else None,
+        _dumps(task.result) if task.result is not None else None,
+        task.error
+    )
+
+
+def _trace_row(trace: MemoryTrace) -> Tuple:
+    return (
+        trace.trace_id,
+        _dumps(trace.content),
+        trace.memory_type,
+        trace.encoding_strength,
+        trace.retrieval_count,
+        trace.last_accessed.isoformat(),
+        _dumps(trace.associations),
+        trace.emotional_valence,
+        _dumps(trace.temporal_context) if trace.temporal_context is not None else None
+    )
+
+
+def _trace_from_row(row: Tuple) -> MemoryTrace:
+    temporal_context = json.loads(row[8]) if row[8] else None
+    if temporal_context and temporal_context.get('timestamp'):
+        temporal_context['timestamp'] = datetime.fromisoformat(temporal_context['timestamp'])
+    return MemoryTrace(
+        trace_id=row[0],
+        content=json.loads(row[1]),
+        memory_type=row[2],
+        encoding_strength=row[3],
+        retrieval_count=row[4],
+        last_accessed=datetime.fromisoformat(row[5]),
+        associations=json.loads(row[6]),
+        emotional_valence=row[7],
+        temporal_context=temporal_context
+    )
+
+
 class EnhancedCognitiveArchitecture:
     """
     Comprehensive cognitive architecture integrating neurosymbolic reasoning
@@ -727,11 +986,13 @@ class EnhancedCognitiveArchitecture:
     def __init__(self, 
                  neural_symbolic_system: NeuralSymbolicIntegration = None,
                  reasoning_engine: AdvancedReasoningEngine = None,
-                 transfer_engine: CrossDomainTransferEngine = None):
+                 transfer_engine: CrossDomainTransferEngine = None,
+                 db_path: Optional[str] = None):
         """Initialize the enhanced cognitive architecture."""
+        self.db_path = db_path or state_db_path()
         
         # Core neurosymbolic foundation
-        self.neural_symbolic_core = neural_symbolic_system or NeuralSymbolicIntegration()
+        self.neural_symbolic_core = neural_symbolic_system or NeuralSymbolicIntegration(db_path=self.db_path)
         self.reasoning_engine = reasoning_engine
         self.transfer_engine = transfer_engine
         
@@ -742,11 +1003,15 @@ class EnhancedCognitiveArchitecture:
         # Central executive control
         self.executive_control = ExecutiveController(self.cognitive_modules)
         
-        # Processing infrastructure
+        # Processing infrastructure: (priority, sequence, task, future)
+        # entries, drained by worker threads in ProcessingPriority order
         self.task_queue = queue.PriorityQueue()
-        self.result_cache = {}
+        self.result_cache = ResultCache()
         self.processing_threads = {}
         self.is_running = False
+        self._task_sequence = itertools.count()
+        self._scheduler_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
         
         # Performance monitoring
         self.performance_metrics = {
@@ -756,10 +1021,15 @@ class EnhancedCognitiveArchitecture:
             'resource_efficiency': 0.0
         }
         
-        # Database for persistence
-        self.db_path = "marcus_enhanced_cognitive.db"
+        # Schema in the shared state database
         self.setup_database()
         
+        # Completed tasks and changed memory traces are written in batches
+        # by background flushes; episodes from earlier runs are loaded first
+        self.task_writer = WriteBehindBuffer(self._write_task_rows, max_queued=PERSISTENCE_QUEUE_SIZE)
+        self.trace_writer = WriteBehindBuffer(self._write_trace_rows, max_queued=PERSISTENCE_QUEUE_SIZE)
+        self._replay_persisted_state()
+        
         logger.info("🧠 Enhanced Cognitive Architecture initialized")
     
     def _initialize_cognitive_modules(self):
@@ -785,53 +1055,116 @@ class EnhancedCognitiveArchitecture:
     
     def setup_database(self):
         """Set up database schema for enhanced cognitive architecture."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Cognitive tasks table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS cognitive_tasks (
-                    task_id TEXT PRIMARY KEY,
-                    task_type TEXT,
-                    input_data TEXT,
-                    priority INTEGER,
-                    required_modules TEXT,
-                    context TEXT,
-                    created TEXT,
-                    started TEXT,
-                    completed TEXT,
-                    result TEXT,
-                    error TEXT
-                )
-            """)
-            
-            # Memory traces table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS memory_traces (
-                    trace_id TEXT PRIMARY KEY,
-                    content TEXT,
-                    memory_type TEXT,
-                    encoding_strength REAL,
-                    retrieval_count INTEGER,
-                    last_accessed TEXT,
-                    associations TEXT,
-                    emotional_valence REAL,
-                    temporal_context TEXT
-                )
-            """)
-            
-            # Cognitive performance table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS cognitive_performance (
-                    session_id TEXT PRIMARY KEY,
-                    timestamp TEXT,
-                    module_type TEXT,
-                    performance_metrics TEXT,
-                    resource_usage REAL
-                )
-            """)
-            
-            conn.commit()
+        return ensure_schema(self.db_path, ENHANCED_COGNITIVE_SCHEMA)
+    
+    def _replay_persisted_state(self):
+        """Restore episodic memory from the database and route new traces back to it."""
+        episodic = self.cognitive_modules.get(CognitiveModuleType.EPISODIC_MEMORY)
+        if not isinstance(episodic, EpisodicMemoryModule):
+            return
+        with state_transaction(self.db_path) as conn:
+            rows = conn.execute('''
+                SELECT trace_id, content, memory_type, encoding_strength, retrieval_count,
+                       last_accessed, associations, emotional_valence, temporal_context
+                FROM memory_traces WHERE memory_type = 'episodic'
+            ''').fetchall()
+        restored = episodic.restore_episodes([_trace_from_row(row) for row in rows])
+        episodic.trace_sink = self._queue_trace
+        if restored:
+            logger.info(f"🧠 Restored {restored} episodic memories")
+    
+    def _queue_task(self, task: CognitiveTask):
+        """Serialize a finished task now, so later changes to it or its result are not written."""
+        self.task_writer.add(_task_row(task))
+    
+    def _queue_trace(self, trace: MemoryTrace):
+        """Serialize a memory trace as it is now and queue the row."""
+        self.trace_writer.add(_trace_row(trace))
+    
+    def _write_task_rows(self, rows: List[Tuple]):
+        """Write a batch of finished task rows in one transaction."""
+        with state_transaction(self.db_path) as conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO cognitive_tasks
+                (task_id, task_type, input_data, priority, required_modules, context,
+                 created, started, completed, result, error)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+    
+    def _write_trace_rows(self, rows: List[Tuple]):
+        """Write the latest row of each memory trace in a batch in one transaction."""
+        latest = {row[0]: row for row in rows}
+        with state_transaction(self.db_path) as conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO memory_traces
+                (trace_id, content, memory_type, encoding_strength, retrieval_count,
+                 last_accessed, associations, emotional_valence, temporal_context)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', list(latest.values()))
+    
+    def flush(self) -> int:
+        """Write queued tasks and traces now; returns how many rows were written."""
+        return self.task_writer.flush() + self.trace_writer.flush()
+    
+    def close(self):
+        """Stop the workers and write everything still queued."""
+        self.stop()
+        self.task_writer.close()
+        self.trace_writer.close()
+        self.executive_control.shutdown()
+    
+    def start(self, num_workers: int = DEFAULT_TASK_WORKERS):
+        """Start worker threads that process queued tasks by priority."""
+        with self._scheduler_lock:
+            if self.is_running:
+                return
+            self.is_running = True
+            for index in range(num_workers):
+                name = f"cognitive-worker-{index}"
+                worker = threading.Thread(target=self._worker_loop, name=name, daemon=True)
+                self.processing_threads[name] = worker
+                worker.start()
+        logger.info(f"🧠 Cognitive scheduler started with {num_workers} workers")
+    
+    def stop(self, wait: bool = True):
+        """Stop the workers once the tasks already queued have been processed."""
+        with self._scheduler_lock:
+            if not self.is_running:
+                return
+            self.is_running = False
+            workers = list(self.processing_threads.values())
+            self.processing_threads = {}
+            # Stop markers sort after every real priority
+            for _ in workers:
+                self.task_queue.put((float('inf'), next(self._task_sequence), None, None))
+        if wait:
+            for worker in workers:
+                worker.join()
+    
+    def submit_task(self, task: CognitiveTask) -> Future:
+        """Queue a task for the workers; the future resolves to its result."""
+        if not self.is_running:
+            self.start()
+        future = Future()
+        self.task_queue.put((task.priority.value, next(self._task_sequence), task, future))
+        return future
+    
+    def process_tasks(self, tasks: List[CognitiveTask]) -> List[Dict[str, Any]]:
+        """Process a batch of tasks through the scheduler, returning results in input order."""
+        futures = [self.submit_task(task) for task in tasks]
+        return [future.result() for future in futures]
+    
+    def _worker_loop(self):
+        """Take tasks off the queue, most urgent first, until a stop marker arrives."""
+        while True:
+            _, _, task, future = self.task_queue.get()
+            try:
+                if task is None:
+                    return
+                if future.set_running_or_notify_cancel():
+                    future.set_result(self.process_cognitive_task(task))
+            finally:
+                self.task_queue.task_done()
     
     def process_cognitive_task(self, task: CognitiveTask) -> Dict[str, Any]:
         """Process a cognitive task through the appropriate modules."""
@@ -844,8 +1177,14 @@ class EnhancedCognitiveArchitecture:
             if not task.required_modules:
                 task.required_modules = self._determine_required_modules(task)
             
-            # Process through executive control
-            result = self.executive_control.coordinate_processing(task)
+            # Pure tasks over unchanged module state reuse an earlier result
+            cache_key = self._result_cache_key(task)
+            result = self.result_cache.get(cache_key) if cache_key else None
+            if result is None:
+                # Process through executive control
+                result = self.executive_control.coordinate_processing(task)
+                if cache_key and result.get('success', False):
+                    self.result_cache.put(cache_key, result)
             
             # Update task with result
             task.completed = datetime.now()
@@ -858,14 +1197,36 @@ class EnhancedCognitiveArchitecture:
             processing_time = (task.completed - task.started).total_seconds()
             self._update_performance_metrics(task, processing_time)
             
+            self._queue_task(task)
             return result
             
         except Exception as e:
             task.error = str(e)
             task.completed = datetime.now()
             logger.error(f"Error processing cognitive task {task.task_id}: {e}")
+            self._queue_task(task)
             return {"success": False, "error": str(e)}
     
+    def _result_cache_key(self, task: CognitiveTask) -> Optional[str]:
+        """Hash of task type, input and module state versions; None if the task is not pure."""
+        versions = []
+        for module_type in task.required_modules:
+            module = self.cognitive_modules.get(module_type)
+            if module is None:
+                continue
+            if not isinstance(module, CognitiveModule) or not module.is_cacheable(task):
+                return None
+            versions.append((module_type.value, module.state_version))
+        if not versions:
+            return None
+        try:
+            payload = json.dumps([task.task_type, task.input_data, sorted(versions)],
+                                 sort_keys=True, default=str)
+        except TypeError:
+            # Keys that cannot be sorted have no canonical form
+            return None
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    
     def _determine_required_modules(self, task: CognitiveTask) -> List[CognitiveModuleType]:
         """Determine which cognitive modules are required for a task."""
         required_modules = []
@@ -945,7 +1306,8 @@ class EnhancedCognitiveArchitecture:
                 required_modules=[CognitiveModuleType.EPISODIC_MEMORY]
             )
             
-            self.cognitive_modules[CognitiveModuleType.EPISODIC_MEMORY].process(memory_task)
+            with self.executive_control.module_locks[CognitiveModuleType.EPISODIC_MEMORY]:
+                self.cognitive_modules[CognitiveModuleType.EPISODIC_MEMORY].process(memory_task)
         
         # Update metacognitive monitoring
         if CognitiveModuleType.METACOGNITIVE_MONITOR in self.cognitive_modules:
@@ -957,21 +1319,23 @@ class EnhancedCognitiveArchitecture:
                 }
             }
             
-            self.cognitive_modules[CognitiveModuleType.METACOGNITIVE_MONITOR].update_state(feedback)
+            with self.executive_control.module_locks[CognitiveModuleType.METACOGNITIVE_MONITOR]:
+                self.cognitive_modules[CognitiveModuleType.METACOGNITIVE_MONITOR].update_state(feedback)
     
     def _update_performance_metrics(self, task: CognitiveTask, processing_time: float):
         """Update overall performance metrics."""
-        self.performance_metrics['tasks_processed'] += 1
-        
-        # Update average processing time
-        old_avg = self.performance_metrics['average_processing_time']
-        n = self.performance_metrics['tasks_processed']
-        self.performance_metrics['average_processing_time'] = (old_avg * (n-1) + processing_time) / n
-        
-        # Update success rate
-        success = 1.0 if task.result and task.result.get('success', False) else 0.0
-        old_success_rate = self.performance_metrics['success_rate']
-        self.performance_metrics['success_rate'] = (old_success_rate * (n-1) + success) / n
+        with self._metrics_lock:
+            self.performance_metrics['tasks_processed'] += 1
+        
+            # Update average processing time
+            old_avg = self.performance_metrics['average_processing_time']
+            n = self.performance_metrics['tasks_processed']
+            self.performance_metrics['average_processing_time'] = (old_avg * (n-1) + processing_time) / n
+        
+            # Update success rate
+            success = 1.0 if task.result and task.result.get('success', False) else 0.0
+            old_success_rate = self.performance_metrics['success_rate']
+            self.performance_metrics['success_rate'] = (old_success_rate * (n-1) + success) / n
     
     def get_system_status(self) -> Dict[str, Any]:
         """Get comprehensive system status."""
@@ -984,6 +1348,7 @@ class EnhancedCognitiveArchitecture:
             "performance_metrics": self.performance_metrics,
             "module_statuses": module_statuses,
             "task_queue_size": self.task_queue.qsize(),
+            "result_cache": self.result_cache.get_stats(),
             "executive_control_status": self.executive_control.get_status(),
             "timestamp": datetime.now().isoformat()
         }
@@ -1164,10 +1529,19 @@ class EnhancedCognitiveArchitecture:
 class ExecutiveController:
     """Executive control system for coordinating cognitive modules."""
     
-    def __init__(self, cognitive_modules: Dict[CognitiveModuleType, CognitiveModule]):
+    def __init__(self, cognitive_modules: Dict[CognitiveModuleType, CognitiveModule],
+                 module_timeout: float = DEFAULT_MODULE_TIMEOUT,
+                 max_parallel_modules: Optional[int] = None):
         self.cognitive_modules = cognitive_modules
         self.coordination_history = deque(maxlen=50)
         self.resource_allocation = {}
+        self.module_timeout = module_timeout
+        
+        # Modules keep mutable state, so each one handles a single task at a
+        # time; different modules of the same task run side by side
+        self.module_locks = {module_type: threading.Lock() for module_type in cognitive_modules}
+        self._module_executor = ThreadPoolExecutor(max_workers=max_parallel_modules,
+                                                   thread_name_prefix="cognitive-module")
         
     def coordinate_processing(self, task: CognitiveTask) -> Dict[str, Any]:
         """Coordinate processing across multiple cognitive modules."""
@@ -1179,21 +1553,37 @@ class ExecutiveController:
             # Allocate resources
             self._allocate_resources(task.required_modules)
             
-            # Process task through required modules
+            # Dispatch every available module at once
+            timeout = self._task_timeout(task)
+            deadline = time.monotonic() + timeout
             module_results = {}
-            
+            futures = {}
             for module_type in task.required_modules:
                 if module_type in self.cognitive_modules:
-                    module = self.cognitive_modules[module_type]
-                    module_result = module.process(task)
-                    module_results[module_type.value] = module_result
+                    future = self._module_executor.submit(self._run_module, module_type, task, deadline)
+                    futures[future] = module_type
                 else:
                     # Handle missing modules gracefully
                     module_results[module_type.value] = {
                         "error": f"Module {module_type.value} not available"
                     }
             
-            # Integrate results
+            # Collect results in completion order
+            try:
+                for future in as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+                    module_type = futures.pop(future)
+                    module_results[module_type.value] = self._module_result(module_type, future)
+            except FuturesTimeoutError:
+                for future, module_type in futures.items():
+                    future.cancel()
+                    logger.warning(f"Module {module_type.value} timed out on task {task.task_id}")
+                    module_results[module_type.value] = {
+                        "success": False,
+                        "error": f"Module {module_type.value} timed out after {timeout:.1f}s"
+                    }
+            
+            # Integrate results, in the order the task listed its modules
+            module_results = {m.value: module_results[m.value] for m in task.required_modules}
             integrated_result = self._integrate_module_results(module_results, task)
             
             # Record coordination
@@ -1214,6 +1604,38 @@ class ExecutiveController:
             logger.error(f"Executive coordination error: {e}")
             return {"success": False, "error": f"Coordination failed: {str(e)}"}
     
+    def _task_timeout(self, task: CognitiveTask) -> float:
+        """Per-module time budget, shortened to the task deadline if it has one."""
+        if task.deadline is None:
+            return self.module_timeout
+        remaining = (task.deadline - datetime.now()).total_seconds()
+        return max(0.0, min(self.module_timeout, remaining))
+    
+    def _run_module(self, module_type: CognitiveModuleType, task: CognitiveTask,
+                    deadline: float) -> Dict[str, Any]:
+        """Run one module on a task once no other task is using it."""
+        lock = self.module_locks[module_type]
+        if not lock.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            raise FuturesTimeoutError(f"Module {module_type.value} busy past the task deadline")
+        try:
+            return self.cognitive_modules[module_type].process(task)
+        finally:
+            lock.release()
+    
+    def _module_result(self, module_type: CognitiveModuleType, future: Future) -> Dict[str, Any]:
+        """Result of a finished module future, turning exceptions into failed results."""
+        try:
+            return future.result()
+        except FuturesTimeoutError as e:
+            return {"success": False, "error": str(e)}
+        except Exception as e:
+            logger.error(f"Module {module_type.value} failed: {e}")
+            return {"success": False, "error": f"Module {module_type.value} failed: {str(e)}"}
+    
+    def shutdown(self, wait: bool = True):
+        """Stop the module thread pool."""
+        self._module_executor.shutdown(wait=wait)
+    
     def _allocate_resources(self, required_modules: List[CognitiveModuleType]):
         """Allocate processing resources to required modules."""
         
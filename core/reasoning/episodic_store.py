@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Marcus Episodic Store - Indexed storage for episodic memory traces
+
+Episode timestamps are kept in one sorted list (with the episode ids in a
+parallel list), so a time range is two bisects and a slice instead of a scan
+over every day. Context items, emotional ranges and the words of each
+episode's content each map to the set of episodes carrying them, so filters
+and keyword queries only ever touch matching episodes.
+
+The store also tracks which episodes changed since the last consolidation
+pass, so consolidation visits only those instead of every episode.
+"""
+
+import heapq
+import re
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date, datetime, time
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set
+
+from ..memory.vector_index import content_text
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+def words(text: str) -> FrozenSet[str]:
+    """Lower-cased word tokens of ``text``"""
+    return frozenset(_WORD_RE.findall(text.lower()))
+
+class EpisodicStore:
+    """Episodes by id, indexed by time, context, emotional range and content word"""
+
+    def __init__(self):
+        self.episodes: Dict[str, Any] = {}
+        self._times: List[datetime] = []
+        self._time_ids: List[str] = []
+        self.context_index: Dict[str, Set[str]] = defaultdict(set)
+        self.emotional_index: Dict[str, Set[str]] = defaultdict(set)
+        self.keyword_index: Dict[str, Set[str]] = defaultdict(set)
+        self.content_words: Dict[str, FrozenSet[str]] = {}
+        self.changed: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.episodes)
+
+    def __contains__(self, episode_id: str) -> bool:
+        return episode_id in self.episodes
+
+    # Updates
+
+    def add(self, episode: Any, emotional_range: str, changed: bool = True):
+        """Index a MemoryTrace-like episode; ``changed`` queues it for consolidation"""
+        episode_id = episode.trace_id
+        self.episodes[episode_id] = episode
+
+        timestamp = episode.temporal_context['timestamp']
+        if not self._times or timestamp >= self._times[-1]:
+            self._times.append(timestamp)
+            self._time_ids.append(episode_id)
+        else:
+            position = bisect_right(self._times, timestamp)
+            self._times.insert(position, timestamp)
+            self._time_ids.insert(position, episode_id)
+
+        for context_key, context_value in episode.content.get('context', {}).items():
+            self.context_index[f"{context_key}:{context_value}"].add(episode_id)
+        self.emotional_index[emotional_range].add(episode_id)
+
+        content_words = words(content_text(episode.content))
+        self.content_words[episode_id] = content_words
+        for word in content_words:
+            self.keyword_index[word].add(episode_id)
+
+        if changed:
+            self.changed.add(episode_id)
+
+    def mark_changed(self, episode: Any):
+        """Queue an episode for the next consolidation pass"""
+        self.changed.add(episode.trace_id)
+
+    def take_changed(self) -> Set[str]:
+        """Episodes changed since the last call"""
+        changed, self.changed = self.changed, set()
+        return changed
+
+    # Queries
+
+    def between(self, start: Optional[date] = None, end: Optional[date] = None) -> List[str]:
+        """Ids of episodes from ``start`` to ``end`` inclusive; plain dates cover whole days"""
+        if start is not None and not isinstance(start, datetime):
+            start = datetime.combine(start, time.min)
+        if end is not None and not isinstance(end, datetime):
+            end = datetime.combine(end, time.max)
+        low = bisect_left(self._times, start) if start is not None else 0
+        high = bisect_right(self._times, end) if end is not None else len(self._times)
+        return self._time_ids[low:high]
+
+    def with_context(self, context: Dict[str, Any]) -> Set[str]:
+        """Episodes matching any of the context items"""
+        return self._union(self.context_index.get(f"{key}:{value}")
+                           for key, value in context.items())
+
+    def with_emotion(self, emotional_ranges: Iterable[str]) -> Set[str]:
+        """Episodes in any of the emotional ranges"""
+        return self._union(self.emotional_index.get(r) for r in emotional_ranges)
+
+    def with_keywords(self, keywords: Iterable[FrozenSet[str]]) -> Set[str]:
+        """Episodes containing every word of at least one keyword"""
+        matches = set()
+        for keyword in keywords:
+            postings = sorted((self.keyword_index.get(word, ()) for word in keyword), key=len)
+            if postings and postings[0]:
+                matches |= set(postings[0]).intersection(*postings[1:])
+        return matches
+
+    def keyword_overlap(self, episode_id: str, keywords: List[FrozenSet[str]]) -> float:
+        """Fraction of the keywords whose words all occur in the episode"""
+        if not keywords:
+            return 0.0
+        content_words = self.content_words[episode_id]
+        return sum(1 for keyword in keywords if keyword and keyword <= content_words) / len(keywords)
+
+    @staticmethod
+    def top_k(episode_ids: Iterable[str], score: Callable[[str], Any], k: int) -> List[str]:
+        """The ``k`` best-scoring ids, best first, without sorting every candidate"""
+        return heapq.nlargest(k, episode_ids, key=score)
+
+    @staticmethod
+    def _union(postings: Iterable[Optional[Set[str]]]) -> Set[str]:
+        result = set()
+        for ids in postings:
+            if ids:
+                result |= ids
+        return result
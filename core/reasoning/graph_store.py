@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Marcus Graph Store - Array-backed knowledge graph
+
+Nodes get integer ids in insertion order; their features live in a list and
+their embeddings in one (nodes, dim) matrix. Edges are appended to growable
+source/target/type arrays, and a bitset of edge types per (source, target)
+pair makes the duplicate check O(1). A CSR view (row offsets plus target and
+type arrays, each row in insertion order) is rebuilt lazily after changes and
+drives traversal and message passing.
+
+Message passing is a sparse x dense product over the CSR arrays, done one
+embedding column at a time so memory stays bounded at millions of edges.
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_EMBEDDING_DIM = 128
+
+def spmm(indptr: np.ndarray, indices: np.ndarray, dense: np.ndarray,
+         weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """Product of a CSR matrix (``indptr``, ``indices``, optional ``weights``) with ``dense``"""
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    out = np.empty((dense.shape[1], len(indptr) - 1))
+    # One column at a time: each gather reads a single contiguous column and
+    # bincount sums it per row, so temporaries stay at one value per edge
+    for column, values in enumerate(np.ascontiguousarray(dense.T)):
+        gathered = values[indices]
+        if weights is not None:
+            gathered *= weights
+        out[column] = np.bincount(rows, weights=gathered, minlength=len(indptr) - 1)
+    return out.T
+
+class GraphStore:
+    """Directed, typed multigraph with integer node ids"""
+
+    def __init__(self, embedding_dim: int = DEFAULT_EMBEDDING_DIM, capacity: int = 1024,
+                 rng: Optional[np.random.Generator] = None):
+        self.embedding_dim = embedding_dim
+        self.rng = rng or np.random.default_rng()
+        self.node_ids: Dict[str, int] = {}
+        self.node_names: List[str] = []
+        self.node_features: List[Dict[str, Any]] = []
+        self.embeddings = np.zeros((capacity, embedding_dim))
+        self.edge_type_ids: Dict[str, int] = {}
+        self.edge_type_names: List[str] = []
+
+        self._sources = np.zeros(capacity, dtype=np.int32)
+        self._targets = np.zeros(capacity, dtype=np.int32)
+        self._types = np.zeros(capacity, dtype=np.int32)
+        self.num_edges = 0
+        # (source << 32 | target) -> bitset of the edge types between them
+        self._type_bits: Dict[int, int] = {}
+        self._csr: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self.node_names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.node_ids
+
+    # Updates
+
+    def add_node(self, name: str, features: Optional[Dict[str, Any]] = None) -> bool:
+        """Add a node with a random embedding; False if it already exists"""
+        if name in self.node_ids:
+            return False
+        node = len(self.node_names)
+        if node == len(self.embeddings):
+            grown = np.zeros((2 * node, self.embedding_dim))
+            grown[:node] = self.embeddings
+            self.embeddings = grown
+        self.node_ids[name] = node
+        self.node_names.append(name)
+        self.node_features.append(features if features is not None else {})
+        self.embeddings[node] = self.rng.normal(0, 1, self.embedding_dim)
+        self._csr = None
+        return True
+
+    def edge_type_id(self, edge_type: str) -> int:
+        """Bit position of ``edge_type``, registering it on first use"""
+        type_id = self.edge_type_ids.get(edge_type)
+        if type_id is None:
+            type_id = self.edge_type_ids[edge_type] = len(self.edge_type_names)
+            self.edge_type_names.append(edge_type)
+        return type_id
+
+    def add_edge(self, source: str, target: str, edge_type: str) -> bool:
+        """Add a typed edge, creating missing nodes; False if it already exists"""
+        for name in (source, target):
+            if name not in self.node_ids:
+                self.add_node(name, {"type": "auto_created"})
+        src, dst = self.node_ids[source], self.node_ids[target]
+        type_id = self.edge_type_id(edge_type)
+
+        key = src << 32 | dst
+        bits = self._type_bits.get(key, 0)
+        if bits >> type_id & 1:
+            return False
+        self._type_bits[key] = bits | 1 << type_id
+
+        edge = self.num_edges
+        if edge == len(self._sources):
+            self._sources = np.resize(self._sources, 2 * edge)
+            self._targets = np.resize(self._targets, 2 * edge)
+            self._types = np.resize(self._types, 2 * edge)
+        self._sources[edge], self._targets[edge], self._types[edge] = src, dst, type_id
+        self.num_edges += 1
+        self._csr = None
+        return True
+
+    def has_edge(self, source: str, target: str, edge_type: str) -> bool:
+        src, dst = self.node_ids.get(source), self.node_ids.get(target)
+        type_id = self.edge_type_ids.get(edge_type)
+        if src is None or dst is None or type_id is None:
+            return False
+        return bool(self._type_bits.get(src << 32 | dst, 0) >> type_id & 1)
+
+    # CSR view
+
+    @property
+    def csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(indptr, targets, types) with each node's edges in insertion order"""
+        if self._csr is None:
+            sources = self._sources[:self.num_edges]
+            order = np.argsort(sources, kind='stable')
+            counts = np.bincount(sources, minlength=len(self.node_names))
+            indptr = np.zeros(len(self.node_names) + 1, dtype=np.int64)
+            np.cumsum(counts, out=indptr[1:])
+            self._csr = (indptr, self._targets[:self.num_edges][order], self._types[:self.num_edges][order])
+        return self._csr
+
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self.csr[0])
+
+    def edges_from(self, node: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Targets and type ids of one node's outgoing edges"""
+        indptr, targets, types = self.csr
+        start, stop = indptr[node], indptr[node + 1]
+        return targets[start:stop], types[start:stop]
+
+    def iter_edges(self, edge_types: Optional[List[str]] = None) -> Iterator[Tuple[str, str, str]]:
+        """(source, target, type) names in node then insertion order, optionally of some types only"""
+        indptr, targets, types = self.csr
+        sources = np.repeat(np.arange(len(self.node_names)), np.diff(indptr))
+        selected = np.arange(len(targets))
+        if edge_types is not None:
+            wanted = [self.edge_type_ids[t] for t in edge_types if t in self.edge_type_ids]
+            selected = np.flatnonzero(np.isin(types, wanted))
+        names, type_names = self.node_names, self.edge_type_names
+        for edge in selected.tolist():
+            yield names[sources[edge]], names[targets[edge]], type_names[types[edge]]
+
+    # Traversal
+
+    def relationships(self, name: str, max_depth: int) -> List[Dict[str, Any]]:
+        """Outgoing edges of every node within ``max_depth`` hops, breadth first"""
+        indptr, targets, types = self.csr
+        start = self.node_ids[name]
+        visited = np.zeros(len(self.node_names), dtype=bool)
+        visited[start] = True
+        queue = deque([(start, 0)])
+        relationships = []
+        while queue:
+            node, depth = queue.popleft()
+            row_targets = targets[indptr[node]:indptr[node + 1]].tolist()
+            row_types = types[indptr[node]:indptr[node + 1]].tolist()
+            for target, type_id in zip(row_targets, row_types):
+                relationships.append({
+                    "source": self.node_names[node],
+                    "target": self.node_names[target],
+                    "type": self.edge_type_names[type_id],
+                    "depth": depth
+                })
+                if depth < max_depth and not visited[target]:
+                    visited[target] = True
+                    queue.append((target, depth + 1))
+        return relationships
+
+    def shortest_path(self, source: str, target: str, max_length: int) -> Optional[List[str]]:
+        """Fewest-hop path of at most ``max_length`` expansions, or None"""
+        if source == target:
+            return [source]
+        indptr, targets, _ = self.csr
+        start, goal = self.node_ids[source], self.node_ids[target]
+        parent = np.full(len(self.node_names), -1, dtype=np.int64)
+        visited = np.zeros(len(self.node_names), dtype=bool)
+        visited[start] = True
+        queue = deque([(start, 1)])
+        while queue:
+            node, length = queue.popleft()
+            if length > max_length:
+                continue
+            for next_node in targets[indptr[node]:indptr[node + 1]].tolist():
+                if next_node == goal:
+                    path = [goal, node]
+                    while parent[path[-1]] >= 0:
+                        path.append(int(parent[path[-1]]))
+                    return [self.node_names[n] for n in reversed(path)]
+                if not visited[next_node]:
+                    visited[next_node] = True
+                    parent[next_node] = node
+                    queue.append((next_node, length + 1))
+        return None
+
+    # Message passing
+
+    def propagate(self, self_weight: float = 0.8) -> int:
+        """Blend each node's embedding with the mean of its out-neighbours'; returns nodes updated"""
+        indptr, targets, _ = self.csr
+        degree = np.diff(indptr)
+        has_neighbors = degree > 0
+        embeddings = self.embeddings[:len(self.node_names)]
+        neighbor_mean = spmm(indptr, targets, embeddings)
+        neighbor_mean[has_neighbors] /= degree[has_neighbors, None]
+        embeddings[has_neighbors] = (self_weight * embeddings[has_neighbors] +
+                                     (1 - self_weight) * neighbor_mean[has_neighbors])
+        return int(np.count_nonzero(has_neighbors))
+
+    def embedding(self, name: str) -> np.ndarray:
+        return self.embeddings[self.node_ids[name]]
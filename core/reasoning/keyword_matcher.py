@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Marcus Keyword Matcher - Compiled multi-phrase matching
+
+Builds an Aho-Corasick automaton once per keyword set so every phrase hit in a
+text is found in a single pass, instead of running ``phrase in text`` once per
+phrase. Matching is substring-based and case-insensitive, the same semantics
+the detectors had with their lower-cased ``in`` checks.
+
+The automaton steps once per character in Python, while ``in`` runs in C, so
+small keyword sets are faster scanned phrase by phrase. Below
+``DIRECT_SCAN_LIMIT`` phrases the matcher does that over the once-lowered text;
+larger sets use the automaton, whose cost does not grow with the phrase count.
+"""
+
+import logging
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Phrase count above which the automaton beats per-phrase C substring scans
+# (see scripts/benchmarks/benchmark_keyword_matcher.py)
+DIRECT_SCAN_LIMIT = 64
+
+class KeywordMatcher:
+    """Multi-phrase matcher over a fixed keyword set, backed by an Aho-Corasick automaton"""
+
+    def __init__(self, phrases: Iterable[str], direct_scan_limit: int = DIRECT_SCAN_LIMIT):
+        self.phrases: List[str] = list(dict.fromkeys(p.lower() for p in phrases if p))
+        self._lengths = [len(p) for p in self.phrases]
+        self.uses_automaton = len(self.phrases) > direct_scan_limit
+        if self.uses_automaton:
+            self._build()
+
+    def _build(self):
+        # Trie of goto edges; state 0 is the root
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for index, phrase in enumerate(self.phrases):
+            state = 0
+            for ch in phrase:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(index)
+
+        # Breadth-first failure links, folded into a full transition table so
+        # matching never walks failure chains
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = delta[fail[state]]
+            delta[state] = {**fallback, **goto[state]}
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for ch, nxt in goto[state].items():
+                fail[nxt] = fallback.get(ch, 0)
+                queue.append(nxt)
+
+        self._delta = delta
+        self._outputs = [tuple(out) for out in outputs]
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Yield ``(start, phrase)`` for every occurrence of every phrase"""
+        if not self.uses_automaton:
+            yield from self.find_all(text)
+            return
+        delta, outputs, lengths, phrases = self._delta, self._outputs, self._lengths, self.phrases
+        state = 0
+        for end, ch in enumerate(text.lower()):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                for index in outputs[state]:
+                    yield end - lengths[index] + 1, phrases[index]
+
+    def find_all(self, text: str) -> List[Tuple[int, str]]:
+        """Every ``(start, phrase)`` hit in ``text``, ordered by position"""
+        if self.uses_automaton:
+            return sorted(self.iter_matches(text))
+        lowered = text.lower()
+        hits = []
+        for phrase in self.phrases:
+            start = lowered.find(phrase)
+            while start >= 0:
+                hits.append((start, phrase))
+                start = lowered.find(phrase, start + 1)
+        return sorted(hits)
+
+    def found(self, text: str) -> Set[str]:
+        """The distinct phrases that occur in ``text``"""
+        lowered = text.lower()
+        if not self.uses_automaton:
+            return {phrase for phrase in self.phrases if phrase in lowered}
+        delta, outputs, phrases = self._delta, self._outputs, self.phrases
+        hits: Set[int] = set()
+        state = 0
+        for ch in lowered:
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                hits.update(outputs[state])
+        return {phrases[index] for index in hits}
+
+    def contains_any(self, text: str) -> bool:
+        """Whether at least one phrase occurs in ``text``; stops at the first hit"""
+        lowered = text.lower()
+        if not self.uses_automaton:
+            return any(phrase in lowered for phrase in self.phrases)
+        delta, outputs = self._delta, self._outputs
+        state = 0
+        for ch in lowered:
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                return True
+        return False
+
+@lru_cache(maxsize=256)
+def _compile(phrases: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(phrases)
+
+def compile_keywords(phrases: Iterable[str]) -> KeywordMatcher:
+    """Shared matcher for a keyword set, built on first use"""
+    return _compile(tuple(phrases))
@@ -21,19 +21,23 @@ Timeline: 3 weeks implementation + 1 week validation
 Depends on: Advanced Reasoning Engine, Cross-Domain Transfer Engine, Consciousness Framework
 """
 
-import sqlite3
 import json
 import logging
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any, Set, Union
+from typing import Dict, List, Optional, Tuple, Any, Set, Union, FrozenSet, Hashable
 from dataclasses import dataclass, field
 from enum import Enum
 import uuid
 import statistics
 import re
+import itertools
 from collections import defaultdict, Counter
 
+from .keyword_matcher import KeywordMatcher
+from .rule_index import FeatureIndex
+from ..memory.state_store import register_schema, ensure_schema, state_transaction, state_db_path
+
 # Import existing systems for integration
 try:
     from .advanced_reasoning_engine import AdvancedReasoningEngine, ReasoningProblem, ReasoningResult, CausalRelation
@@ -65,6 +69,101 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Attributes set up by _initialize_foundational_systems the first time one is read
+FOUNDATION_ATTRIBUTES = frozenset({
+    'neural_patterns', 'symbolic_rules', 'transfer_engine', 'problem_type_indicators'
+})
+
+# Concepts a rule can be about, with phrases that signal them in a problem
+CONCEPT_MAPPINGS = {
+    'creative': ['innovative', 'new', 'alternative', 'brainstorm', 'novel'],
+    'physical': ['move', 'force', 'object', 'weight', 'space', 'lift'],
+    'moral': ['ethical', 'right', 'wrong', 'should', 'help', 'fair'],
+    'logical': ['prove', 'because', 'therefore', 'if', 'then', 'logic'],
+    'social': ['friend', 'person', 'relationship', 'collaborate', 'help'],
+    'helping': ['assist', 'support', 'aid', 'help', 'cooperate'],
+    'problem': ['challenge', 'issue', 'difficulty', 'solve', 'solution']
+}
+
+# Finds every concept and synonym in a rule or problem text in one pass
+CONCEPT_MATCHER = KeywordMatcher(
+    [concept for concept in CONCEPT_MAPPINGS]
+    + [synonym for synonyms in CONCEPT_MAPPINGS.values() for synonym in synonyms]
+)
+
+# Concepts a neural pattern feature can stand for, with their related features
+PATTERN_CONCEPT_MAPPINGS = {
+    'creative': ['innovative', 'new', 'alternative', 'brainstorm', 'novel', 'original'],
+    'physical': ['move', 'force', 'object', 'weight', 'space', 'lift', 'heavy'],
+    'moral': ['ethical', 'right', 'wrong', 'should', 'help', 'fair', 'good'],
+    'logical': ['prove', 'because', 'therefore', 'if', 'then', 'logic', 'reason'],
+    'social': ['friend', 'person', 'relationship', 'collaborate', 'help', 'people'],
+    'learning': ['understand', 'study', 'practice', 'knowledge', 'skill', 'concept'],
+    'problem_solving': ['solve', 'solution', 'challenge', 'issue', 'difficulty', 'approach']
+}
+
+WORD_RE = re.compile(r'\w+')
+STOP_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
+                        'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had'})
+
+# Combined keyword/concept score a rule needs to count as relevant
+RULE_MATCH_THRESHOLD = 0.15
+# Match score a neural pattern needs to count as relevant
+PATTERN_MATCH_THRESHOLD = 0.3
+
+def _keywords(text: str) -> FrozenSet[str]:
+    """Words of three or more characters that are not stop words"""
+    return frozenset(word for word in WORD_RE.findall(text) if len(word) > 2 and word not in STOP_WORDS)
+
+def _rule_concept_keys(rule_text: str) -> FrozenSet[Tuple[str, str]]:
+    """A rule naming a concept needs one of its synonyms in the problem ('syn');
+    a rule using only synonyms is satisfied by the concept or any synonym ('any')"""
+    hits = CONCEPT_MATCHER.found(rule_text)
+    keys = set()
+    for concept, synonyms in CONCEPT_MAPPINGS.items():
+        if concept in hits:
+            keys.add(('syn', concept))
+        elif any(synonym in hits for synonym in synonyms):
+            keys.add(('any', concept))
+    return frozenset(keys)
+
+def _problem_concept_keys(problem_text: str) -> FrozenSet[Tuple[str, str]]:
+    """The rule concept keys a problem text satisfies"""
+    hits = CONCEPT_MATCHER.found(problem_text)
+    keys = set()
+    for concept, synonyms in CONCEPT_MAPPINGS.items():
+        if any(synonym in hits for synonym in synonyms):
+            keys.update((('syn', concept), ('any', concept)))
+        elif concept in hits:
+            keys.add(('any', concept))
+    return frozenset(keys)
+
+def compile_rule(rule: 'SymbolicRule') -> Tuple[FrozenSet[Hashable], int]:
+    """Index features of a rule (keywords and concept keys) and its keyword count"""
+    rule_text = f"{rule.condition} {rule.conclusion}".lower()
+    keywords = _keywords(rule_text)
+    if not keywords:
+        # Rules without keywords never match, so they are not indexed
+        return frozenset(), 0
+    return keywords | _rule_concept_keys(rule_text), len(keywords)
+
+def compile_pattern(pattern: 'NeuralPattern') -> Tuple[FrozenSet[Hashable], Tuple[FrozenSet[str], Dict[str, int], int]]:
+    """Index features of a pattern, plus its feature set and how many features stand for each concept"""
+    features = frozenset(pattern.input_features + pattern.context_tags)
+    concept_counts: Dict[str, int] = defaultdict(int)
+    for feature in features:
+        for concept, synonyms in PATTERN_CONCEPT_MAPPINGS.items():
+            if feature == concept or feature in synonyms:
+                concept_counts[concept] += 1
+                break
+    index_features = features | {('concept', concept) for concept in concept_counts}
+    return index_features, (features, dict(concept_counts), sum(concept_counts.values()))
+
+def _pattern_concepts(problem_features: Set[str]) -> Set[str]:
+    """Pattern concepts present in a problem, directly or through a related feature"""
+    return {concept for concept, synonyms in PATTERN_CONCEPT_MAPPINGS.items()
+            if concept in problem_features or any(synonym in problem_features for synonym in synonyms)}
+
 
 class ReasoningMode(Enum):
     """Different reasoning approaches available."""
@@ -143,6 +242,52 @@ class HybridReasoningResult:
     success: bool = False
 
 
+NEURAL_SYMBOLIC_SCHEMA = register_schema("neural_symbolic", 1, [
+    # Neural patterns table
+    """
+        CREATE TABLE IF NOT EXISTS neural_patterns (
+            pattern_id TEXT PRIMARY KEY,
+            pattern_type TEXT,
+            input_features TEXT,
+            output_prediction TEXT,
+            confidence REAL,
+            success_rate REAL,
+            usage_count INTEGER,
+            last_used TEXT,
+            context_tags TEXT
+        )
+    """,
+    # Symbolic rules table
+    """
+        CREATE TABLE IF NOT EXISTS symbolic_rules (
+            rule_id TEXT PRIMARY KEY,
+            condition TEXT,
+            conclusion TEXT,
+            confidence REAL,
+            evidence_count INTEGER,
+            rule_type TEXT,
+            context_domain TEXT,
+            created TEXT
+        )
+    """,
+    # Reasoning episodes table
+    """
+        CREATE TABLE IF NOT EXISTS reasoning_episodes (
+            episode_id TEXT PRIMARY KEY,
+            problem TEXT,
+            approaches_used TEXT,
+            symbolic_result TEXT,
+            neural_result TEXT,
+            final_result TEXT,
+            approach_selected TEXT,
+            confidence REAL,
+            success INTEGER,
+            reasoning_time REAL,
+            timestamp TEXT
+        )
+    """,
+])
+
 class NeuralSymbolicIntegration:
     """
     Unified reasoning pipeline integrating symbolic logic with neural pattern recognition.
@@ -156,19 +301,20 @@ class NeuralSymbolicIntegration:
                  transfer_engine: CrossDomainTransferEngine = None,
                  consciousness_framework: ConsciousnessIntegrationFramework = None,
                  memory_system: AutobiographicalMemorySystem = None,
-                 value_system: ValueLearningSystem = None):
+                 value_system: ValueLearningSystem = None,
+                 db_path: Optional[str] = None):
         """Initialize the neural-symbolic integration system."""
         
-        # Integration with existing systems
-        self.reasoning_engine = reasoning_engine or AdvancedReasoningEngine()
-        self.transfer_engine = transfer_engine
+        # Integration with existing systems; engines not passed in are built on first use
+        if reasoning_engine is not None:
+            self.reasoning_engine = reasoning_engine
+        self._given_transfer_engine = transfer_engine
+        self._foundations_loaded = False
         self.consciousness_framework = consciousness_framework
         self.memory_system = memory_system
         self.value_system = value_system
         
         # Core neural-symbolic components
-        self.neural_patterns: Dict[str, NeuralPattern] = {}
-        self.symbolic_rules: Dict[str, SymbolicRule] = {}
         self.reasoning_episodes: List[ReasoningEpisode] = []
         
         # Reasoning approach selection
@@ -182,70 +328,32 @@ class NeuralSymbolicIntegration:
         self.pattern_weights: Dict[str, float] = {}
         self.rule_strengths: Dict[str, float] = {}
         
-        # Database for persistence
-        self.db_path = "marcus_neural_symbolic.db"
-        self.setup_database()
-        
-        # Initialize with foundational patterns and rules
-        self._initialize_foundational_systems()
+        # Shared state database for persistence; the schema is applied on first save
+        self.db_path = db_path or state_db_path()
         
         logger.info("🧠 Neural-Symbolic Integration System initialized")
 
+    def __getattr__(self, name: str):
+        """Build the reasoning engine and foundational patterns and rules on first use"""
+        if name == 'reasoning_engine':
+            self.reasoning_engine = AdvancedReasoningEngine()
+            return self.reasoning_engine
+        if name in FOUNDATION_ATTRIBUTES and not self.__dict__.get('_foundations_loaded', True):
+            self._foundations_loaded = True
+            self._initialize_foundational_systems()
+            return getattr(self, name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
     def setup_database(self):
         """Set up the neural-symbolic reasoning database schema."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Neural patterns table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS neural_patterns (
-                    pattern_id TEXT PRIMARY KEY,
-                    pattern_type TEXT,
-                    input_features TEXT,
-                    output_prediction TEXT,
-                    confidence REAL,
-                    success_rate REAL,
-                    usage_count INTEGER,
-                    last_used TEXT,
-                    context_tags TEXT
-                )
-            """)
-            
-            # Symbolic rules table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS symbolic_rules (
-                    rule_id TEXT PRIMARY KEY,
-                    condition TEXT,
-                    conclusion TEXT,
-                    confidence REAL,
-                    evidence_count INTEGER,
-                    rule_type TEXT,
-                    context_domain TEXT,
-                    created TEXT
-                )
-            """)
-            
-            # Reasoning episodes table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS reasoning_episodes (
-                    episode_id TEXT PRIMARY KEY,
-                    problem TEXT,
-                    approaches_used TEXT,
-                    symbolic_result TEXT,
-                    neural_result TEXT,
-                    final_result TEXT,
-                    approach_selected TEXT,
-                    confidence REAL,
-                    success INTEGER,
-                    reasoning_time REAL,
-                    timestamp TEXT
-                )
-            """)
-            
-            conn.commit()
+        return ensure_schema(self.db_path, NEURAL_SYMBOLIC_SCHEMA)
 
     def _initialize_foundational_systems(self):
         """Initialize foundational neural patterns and symbolic rules."""
+        # Compiled on insertion and indexed by keyword and concept
+        self.neural_patterns: Dict[str, NeuralPattern] = FeatureIndex(compile_pattern)
+        self.symbolic_rules: Dict[str, SymbolicRule] = FeatureIndex(compile_rule)
+        self.transfer_engine = self._given_transfer_engine
         
         # Initialize symbolic rules from existing causal relations
         if self.reasoning_engine and hasattr(self.reasoning_engine, 'causal_relations'):
@@ -464,10 +572,7 @@ class NeuralSymbolicIntegration:
         problem_goal = problem.get('goal', '')
         
         # Find relevant symbolic rules
-        relevant_rules = []
-        for rule_id, rule in self.symbolic_rules.items():
-            if self._rule_matches_problem(rule, problem_description, problem_goal):
-                relevant_rules.append(rule)
+        relevant_rules = self._matching_rules(problem_description, problem_goal)
         
         # Sort by confidence and evidence
         relevant_rules.sort(key=lambda r: (r.confidence * r.evidence_count), reverse=True)
@@ -511,11 +616,7 @@ class NeuralSymbolicIntegration:
         problem_features = self._extract_problem_features(problem_description, problem_goal, context)
         
         # Find matching neural patterns
-        pattern_matches = []
-        for pattern_id, pattern in self.neural_patterns.items():
-            match_score = self._calculate_pattern_match(pattern, problem_features)
-            if match_score > 0.3:  # Threshold for pattern relevance
-                pattern_matches.append((pattern, match_score))
+        pattern_matches = self._matching_patterns(problem_features)
         
         # Sort by match score and success rate
         pattern_matches.sort(key=lambda x: x[1] * x[0].success_rate, reverse=True)
@@ -708,50 +809,34 @@ class NeuralSymbolicIntegration:
 
     def _rule_matches_problem(self, rule: SymbolicRule, problem_description: str, problem_goal: str) -> bool:
         """Check if a symbolic rule is relevant to the current problem."""
-        
-        # Enhanced keyword matching with semantic understanding
+        _, keyword_count = compile_rule(rule)
         rule_text = f"{rule.condition} {rule.conclusion}".lower()
         problem_text = f"{problem_description} {problem_goal}".lower()
         
-        # Extract meaningful keywords (exclude common words)
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had'}
-        
-        rule_keywords = set(word for word in re.findall(r'\w+', rule_text) if len(word) > 2 and word not in stop_words)
-        problem_keywords = set(word for word in re.findall(r'\w+', problem_text) if len(word) > 2 and word not in stop_words)
-        
-        # Calculate keyword overlap
-        overlap = len(rule_keywords & problem_keywords)
-        
-        # Enhanced semantic matching
-        semantic_matches = 0
-        
-        # Check for conceptual matches
-        concept_mappings = {
-            'creative': ['innovative', 'new', 'alternative', 'brainstorm', 'novel'],
-            'physical': ['move', 'force', 'object', 'weight', 'space', 'lift'],
-            'moral': ['ethical', 'right', 'wrong', 'should', 'help', 'fair'],
-            'logical': ['prove', 'because', 'therefore', 'if', 'then', 'logic'],
-            'social': ['friend', 'person', 'relationship', 'collaborate', 'help'],
-            'helping': ['assist', 'support', 'aid', 'help', 'cooperate'],
-            'problem': ['challenge', 'issue', 'difficulty', 'solve', 'solution']
-        }
-        
-        for concept, synonyms in concept_mappings.items():
-            if concept in rule_text:
-                if any(syn in problem_text for syn in synonyms):
-                    semantic_matches += 1
-            elif any(syn in rule_text for syn in synonyms):
-                if concept in problem_text or any(syn2 in problem_text for syn2 in synonyms):
-                    semantic_matches += 1
-        
-        # Calculate combined score
-        if rule_keywords:
-            overlap_ratio = overlap / len(rule_keywords)
-            semantic_ratio = semantic_matches / max(len(concept_mappings), 1)
-            combined_score = (overlap_ratio * 0.7) + (semantic_ratio * 0.3)
-            return combined_score > 0.15  # Lower threshold for better matching
-        
-        return False
+        overlap = len(_keywords(rule_text) & _keywords(problem_text))
+        semantic_matches = len(_rule_concept_keys(rule_text) & _problem_concept_keys(problem_text))
+        return self._rule_score(keyword_count, overlap, semantic_matches) > RULE_MATCH_THRESHOLD
+    
+    def _matching_rules(self, problem_description: str, problem_goal: str) -> List[SymbolicRule]:
+        """Relevant rules in insertion order, scoring only rules that share a keyword or concept."""
+        problem_text = f"{problem_description} {problem_goal}".lower()
+        rules = self.symbolic_rules
+        overlaps = rules.shared_counts(_keywords(problem_text))
+        semantic = rules.shared_counts(_problem_concept_keys(problem_text))
+        
+        matching = [rule_id for rule_id in set(overlaps) | set(semantic)
+                    if self._rule_score(rules.compiled(rule_id), overlaps.get(rule_id, 0),
+                                        semantic.get(rule_id, 0)) > RULE_MATCH_THRESHOLD]
+        return [rules[rule_id] for rule_id in rules.in_order(matching)]
+    
+    @staticmethod
+    def _rule_score(keyword_count: int, overlap: int, semantic_matches: int) -> float:
+        """Keyword overlap ratio blended with the share of concepts matched."""
+        if not keyword_count:
+            return 0.0
+        overlap_ratio = overlap / keyword_count
+        semantic_ratio = semantic_matches / max(len(CONCEPT_MAPPINGS), 1)
+        return (overlap_ratio * 0.7) + (semantic_ratio * 0.3)
 
     def _extract_problem_features(self, problem_description: str, problem_goal: str, context: Dict[str, Any] = None) -> List[str]:
         """Extract features from problem for neural pattern matching."""
@@ -774,43 +859,41 @@ class NeuralSymbolicIntegration:
 
     def _calculate_pattern_match(self, pattern: NeuralPattern, problem_features: List[str]) -> float:
         """Calculate how well a neural pattern matches the current problem."""
-        
-        # Enhanced pattern matching with semantic understanding
-        pattern_features = set(pattern.input_features + pattern.context_tags)
         problem_feature_set = set(problem_features)
-        
+        _, compiled = compile_pattern(pattern)
+        return self._pattern_score(pattern, compiled, problem_feature_set, _pattern_concepts(problem_feature_set))
+    
+    def _matching_patterns(self, problem_features: List[str]) -> List[Tuple[NeuralPattern, float]]:
+        """(pattern, score) for relevant patterns in insertion order, scoring only patterns sharing a feature."""
+        patterns = self.neural_patterns
+        problem_feature_set = set(problem_features)
+        problem_concepts = _pattern_concepts(problem_feature_set)
+        candidates = patterns.shared_counts(
+            itertools.chain(problem_feature_set, (('concept', concept) for concept in problem_concepts)))
+        
+        matches = []
+        for pattern_id in patterns.in_order(candidates):
+            pattern = patterns[pattern_id]
+            score = self._pattern_score(pattern, patterns.compiled(pattern_id), problem_feature_set, problem_concepts)
+            if score > PATTERN_MATCH_THRESHOLD:
+                matches.append((pattern, score))
+        return matches
+    
+    @staticmethod
+    def _pattern_score(pattern: NeuralPattern, compiled: Tuple[FrozenSet[str], Dict[str, int], int],
+                       problem_feature_set: Set[str], problem_concepts: Set[str]) -> float:
+        """Direct and semantic feature overlap, boosted by the pattern's track record."""
+        pattern_features, concept_counts, total_concepts = compiled
         if not pattern_features:
             return 0.0
         
         # Direct feature overlap
-        direct_overlap = len(pattern_features & problem_feature_set)
-        direct_score = direct_overlap / len(pattern_features)
+        direct_score = len(pattern_features & problem_feature_set) / len(pattern_features)
         
-        # Semantic similarity matching
+        # Semantic similarity: features whose concept shows up in the problem
         semantic_score = 0.0
-        semantic_mappings = {
-            'creative': ['innovative', 'new', 'alternative', 'brainstorm', 'novel', 'original'],
-            'physical': ['move', 'force', 'object', 'weight', 'space', 'lift', 'heavy'],
-            'moral': ['ethical', 'right', 'wrong', 'should', 'help', 'fair', 'good'],
-            'logical': ['prove', 'because', 'therefore', 'if', 'then', 'logic', 'reason'],
-            'social': ['friend', 'person', 'relationship', 'collaborate', 'help', 'people'],
-            'learning': ['understand', 'study', 'practice', 'knowledge', 'skill', 'concept'],
-            'problem_solving': ['solve', 'solution', 'challenge', 'issue', 'difficulty', 'approach']
-        }
-        
-        # Check for semantic matches
-        semantic_matches = 0
-        total_concepts = 0
-        
-        for pattern_feature in pattern_features:
-            for concept, synonyms in semantic_mappings.items():
-                if pattern_feature == concept or pattern_feature in synonyms:
-                    total_concepts += 1
-                    if any(syn in problem_feature_set for syn in synonyms) or concept in problem_feature_set:
-                        semantic_matches += 1
-                    break
-        
         if total_concepts > 0:
+            semantic_matches = sum(count for concept, count in concept_counts.items() if concept in problem_concepts)
             semantic_score = semantic_matches / total_concepts
         
         # Combine direct and semantic scores
@@ -820,9 +903,7 @@ class NeuralSymbolicIntegration:
         success_boost = pattern.success_rate * 0.2
         usage_boost = min(pattern.usage_count / 10.0, 0.1)  # Small boost for experience
         
-        final_score = min(combined_score + success_boost + usage_boost, 1.0)
-        
-        return final_score
+        return min(combined_score + success_boost + usage_boost, 1.0)
 
     def _update_performance_metrics(self, approach: ReasoningMode, result: Dict[str, Any]):
         """Update performance metrics for reasoning approaches."""
@@ -986,7 +1067,8 @@ class NeuralSymbolicIntegration:
 
     def save_to_database(self):
         """Save current state to database."""
-        with sqlite3.connect(self.db_path) as conn:
+        self.setup_database()
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             
             # Save neural patterns
@@ -1027,7 +1109,6 @@ class NeuralSymbolicIntegration:
                     int(episode.success), episode.reasoning_time, episode.timestamp.isoformat()
                 ))
             
-            conn.commit()
 
 
 def demonstrate_neural_symbolic_integration():
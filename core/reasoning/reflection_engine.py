@@ -4,7 +4,6 @@ Fixes the failing tests and provides a working spaced repetition system
 """
 
 import json
-import sqlite3
 from datetime import datetime, timedelta
 from enum import Enum
 from dataclasses import dataclass
@@ -12,6 +11,13 @@ from typing import Dict, List, Optional, Tuple
 import math
 import random
 
+from core.memory.sm2_scheduler import SM2Scheduler, SM2Policy
+from core.memory.learners import DEFAULT_LEARNER_ID
+from core.memory.memory_system import MEMORY_SCHEMA
+from core.memory.connection_manager import get_connection_manager
+from core.memory.due_queue import sync_due_queue
+from core.memory.state_store import ensure_schema
+
 class MasteryLevel(Enum):
     """Knowledge mastery levels for spaced repetition"""
     UNKNOWN = 0      # Never seen before
@@ -73,8 +79,11 @@ class RetentionEngine:
     Implements SuperMemo-inspired algorithm adapted for child development
     """
     
-    def __init__(self, db_path: str = "marcus_memory.db"):
+    def __init__(self, db_path: str = "marcus_memory.db", learner_id: str = DEFAULT_LEARNER_ID):
         self.db_path = db_path
+        self.learner_id = learner_id
+        # Pooled connections shared with MarcusMemorySystem on the same db_path
+        self.connections = get_connection_manager(self.db_path)
         self.init_database()
         
         # Algorithm parameters tuned for kindergarten learning
@@ -91,41 +100,24 @@ class RetentionEngine:
             2: 3,    # Good: review in 3 days
             3: 7     # Easy: review in a week
         }
+        
+        # SM-2 engine on the 0-3 performance scale, with jittered intervals to avoid review bunching
+        self.scheduler = SM2Scheduler(SM2Policy(
+            max_quality=3,
+            pass_threshold=2,
+            min_ease=self.minimum_ease,
+            max_ease=self.maximum_ease,
+            fail_ease_penalty=self.ease_penalty,
+            reset_repetitions_on_fail=False,
+            first_intervals=tuple(self.initial_intervals[p] for p in range(4)),
+            interval_jitter=0.1,
+            max_mastery=MasteryLevel.MASTERED.value
+        ))
     
     def init_database(self):
         """Initialize SQLite database for persistent storage"""
-        conn = sqlite3.connect(self.db_path)
-        
-        # Create concepts table
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS concepts (
-                id TEXT PRIMARY KEY,
-                content TEXT NOT NULL,
-                subject TEXT NOT NULL,
-                grade_level TEXT NOT NULL,
-                emotional_context TEXT,
-                created_at TEXT NOT NULL
-            )
-        ''')
-        
-        # Create memory records table
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS memory_records (
-                concept_id TEXT PRIMARY KEY,
-                mastery_level INTEGER NOT NULL,
-                ease_factor REAL NOT NULL,
-                interval_days INTEGER NOT NULL,
-                repetitions INTEGER NOT NULL,
-                last_reviewed TEXT NOT NULL,
-                next_review TEXT NOT NULL,
-                success_streak INTEGER NOT NULL,
-                total_attempts INTEGER NOT NULL,
-                FOREIGN KEY (concept_id) REFERENCES concepts (id)
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        # Same learner-partitioned tables as MarcusMemorySystem, so both can share a database
+        ensure_schema(self.db_path, MEMORY_SCHEMA)
     
     def learn_new_concept(self, content: str, subject: str, 
                          grade_level: str = "K", emotional_context: str = "neutral") -> Tuple[MemoryRecord, LearningConcept]:
@@ -170,22 +162,20 @@ class RetentionEngine:
         if current_time is None:
             current_time = datetime.now()
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Query concepts due for review
-        cursor.execute('''
-            SELECT c.id, c.content, c.subject, c.grade_level, c.emotional_context, c.created_at,
-                   m.mastery_level, m.ease_factor, m.interval_days, m.repetitions,
-                   m.last_reviewed, m.next_review, m.success_streak, m.total_attempts
-            FROM concepts c
-            JOIN memory_records m ON c.id = m.concept_id
-            WHERE datetime(m.next_review) <= datetime(?)
-            ORDER BY datetime(m.next_review) ASC
-        ''', (current_time.isoformat(),))
+        with self.connections.transaction() as conn:
+            # Query concepts due for review
+            rows = conn.execute('''
+                SELECT c.id, c.content, c.subject, c.grade_level, c.emotional_context, c.created_at,
+                       m.mastery_level, m.ease_factor, m.interval_days, m.repetitions,
+                       m.last_reviewed, m.next_review, m.success_streak, m.total_attempts
+                FROM concepts c
+                JOIN memory_records m ON c.learner_id = m.learner_id AND c.id = m.concept_id
+                WHERE m.learner_id = ? AND m.next_review_ts <= ?
+                ORDER BY m.next_review_ts ASC
+            ''', (self.learner_id, int(current_time.timestamp()))).fetchall()
         
         results = []
-        for row in cursor.fetchall():
+        for row in rows:
             concept = LearningConcept(
                 id=row[0],
                 content=row[1],
@@ -209,7 +199,6 @@ class RetentionEngine:
             
             results.append((concept, memory))
         
-        conn.close()
         return results
     
     def review_concept(self, concept_id: str, performance: int) -> Tuple[MemoryRecord, bool]:
@@ -235,25 +224,27 @@ class RetentionEngine:
         memory.total_attempts += 1
         success = performance >= 2  # Good or Easy
         
-        if success:
-            memory.success_streak += 1
-        else:
-            memory.success_streak = 0
+        # Calculate new streak, ease factor, interval and repetitions
+        scheduled = self.scheduler.schedule_one(
+            ease_factor=memory.ease_factor,
+            interval_days=memory.interval_days,
+            repetitions=memory.repetitions,
+            quality=performance,
+            success_streak=memory.success_streak
+        )
+        memory.success_streak = scheduled['success_streak']
         
         # Update mastery level based on performance and history
         memory.mastery_level = self._calculate_new_mastery_level(memory, performance)
         
-        # Calculate new ease factor
-        memory.ease_factor = self._calculate_new_ease_factor(memory.ease_factor, performance)
-        
-        # Calculate new interval
-        memory.interval_days = self._calculate_new_interval(memory, performance)
+        memory.ease_factor = scheduled['ease_factor']
+        memory.interval_days = scheduled['interval_days']
         
         # Update timing
         now = datetime.now()
         memory.last_reviewed = now
         memory.next_review = now + timedelta(days=memory.interval_days)
-        memory.repetitions += 1
+        memory.repetitions = scheduled['repetitions']
         
         # Save updated record
         self._save_memory_record(memory)
@@ -289,35 +280,6 @@ class RetentionEngine:
         
         return MasteryLevel(new_level)
     
-    def _calculate_new_ease_factor(self, current_ease: float, performance: int) -> float:
-        """Calculate new ease factor using SuperMemo algorithm"""
-        if performance >= 2:  # Good or Easy
-            new_ease = current_ease + (0.1 - (3 - performance) * (0.08 + (3 - performance) * 0.02))
-        else:  # Failed or Hard
-            new_ease = current_ease - self.ease_penalty
-        
-        # Clamp to reasonable bounds
-        return max(self.minimum_ease, min(self.maximum_ease, new_ease))
-    
-    def _calculate_new_interval(self, memory: MemoryRecord, performance: int) -> int:
-        """Calculate next review interval"""
-        if memory.repetitions == 0:
-            # First review
-            return self.initial_intervals[performance]
-        elif performance < 2:
-            # Failed or hard - reset to short interval
-            return 1
-        else:
-            # Good or easy - use spaced repetition formula
-            if memory.repetitions == 1:
-                interval = 6  # Second review after ~6 days
-            else:
-                interval = memory.interval_days * memory.ease_factor
-            
-            # Add some randomness to avoid review bunching
-            jitter = random.uniform(0.9, 1.1)
-            return max(1, int(interval * jitter))
-    
     def study_session(self, max_reviews: int = 10, current_time: Optional[datetime] = None) -> List[Tuple[LearningConcept, bool, MasteryLevel]]:
         """Conduct a study session with multiple concept reviews"""
         if current_time is None:
@@ -369,30 +331,29 @@ class RetentionEngine:
     
     def get_concept_statistics(self) -> Dict:
         """Get statistics about Marcus's learning progress"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Count concepts by mastery level
-        cursor.execute('''
-            SELECT mastery_level, COUNT(*) 
-            FROM memory_records 
-            GROUP BY mastery_level
-        ''')
-        mastery_counts = {MasteryLevel(level): count for level, count in cursor.fetchall()}
-        
-        # Get total concepts
-        cursor.execute('SELECT COUNT(*) FROM concepts')
-        total_concepts = cursor.fetchone()[0]
-        
-        # Get due concepts
-        cursor.execute('''
-            SELECT COUNT(*) 
-            FROM memory_records 
-            WHERE datetime(next_review) <= datetime('now')
-        ''')
-        due_concepts = cursor.fetchone()[0]
-        
-        conn.close()
+        with self.connections.transaction() as conn:
+            cursor = conn.cursor()
+            
+            # Count concepts by mastery level
+            cursor.execute('''
+                SELECT mastery_level, COUNT(*) 
+                FROM memory_records 
+                WHERE learner_id = ?
+                GROUP BY mastery_level
+            ''', (self.learner_id,))
+            mastery_counts = {MasteryLevel(level): count for level, count in cursor.fetchall()}
+            
+            # Get total concepts
+            cursor.execute('SELECT COUNT(*) FROM concepts WHERE learner_id = ?', (self.learner_id,))
+            total_concepts = cursor.fetchone()[0]
+            
+            # Get due concepts
+            cursor.execute('''
+                SELECT COUNT(*) 
+                FROM memory_records 
+                WHERE learner_id = ? AND next_review_ts <= ?
+            ''', (self.learner_id, int(datetime.now().timestamp())))
+            due_concepts = cursor.fetchone()[0]
         
         return {
             'total_concepts': total_concepts,
@@ -403,58 +364,49 @@ class RetentionEngine:
     
     def _calculate_average_success_rate(self) -> float:
         """Calculate Marcus's overall success rate"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT AVG(CAST(success_streak AS FLOAT) / CAST(total_attempts AS FLOAT))
-            FROM memory_records 
-            WHERE total_attempts > 0
-        ''')
-        result = cursor.fetchone()[0]
-        conn.close()
+        with self.connections.transaction() as conn:
+            result = conn.execute('''
+                SELECT AVG(CAST(success_streak AS FLOAT) / CAST(total_attempts AS FLOAT))
+                FROM memory_records 
+                WHERE learner_id = ? AND total_attempts > 0
+            ''', (self.learner_id,)).fetchone()[0]
         
         return result if result else 0.0
     
     def _save_concept(self, concept: LearningConcept):
         """Save concept to database"""
-        conn = sqlite3.connect(self.db_path)
-        conn.execute('''
-            INSERT OR REPLACE INTO concepts 
-            (id, content, subject, grade_level, emotional_context, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (concept.id, concept.content, concept.subject, 
-              concept.grade_level, concept.emotional_context, concept.created_at.isoformat()))
-        conn.commit()
-        conn.close()
+        with self.connections.transaction() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO concepts 
+                (learner_id, id, content, subject, grade_level, emotional_context, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (self.learner_id, concept.id, concept.content, concept.subject, 
+                  concept.grade_level, concept.emotional_context, concept.created_at.isoformat()))
     
     def _save_memory_record(self, memory: MemoryRecord):
         """Save memory record to database"""
-        conn = sqlite3.connect(self.db_path)
-        conn.execute('''
-            INSERT OR REPLACE INTO memory_records 
-            (concept_id, mastery_level, ease_factor, interval_days, repetitions,
-             last_reviewed, next_review, success_streak, total_attempts)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (memory.concept_id, memory.mastery_level.value, memory.ease_factor,
-              memory.interval_days, memory.repetitions, memory.last_reviewed.isoformat(),
-              memory.next_review.isoformat(), memory.success_streak, memory.total_attempts))
-        conn.commit()
-        conn.close()
+        next_review_ts = int(memory.next_review.timestamp())
+        with self.connections.transaction() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO memory_records 
+                (learner_id, concept_id, mastery_level, ease_factor, interval_days, repetitions,
+                 last_reviewed, next_review, next_review_ts, success_streak, total_attempts)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (self.learner_id, memory.concept_id, memory.mastery_level.value, memory.ease_factor,
+                  memory.interval_days, memory.repetitions, memory.last_reviewed.isoformat(),
+                  memory.next_review.isoformat(), next_review_ts,
+                  memory.success_streak, memory.total_attempts))
+            # Keep MarcusMemorySystem's due queue for this learner in step
+            sync_due_queue(self.connections, self.learner_id, [(memory.concept_id, next_review_ts)])
     
     def _load_memory_record(self, concept_id: str) -> Optional[MemoryRecord]:
         """Load memory record from database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT concept_id, mastery_level, ease_factor, interval_days, repetitions,
-                   last_reviewed, next_review, success_streak, total_attempts
-            FROM memory_records WHERE concept_id = ?
-        ''', (concept_id,))
-        
-        row = cursor.fetchone()
-        conn.close()
+        with self.connections.transaction() as conn:
+            row = conn.execute('''
+                SELECT concept_id, mastery_level, ease_factor, interval_days, repetitions,
+                       last_reviewed, next_review, success_streak, total_attempts
+                FROM memory_records WHERE learner_id = ? AND concept_id = ?
+            ''', (self.learner_id, concept_id)).fetchone()
         
         if not row:
             return None
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Marcus Rule Index - Compiled feature index for rules and patterns
+
+A ``FeatureIndex`` behaves like the ``{id: rule}`` dict it replaces, but
+compiles each item once when it is stored: a compile function returns the
+item's features (keywords, concept keys, ...) and any cached data its scorer
+needs. An inverted index from feature to item ids then answers "which items
+share a feature with this problem, and how many" by walking only the
+postings of the problem's own features.
+
+Items are compiled when assigned; mutate an item in place and assign it
+again to re-index it.
+"""
+
+import itertools
+from collections import defaultdict
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, Iterator, List, MutableMapping, Set, Tuple
+
+Compiler = Callable[[Any], Tuple[Iterable[Hashable], Any]]
+
+class FeatureIndex(MutableMapping):
+    """Mapping of id -> item with an inverted index from compiled features to ids"""
+
+    def __init__(self, compile_item: Compiler, items: Dict[str, Any] = None):
+        self.compile_item = compile_item
+        self._items: Dict[str, Any] = {}
+        self._compiled: Dict[str, Any] = {}
+        self._features: Dict[str, FrozenSet[Hashable]] = {}
+        self._postings: Dict[Hashable, Set[str]] = defaultdict(set)
+        # Insertion rank, so candidates come back in the dict's iteration order
+        self._position: Dict[str, int] = {}
+        self._counter = itertools.count()
+        if items:
+            self.update(items)
+
+    # Mapping protocol
+
+    def __getitem__(self, key: str) -> Any:
+        return self._items[key]
+
+    def __setitem__(self, key: str, item: Any):
+        if key in self._items:
+            self._unindex(key)
+        else:
+            self._position[key] = next(self._counter)
+        features, compiled = self.compile_item(item)
+        features = frozenset(features)
+        self._items[key] = item
+        self._compiled[key] = compiled
+        self._features[key] = features
+        for feature in features:
+            self._postings[feature].add(key)
+
+    def __delitem__(self, key: str):
+        self._unindex(key)
+        del self._items[key], self._compiled[key], self._features[key], self._position[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._items
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} items, {len(self._postings)} features)"
+
+    def _unindex(self, key: str):
+        for feature in self._features[key]:
+            postings = self._postings[feature]
+            postings.discard(key)
+            if not postings:
+                del self._postings[feature]
+
+    # Queries
+
+    def compiled(self, key: str) -> Any:
+        """Data the compile function cached for ``key``"""
+        return self._compiled[key]
+
+    def shared_counts(self, features: Iterable[Hashable]) -> Dict[str, int]:
+        """Number of the given features each item shares; items sharing none are absent"""
+        counts: Dict[str, int] = defaultdict(int)
+        postings = self._postings
+        for feature in set(features):
+            for key in postings.get(feature, ()):
+                counts[key] += 1
+        return counts
+
+    def in_order(self, keys: Iterable[str]) -> List[str]:
+        """``keys`` sorted by insertion order"""
+        return sorted(keys, key=self._position.__getitem__)
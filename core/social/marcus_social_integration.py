@@ -24,6 +24,8 @@ from .peer_interaction_simulation import (
     create_peer_interaction_system, PeerInteractionSimulator,
     InteractionContext, ConversationTopic, SocialSkillArea
 )
+from ..memory.learners import DEFAULT_LEARNER_ID
+from ..memory.state_store import state_db_path
 
 try:
     from ..learning.daily_learning_loop import run_learning_session, calculate_mastery_levels
@@ -85,17 +87,18 @@ class IntegratedLearningSession:
 class MarcusSocialLearningIntegration:
     """Main integration class for social learning across all systems"""
     
-    def __init__(self, db_path: str = "marcus_integrated_learning.db"):
+    def __init__(self, db_path: Optional[str] = None, learner_id: str = DEFAULT_LEARNER_ID):
         """Initialize the integrated social learning system"""
-        self.db_path = db_path
+        self.db_path = db_path or state_db_path()
+        self.learner_id = learner_id
         
         # Initialize peer interaction system
-        self.peer_system = create_peer_interaction_system()
+        self.peer_system = create_peer_interaction_system(db_path=self.db_path, learner_id=learner_id)
         logger.info("Peer Interaction System initialized")
         
         # Initialize other systems if available
         self.eq_system = EmotionalIntelligenceAssessment() if EQ_SYSTEM_AVAILABLE else None
-        self.grade_system = GradeProgressionSystem() if GRADE_SYSTEM_AVAILABLE else None
+        self.grade_system = GradeProgressionSystem(learner_id=learner_id) if GRADE_SYSTEM_AVAILABLE else None
         
         # Social learning configuration
         self.social_learning_config = {
@@ -198,12 +201,14 @@ class MarcusSocialLearningIntegration:
         # Run base academic session if available
         if DAILY_LOOP_AVAILABLE:
             try:
-                from ..learning.daily_learning_loop import load_all_sessions
-                session_history = load_all_sessions()
-                if not session_history:
-                    session_history = [{"date": session_date.strftime("%Y-%m-%d"), "mastery_levels": {}}]
+                from ..learning.daily_learning_loop import get_session_store
+                session_store = get_session_store()
+                today = session_date.strftime("%Y-%m-%d")
+                session_history = [{"date": today, "mastery_levels": {}}]
                 
-                academic_session = run_learning_session(session_history, session_date.strftime("%Y-%m-%d"))
+                academic_session = run_learning_session(session_history, today,
+                                                        due_reviews=session_store.get_due_reviews(today),
+                                                        aggregate=session_store.aggregate)
                 academic_results["subjects_covered"] = academic_session.get("concepts_learned", [])
             except Exception as e:
                 logger.warning(f"Could not run academic session: {e}")
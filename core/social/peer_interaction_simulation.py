@@ -22,7 +22,6 @@ Integration Points:
 
 import random
 import json
-import sqlite3
 import logging
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
@@ -30,6 +29,9 @@ from datetime import datetime, timedelta
 from enum import Enum
 import uuid
 
+from ..memory.learners import DEFAULT_LEARNER_ID
+from ..memory.state_store import register_schema, ensure_schema, state_transaction, state_db_path
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -181,11 +183,71 @@ class CollaborativeLearningActivity:
     differentiation_strategies: Dict[str, List[str]]  # personality_type -> strategies
     assessment_rubric: Dict[str, List[str]]  # skill -> indicators
 
+PEER_INTERACTION_SCHEMA = register_schema("peer_interaction", 1, [
+    # Peer interaction sessions table
+    """
+        CREATE TABLE IF NOT EXISTS peer_interaction_sessions (
+            session_id TEXT PRIMARY KEY,
+            marcus_id TEXT NOT NULL DEFAULT 'marcus',
+            peers_involved TEXT NOT NULL,  -- JSON list
+            context TEXT NOT NULL,
+            topic TEXT NOT NULL,
+            duration_minutes INTEGER NOT NULL,
+            conversation_data TEXT NOT NULL,  -- JSON
+            social_skills_practiced TEXT NOT NULL,  -- JSON list
+            learning_objectives_met TEXT NOT NULL,  -- JSON list
+            conflicts_resolved INTEGER DEFAULT 0,
+            collaboration_successes INTEGER DEFAULT 0,
+            overall_success_rating REAL NOT NULL,
+            marcus_growth_areas TEXT NOT NULL,  -- JSON list
+            peer_feedback TEXT,  -- JSON
+            session_timestamp TEXT NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    # Peer relationships tracking
+    """
+        CREATE TABLE IF NOT EXISTS peer_relationships (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            marcus_id TEXT NOT NULL DEFAULT 'marcus',
+            peer_id TEXT NOT NULL,
+            relationship_strength REAL DEFAULT 0.5,  -- 0-1 scale
+            interaction_count INTEGER DEFAULT 0,
+            positive_interactions INTEGER DEFAULT 0,
+            conflicts_resolved INTEGER DEFAULT 0,
+            collaboration_history TEXT,  -- JSON
+            last_interaction_date TEXT,
+            relationship_notes TEXT,
+            UNIQUE(marcus_id, peer_id)
+        )
+    """,
+    # Social skills progress tracking
+    """
+        CREATE TABLE IF NOT EXISTS social_skills_progress (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            marcus_id TEXT NOT NULL DEFAULT 'marcus',
+            skill_area TEXT NOT NULL,
+            current_level REAL NOT NULL,  -- 0-1 scale
+            practice_count INTEGER DEFAULT 0,
+            successful_demonstrations INTEGER DEFAULT 0,
+            last_practiced DATE,
+            progress_notes TEXT,
+            UNIQUE(marcus_id, skill_area)
+        )
+    """,
+    # Relationships and skills are already keyed by learner through their UNIQUE constraints
+    """
+        CREATE INDEX IF NOT EXISTS idx_peer_sessions_learner_timestamp
+        ON peer_interaction_sessions(marcus_id, session_timestamp)
+    """,
+])
+
 class PeerInteractionSimulator:
     """Core simulation engine for peer interactions"""
     
-    def __init__(self, db_path: str = "peer_interactions.db"):
-        self.db_path = db_path
+    def __init__(self, db_path: Optional[str] = None, learner_id: str = DEFAULT_LEARNER_ID):
+        self.db_path = db_path or state_db_path()
+        self.learner_id = learner_id  # stored in the marcus_id columns
         self.peers = {}  # peer_id -> PeerPersonality
         self.collaborative_activities = {}  # activity_id -> CollaborativeLearningActivity
         self.conversation_engine = ConversationEngine()
@@ -202,64 +264,7 @@ class PeerInteractionSimulator:
     
     def _init_database(self):
         """Initialize database for tracking peer interactions"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Peer interaction sessions table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS peer_interaction_sessions (
-                    session_id TEXT PRIMARY KEY,
-                    marcus_id TEXT NOT NULL DEFAULT 'marcus',
-                    peers_involved TEXT NOT NULL,  -- JSON list
-                    context TEXT NOT NULL,
-                    topic TEXT NOT NULL,
-                    duration_minutes INTEGER NOT NULL,
-                    conversation_data TEXT NOT NULL,  -- JSON
-                    social_skills_practiced TEXT NOT NULL,  -- JSON list
-                    learning_objectives_met TEXT NOT NULL,  -- JSON list
-                    conflicts_resolved INTEGER DEFAULT 0,
-                    collaboration_successes INTEGER DEFAULT 0,
-                    overall_success_rating REAL NOT NULL,
-                    marcus_growth_areas TEXT NOT NULL,  -- JSON list
-                    peer_feedback TEXT,  -- JSON
-                    session_timestamp TEXT NOT NULL,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Peer relationships tracking
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS peer_relationships (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    marcus_id TEXT NOT NULL DEFAULT 'marcus',
-                    peer_id TEXT NOT NULL,
-                    relationship_strength REAL DEFAULT 0.5,  -- 0-1 scale
-                    interaction_count INTEGER DEFAULT 0,
-                    positive_interactions INTEGER DEFAULT 0,
-                    conflicts_resolved INTEGER DEFAULT 0,
-                    collaboration_history TEXT,  -- JSON
-                    last_interaction_date TEXT,
-                    relationship_notes TEXT,
-                    UNIQUE(marcus_id, peer_id)
-                )
-            """)
-            
-            # Social skills progress tracking
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS social_skills_progress (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    marcus_id TEXT NOT NULL DEFAULT 'marcus',
-                    skill_area TEXT NOT NULL,
-                    current_level REAL NOT NULL,  -- 0-1 scale
-                    practice_count INTEGER DEFAULT 0,
-                    successful_demonstrations INTEGER DEFAULT 0,
-                    last_practiced DATE,
-                    progress_notes TEXT,
-                    UNIQUE(marcus_id, skill_area)
-                )
-            """)
-            
-            conn.commit()
+        return ensure_schema(self.db_path, PEER_INTERACTION_SCHEMA)
     
     def _create_peer_personalities(self):
         """Create diverse peer personalities for interactions"""
@@ -569,7 +574,7 @@ class PeerInteractionSimulator:
         # Create session object
         session = PeerInteractionSession(
             session_id=session_id,
-            marcus_id="marcus",
+            marcus_id=self.learner_id,
             peers_involved=[peer.id for peer in selected_peers],
             context=context,
             topic=topic,
@@ -646,7 +651,7 @@ class PeerInteractionSimulator:
     def get_peer_relationship_status(self, peer_id: str) -> Dict[str, Any]:
         """Get current relationship status with a specific peer"""
         
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT relationship_strength, interaction_count, positive_interactions,
@@ -654,7 +659,7 @@ class PeerInteractionSimulator:
                        relationship_notes
                 FROM peer_relationships
                 WHERE marcus_id = ? AND peer_id = ?
-            """, ("marcus", peer_id))
+            """, (self.learner_id, peer_id))
             
             row = cursor.fetchone()
             if not row:
@@ -680,14 +685,14 @@ class PeerInteractionSimulator:
     def get_social_skills_progress(self) -> Dict[str, Any]:
         """Get Marcus's current social skills progress"""
         
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT skill_area, current_level, practice_count,
                        successful_demonstrations, last_practiced, progress_notes
                 FROM social_skills_progress
                 WHERE marcus_id = ?
-            """, ("marcus",))
+            """, (self.learner_id,))
             
             skills_data = {}
             for row in cursor.fetchall():
@@ -912,7 +917,7 @@ class PeerInteractionSimulator:
     
     def _store_interaction_session(self, session: PeerInteractionSession):
         """Store interaction session in database"""
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             
             # Convert conversation turns for JSON serialization
@@ -951,13 +956,12 @@ class PeerInteractionSimulator:
                 json.dumps(session.peer_feedback),
                 session.session_timestamp.isoformat()
             ))
-            conn.commit()
 
     # Additional helper methods continued...
     
     def _update_peer_relationships(self, peers: List[PeerPersonality], success_rating: float):
         """Update peer relationship strength based on interaction success"""
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             
             for peer in peers:
@@ -966,7 +970,7 @@ class PeerInteractionSimulator:
                     SELECT relationship_strength, interaction_count, positive_interactions
                     FROM peer_relationships
                     WHERE marcus_id = ? AND peer_id = ?
-                """, ("marcus", peer.id))
+                """, (self.learner_id, peer.id))
                 
                 row = cursor.fetchone()
                 
@@ -985,7 +989,7 @@ class PeerInteractionSimulator:
                             positive_interactions = ?, last_interaction_date = ?
                         WHERE marcus_id = ? AND peer_id = ?
                     """, (new_strength, interaction_count, positive_interactions,
-                          datetime.now().date().isoformat(), "marcus", peer.id))
+                          datetime.now().date().isoformat(), self.learner_id, peer.id))
                 else:
                     # Create new relationship
                     cursor.execute("""
@@ -993,15 +997,14 @@ class PeerInteractionSimulator:
                         (marcus_id, peer_id, relationship_strength, interaction_count,
                          positive_interactions, last_interaction_date)
                         VALUES (?, ?, ?, ?, ?, ?)
-                    """, ("marcus", peer.id, success_rating, 1,
+                    """, (self.learner_id, peer.id, success_rating, 1,
                           1 if success_rating > 0.6 else 0,
                           datetime.now().date().isoformat()))
             
-            conn.commit()
     
     def _update_skills_progress(self, skills_practiced: List[SocialSkillArea], success_rating: float):
         """Update social skills progress based on practice session"""
-        with sqlite3.connect(self.db_path) as conn:
+        with state_transaction(self.db_path) as conn:
             cursor = conn.cursor()
             
             for skill in skills_practiced:
@@ -1010,7 +1013,7 @@ class PeerInteractionSimulator:
                     SELECT current_level, practice_count, successful_demonstrations
                     FROM social_skills_progress
                     WHERE marcus_id = ? AND skill_area = ?
-                """, ("marcus", skill.value))
+                """, (self.learner_id, skill.value))
                 
                 row = cursor.fetchone()
                 
@@ -1034,7 +1037,7 @@ class PeerInteractionSimulator:
                             successful_demonstrations = ?, last_practiced = ?
                         WHERE marcus_id = ? AND skill_area = ?
                     """, (new_level, practice_count, successful_demonstrations,
-                          datetime.now().date().isoformat(), "marcus", skill.value))
+                          datetime.now().date().isoformat(), self.learner_id, skill.value))
                 else:
                     # Create new skill record
                     initial_level = 0.5  # Starting level
@@ -1045,10 +1048,9 @@ class PeerInteractionSimulator:
                         (marcus_id, skill_area, current_level, practice_count,
                          successful_demonstrations, last_practiced)
                         VALUES (?, ?, ?, ?, ?, ?)
-                    """, ("marcus", skill.value, initial_level, 1,
+                    """, (self.learner_id, skill.value, initial_level, 1,
                           successful_demonstrations, datetime.now().date().isoformat()))
             
-            conn.commit()
     
     def _categorize_relationship_strength(self, strength: float) -> str:
         """Categorize relationship strength into readable levels"""
@@ -1645,9 +1647,10 @@ class SocialDynamicsModel:
             return 0.6
 
 # Factory function for easy integration
-def create_peer_interaction_system(db_path: str = "peer_interactions.db") -> PeerInteractionSimulator:
+def create_peer_interaction_system(db_path: Optional[str] = None,
+                                   learner_id: str = DEFAULT_LEARNER_ID) -> PeerInteractionSimulator:
     """Create and initialize the peer interaction simulation system"""
-    return PeerInteractionSimulator(db_path=db_path)
+    return PeerInteractionSimulator(db_path=db_path, learner_id=learner_id)
 
 # Demo function
 def demo_peer_interaction_system():
@@ -0,0 +1,5 @@
+# __main__.py
+"""Run the batch AV pipeline: python -m marcus_av_pipeline <episode_dir>"""
+from marcus_av_pipeline.batch_pipeline import main
+
+main()
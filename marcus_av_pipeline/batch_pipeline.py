@@ -0,0 +1,270 @@
+# batch_pipeline.py
+"""
+Batch AV episode processor: extract -> metadata -> transcribe -> annotate -> ingest
+
+Every episode in a directory runs through the stage DAG, and independent
+episodes run in parallel. Each stage's result is cached under a content hash
+of its input files, so a rerun skips unchanged episodes and stages; when an
+upstream stage reruns but writes identical output, the stages after it stay
+cached too. Per-stage timings are printed at the end of the batch.
+
+Usage:
+    python -m marcus_av_pipeline.batch_pipeline <episode_dir> [--output output] [--workers 4]
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from graphlib import TopologicalSorter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Add root project directory to sys.path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+VIDEO_PATTERNS = ("*.mp4", "*.mov", "*.mkv", "*.avi")
+HASH_BLOCK_SIZE = 1024 * 1024
+
+class StageError(Exception):
+    """Raised when a stage produces no output"""
+
+@dataclass
+class Episode:
+    """One source video and where its stage outputs go"""
+    video_path: str
+    output_root: str = "output"
+    title: Optional[str] = None
+
+    @property
+    def episode_id(self) -> str:
+        return Path(self.video_path).stem
+
+    def output_dir(self, name: str) -> Path:
+        return Path(self.output_root) / name
+
+@dataclass
+class Stage:
+    """
+    One pipeline step
+
+    ``run(episode, inputs)`` gets the paths produced by the stages named in
+    ``inputs`` (plus ``"video"``) and returns its output path, or None for a
+    sink such as memory ingestion. ``params`` are folded into the cache key,
+    and bumping ``version`` invalidates earlier results.
+    """
+    name: str
+    inputs: Tuple[str, ...]
+    run: Callable[[Episode, Dict[str, str]], Optional[str]]
+    version: str = "1"
+    params: Dict[str, Any] = field(default_factory=dict)
+
+@dataclass
+class StageResult:
+    stage: str
+    status: str              # "ran", "cached" or "failed"
+    seconds: float
+    output: Optional[str] = None
+    error: Optional[str] = None
+
+def default_stages(memory=None, transcribe_workers: int = 4) -> List[Stage]:
+    """The AV pipeline's stages; heavy dependencies load when a stage first runs"""
+    ingest_lock = threading.Lock()
+
+    def extract(episode, inputs):
+        from marcus_av_pipeline.extract_audio import extract_audio
+        return extract_audio(inputs["video"], str(episode.output_dir("audio")))
+
+    def metadata(episode, inputs):
+        from marcus_av_pipeline.parse_episode_metadata import parse_episode_metadata
+        output_dir = episode.output_dir("metadata")
+        if not parse_episode_metadata(inputs["video"], episode.title or episode.episode_id, str(output_dir)):
+            return ""
+        return str(output_dir / f"{episode.episode_id}_metadata.json")
+
+    def transcribe(episode, inputs):
+        from marcus_av_pipeline.transcribe_audio import transcribe_audio
+        return transcribe_audio(inputs["extract"], str(episode.output_dir("transcripts")),
+                                max_workers=transcribe_workers)
+
+    def annotate(episode, inputs):
+        from marcus_av_pipeline.transcript_stream import read_transcript_chunks, annotate_chunks, write_jsonl, drain
+        output_path = episode.output_dir("analysis") / f"{episode.episode_id}_annotated.jsonl"
+        drain(write_jsonl(annotate_chunks(read_transcript_chunks(inputs["transcribe"]),
+                                          episode=episode.title or episode.episode_id), str(output_path)))
+        return str(output_path)
+
+    def ingest(episode, inputs):
+        from marcus_av_pipeline.ingest_transcript_to_memory import ingest_labeled_transcript
+        # One writer at a time into the shared memory database
+        with ingest_lock:
+            ingest_labeled_transcript(inputs["annotate"], episode.episode_id, memory)
+        return None
+
+    stages = [
+        Stage("extract", ("video",), extract),
+        Stage("metadata", ("video",), metadata),
+        Stage("transcribe", ("extract",), transcribe),
+        Stage("annotate", ("transcribe",), annotate),
+    ]
+    if memory is not None:
+        stages.append(Stage("ingest", ("annotate",), ingest,
+                            params={"db_path": memory.db_path, "learner_id": memory.learner_id}))
+    return stages
+
+class BatchPipeline:
+    """Run episodes through a stage DAG with content-hash caching"""
+
+    def __init__(self, stages: List[Stage], output_root: str = "output",
+                 max_workers: int = 4, manifest_path: Optional[str] = None):
+        self.stages = {stage.name: stage for stage in stages}
+        graph = {stage.name: [dep for dep in stage.inputs if dep != "video"] for stage in stages}
+        for name, deps in graph.items():
+            for dep in deps:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage {name} depends on unknown stage {dep}")
+        # Raises graphlib.CycleError for a cyclic pipeline
+        self.order = list(TopologicalSorter(graph).static_order())
+        self.output_root = output_root
+        self.max_workers = max_workers
+        self.manifest_path = Path(manifest_path or Path(output_root) / "cache" / "pipeline_manifest.json")
+        self._lock = threading.Lock()
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        if self.manifest_path.exists():
+            with self.manifest_path.open() as f:
+                manifest = json.load(f)
+            return {"files": manifest.get("files", {}), "stages": manifest.get("stages", {})}
+        return {"files": {}, "stages": {}}
+
+    def _save_manifest(self):
+        # Callers hold self._lock; write-then-rename so a crash never leaves half a manifest
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.manifest_path.with_suffix(".tmp")
+        with temp_path.open("w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+    def file_hash(self, path: str) -> str:
+        """SHA-256 of a file, reused while its size and mtime are unchanged"""
+        stat = os.stat(path)
+        key = str(Path(path).resolve())
+        with self._lock:
+            known = self.manifest["files"].get(key)
+        if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+            return known["sha256"]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        with self._lock:
+            self.manifest["files"][key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                                           "sha256": digest.hexdigest()}
+        return digest.hexdigest()
+
+    def cache_key(self, stage: Stage, inputs: Dict[str, str]) -> str:
+        """Hash of the stage definition and the content of its input files"""
+        payload = {
+            "stage": stage.name,
+            "version": stage.version,
+            "params": stage.params,
+            "inputs": {name: self.file_hash(path) for name, path in sorted(inputs.items())},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _output_intact(self, entry: Dict[str, Any]) -> bool:
+        """Whether a cached output is still the file the stage wrote, not since replaced by another episode"""
+        output = entry["output"]
+        if output is None:
+            return True
+        return os.path.exists(output) and self.file_hash(output) == entry.get("sha256")
+
+    def discover(self, episode_dir: str, patterns: Iterable[str] = VIDEO_PATTERNS) -> List[Episode]:
+        """Every video in ``episode_dir``, in name order"""
+        videos = sorted({path for pattern in patterns for path in Path(episode_dir).glob(pattern)})
+        return [Episode(str(video), self.output_root) for video in videos]
+
+    def run_episode(self, episode: Episode) -> Dict[str, StageResult]:
+        """Run one episode's stages in dependency order, skipping cached ones"""
+        outputs = {"video": episode.video_path}
+        results: Dict[str, StageResult] = {}
+        for name in self.order:
+            stage = self.stages[name]
+            started = time.perf_counter()
+            failed_deps = [dep for dep in stage.inputs if dep not in outputs]
+            if failed_deps:
+                results[name] = StageResult(name, "failed", 0.0, error=f"skipped, {failed_deps[0]} failed")
+                continue
+            try:
+                inputs = {dep: outputs[dep] for dep in stage.inputs}
+                key = self.cache_key(stage, inputs)
+                entry_id = f"{Path(episode.video_path).resolve()}:{name}"
+                with self._lock:
+                    entry = self.manifest["stages"].get(entry_id)
+                if entry and entry["key"] == key and self._output_intact(entry):
+                    status, output = "cached", entry["output"]
+                else:
+                    output = stage.run(episode, inputs)
+                    if output == "" or (output is not None and not os.path.exists(output)):
+                        raise StageError(f"{name} produced no output")
+                    status = "ran"
+                    output_hash = self.file_hash(output) if output is not None else None
+                    with self._lock:
+                        self.manifest["stages"][entry_id] = {"key": key, "output": output, "sha256": output_hash}
+                        self._save_manifest()
+            except Exception as e:
+                print(f"❌ {episode.episode_id} {name}: {e}")
+                results[name] = StageResult(name, "failed", time.perf_counter() - started, error=str(e))
+                continue
+            if output is not None:
+                outputs[name] = output
+            results[name] = StageResult(name, status, time.perf_counter() - started, output)
+        return results
+
+    def run(self, episodes: List[Episode]) -> Dict[str, Dict[str, StageResult]]:
+        """Run every episode, ``max_workers`` at a time"""
+        print(f"🎬 Processing {len(episodes)} episodes with {self.max_workers} workers...")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = dict(zip((e.episode_id for e in episodes), pool.map(self.run_episode, episodes)))
+        with self._lock:
+            self._save_manifest()
+        self.print_timings(results)
+        return results
+
+    def print_timings(self, results: Dict[str, Dict[str, StageResult]]):
+        print(f"\n⏱️ {'stage':<12} {'ran':>5} {'cached':>7} {'failed':>7} {'seconds':>9}")
+        for name in self.order:
+            stage_results = [episode[name] for episode in results.values() if name in episode]
+            counts = {status: sum(1 for r in stage_results if r.status == status)
+                      for status in ("ran", "cached", "failed")}
+            seconds = sum(r.seconds for r in stage_results)
+            print(f"   {name:<12} {counts['ran']:>5} {counts['cached']:>7} {counts['failed']:>7} {seconds:>9.2f}")
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run a directory of episodes through the AV pipeline")
+    parser.add_argument("episode_dir", help="Directory of episode videos")
+    parser.add_argument("--output", default="output", help="Output root directory")
+    parser.add_argument("--workers", type=int, default=4, help="Episodes processed in parallel")
+    parser.add_argument("--transcribe-workers", type=int, default=4, help="Recognizer calls per episode")
+    parser.add_argument("--memory-db", default=None, help="Memory database to ingest into (default: the state database)")
+    parser.add_argument("--no-ingest", action="store_true", help="Stop after annotation")
+    args = parser.parse_args(argv)
+
+    memory = None
+    if not args.no_ingest:
+        from core.memory.memory_system import MarcusMemorySystem
+        memory = MarcusMemorySystem(args.memory_db)
+    pipeline = BatchPipeline(default_stages(memory, args.transcribe_workers), args.output, args.workers)
+    episodes = pipeline.discover(args.episode_dir)
+    if not episodes:
+        print(f"⚠️ No episodes found in {args.episode_dir}")
+        return {}
+    return pipeline.run(episodes)
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,14 @@
-import json
+import sys
 from pathlib import Path
 from textblob import TextBlob
 import re
 
+# Add root project directory to sys.path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from core.reasoning.keyword_matcher import KeywordMatcher
+from marcus_av_pipeline.transcript_stream import read_transcript_chunks, annotate_chunks, write_jsonl, drain
+
 TEACHING_KEYWORDS = [
     "you are special",
     "I like you just the way you are",
@@ -17,6 +23,7 @@ TEACHING_KEYWORDS = [
     "safe",
     "talk about your feelings"
 ]
+TEACHING_MATCHER = KeywordMatcher(TEACHING_KEYWORDS)
 
 def detect_emotion(text: str) -> str:
     polarity = TextBlob(text).sentiment.polarity
@@ -32,25 +39,17 @@ def detect_emotion(text: str) -> str:
         return "conflicted"
 
 def detect_teaching_moment(text: str) -> bool:
-    lowered = text.lower()
-    return any(phrase in lowered for phrase in TEACHING_KEYWORDS)
+    return TEACHING_MATCHER.contains_any(text)
 
 def annotate_transcript(transcript_path: str, output_path: str):
-    with open(transcript_path, "r") as f:
-        chunks = json.load(f)
-
-    for chunk in chunks:
-        text = chunk["text"]
-        chunk["emotion"] = detect_emotion(text)
-        chunk["teaching_moment"] = detect_teaching_moment(text)
-
-    with open(output_path, "w") as f:
-        json.dump(chunks, f, indent=2)
+    """Stream a transcript into a JSONL file annotated with emotion and teaching phrases"""
+    annotators = [("emotion", detect_emotion), ("teaching_moment", detect_teaching_moment)]
+    chunks = annotate_chunks(read_transcript_chunks(transcript_path), annotators)
+    drain(write_jsonl(chunks, output_path))
     print(f"✅ Annotated transcript saved: {output_path}")
 
 # Example usage
 if __name__ == "__main__":
     transcript_file = "output/transcripts/MrRogersspeech_transcript.json"
-    annotated_file = "output/analysis/MrRogersspeech_annotated.json"
-    Path("output/analysis").mkdir(parents=True, exist_ok=True)
+    annotated_file = "output/analysis/MrRogersspeech_annotated.jsonl"
     annotate_transcript(transcript_file, annotated_file)
@@ -5,38 +5,37 @@ from pathlib import Path
 # Add root project directory to sys.path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
-import json
-from pathlib import Path
-from memory_system import MarcusMemorySystem, Concept
-
-def ingest_labeled_transcript(transcript_path: str, episode_title: str):
-    memory = MarcusMemorySystem()
-    path = Path(transcript_path)
-
-    if not path.exists():
-        print(f"❌ File not found: {transcript_path}")
-        return
-
-    with open(path, 'r') as f:
-        data = json.load(f)
+from core.memory.memory_system import MarcusMemorySystem, Concept
+from marcus_av_pipeline.transcript_stream import read_transcript_chunks
 
-    count = 0
-    for chunk in data:
+def teaching_moment_concepts(chunks, episode_title: str):
+    """Yield a Concept for every chunk flagged as a teaching moment"""
+    for chunk in chunks:
         if chunk.get("teaching_moment") is True:
-            concept = Concept(
+            yield Concept(
                 id=f"{episode_title}_chunk{chunk['chunk']}",
                 content=chunk["text"],
                 subject="emotional_learning",
                 grade_level="kindergarten",
                 emotional_context=chunk.get("emotion", "neutral")
             )
-            success = memory.learn_concept(concept)
-            if success:
-                count += 1
 
-    print(f"✅ {count} teaching moments imported into Marcus's memory.")
+def ingest_labeled_transcript(transcript_path: str, episode_title: str, memory: MarcusMemorySystem = None):
+    memory = memory or MarcusMemorySystem()
+    path = Path(transcript_path)
+
+    if not path.exists():
+        print(f"❌ File not found: {transcript_path}")
+        return
+
+    # Chunks are parsed one at a time as learn_concepts_bulk pulls each batch
+    result = memory.learn_concepts_bulk(teaching_moment_concepts(read_transcript_chunks(path), episode_title))
+
+    print(f"✅ {result['inserted'] + result['replaced']} teaching moments imported into Marcus's memory "
+          f"({result['inserted']} new, {result['replaced']} updated, {result['skipped']} skipped).")
+    return result
 
 # Example usage
 if __name__ == "__main__":
-    labeled_file = "output/transcripts/MrRogersspeech_transcript_labeled.json"
+    labeled_file = "output/transcripts/MrRogersspeech_transcript_labeled.jsonl"
     ingest_labeled_transcript(labeled_file, episode_title="MrRogersspeech")
@@ -10,7 +10,7 @@ ffmpeg_path = imageio_ffmpeg.get_ffmpeg_exe()
 ffprobe_path = ffmpeg_path.replace("ffmpeg", "ffprobe")
 os.environ["PATH"] = str(Path(ffmpeg_path).parent) + os.pathsep + os.environ["PATH"]
 
-def parse_episode_metadata(video_path: str, title: str = "Untitled") -> dict:
+def parse_episode_metadata(video_path: str, title: str = "Untitled", output_dir: str = "output/metadata") -> dict:
     input_path = Path(video_path)
     episode_id = input_path.stem
 
@@ -37,7 +37,7 @@ def parse_episode_metadata(video_path: str, title: str = "Untitled") -> dict:
         }
 
         # Save to metadata file
-        output_dir = Path("output/metadata")
+        output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         output_file = output_dir / f"{episode_id}_metadata.json"
         with open(output_file, "w") as f:
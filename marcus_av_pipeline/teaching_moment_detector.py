@@ -1,28 +1,28 @@
-import json
+import sys
 from pathlib import Path
 
+# Add root project directory to sys.path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from core.reasoning.keyword_matcher import KeywordMatcher
+from marcus_av_pipeline.transcript_stream import read_transcript_chunks, annotate_chunks, write_jsonl, drain
+
 KEYWORDS = [
     "love", "kindness", "feelings", "empathy", "help", "respect",
     "neighbor", "forgive", "yourself", "understand", "special"
 ]
+KEYWORD_MATCHER = KeywordMatcher(KEYWORDS)
 
 def is_teaching_moment(text: str) -> bool:
     """Detects whether a chunk contains a moral/educational teaching."""
-    text_lower = text.lower()
-    return any(kw in text_lower for kw in KEYWORDS)
+    return KEYWORD_MATCHER.contains_any(text)
 
 def annotate_teaching_moments(transcript_path: str) -> str:
-    """Annotate a transcript file with teaching moment flags."""
+    """Annotate a transcript file with teaching moment flags, streaming to JSONL."""
     input_path = Path(transcript_path)
-    with input_path.open("r") as f:
-        data = json.load(f)
-
-    for chunk in data:
-        chunk["teaching_moment"] = is_teaching_moment(chunk["text"])
-
-    output_path = input_path.parent / (input_path.stem + "_labeled.json")
-    with output_path.open("w") as f:
-        json.dump(data, f, indent=2)
+    output_path = input_path.parent / (input_path.stem + "_labeled.jsonl")
+    chunks = annotate_chunks(read_transcript_chunks(transcript_path), [("teaching_moment", is_teaching_moment)])
+    drain(write_jsonl(chunks, str(output_path)))
 
     print(f"✅ Teaching moments annotated: {output_path}")
     return str(output_path)
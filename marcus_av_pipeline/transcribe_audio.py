@@ -1,57 +1,60 @@
 # transcribe_audio.py
 import speech_recognition as sr
 from pathlib import Path
-from pydub import AudioSegment
-import math
 import os
+import sys
 import json
 
-def transcribe_audio(audio_path: str, output_path: str = "output/transcripts") -> str:
-    recognizer = sr.Recognizer()
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from marcus_av_pipeline.transcription_engine import (
+    PCMAudio, TranscriptionEngine, TranscriptionError, UnintelligibleAudio
+)
+
+class GoogleRecognizer:
+    """Google Web Speech recognizer over in-memory PCM"""
+
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+
+    def recognize(self, audio: PCMAudio) -> str:
+        audio_data = sr.AudioData(bytes(audio.data), audio.sample_rate, audio.sample_width)
+        try:
+            return self.recognizer.recognize_google(audio_data)
+        except sr.UnknownValueError:
+            raise UnintelligibleAudio()
+
+def transcribe_audio(audio_path: str, output_path: str = "output/transcripts",
+                     recognizer=None, max_workers: int = 4) -> str:
     audio_file = Path(audio_path)
     output_dir = Path(output_path)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Split audio into 30-second chunks
-    audio = AudioSegment.from_wav(audio_file)
-    chunk_length_ms = 30 * 1000  # 30 sec
-    num_chunks = math.ceil(len(audio) / chunk_length_ms)
-
-    transcript_data = []
-    
-    print(f"🎧 Transcribing {num_chunks} audio chunks...")
-
-    for i in range(num_chunks):
-        start_ms = i * chunk_length_ms
-        end_ms = min((i + 1) * chunk_length_ms, len(audio))
-        chunk = audio[start_ms:end_ms]
-        chunk_path = output_dir / f"chunk_{i}.wav"
-        chunk.export(chunk_path, format="wav")
-
-        with sr.AudioFile(str(chunk_path)) as source:
-            audio_data = recognizer.record(source)
-
-            try:
-                text = recognizer.recognize_google(audio_data)
-                print(f"✅ Chunk {i}: {text[:60]}...")
-            except sr.UnknownValueError:
-                text = "[Unintelligible]"
-                print(f"⚠️ Chunk {i}: Could not understand")
-            except sr.RequestError as e:
-                print(f"❌ Speech Recognition error: {e}")
-                break
-
-        transcript_data.append({
-            "chunk": i,
-            "start_time_sec": start_ms // 1000,
-            "end_time_sec": end_ms // 1000,
-            "text": text
-        })
+    # Split audio into 30-second chunks, sliced from memory
+    audio = PCMAudio.from_wav(audio_file)
+    engine = TranscriptionEngine(recognizer or GoogleRecognizer(), chunk_seconds=30, max_workers=max_workers)
+    checkpoint_path = output_dir / (audio_file.stem + "_transcript.checkpoint.jsonl")
+
+    print(f"🎧 Transcribing {audio.duration_ms / 1000:.0f}s of audio with {max_workers} workers...")
+
+    try:
+        transcript_data = engine.transcribe(audio, checkpoint_path=str(checkpoint_path))
+    except TranscriptionError as e:
+        print(f"❌ Speech Recognition error: {e}")
+        print(f"♻️ Rerun to resume from {checkpoint_path}")
+        return ""
+
+    for record in transcript_data:
+        if record["text"] == "[Unintelligible]":
+            print(f"⚠️ Chunk {record['chunk']}: Could not understand")
+        else:
+            print(f"✅ Chunk {record['chunk']}: {record['text'][:60]}...")
 
     # Save as JSON transcript
     transcript_path = output_dir / (audio_file.stem + "_transcript.json")
     with open(transcript_path, "w") as f:
         json.dump(transcript_data, f, indent=2)
+    os.remove(checkpoint_path)
 
     print(f"📄 Transcript saved: {transcript_path}")
     return str(transcript_path)
@@ -0,0 +1,148 @@
+# transcript_stream.py
+"""
+Streaming transcript pipeline: read chunks -> annotate -> JSONL -> memory
+
+Each transcript chunk is parsed once, annotated with its emotion and
+teaching-moment flag, optionally appended to a JSONL file and handed straight
+to memory ingestion. Nothing holds a whole transcript, so long episodes and
+whole episode batches run in constant memory.
+"""
+import sys
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Add root project directory to sys.path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+Chunk = Dict[str, Any]
+Annotator = Tuple[str, Callable[[str], Any]]
+
+READ_BLOCK_SIZE = 64 * 1024
+
+def _iter_json_array(f, block_size: int = READ_BLOCK_SIZE) -> Iterator[Chunk]:
+    """Yield the elements of a JSON array whose opening bracket has been read, block by block"""
+    decoder = json.JSONDecoder()
+    buffer, pos = "", 0
+    while True:
+        # Skip whitespace and the separators between elements
+        while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] == ","):
+            pos += 1
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            block = f.read(block_size)
+            if not block:
+                if buffer[pos:].strip():
+                    raise
+                return
+            buffer, pos = buffer[pos:] + block, 0
+            continue
+        yield item
+        pos = end
+
+def read_transcript_chunks(transcript_path: str, block_size: int = READ_BLOCK_SIZE) -> Iterator[Chunk]:
+    """Stream chunks from a JSONL transcript or a legacy JSON-array transcript"""
+    with open(transcript_path, "r") as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        if first == "[":
+            yield from _iter_json_array(f, block_size)
+            return
+        line = first + f.readline()
+        while line:
+            if line.strip():
+                yield json.loads(line)
+            line = f.readline()
+
+def default_annotators() -> List[Annotator]:
+    """Emotion and teaching-moment annotators used by the AV pipeline"""
+    from marcus_av_pipeline.emotional_analysis import detect_emotion
+    from marcus_av_pipeline.teaching_moment_detector import is_teaching_moment
+    return [("emotion", detect_emotion), ("teaching_moment", is_teaching_moment)]
+
+def annotate_chunks(chunks: Iterable[Chunk], annotators: Optional[List[Annotator]] = None,
+                    **fields: Any) -> Iterator[Chunk]:
+    """Add each annotator's result to every chunk; extra ``fields`` are stamped on as-is"""
+    annotators = default_annotators() if annotators is None else annotators
+    for chunk in chunks:
+        text = chunk["text"]
+        for name, annotate in annotators:
+            chunk[name] = annotate(text)
+        chunk.update(fields)
+        yield chunk
+
+def write_jsonl(chunks: Iterable[Chunk], output_path: str, append: bool = False) -> Iterator[Chunk]:
+    """Write every chunk as one JSON line while passing it on downstream"""
+    output = Path(output_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("a" if append else "w") as f:
+        for chunk in chunks:
+            f.write(json.dumps(chunk) + "\n")
+            yield chunk
+
+def drain(chunks: Iterable[Chunk]) -> int:
+    """Consume a chunk stream that has no downstream consumer; returns the chunk count"""
+    count = 0
+    for count, _ in enumerate(chunks, 1):
+        pass
+    return count
+
+def stream_episode(transcript_path: str, episode_title: str, output_path: Optional[str] = None,
+                   memory=None, annotators: Optional[List[Annotator]] = None,
+                   append: bool = False) -> Dict[str, int]:
+    """
+    Annotate one transcript in a single pass
+
+    Annotated chunks go to ``output_path`` as JSONL when given, and teaching
+    moments are learned by ``memory`` when given. Returns the number of chunks
+    processed and, with memory, the ingestion counts.
+    """
+    from marcus_av_pipeline.ingest_transcript_to_memory import teaching_moment_concepts
+
+    counted = {'chunks': 0}
+
+    def count(chunks):
+        for chunk in chunks:
+            counted['chunks'] += 1
+            yield chunk
+
+    chunks = count(annotate_chunks(read_transcript_chunks(transcript_path), annotators,
+                                   episode=episode_title))
+    if output_path:
+        chunks = write_jsonl(chunks, output_path, append=append)
+
+    result = {}
+    if memory is not None:
+        # Every chunk still reaches the JSONL output as ingestion pulls concepts through
+        result = memory.learn_concepts_bulk(teaching_moment_concepts(chunks, episode_title))
+    drain(chunks)
+    return {'chunks': counted['chunks'], **result}
+
+def stream_episodes(episodes: Iterable[Tuple[str, str]], output_path: Optional[str] = None,
+                    memory=None, annotators: Optional[List[Annotator]] = None) -> Dict[str, int]:
+    """Run a batch of ``(transcript_path, episode_title)`` pairs into one JSONL file"""
+    annotators = default_annotators() if annotators is None else annotators
+    totals: Dict[str, int] = {}
+    for index, (transcript_path, episode_title) in enumerate(episodes):
+        result = stream_episode(transcript_path, episode_title, output_path, memory,
+                                annotators, append=index > 0)
+        for key, value in result.items():
+            if isinstance(value, int):
+                totals[key] = totals.get(key, 0) + value
+    print(f"✅ Streamed {totals.get('chunks', 0)} transcript chunks"
+          + (f" into {output_path}" if output_path else ""))
+    return totals
+
+# Example usage
+if __name__ == "__main__":
+    from core.memory.memory_system import MarcusMemorySystem
+    stream_episode(
+        "output/transcripts/MrRogersspeech_transcript.json",
+        episode_title="MrRogersspeech",
+        output_path="output/analysis/MrRogersspeech_annotated.jsonl",
+        memory=MarcusMemorySystem()
+    )
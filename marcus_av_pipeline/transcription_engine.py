@@ -0,0 +1,235 @@
+# transcription_engine.py
+"""
+Concurrent chunked transcription of an in-memory PCM buffer
+
+Audio is sliced into fixed-length chunks as views over the decoded PCM bytes,
+with a little overlap on each side so words on a boundary are heard whole.
+Chunks go to a bounded thread pool behind a pluggable recognizer, finished
+chunks are appended to a JSONL checkpoint as they complete, and the
+transcript is reassembled in chunk order with the words repeated in the
+overlap removed. Rerunning after a failure skips every checkpointed chunk.
+"""
+import hashlib
+import json
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Protocol, Union
+
+UNINTELLIGIBLE = "[Unintelligible]"
+
+class UnintelligibleAudio(Exception):
+    """Raised by a recognizer when a chunk holds no recognizable speech"""
+
+class TranscriptionError(Exception):
+    """Raised when a chunk fails; finished chunks remain in the checkpoint"""
+
+@dataclass
+class PCMAudio:
+    """Raw interleaved PCM samples and their format"""
+    data: Union[bytes, memoryview]
+    sample_rate: int
+    sample_width: int
+    channels: int = 1
+
+    @classmethod
+    def from_wav(cls, path: str) -> 'PCMAudio':
+        with wave.open(str(path), "rb") as wav:
+            return cls(wav.readframes(wav.getnframes()), wav.getframerate(),
+                       wav.getsampwidth(), wav.getnchannels())
+
+    @property
+    def frame_size(self) -> int:
+        return self.sample_width * self.channels
+
+    @property
+    def duration_ms(self) -> int:
+        return len(self.data) // self.frame_size * 1000 // self.sample_rate
+
+    def slice_ms(self, start_ms: int, end_ms: int) -> 'PCMAudio':
+        """Zero-copy view of the audio between two offsets"""
+        start = start_ms * self.sample_rate // 1000 * self.frame_size
+        end = end_ms * self.sample_rate // 1000 * self.frame_size
+        return PCMAudio(memoryview(self.data)[start:end], self.sample_rate, self.sample_width, self.channels)
+
+@dataclass
+class AudioChunk:
+    """One chunk of an episode: its nominal time span and the padded audio sent to the recognizer"""
+    index: int
+    start_ms: int
+    end_ms: int
+    audio: PCMAudio
+
+class Recognizer(Protocol):
+    def recognize(self, audio: PCMAudio) -> str:
+        """Text spoken in ``audio``; raise UnintelligibleAudio when there is none"""
+
+class StubRecognizer:
+    """
+    Offline recognizer for tests
+
+    Reads one "word" per ``word_ms`` window: the first sample of the window is
+    the word's number, so ``word_ms`` of samples valued 7 are heard as "word7".
+    Zero samples are silence. A chunk that hears ``fail_on`` raises
+    ConnectionError, the first ``fail_times`` times, like a dropped API call.
+    """
+
+    def __init__(self, word_ms: int = 500, fail_on: Optional[str] = None, fail_times: int = 1):
+        self.word_ms = word_ms
+        self.fail_on = fail_on
+        self.fail_times = fail_times
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def recognize(self, audio: PCMAudio) -> str:
+        with self._lock:
+            self.calls += 1
+        words = []
+        step = self.word_ms * audio.sample_rate // 1000 * audio.frame_size
+        data = bytes(audio.data)
+        for offset in range(0, len(data) - audio.sample_width + 1, step):
+            value = int.from_bytes(data[offset:offset + audio.sample_width], "little", signed=True)
+            if value:
+                words.append(f"word{value}")
+        with self._lock:
+            if self.fail_on in words and self.fail_times > 0:
+                self.fail_times -= 1
+                raise ConnectionError(f"stub recognizer failed on {self.fail_on}")
+        if not words:
+            raise UnintelligibleAudio()
+        return " ".join(words)
+
+def merge_overlap(previous: str, text: str, max_words: int) -> str:
+    """Drop the leading words of ``text`` that repeat the tail of ``previous``"""
+    prev_words, words = previous.split(), text.split()
+    for size in range(min(max_words, len(prev_words), len(words)), 0, -1):
+        if prev_words[-size:] == words[:size]:
+            return " ".join(words[size:])
+    return text
+
+class TranscriptionEngine:
+    """Slice, recognize concurrently and reassemble an episode's transcript"""
+
+    def __init__(self, recognizer: Recognizer, chunk_seconds: int = 30,
+                 overlap_ms: int = 500, max_workers: int = 4):
+        self.recognizer = recognizer
+        self.chunk_ms = chunk_seconds * 1000
+        self.overlap_ms = overlap_ms
+        self.max_workers = max_workers
+
+    def slice(self, audio: PCMAudio) -> Iterator[AudioChunk]:
+        """Chunks covering ``audio``, each padded by the overlap on both sides"""
+        duration = audio.duration_ms
+        for index, start in enumerate(range(0, duration, self.chunk_ms)):
+            end = min(start + self.chunk_ms, duration)
+            padded = audio.slice_ms(max(0, start - self.overlap_ms), min(duration, end + self.overlap_ms))
+            yield AudioChunk(index, start, end, padded)
+
+    def _recognize(self, chunk: AudioChunk) -> Dict[str, Any]:
+        try:
+            text = self.recognizer.recognize(chunk.audio)
+        except UnintelligibleAudio:
+            text = UNINTELLIGIBLE
+        return {
+            "chunk": chunk.index,
+            "start_time_sec": chunk.start_ms // 1000,
+            "end_time_sec": chunk.end_ms // 1000,
+            "text": text
+        }
+
+    def _checkpoint_header(self, audio: PCMAudio) -> Dict[str, Any]:
+        return {"checkpoint": {"bytes": len(audio.data), "sha256": hashlib.sha256(audio.data).hexdigest(),
+                               "sample_rate": audio.sample_rate,
+                               "chunk_ms": self.chunk_ms, "overlap_ms": self.overlap_ms}}
+
+    def _load_checkpoint(self, path: Optional[Path], header: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
+        if path is None or not path.exists():
+            return {}
+        done = {}
+        with path.open() as f:
+            lines = [line for line in f if line.strip()]
+        # A checkpoint from different audio or chunking starts over
+        if not lines or json.loads(lines[0]) != header:
+            return {}
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break   # torn final line from an interrupted write
+            done[record["chunk"]] = record
+        return done
+
+    def transcribe(self, audio: PCMAudio, checkpoint_path: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Transcribe every chunk, resuming from ``checkpoint_path`` when it holds finished chunks"""
+        checkpoint = Path(checkpoint_path) if checkpoint_path else None
+        header = self._checkpoint_header(audio)
+        done = self._load_checkpoint(checkpoint, header)
+        chunks = list(self.slice(audio))
+        if done:
+            print(f"♻️ Resuming: {len(done)}/{len(chunks)} chunks already transcribed")
+
+        failure = None
+        log = None
+        if checkpoint:
+            checkpoint.parent.mkdir(parents=True, exist_ok=True)
+            log = checkpoint.open("a" if done else "w")
+            if not done:
+                log.write(json.dumps(header) + "\n")
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                in_flight = {}
+
+                def collect(finished):
+                    nonlocal failure
+                    for future in finished:
+                        chunk = in_flight.pop(future)
+                        try:
+                            record = future.result()
+                        except Exception as e:
+                            failure = failure or e
+                            print(f"❌ Chunk {chunk.index}: {e}")
+                            continue
+                        done[chunk.index] = record
+                        if log:
+                            log.write(json.dumps(record) + "\n")
+                            log.flush()
+
+                for chunk in chunks:
+                    if chunk.index in done:
+                        continue
+                    if failure:
+                        break
+                    # Keep at most two chunks per worker queued so memory stays bounded
+                    while len(in_flight) >= 2 * self.max_workers:
+                        finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        collect(finished)
+                    in_flight[pool.submit(self._recognize, chunk)] = chunk
+                while in_flight:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(finished)
+        finally:
+            if log:
+                log.close()
+
+        if failure:
+            raise TranscriptionError(
+                f"{len(done)}/{len(chunks)} chunks transcribed before failure: {failure}") from failure
+
+        records = [done[chunk.index] for chunk in chunks]
+        return self._merge(records)
+
+    def _merge(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Remove words heard twice in the overlap between neighbouring chunks"""
+        # Generous bound on words that fit in the padding from both sides
+        max_words = max(1, 2 * self.overlap_ms // 200)
+        merged = []
+        previous = ""
+        for record in records:
+            text = record["text"]
+            if text != UNINTELLIGIBLE and previous:
+                text = merge_overlap(previous, text, max_words)
+            merged.append({**record, "text": text})
+            previous = record["text"] if record["text"] != UNINTELLIGIBLE else ""
+        return merged
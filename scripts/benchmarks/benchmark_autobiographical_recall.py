@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: autobiographical recall latency, JSON LIKE scans vs indexed recall
+
+Fills a throwaway database with synthetic memories, then times each recall
+filter with the previous query (LIKE over the JSON columns, then a separate
+retrieval-count UPDATE) and with the indexed recall (side tables, the
+primary_emotion column and FTS5, counted in the same statement).
+
+Usage:
+    python scripts/benchmarks/benchmark_autobiographical_recall.py [num_memories] [repeats]
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import tempfile
+import statistics
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.memory.autobiographical_memory_system import AutobiographicalMemorySystem, AutobiographicalMemory
+from core.memory.state_store import state_transaction
+
+logging.getLogger('core.memory.autobiographical_memory_system').setLevel(logging.WARNING)
+logging.getLogger('core.memory.state_store').setLevel(logging.WARNING)
+
+EXPERIENCE_TYPES = ["learning", "social", "physical", "emotional", "achievement"]
+EMOTIONS = ["joy", "curious", "proud", "calm", "frustrated", "excited", "nervous", "happy"]
+MARKERS = ["yesterday", "earlier today", "today", "last week", "right now", "I used to", "next time"]
+WORDS = ["block", "tower", "garden", "friend", "number", "letter", "puzzle", "song", "story", "color"]
+BATCH_SIZE = 10000
+
+QUERIES = [
+    ("marker", {"temporal_context": "last week"}, ("temporal_markers", "%last week%")),
+    ("emotion", {"emotion_filter": "nervous"}, ("emotional_context", "%nervous%")),
+    ("type", {"experience_type": "achievement"}, None),
+    ("concept", {"concept": "concept_417"}, ("related_concepts", "%concept_417%")),
+    ("text", {"text_query": "purple giraffe"}, ("narrative_summary", "%purple giraffe%")),
+]
+
+def synthetic_memories(count: int, rng: random.Random):
+    start = datetime(2025, 1, 1)
+    for i in range(count):
+        words = rng.sample(WORDS, 3)
+        # A handful of memories carry a rare phrase for the text query to find
+        if i % 50000 == 7:
+            words.append("purple giraffe")
+        emotion = rng.choice(EMOTIONS)
+        yield AutobiographicalMemory(
+            memory_id=f"memory_{i}",
+            timestamp=start + timedelta(seconds=i * 30),
+            experience_type=rng.choice(EXPERIENCE_TYPES),
+            self_reference_context=f"I played with the {' and the '.join(words)} and felt {emotion}",
+            temporal_markers=rng.sample(MARKERS, rng.randint(1, 2)),
+            emotional_context={"primary_emotion": emotion, "intensity": rng.random(),
+                               "triggers": rng.sample(EMOTIONS, 2)},
+            narrative_summary=f"During a session with the {words[0]}, I felt {emotion} about this.",
+            related_concepts=[f"concept_{rng.randrange(2000)}" for _ in range(2)],
+            confidence_level=0.8,
+            importance_score=round(rng.random(), 3),
+        )
+
+def legacy_recall(db_path: str, experience_type=None, like=None, limit: int = 10):
+    """The previous recall: LIKE over JSON text, then a second statement for the counts"""
+    # NOT INDEXED keeps the scan the version 1 schema had, which had no recall indexes
+    query = "SELECT memory_id FROM autobiographical_memories NOT INDEXED WHERE 1=1"
+    params = []
+    if like:
+        query += f" AND {like[0]} LIKE ?"
+        params.append(like[1])
+    if experience_type:
+        query += " AND experience_type = ?"
+        params.append(experience_type)
+    query += " ORDER BY importance_score DESC, timestamp DESC LIMIT ?"
+    params.append(limit)
+    with state_transaction(db_path) as conn:
+        ids = [row[0] for row in conn.execute(query, params)]
+        if ids:
+            conn.execute(f"UPDATE autobiographical_memories SET retrieval_count = retrieval_count + 1 "
+                         f"WHERE memory_id IN ({','.join('?' * len(ids))})", ids)
+    return ids
+
+def timed_ms(fn, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def run_benchmark(num_memories: int = 1_000_000, repeats: int = 5):
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "recall.db")
+        memory = AutobiographicalMemorySystem(db_path)
+
+        start = time.perf_counter()
+        batch = []
+        for item in synthetic_memories(num_memories, rng):
+            batch.append(item)
+            if len(batch) == BATCH_SIZE:
+                memory._insert_memories(batch)
+                batch = []
+        if batch:
+            memory._insert_memories(batch)
+        print(f"📝 Stored {num_memories:,} memories in {time.perf_counter() - start:.1f}s")
+
+        print(f"{'filter':>10} {'LIKE scan ms':>13} {'indexed ms':>11} {'speedup':>8}")
+        for name, filters, like in QUERIES:
+            legacy_ms = timed_ms(lambda: legacy_recall(db_path, filters.get("experience_type"), like), repeats)
+            indexed_ms = timed_ms(lambda: memory.recall_autobiographical_memories(**filters), repeats)
+            print(f"{name:>10} {legacy_ms:>13.2f} {indexed_ms:>11.2f} {legacy_ms / indexed_ms:>7.1f}x")
+        memory.close()
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    run_benchmark(n, repeats)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark: autobiographical memories stored per second, commit-per-memory vs write-behind
+
+Streams the same experiences into a throwaway database twice: once with a
+buffer of one (every store commits, as before) and once with the default
+write-behind buffer, flushing at the end so both runs persist everything.
+
+Usage:
+    python scripts/benchmarks/benchmark_autobiographical_writes.py [num_memories]
+"""
+
+import os
+import sys
+import time
+import logging
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.memory.autobiographical_memory_system import AutobiographicalMemorySystem
+
+logging.getLogger('core.memory.autobiographical_memory_system').setLevel(logging.WARNING)
+logging.getLogger('core.memory.state_store').setLevel(logging.WARNING)
+
+EXPERIENCES = [
+    ("physical", "Explored the garden corner and found a red block right now"),
+    ("social", "Collaborative tower building with Alex earlier today"),
+    ("learning", "Successfully learned that squares have four sides"),
+    ("emotional", "Felt proud when I used to struggle but now I can count to twenty"),
+]
+
+def run_benchmark(num_memories: int = 2000):
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for label, max_pending in (('commit_per_memory', 1), ('write_behind', 256)):
+            memory = AutobiographicalMemorySystem(os.path.join(tmp, f"{label}.db"), max_pending=max_pending)
+            start = time.perf_counter()
+            for i in range(num_memories):
+                experience_type, context = EXPERIENCES[i % len(EXPERIENCES)]
+                memory.store_autobiographical_memory(experience_type, context,
+                                                     {"primary_emotion": "curious", "intensity": 0.6})
+            memory.flush()
+            elapsed = time.perf_counter() - start
+            stored = memory.get_memory_statistics()['total_memories']
+            memory.close()
+
+            results[label] = num_memories / elapsed
+            print(f"{label:>18}: {stored} memories in {elapsed:.3f}s -> {results[label]:,.0f} memories/sec")
+
+        print(f"{'speedup':>18}: {results['write_behind'] / results['commit_per_memory']:.2f}x")
+        return results
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: due-review lookups through the in-memory heap index
+
+Compares the old queries on the ISO ``next_review`` column (indexed, and
+wrapped in ``datetime()`` as RetentionEngine did) against DueReviewQueue
+for "next N due" and "count due" on a throwaway memory database.
+
+Usage:
+    python scripts/benchmarks/benchmark_due_queue.py [num_concepts] [queries]
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import datetime
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.memory.memory_system import MarcusMemorySystem, Concept
+
+logging.getLogger('core.memory.memory_system').setLevel(logging.WARNING)
+
+def timed(fn, queries: int) -> float:
+    start = time.perf_counter()
+    for _ in range(queries):
+        fn()
+    return queries / (time.perf_counter() - start)
+
+def benchmark(n: int, queries: int):
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = MarcusMemorySystem(os.path.join(tmp, "due.db"))
+        memory.learn_concepts_bulk(Concept(f"concept_{i}", f"Concept number {i}", "math") for i in range(n))
+        # Spread review times over +/- 30 days so roughly half the concepts are due
+        now = datetime.datetime.now()
+        updates = []
+        for i in range(n):
+            next_review = now + datetime.timedelta(seconds=rng.randint(-30 * 86400, 30 * 86400))
+            updates.append((next_review.isoformat(), int(next_review.timestamp()), memory.learner_id, f"concept_{i}"))
+        with memory.connections.transaction() as conn:
+            conn.executemany("""
+                UPDATE memory_records SET next_review = ?, next_review_ts = ?
+                WHERE learner_id = ? AND concept_id = ?
+            """, updates)
+        now = now.isoformat()
+        learner_id = memory.learner_id
+
+        def scan_next():
+            conn.execute("""
+                SELECT c.id, c.content, c.subject, c.grade_level, m.mastery_level, m.next_review
+                FROM concepts c JOIN memory_records m ON c.learner_id = m.learner_id AND c.id = m.concept_id
+                WHERE m.learner_id = ? AND m.next_review <= ? ORDER BY m.next_review ASC LIMIT 10
+            """, (learner_id, now)).fetchall()
+
+        def datetime_scan_next():
+            # RetentionEngine's old query: datetime() on both sides defeats the index
+            conn.execute("""
+                SELECT c.id, c.content, c.subject, c.grade_level, m.mastery_level, m.next_review
+                FROM concepts c JOIN memory_records m ON c.learner_id = m.learner_id AND c.id = m.concept_id
+                WHERE m.learner_id = ? AND datetime(m.next_review) <= datetime(?)
+                ORDER BY datetime(m.next_review) ASC LIMIT 10
+            """, (learner_id, now)).fetchall()
+
+        def scan_count():
+            conn.execute("SELECT COUNT(*) FROM memory_records WHERE learner_id = ? AND next_review <= ?",
+                         (learner_id, now)).fetchone()
+
+        memory.count_due_reviews()   # load the queue outside the timed region
+        results = [
+            ("next 10 due (datetime)", timed(datetime_scan_next, max(1, queries // 20))),
+            ("next 10 due (scan)", timed(scan_next, queries)),
+            ("next 10 due (heap)", timed(lambda: memory.get_due_reviews(10), queries)),
+            ("count due (scan)", timed(scan_count, queries)),
+            ("count due (heap)", timed(memory.count_due_reviews, queries)),
+        ]
+        memory.close()
+
+    print(f"Due-review lookups on {n:,} concepts")
+    for name, rate in results:
+        print(f"{name:>24}: {rate:12,.0f} queries/sec")
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    benchmark(n, queries)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark: episodic retrieval and consolidation, full scans vs the indexed store
+
+Fills an EpisodicMemoryModule with synthetic episodes, then times each query
+with the previous approach (every episode as a candidate, strptime over every
+day key, json.dumps per candidate for keywords, a full sort) against the
+indexed store (bisect time ranges, inverted keyword index, top-k heap), and
+a full consolidation walk against the incremental pass.
+
+Usage:
+    python scripts/benchmarks/benchmark_episodic_store.py [num_episodes] [repeats]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import statistics
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.reasoning.enhanced_cognitive_architecture import EpisodicMemoryModule, MemoryTrace
+
+logging.getLogger('core').setLevel(logging.WARNING)
+
+WORDS = ["block", "tower", "garden", "friend", "number", "letter", "puzzle", "song", "story", "color"]
+PLACES = ["classroom", "playground", "home", "library", "park"]
+START = datetime(2025, 1, 1)
+
+QUERIES = [
+    ("time range", {"time_range": {"start": date(2025, 2, 1), "end": date(2025, 2, 3)}}),
+    ("context", {"context": {"place": "library"}}),
+    ("keywords", {"content_keywords": ["purple giraffe"]}),
+    ("time + keywords", {"time_range": {"start": date(2025, 1, 1), "end": date(2025, 3, 31)},
+                         "content_keywords": ["puzzle", "song"]}),
+]
+
+def synthetic_episodes(count: int, rng: random.Random):
+    for i in range(count):
+        event = " ".join(rng.sample(WORDS, 3))
+        # A handful of episodes carry a rare phrase for the keyword query to find
+        if i % 20000 == 7:
+            event += " purple giraffe"
+        content = {"event": event, "context": {"place": rng.choice(PLACES)}}
+        yield MemoryTrace(
+            trace_id=f"episode_{i}",
+            content=content,
+            memory_type="episodic",
+            encoding_strength=rng.uniform(0.1, 1.0),
+            emotional_valence=rng.uniform(-1, 1),
+            temporal_context={"timestamp": START + timedelta(seconds=i * 120), "context": content["context"]}
+        )
+
+def scan_retrieve(module: EpisodicMemoryModule, temporal_index, context_index, query):
+    """The previous retrieval: filter from every id, score everything, sort everything"""
+    candidates = set(module.episodes)
+    if 'time_range' in query:
+        start, end = query['time_range'].get('start'), query['time_range'].get('end')
+        in_range = set()
+        for date_key, episode_ids in temporal_index.items():
+            day = datetime.strptime(date_key, '%Y-%m-%d').date()
+            if (not start or day >= start) and (not end or day <= end):
+                in_range.update(episode_ids)
+        candidates &= in_range
+    if 'context' in query:
+        matching = set()
+        for key, value in query['context'].items():
+            matching.update(context_index.get(f"{key}:{value}", []))
+        if matching:
+            candidates &= matching
+    ranked = []
+    for episode_id in candidates:
+        episode = module.episodes[episode_id]
+        factors = []
+        if 'content_keywords' in query:
+            text = json.dumps(episode.content).lower()
+            factors.append(sum(k in text for k in query['content_keywords']) / len(query['content_keywords']))
+        since = (datetime.now() - episode.temporal_context['timestamp']).total_seconds()
+        factors += [0.3 / (1.0 + since / 86400), episode.encoding_strength]
+        ranked.append((statistics.mean(factors), episode.encoding_strength, episode_id))
+    ranked.sort(reverse=True)
+    return ranked[:10]
+
+def timed(function, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+def run_benchmark(num_episodes: int = 100_000, repeats: int = 5):
+    module = EpisodicMemoryModule()
+    start = time.perf_counter()
+    episodes = list(synthetic_episodes(num_episodes, random.Random(3)))
+    module.restore_episodes(episodes)
+    print(f"Indexed {num_episodes:,} episodes in {time.perf_counter() - start:.2f}s")
+
+    # The day and context indices the previous module kept
+    temporal_index, context_index = defaultdict(list), defaultdict(list)
+    for episode in episodes:
+        temporal_index[episode.temporal_context['timestamp'].strftime('%Y-%m-%d')].append(episode.trace_id)
+        context_index[f"place:{episode.content['context']['place']}"].append(episode.trace_id)
+
+    for label, query in QUERIES:
+        scan_ms = timed(lambda: scan_retrieve(module, temporal_index, context_index, query), repeats)
+        indexed_ms = timed(lambda: module._retrieve_episodes(query), repeats)
+        print(f"{label:>16}: scan {scan_ms:9.2f} ms, indexed {indexed_ms:8.2f} ms ({scan_ms / indexed_ms:6.1f}x)")
+
+    def full_walk():
+        """The previous pass over every episode, on copies of the strengths"""
+        strengths = {}
+        for episode in module.episodes.values():
+            if episode.retrieval_count > 3 or abs(episode.emotional_valence) > 0.7:
+                strengths[episode.trace_id] = min(1.0, episode.encoding_strength * 1.1)
+            elif episode.retrieval_count == 0 and episode.encoding_strength < 0.3:
+                strengths[episode.trace_id] = episode.encoding_strength * 0.9
+
+    def incremental():
+        for episode in episodes[:100]:
+            module.store.mark_changed(episode)
+        module._consolidate_memories()
+    walk_ms = timed(full_walk, repeats)
+    incremental_ms = timed(incremental, repeats)
+    print(f"   consolidation: full walk {walk_ms:9.2f} ms, incremental {incremental_ms:8.2f} ms (100 changed)")
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    r = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    run_benchmark(n, r)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: knowledge graph construction, traversal and message passing
+
+Builds the same random typed graph in the previous dict-of-edge-lists layout
+and in GraphStore, then times edge insertion, neighbour-mean embedding
+updates and shortest-path searches in each.
+
+Usage:
+    python scripts/benchmarks/benchmark_graph_store.py [num_edges] [num_nodes]
+"""
+
+import os
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.reasoning.graph_store import GraphStore
+
+EDGE_TYPES = ["is_a", "part_of", "related_to", "causes", "enables", "requires", "similar_to"]
+EMBEDDING_DIM = 128
+PATH_QUERIES = 200
+
+def legacy_build(edges):
+    """Edge lists of dicts with the linear duplicate scan"""
+    graph = defaultdict(list)
+    for source, target, edge_type in edges:
+        if any(e["target"] == target and e["type"] == edge_type for e in graph[source]):
+            continue
+        graph[source].append({"target": target, "type": edge_type, "weight": 1.0})
+    return graph
+
+def legacy_propagate(graph, embeddings):
+    for node, edges in graph.items():
+        neighbors = [embeddings[e["target"]] for e in edges if e["target"] in embeddings]
+        if neighbors:
+            embeddings[node] = 0.8 * embeddings[node] + 0.2 * np.mean(neighbors, axis=0)
+
+def legacy_path(graph, source, target, max_length):
+    queue, visited = [(source, [source])], set()
+    while queue:
+        node, path = queue.pop(0)
+        if node in visited or len(path) > max_length:
+            continue
+        visited.add(node)
+        for edge in graph.get(node, []):
+            if edge["target"] == target:
+                return path + [target]
+            if edge["target"] not in visited:
+                queue.append((edge["target"], path + [edge["target"]]))
+    return None
+
+def run_benchmark(num_edges: int = 1_000_000, num_nodes: int = 100_000):
+    rng = np.random.default_rng(42)
+    names = [f"concept_{i}" for i in range(num_nodes)]
+    sources = rng.integers(0, num_nodes, num_edges)
+    targets = rng.integers(0, num_nodes, num_edges)
+    types = rng.integers(0, len(EDGE_TYPES), num_edges)
+    edges = [(names[s], names[t], EDGE_TYPES[k]) for s, t, k in zip(sources, targets, types)]
+    queries = [(names[s], names[t]) for s, t in rng.integers(0, num_nodes, (PATH_QUERIES, 2))]
+
+    start = time.perf_counter()
+    legacy = legacy_build(edges)
+    legacy_build_s = time.perf_counter() - start
+    start = time.perf_counter()
+    store = GraphStore(EMBEDDING_DIM)
+    for name in names:
+        store.add_node(name)
+    for source, target, edge_type in edges:
+        store.add_edge(source, target, edge_type)
+    store.csr
+    store_build_s = time.perf_counter() - start
+    print(f"build {store.num_edges:,} edges: legacy {legacy_build_s:.1f}s, store {store_build_s:.1f}s")
+
+    embeddings = {name: store.embedding(name).copy() for name in names}
+    start = time.perf_counter()
+    legacy_propagate(legacy, embeddings)
+    legacy_prop_s = time.perf_counter() - start
+    start = time.perf_counter()
+    store.propagate()
+    store_prop_s = time.perf_counter() - start
+    print(f"embedding update: legacy {legacy_prop_s:.2f}s, store {store_prop_s:.3f}s "
+          f"({legacy_prop_s / store_prop_s:.0f}x)")
+
+    start = time.perf_counter()
+    legacy_found = [legacy_path(legacy, s, t, 4) for s, t in queries]
+    legacy_path_s = time.perf_counter() - start
+    start = time.perf_counter()
+    store_found = [store.shortest_path(s, t, 4) for s, t in queries]
+    store_path_s = time.perf_counter() - start
+    assert [p is None for p in legacy_found] == [p is None for p in store_found]
+    print(f"{PATH_QUERIES} path searches: legacy {legacy_path_s:.2f}s, store {store_path_s:.2f}s "
+          f"({legacy_path_s / store_path_s:.1f}x)")
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    nodes = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    run_benchmark(n, nodes)
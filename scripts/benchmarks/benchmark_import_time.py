@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark: import and construction time of the daily learning entry points
+
+Each measurement runs in a fresh interpreter so nothing is already cached in
+sys.modules. Reports the median time to import the daily learning loop and
+the core package, and to construct the neural-symbolic and consciousness
+systems, whose engines, databases and thread pool are now built on first use.
+Exits with status 1 when importing the daily learning loop exceeds the budget.
+
+Usage:
+    python scripts/benchmarks/benchmark_import_time.py [budget_ms] [runs]
+"""
+
+import os
+import sys
+import json
+import tempfile
+import statistics
+import subprocess
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Median milliseconds allowed for ``import core.learning.daily_learning_loop``
+IMPORT_BUDGET_MS = 75
+
+MEASUREMENTS = [
+    ("import core", "import core"),
+    ("import daily_learning_loop", "import core.learning.daily_learning_loop"),
+    ("import neural_symbolic_integration", "import core.reasoning.neural_symbolic_integration"),
+    ("NeuralSymbolicIntegration()", "from core.reasoning.neural_symbolic_integration import NeuralSymbolicIntegration\n"
+                                    "start = time.perf_counter()\nNeuralSymbolicIntegration()"),
+    ("ConsciousnessIntegrationFramework()", "from core.consciousness.consciousness_integration_framework import "
+                                            "ConsciousnessIntegrationFramework\n"
+                                            "start = time.perf_counter()\nConsciousnessIntegrationFramework()"),
+]
+
+PROBE = """
+import sys, time, json, logging
+logging.disable(logging.CRITICAL)
+start = time.perf_counter()
+{code}
+print(json.dumps({{"ms": (time.perf_counter() - start) * 1000, "numpy": "numpy" in sys.modules}}))
+"""
+
+def measure(code: str, cwd: str) -> dict:
+    """Run ``code`` in a fresh interpreter and return its timing"""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    output = subprocess.run([sys.executable, "-c", PROBE.format(code=code)], cwd=cwd, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def benchmark(budget_ms: float, runs: int) -> bool:
+    print(f"Median of {runs} fresh interpreters")
+    print(f"{'measurement':>36} {'ms':>8}  numpy loaded")
+    results = {}
+    # Run from a scratch directory: the learning loop creates its log file on import
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, code in MEASUREMENTS:
+            samples = [measure(code, tmp) for _ in range(runs)]
+            results[name] = statistics.median(s["ms"] for s in samples)
+            print(f"{name:>36} {results[name]:>8.1f}  {samples[0]['numpy']}")
+
+    loop_ms = results["import daily_learning_loop"]
+    within = loop_ms <= budget_ms
+    print(f"\n{'✅' if within else '❌'} daily_learning_loop import {loop_ms:.1f}ms (budget {budget_ms:.0f}ms)")
+    return within
+
+if __name__ == "__main__":
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else IMPORT_BUDGET_MS
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    sys.exit(0 if benchmark(budget_ms, runs) else 1)
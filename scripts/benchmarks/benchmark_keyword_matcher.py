@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: keyword detection over full episode transcripts
+
+Times the old per-phrase ``phrase in text`` loop against KeywordMatcher, both
+with its default engine choice and with the Aho-Corasick automaton forced, for
+the AV pipeline's teaching-moment keyword sets and for larger vocabularies.
+Episodes are built from the sample transcript chunks unless transcript files
+(JSON or JSONL) are given.
+
+Usage:
+    python scripts/benchmarks/benchmark_keyword_matcher.py [transcript ...]
+"""
+
+import os
+import sys
+import time
+import random
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, REPO_ROOT)
+
+from core.reasoning.keyword_matcher import KeywordMatcher
+from marcus_av_pipeline.transcript_stream import read_transcript_chunks
+from marcus_av_pipeline.emotional_analysis import TEACHING_KEYWORDS
+from marcus_av_pipeline.teaching_moment_detector import KEYWORDS
+
+SAMPLE_TRANSCRIPT = os.path.join(REPO_ROOT, "output", "transcripts", "MrRogersspeech_transcript.json")
+EPISODES = 20
+CHUNKS_PER_EPISODE = 56   # a 28 minute episode in 30 second chunks
+
+def naive_found(phrases, text):
+    lowered = text.lower()
+    return {phrase for phrase in phrases if phrase.lower() in lowered}
+
+def sample_episodes(rng: random.Random):
+    """Full-length episodes assembled from shuffled sample sentences"""
+    words = " ".join(chunk["text"] for chunk in read_transcript_chunks(SAMPLE_TRANSCRIPT)).split()
+    episodes = []
+    for _ in range(EPISODES):
+        chunks = []
+        for _ in range(CHUNKS_PER_EPISODE):
+            start = rng.randrange(len(words))
+            chunks.append(" ".join((words * 2)[start:start + 75]))
+        episodes.append(chunks)
+    return episodes
+
+def vocabulary(episodes, size: int, rng: random.Random):
+    """Phrase list of ``size`` one- to three-word phrases, about half drawn from the episodes"""
+    words = sorted({w for chunks in episodes for chunk in chunks for w in chunk.split()})
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    phrases = set()
+    while len(phrases) < size:
+        if rng.random() < 0.5:
+            phrases.add(" ".join(rng.choice(words) for _ in range(rng.randint(1, 3))))
+        else:
+            phrases.add("".join(rng.choice(letters) for _ in range(rng.randint(4, 10))))
+    return sorted(phrases)
+
+def timed(fn, episodes) -> float:
+    start = time.perf_counter()
+    for chunks in episodes:
+        for chunk in chunks:
+            fn(chunk)
+    return (time.perf_counter() - start) * 1000 / len(episodes)
+
+def benchmark(episodes, rng: random.Random):
+    keyword_sets = [
+        ("TEACHING_KEYWORDS", TEACHING_KEYWORDS),
+        ("detector KEYWORDS", KEYWORDS),
+        ("100 phrases", vocabulary(episodes, 100, rng)),
+        ("1,000 phrases", vocabulary(episodes, 1_000, rng)),
+        ("10,000 phrases", vocabulary(episodes, 10_000, rng)),
+    ]
+    chunks = sum(len(e) for e in episodes)
+    chars = sum(len(c) for e in episodes for c in e)
+    print(f"Keyword hits per chunk over {len(episodes)} episodes ({chunks:,} chunks, {chars:,} chars)")
+    print(f"{'keyword set':>18} {'in-loop':>10} {'matcher':>10} {'automaton':>10}   ms per episode")
+    for name, phrases in keyword_sets:
+        matcher = KeywordMatcher(phrases)
+        automaton = KeywordMatcher(phrases, direct_scan_limit=0)
+        for chunk in episodes[0]:
+            assert matcher.found(chunk) == automaton.found(chunk) == naive_found(phrases, chunk)
+        naive_ms = timed(lambda text: naive_found(phrases, text), episodes)
+        matcher_ms = timed(matcher.found, episodes)
+        automaton_ms = timed(automaton.found, episodes)
+        print(f"{name:>18} {naive_ms:>10.2f} {matcher_ms:>10.2f} {automaton_ms:>10.2f}")
+
+if __name__ == "__main__":
+    rng = random.Random(42)
+    if len(sys.argv) > 1:
+        episodes = [[chunk["text"] for chunk in read_transcript_chunks(path)] for path in sys.argv[1:]]
+    else:
+        episodes = sample_episodes(rng)
+    benchmark(episodes, rng)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: reviews per second with connect-per-call vs pooled connections
+
+Seeds a throwaway memory database, then reviews every concept several times
+using the old connect-per-call pattern and the pooled ``MarcusMemorySystem``.
+
+Usage:
+    python scripts/benchmarks/benchmark_memory_connections.py [num_concepts] [rounds]
+"""
+
+import os
+import sys
+import time
+import json
+import sqlite3
+import logging
+import tempfile
+import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.memory.memory_system import MarcusMemorySystem, Concept
+from core.memory.learners import DEFAULT_LEARNER_ID
+
+logging.getLogger('core.memory.memory_system').setLevel(logging.WARNING)
+
+def connect_per_call_review(db_path: str, concept_id: str, success: bool) -> bool:
+    """The pre-pool review path: open, read, update, commit, close"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT context_vector, related_concepts, ease_factor, interval_days, repetitions
+            FROM memory_records WHERE learner_id = ? AND concept_id = ?
+        """, (DEFAULT_LEARNER_ID, concept_id))
+        row = cursor.fetchone()
+        if not row:
+            return False
+        json.loads(row[0])
+        json.loads(row[1])
+        ease_factor, interval_days, repetitions = row[2], row[3], row[4]
+        if success:
+            repetitions += 1
+            interval_days = 1 if repetitions == 1 else 6 if repetitions == 2 else int(interval_days * ease_factor)
+        else:
+            repetitions, interval_days = 0, 1
+            ease_factor = max(1.3, ease_factor - 0.2)
+        next_review = (datetime.datetime.now() + datetime.timedelta(days=interval_days)).isoformat()
+        cursor.execute("""
+            UPDATE memory_records SET ease_factor = ?, interval_days = ?,
+                repetitions = ?, last_reviewed = ?, next_review = ?
+            WHERE learner_id = ? AND concept_id = ?
+        """, (ease_factor, interval_days, repetitions,
+              datetime.datetime.now().isoformat(), next_review, DEFAULT_LEARNER_ID, concept_id))
+        conn.commit()
+        return True
+    finally:
+        conn.close()
+
+def run_benchmark(num_concepts: int = 500, rounds: int = 3):
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for label in ('connect_per_call', 'pooled'):
+            db_path = os.path.join(tmp, f"{label}.db")
+            memory = MarcusMemorySystem(db_path)
+            for i in range(num_concepts):
+                memory.learn_concept(Concept(f"concept_{i}", f"Concept number {i}", "math"))
+            concept_ids = [f"concept_{i}" for i in range(num_concepts)]
+
+            start = time.perf_counter()
+            for r in range(rounds):
+                for cid in concept_ids:
+                    if label == 'pooled':
+                        memory.review_concept(cid, success=(r % 2 == 0))
+                    else:
+                        connect_per_call_review(db_path, cid, success=(r % 2 == 0))
+            elapsed = time.perf_counter() - start
+            memory.close()
+
+            reviews = num_concepts * rounds
+            results[label] = reviews / elapsed
+            print(f"{label:>18}: {reviews} reviews in {elapsed:.3f}s -> {results[label]:,.0f} reviews/sec")
+
+        print(f"{'speedup':>18}: {results['pooled'] / results['connect_per_call']:.2f}x")
+        return results
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    run_benchmark(n, rounds)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Monte Carlo inference in ProbabilisticReasoningModule
+
+Times the previous per-sample loop (three np.random.choice calls per sample
+and a list.count per state) against the batched ancestral sampler, then the
+batched sampler alone at millions of samples, with and without evidence.
+
+Usage:
+    python scripts/benchmarks/benchmark_monte_carlo.py [num_samples]
+"""
+
+import os
+import sys
+import time
+import logging
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.reasoning.advanced_cognitive_modules import ProbabilisticReasoningModule
+
+logging.getLogger('core').setLevel(logging.WARNING)
+
+LOOP_SAMPLES = 20000
+
+def loop_simulation(module: ProbabilisticReasoningModule, num_samples: int):
+    """The previous sampler: one sample at a time"""
+    cpt = module.conditional_probabilities["learning_success"]
+    samples = []
+    for _ in range(num_samples):
+        attention = np.random.choice(["focused", "distracted"], p=[0.7, 0.3])
+        knowledge = np.random.choice(["extensive", "moderate", "limited"], p=[0.2, 0.5, 0.3])
+        distribution = cpt[(attention, knowledge)]
+        samples.append(np.random.choice(list(distribution), p=list(distribution.values())))
+    return {value: samples.count(value) / len(samples) for value in set(samples)}
+
+def run_benchmark(num_samples: int = 5_000_000):
+    module = ProbabilisticReasoningModule()
+
+    start = time.perf_counter()
+    loop_simulation(module, LOOP_SAMPLES)
+    loop_rate = LOOP_SAMPLES / (time.perf_counter() - start)
+    start = time.perf_counter()
+    module._monte_carlo_simulation({'query_variable': 'learning_success', 'num_samples': LOOP_SAMPLES})
+    batch_rate = LOOP_SAMPLES / (time.perf_counter() - start)
+    print(f"{LOOP_SAMPLES:,} samples: loop {loop_rate:,.0f}/s, batched {batch_rate:,.0f}/s "
+          f"({batch_rate / loop_rate:.0f}x)")
+
+    for evidence in ({}, {'learning_success': 'high'}):
+        start = time.perf_counter()
+        result = module._monte_carlo_simulation({
+            'query_variable': 'attention_level', 'num_samples': num_samples, 'evidence': evidence
+        })
+        elapsed = time.perf_counter() - start
+        label = "likelihood-weighted" if evidence else "prior"
+        print(f"{num_samples:,} {label} samples in {elapsed:.2f}s: {result['empirical_distribution']}")
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    run_benchmark(n)
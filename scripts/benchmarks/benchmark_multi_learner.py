@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-learner query latency as the learner count grows
+
+Grows one memory database from 10 to 10,000 learners and times the queries a
+single learner's session runs: due reviews, mastery statistics and the grade
+progression mastery average. With learner-leading composite indexes each
+query only touches its own learner's rows, so latency should stay flat.
+
+Usage:
+    python scripts/benchmarks/benchmark_multi_learner.py [concepts_per_learner] [queries]
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.memory.memory_system import MarcusMemorySystem, Concept
+
+logging.getLogger('core.memory.memory_system').setLevel(logging.WARNING)
+
+LEARNER_COUNTS = (10, 100, 1_000, 10_000)
+
+def timed_ms(fn, learners, queries: int, rng: random.Random) -> float:
+    """Mean milliseconds per call of ``fn`` on randomly chosen learners"""
+    picks = [rng.choice(learners) for _ in range(queries)]
+    start = time.perf_counter()
+    for learner in picks:
+        fn(learner)
+    return (time.perf_counter() - start) * 1000 / queries
+
+def benchmark(concepts_per_learner: int, queries: int):
+    rng = random.Random(42)
+    subjects = ["math", "reading", "science", "social", "art"]
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = MarcusMemorySystem(os.path.join(tmp, "learners.db"))
+        conn = memory.connections.get_connection()
+        learners = []
+
+        def mastery_average(learner):
+            conn.execute("SELECT AVG(mastery_level) FROM memory_records WHERE learner_id = ?",
+                         (learner.learner_id,)).fetchone()
+
+        def due_reviews(learner):
+            # Drop cached queues so every call loads the learner's due queue from SQLite
+            memory.connections.cache.clear()
+            learner.get_due_reviews(10)
+
+        print(f"Per-learner query latency, {concepts_per_learner} concepts per learner")
+        print(f"{'learners':>9} {'rows':>10} {'due reviews':>12} {'learning stats':>15} {'mastery avg':>12}")
+        for target in LEARNER_COUNTS:
+            while len(learners) < target:
+                learner = memory.for_learner(f"learner_{len(learners):05d}")
+                learner.learn_concepts_bulk(
+                    Concept(f"concept_{i}", f"Concept {i}", subjects[i % len(subjects)])
+                    for i in range(concepts_per_learner)
+                )
+                # A few reviews so mastery levels and review times differ between concepts
+                learner.review_concepts_batch(
+                    (f"concept_{rng.randrange(concepts_per_learner)}", rng.randint(0, 5)) for _ in range(5)
+                )
+                learners.append(learner)
+
+            rows = conn.execute("SELECT COUNT(*) FROM memory_records").fetchone()[0]
+            due_ms = timed_ms(due_reviews, learners, queries, rng)
+            stats_ms = timed_ms(lambda l: l.get_learning_stats(), learners, queries, rng)
+            mastery_ms = timed_ms(mastery_average, learners, queries, rng)
+            print(f"{target:>9,} {rows:>10,} {due_ms:>10.3f}ms {stats_ms:>13.3f}ms {mastery_ms:>10.3f}ms")
+        memory.close()
+
+if __name__ == "__main__":
+    concepts_per_learner = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    benchmark(concepts_per_learner, queries)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark: TransformerNLPModule attention and text embeddings on long inputs
+
+Times the previous per-pair attention loop (one cosine, with both norms, per
+token pair) against the matrix attention, and repeated text embedding with
+and without the LRU cache, over inputs of about 1k tokens.
+
+Usage:
+    python scripts/benchmarks/benchmark_nlp_attention.py [tokens] [repeats]
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.reasoning.advanced_cognitive_modules import TransformerNLPModule
+
+logging.getLogger('core').setLevel(logging.WARNING)
+
+EXTRA_WORDS = ["block", "tower", "friend", "share", "count", "paint", "garden", "story", "kind", "brave"]
+
+def pairwise_attention(module: TransformerNLPModule, tokens):
+    """The previous attention: _token_similarity for every ordered token pair"""
+    scores = {}
+    for i, token in enumerate(tokens):
+        pairs = [module._token_similarity(token, other) for j, other in enumerate(tokens) if i != j]
+        scores[token] = statistics.mean(pairs) if pairs else 0.0
+    return scores
+
+def sample_text(module: TransformerNLPModule, length: int, rng: random.Random) -> str:
+    """Mostly vocabulary words with some unknown ones, like real input"""
+    words = sorted(module.vocabulary) + EXTRA_WORDS
+    return " ".join(rng.choice(words) for _ in range(length))
+
+def timed_ms(fn, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def run_benchmark(length: int = 1000, repeats: int = 3):
+    rng = random.Random(42)
+    module = TransformerNLPModule()
+    text = sample_text(module, length, rng)
+    tokens = module._tokenize(text)
+
+    pairwise_ms = timed_ms(lambda: pairwise_attention(module, tokens), 1)
+    matrix_ms = timed_ms(lambda: module._compute_attention(tokens), repeats)
+    print(f"attention over {len(tokens)} tokens: pairwise {pairwise_ms:.1f} ms, "
+          f"matrix {matrix_ms:.2f} ms ({pairwise_ms / matrix_ms:.0f}x)")
+
+    def uncached():
+        module._text_embedding_cache.clear()
+        return module._get_text_embedding(text)
+    uncached_ms = timed_ms(uncached, repeats)
+    module._get_text_embedding(text)
+    cached_ms = timed_ms(lambda: module._get_text_embedding(text), repeats)
+    print(f"text embedding of {len(tokens)} tokens: uncached {uncached_ms:.3f} ms, "
+          f"cached {cached_ms:.4f} ms ({uncached_ms / cached_ms:.0f}x)")
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    run_benchmark(n, repeats)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: symbolic rule and neural pattern matching, full scans vs the compiled index
+
+Fills NeuralSymbolicIntegration with synthetic rules and patterns, then times
+each problem with the previous approach (re-tokenizing and concept-matching
+every rule, rebuilding the concept mappings for every pattern) against the
+compiled feature index, which tokenizes the problem once and scores only the
+rules and patterns sharing a keyword or concept with it.
+
+Usage:
+    python scripts/benchmarks/benchmark_rule_index.py [num_rules] [repeats]
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.reasoning.neural_symbolic_integration import (
+    CONCEPT_MAPPINGS, CONCEPT_MATCHER, PATTERN_CONCEPT_MAPPINGS, NeuralPattern, NeuralSymbolicIntegration, SymbolicRule, _keywords
+)
+
+logging.getLogger('core').setLevel(logging.WARNING)
+
+TERMS = [f"term{i}" for i in range(5000)]
+CONCEPT_WORDS = list(CONCEPT_MAPPINGS) + [s for synonyms in CONCEPT_MAPPINGS.values() for s in synonyms]
+
+PROBLEMS = [
+    ("rare terms", "how does term17 relate to term4242", "explain term17"),
+    ("concepts", "find a new creative way to move the heavy box", "solve the problem"),
+    ("mixed", "help a friend understand term99 and term100", "learn term99"),
+]
+
+def synthetic_rule(i: int, rng: random.Random) -> SymbolicRule:
+    words = rng.sample(TERMS, 3) + ([rng.choice(CONCEPT_WORDS)] if i % 10 == 0 else [])
+    return SymbolicRule(rule_id=f"rule_{i}", condition=" ".join(words[:2]), conclusion=" ".join(words[2:]),
+                        confidence=rng.random(), evidence_count=rng.randint(1, 10),
+                        rule_type="causal", context_domain="general")
+
+def synthetic_pattern(i: int, rng: random.Random) -> NeuralPattern:
+    return NeuralPattern(pattern_id=f"pattern_{i}", pattern_type="generated", input_features=rng.sample(TERMS, 4),
+                         output_prediction="apply_rule", confidence=rng.random(), success_rate=rng.random() * 0.5,
+                         context_tags=[rng.choice(list(PATTERN_CONCEPT_MAPPINGS))] if i % 10 == 0 else [])
+
+def scan_rules(system: NeuralSymbolicIntegration, description: str, goal: str):
+    """The previous rule search: re-tokenize and concept-match every rule"""
+    problem_text = f"{description} {goal}".lower()
+    return [rule for rule in system.symbolic_rules.values()
+            if _scan_rule_matches(rule, problem_text)]
+
+def _scan_rule_matches(rule: SymbolicRule, problem_text: str) -> bool:
+    rule_text = f"{rule.condition} {rule.conclusion}".lower()
+    rule_keywords, problem_keywords = _keywords(rule_text), _keywords(problem_text)
+    rule_hits, problem_hits = CONCEPT_MATCHER.found(rule_text), CONCEPT_MATCHER.found(problem_text)
+    semantic_matches = 0
+    for concept, synonyms in CONCEPT_MAPPINGS.items():
+        if concept in rule_hits:
+            semantic_matches += any(syn in problem_hits for syn in synonyms)
+        elif any(syn in rule_hits for syn in synonyms):
+            semantic_matches += concept in problem_hits or any(syn in problem_hits for syn in synonyms)
+    if not rule_keywords:
+        return False
+    return (len(rule_keywords & problem_keywords) / len(rule_keywords) * 0.7
+            + semantic_matches / len(CONCEPT_MAPPINGS) * 0.3) > 0.15
+
+def scan_patterns(system: NeuralSymbolicIntegration, features):
+    """The previous pattern search: score every pattern"""
+    feature_set = set(features)
+    matches = []
+    for pattern in system.neural_patterns.values():
+        pattern_features = set(pattern.input_features + pattern.context_tags)
+        mappings = dict(PATTERN_CONCEPT_MAPPINGS)
+        semantic_matches = total_concepts = 0
+        for feature in pattern_features:
+            for concept, synonyms in mappings.items():
+                if feature == concept or feature in synonyms:
+                    total_concepts += 1
+                    semantic_matches += any(s in feature_set for s in synonyms) or concept in feature_set
+                    break
+        direct = len(pattern_features & feature_set) / len(pattern_features)
+        semantic = semantic_matches / total_concepts if total_concepts else 0.0
+        score = min(direct * 0.6 + semantic * 0.4 + pattern.success_rate * 0.2 + min(pattern.usage_count / 10.0, 0.1), 1.0)
+        if score > 0.3:
+            matches.append((pattern, score))
+    return matches
+
+def timed(function, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+def run_benchmark(num_rules: int = 100_000, repeats: int = 3):
+    rng = random.Random(9)
+    system = NeuralSymbolicIntegration(db_path=":memory:")
+    start = time.perf_counter()
+    for i in range(num_rules):
+        system.symbolic_rules[f"rule_{i}"] = synthetic_rule(i, rng)
+        system.neural_patterns[f"pattern_{i}"] = synthetic_pattern(i, rng)
+    print(f"Compiled {num_rules:,} rules and {num_rules:,} patterns in {time.perf_counter() - start:.2f}s")
+
+    for label, description, goal in PROBLEMS:
+        features = system._extract_problem_features(description, goal)
+        assert scan_rules(system, description, goal) == system._matching_rules(description, goal)
+        assert scan_patterns(system, features) == system._matching_patterns(features)
+        scan_ms = timed(lambda: scan_rules(system, description, goal), repeats)
+        indexed_ms = timed(lambda: system._matching_rules(description, goal), repeats)
+        print(f"{label:>10} rules:    scan {scan_ms:9.2f} ms, indexed {indexed_ms:8.2f} ms ({scan_ms / indexed_ms:7.1f}x)")
+        scan_ms = timed(lambda: scan_patterns(system, features), repeats)
+        indexed_ms = timed(lambda: system._matching_patterns(features), repeats)
+        print(f"{label:>10} patterns: scan {scan_ms:9.2f} ms, indexed {indexed_ms:8.2f} ms ({scan_ms / indexed_ms:7.1f}x)")
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    r = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    run_benchmark(n, r)
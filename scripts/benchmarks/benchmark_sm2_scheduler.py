@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vectorized SM-2 scheduling on synthetic concepts
+
+Compares the per-concept SM-2 loop against one vectorized SM2Scheduler
+step, then compares per-call review_concept against review_concepts_batch
+on a throwaway memory database.
+
+Usage:
+    python scripts/benchmarks/benchmark_sm2_scheduler.py [num_concepts] [db_sample]
+"""
+
+import os
+import sys
+import time
+import logging
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.memory.sm2_scheduler import SM2Scheduler, SM2State
+from core.memory.memory_system import MarcusMemorySystem, Concept
+
+logging.getLogger('core.memory.memory_system').setLevel(logging.WARNING)
+
+def scalar_sm2(ease, interval, repetitions, quality):
+    """One-at-a-time SM-2, as each call site used to implement it"""
+    new_ease = max(1.3, ease + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)))
+    if quality < 3:
+        return 1, new_ease, 0
+    repetitions += 1
+    if repetitions == 1:
+        return 1, new_ease, repetitions
+    if repetitions == 2:
+        return 6, new_ease, repetitions
+    return int(interval * new_ease), new_ease, repetitions
+
+def benchmark_compute(n: int):
+    rng = np.random.default_rng(42)
+    ease = rng.uniform(1.3, 2.8, n)
+    interval = rng.integers(1, 60, n).astype(float)
+    reps = rng.integers(0, 6, n)
+    quality = rng.integers(0, 6, n)
+
+    start = time.perf_counter()
+    for i in range(n):
+        scalar_sm2(float(ease[i]), float(interval[i]), int(reps[i]), int(quality[i]))
+    scalar = time.perf_counter() - start
+
+    scheduler = SM2Scheduler()
+    state = SM2State(ease, interval, reps, np.zeros(n))
+    start = time.perf_counter()
+    scheduler.schedule(state, quality)
+    vectorized = time.perf_counter() - start
+
+    print(f"Schedule computation for {n:,} concepts")
+    print(f"{'scalar loop':>22}: {scalar * 1000:9.2f} ms")
+    print(f"{'vectorized':>22}: {vectorized * 1000:9.2f} ms  ({scalar / vectorized:.1f}x)")
+
+def benchmark_database(n: int, sample: int):
+    rng = np.random.default_rng(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = MarcusMemorySystem(os.path.join(tmp, "sm2.db"))
+        memory.learn_concepts_bulk(Concept(f"concept_{i}", f"Concept number {i}", "math") for i in range(n))
+        quality = rng.integers(0, 6, n)
+
+        start = time.perf_counter()
+        for i in range(sample):
+            memory.review_concept(f"concept_{i}", success=bool(quality[i] >= 3))
+        per_call = sample / (time.perf_counter() - start)
+
+        outcomes = [(f"concept_{i}", int(quality[i])) for i in range(n)]
+        start = time.perf_counter()
+        memory.review_concepts_batch(outcomes)
+        batched = n / (time.perf_counter() - start)
+        memory.close()
+
+    print(f"Database reviews ({n:,} concepts, per-call measured on {sample:,})")
+    print(f"{'review_concept':>22}: {per_call:12,.0f} reviews/sec")
+    print(f"{'review_concepts_batch':>22}: {batched:12,.0f} reviews/sec  ({batched / per_call:.1f}x)")
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    sample = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    benchmark_compute(n)
+    benchmark_database(n, min(sample, n))
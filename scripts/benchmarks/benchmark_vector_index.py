@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: top-k memory recall with the vector index
+
+Fills a memory-mapped index with synthetic memory texts, then times batched
+exact search and probed search after training the coarse quantizer, and
+reports how many of the exact top-k the probed search recovers.
+
+Usage:
+    python scripts/benchmarks/benchmark_vector_index.py [num_vectors] [num_queries]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.memory.vector_index import VectorIndex, embed_texts
+
+COMMON_WORDS = ["I", "felt", "today", "with", "my", "friend", "and", "the", "learned", "played"]
+TOPICS = 500
+WORDS_PER_TOPIC = 12
+BATCH_SIZE = 20000
+TOP_K = 10
+
+def synthetic_texts(count: int, rng: random.Random):
+    """Memory-like texts, each mostly drawn from one of TOPICS small vocabularies"""
+    for _ in range(count):
+        topic = rng.randrange(TOPICS)
+        words = [f"w{topic}_{rng.randrange(WORDS_PER_TOPIC)}" for _ in range(rng.randint(4, 8))]
+        words += rng.sample(COMMON_WORDS, 3)
+        rng.shuffle(words)
+        yield " ".join(words)
+
+def run_benchmark(num_vectors: int = 200_000, num_queries: int = 64):
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = VectorIndex(path=os.path.join(tmp, "vectors"))
+
+        start = time.perf_counter()
+        texts = []
+        for i, text in enumerate(synthetic_texts(num_vectors, rng)):
+            texts.append(text)
+            if len(texts) == BATCH_SIZE:
+                index.add_texts([f"m{i - BATCH_SIZE + 1 + j}" for j in range(BATCH_SIZE)], texts)
+                texts = []
+        if texts:
+            index.add_texts([f"m{num_vectors - len(texts) + j}" for j in range(len(texts))], texts)
+        index.save()
+        print(f"📝 Indexed {num_vectors:,} texts in {time.perf_counter() - start:.1f}s")
+
+        queries = embed_texts(list(synthetic_texts(num_queries, rng)))
+        start = time.perf_counter()
+        exact = index.search(queries, TOP_K)
+        exact_s = time.perf_counter() - start
+        print(f"exact:  {exact_s * 1000 / num_queries:8.2f} ms/query ({num_queries} queries in one batch)")
+
+        nlist = max(16, int(num_vectors ** 0.5))
+        start = time.perf_counter()
+        index.train_quantizer(nlist)
+        print(f"🧭 Trained {nlist}-group quantizer in {time.perf_counter() - start:.1f}s")
+        for nprobe in (4, 16, 64):
+            start = time.perf_counter()
+            probed = index.search(queries, TOP_K, nprobe=nprobe)
+            probed_s = time.perf_counter() - start
+            overlap = sum(len({i for i, _ in a} & {i for i, _ in b}) for a, b in zip(exact, probed))
+            print(f"nprobe={nprobe:<3} {probed_s * 1000 / num_queries:8.2f} ms/query, "
+                  f"recall@{TOP_K} {overlap / (TOP_K * num_queries):.2f}, "
+                  f"{exact_s / probed_s:.1f}x faster than exact")
+        index.close()
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    run_benchmark(n, queries)
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+One-shot import of output/sessions/*.json files into the indexed session store
+
+Usage:
+    python scripts/migration/import_session_files.py [sessions_dir] [session_db]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.learning.session_store import SessionStore, import_session_files
+
+LEARNING_OUTPUT_DIR = os.path.join("core", "learning", "output")
+
+def import_sessions(sessions_dir=os.path.join(LEARNING_OUTPUT_DIR, "sessions"),
+                    session_db=os.path.join(LEARNING_OUTPUT_DIR, "sessions.db")):
+    print(f"🔄 Importing session files from {sessions_dir}...")
+
+    if not os.path.exists(sessions_dir):
+        print("No sessions to import")
+        return
+
+    store = SessionStore(session_db)
+    imported = import_session_files(store, sessions_dir)
+
+    print(f"✅ Imported {imported} sessions ({store.count_sessions()} now in {session_db})")
+
+if __name__ == "__main__":
+    import_sessions(*sys.argv[1:3])
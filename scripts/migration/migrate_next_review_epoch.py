@@ -0,0 +1,46 @@
+import sqlite3
+from datetime import datetime
+
+def migrate_next_review_epoch(db_path="marcus_memory.db"):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    print("🔧 Adding integer next_review_ts column...")
+
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(memory_records)")}
+    if "next_review_ts" not in columns:
+        cursor.execute("ALTER TABLE memory_records ADD COLUMN next_review_ts INTEGER")
+
+    rows = cursor.execute("""
+        SELECT rowid, concept_id, next_review FROM memory_records
+        WHERE next_review IS NOT NULL AND next_review_ts IS NULL
+    """).fetchall()
+
+    updates = []
+    for rowid, concept_id, next_review in rows:
+        try:
+            updates.append((int(datetime.fromisoformat(next_review).timestamp()), rowid))
+        except ValueError:
+            print(f"⚠️ Skipping {concept_id}: unparseable next_review {next_review!r}")
+
+    # concept_id repeats across learners, so each record is addressed by rowid
+    cursor.executemany("UPDATE memory_records SET next_review_ts = ? WHERE rowid = ?", updates)
+    print(f"📅 Backfilled {len(updates)} review times")
+
+    # Earlier runs created an index without learner_id that the schema's index makes redundant
+    cursor.execute("DROP INDEX IF EXISTS idx_memory_next_review_ts")
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(memory_records)")}
+    if "learner_id" in columns:
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_memory_learner_next_review_ts
+            ON memory_records(learner_id, next_review_ts)
+        """)
+    else:
+        print("ℹ️ No learner_id column yet; the memory system adds it and its index on first open")
+
+    conn.commit()
+    conn.close()
+    print("✅ next_review_ts migration complete.")
+
+if __name__ == "__main__":
+    migrate_next_review_epoch()
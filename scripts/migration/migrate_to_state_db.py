@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Copy the per-subsystem legacy databases into the shared Marcus state database
+
+Each legacy file is snapshotted into a temporary copy, the copy is brought
+up to its subsystem's current schema, then attached to the state database and
+every table copied with INSERT OR IGNORE, so running the migration twice does
+not duplicate rows. Legacy files are opened read-only and left in place.
+
+Usage:
+    python scripts/migration/migrate_to_state_db.py [state_db] [legacy_dir]
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+import importlib
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.memory.state_store import ensure_schema, state_db_path
+from core.memory.connection_manager import close_connection_manager
+
+# Legacy file -> (module, schema constant) of every subsystem that wrote to it
+LEGACY_DATABASES = {
+    "marcus_memory.db": [("core.memory.memory_system", "MEMORY_SCHEMA")],
+    "marcus_autobiographical_memory.db": [("core.memory.autobiographical_memory_system", "AUTOBIOGRAPHICAL_SCHEMA")],
+    "marcus_personal_narratives.db": [("core.consciousness.personal_narrative_constructor", "NARRATIVE_SCHEMA")],
+    "marcus_intrinsic_motivation.db": [("core.consciousness.intrinsic_motivation_engine", "MOTIVATION_SCHEMA")],
+    "marcus_value_system.db": [("core.consciousness.value_learning_system", "VALUE_SYSTEM_SCHEMA")],
+    "marcus_consciousness.db": [("core.consciousness.consciousness_integration_framework", "CONSCIOUSNESS_SCHEMA")],
+    "marcus_neural_symbolic.db": [("core.reasoning.neural_symbolic_integration", "NEURAL_SYMBOLIC_SCHEMA")],
+    "marcus_cross_domain_transfer.db": [("core.reasoning.cross_domain_transfer_engine", "CROSS_DOMAIN_SCHEMA")],
+    "marcus_enhanced_cognitive.db": [("core.reasoning.enhanced_cognitive_architecture", "ENHANCED_COGNITIVE_SCHEMA")],
+    "peer_interactions.db": [("core.social.peer_interaction_simulation", "PEER_INTERACTION_SCHEMA")],
+    "grade_progression_memory.db": [("core.memory.memory_system", "MEMORY_SCHEMA"),
+                                    ("core.learning.grade_progression_system", "GRADE_PROGRESSION_SCHEMA")],
+}
+
+def load_schemas(entries):
+    schemas = []
+    for module_name, attribute in entries:
+        try:
+            schemas.append(getattr(importlib.import_module(module_name), attribute))
+        except ImportError as e:
+            print(f"⚠️ Skipping {attribute}: {e}")
+    return schemas
+
+def snapshot(legacy_path, directory):
+    """Consistent copy of ``legacy_path`` in ``directory``, read without writing to the original"""
+    copy_path = os.path.join(directory, os.path.basename(legacy_path))
+    source = sqlite3.connect(f"file:{os.path.abspath(legacy_path)}?mode=ro", uri=True)
+    target = sqlite3.connect(copy_path)
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+        target.close()
+    return copy_path
+
+def copy_tables(state_db, legacy_path):
+    """Copy every legacy table that also exists in the state database; returns rows added"""
+    conn = sqlite3.connect(state_db)
+    conn.execute("ATTACH DATABASE ? AS legacy", (legacy_path,))
+    copied = 0
+    try:
+        legacy_tables = conn.execute(
+            "SELECT name, sql FROM legacy.sqlite_master WHERE type = 'table' "
+            "AND name NOT LIKE 'sqlite_%' AND name != 'schema_versions'").fetchall()
+        # Full-text indexes are rebuilt by triggers as their content tables are copied
+        virtual = [name for name, sql in legacy_tables if sql.upper().startswith("CREATE VIRTUAL TABLE")]
+        tables = [name for name, _ in legacy_tables
+                  if not any(name == v or name.startswith(v + "_") for v in virtual)]
+        for table in tables:
+            target = [row[1] for row in conn.execute(f'PRAGMA main.table_info("{table}")')]
+            if not target:
+                print(f"⚠️ {table} has no table in {state_db}, skipped")
+                continue
+            source = {row[1] for row in conn.execute(f'PRAGMA legacy.table_info("{table}")')}
+            columns = ", ".join(f'"{c}"' for c in target if c in source)
+            before = conn.total_changes
+            conn.execute(f'INSERT OR IGNORE INTO main."{table}" ({columns}) SELECT {columns} FROM legacy."{table}"')
+            copied += conn.total_changes - before
+        conn.commit()
+    finally:
+        conn.execute("DETACH DATABASE legacy")
+        conn.close()
+    return copied
+
+def migrate_to_state_db(state_db=None, legacy_dir="."):
+    state_db = state_db or state_db_path()
+    print(f"🔄 Consolidating legacy databases into {state_db}...")
+
+    for filename, entries in LEGACY_DATABASES.items():
+        legacy_path = os.path.join(legacy_dir, filename)
+        if not os.path.exists(legacy_path) or os.path.abspath(legacy_path) == os.path.abspath(state_db):
+            continue
+        schemas = load_schemas(entries)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Upgrade a copy so its columns match the current tables; older code
+            # still reading the legacy file keeps the schema it expects
+            upgraded = snapshot(legacy_path, temp_dir)
+            for schema in schemas:
+                ensure_schema(upgraded, schema)
+                ensure_schema(state_db, schema)
+            close_connection_manager(upgraded)
+            close_connection_manager(state_db)
+
+            copied = copy_tables(state_db, upgraded)
+        print(f"📦 {filename}: {copied} rows copied")
+
+    print("✅ State database migration complete.")
+
+if __name__ == "__main__":
+    migrate_to_state_db(sys.argv[1] if len(sys.argv) > 1 else None,
+                        sys.argv[2] if len(sys.argv) > 2 else ".")
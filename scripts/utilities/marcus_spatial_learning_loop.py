@@ -452,20 +452,20 @@ class MarcusSpatialLearningLoop:
         
         if self.memory_system:
             # Store spatial memories
-            for i, concept in enumerate(concepts_formed):
-                memory_concept = Concept(
+            learn_result = self.memory_system.learn_concepts_bulk(
+                Concept(
                     id=f"spatial_{concept}_{i}",
                     content=f"Spatial concept learned during exploration: {concept}",
                     subject="spatial_learning",
                     grade_level="kindergarten",
                     emotional_context="discovered"
                 )
-                
-                try:
-                    self.memory_system.learn_concept(memory_concept)
-                    memory_consolidation_score += 0.1
-                except Exception as e:
-                    logger.warning(f"Could not store spatial concept: {e}")
+                for i, concept in enumerate(concepts_formed)
+            )
+            
+            if 'error' in learn_result:
+                logger.warning(f"Could not store spatial concepts: {learn_result['error']}")
+            memory_consolidation_score += 0.1 * (learn_result['inserted'] + learn_result['replaced'])
         
         # Update spatial world model
         for relationship in relationships_learned:
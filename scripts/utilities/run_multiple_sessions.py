@@ -5,110 +5,88 @@ Run multiple learning sessions to test analytics and progression
 
 import os
 import json
-import time
 from datetime import date, datetime, timedelta
 
-# First, let's check what was saved
-print("📁 Checking saved sessions...")
-print("=" * 50)
+from core.learning.simulation_runner import SimulationRunner
 
-OUTPUT_DIR = "output/sessions"
+# Worker processes re-import this script, so it only runs as __main__
+if __name__ == "__main__":
+    from core.learning.daily_learning_loop import LearningLoopPaths
 
-if os.path.exists(OUTPUT_DIR):
-    files = sorted([f for f in os.listdir(OUTPUT_DIR) if f.endswith('.json')])
-    print(f"Found {len(files)} saved files:")
-    for f in files:
-        print(f"  - {f}")
-        
-    # Read and display the most recent session
-    if files:
-        latest = files[-1]
-        with open(os.path.join(OUTPUT_DIR, latest), 'r') as f:
-            session = json.load(f)
-        
-        print(f"\n📄 Latest session ({latest}):")
-        print(json.dumps(session, indent=2))
-
-# Now let's simulate multiple days of learning
-print("\n" + "="*50)
-print("🚀 Simulating multiple learning sessions...")
-print("=" * 50)
+    # Each simulated day gets its own date through the simulation runner
+    runner = SimulationRunner(seed=0, start_date=date.today() - timedelta(days=4), end_date=date.today(),
+                              learners=1, output_root="output/simulations/multiple_sessions")
+    paths = LearningLoopPaths.under(runner.learner_dir(runner.learner_id(0)))
+    OUTPUT_DIR = str(paths.output_dir)
+    ANALYTICS_DIR = str(paths.analytics_dir)
 
-# We'll modify the date in the sessions to simulate multiple days
-from core.learning.daily_learning_loop import run_daily_learning_loop
-import core.learning.daily_learning_loop as daily_learning_loop
+    # First, let's check what was saved
+    print("📁 Checking saved sessions...")
+    print("=" * 50)
 
-# Save original TODAY value
-original_today = daily_learning_loop.TODAY
-
-try:
-    # Run sessions for the past few days
-    for days_ago in range(4, -1, -1):  # 4, 3, 2, 1, 0 days ago
-        # Calculate the date
-        session_date = date.today() - timedelta(days=days_ago)
-        date_str = str(session_date)
-        
-        # Temporarily change the date in the module
-        daily_learning_loop.TODAY = date_str
+    if os.path.exists(OUTPUT_DIR):
+        files = sorted([f for f in os.listdir(OUTPUT_DIR) if f.endswith('.json')])
+        print(f"Found {len(files)} saved files:")
+        for f in files:
+            print(f"  - {f}")
         
-        print(f"\n📅 Running session for {date_str}...")
-        print("-" * 30)
+        # Read and display the most recent session
+        if files:
+            latest = files[-1]
+            with open(os.path.join(OUTPUT_DIR, latest), 'r') as f:
+                session = json.load(f)
         
-        # Skip if session already exists
-        session_file = os.path.join(OUTPUT_DIR, f"session_{date_str}.json")
-        if os.path.exists(session_file):
-            print(f"  ⏭️  Session already exists, skipping...")
-            continue
-        
-        # Run the session
-        session = run_daily_learning_loop()
-        
-        print(f"  ✅ Session for {date_str} completed!")
-        time.sleep(0.5)  # Small delay to see the output
+            print(f"\n📄 Latest session ({latest}):")
+            print(json.dumps(session, indent=2))
 
-finally:
-    # Restore original date
-    daily_learning_loop.TODAY = original_today
+    # Now let's simulate multiple days of learning
+    print("\n" + "="*50)
+    print("🚀 Simulating multiple learning sessions...")
+    print("=" * 50)
 
-# Now let's check the analytics
-print("\n" + "="*50)
-print("📊 Checking generated analytics...")
-print("=" * 50)
+    for result in runner.iter_results():
+        print(f"\n📅 Session for {result.day} completed!")
+        print(f"  Concepts: {result.concepts_learned} | Reviews: {result.reviews_completed}")
 
-analytics_files = [f for f in os.listdir(OUTPUT_DIR) if f.startswith('analytics_')]
-if analytics_files:
-    print(f"Found {len(analytics_files)} analytics files:")
-    for f in analytics_files:
-        print(f"  - {f}")
-    
-    # Display the latest analytics
+    # Now let's check the analytics
+    print("\n" + "="*50)
+    print("📊 Checking generated analytics...")
+    print("=" * 50)
+
+    analytics_files = sorted(os.listdir(ANALYTICS_DIR)) if os.path.exists(ANALYTICS_DIR) else []
     if analytics_files:
-        latest_analytics = sorted(analytics_files)[-1]
-        with open(os.path.join(OUTPUT_DIR, latest_analytics), 'r') as f:
-            analytics = json.load(f)
+        print(f"Found {len(analytics_files)} analytics files:")
+        for f in analytics_files:
+            print(f"  - {f}")
+    
+        # Display the latest analytics
+        if analytics_files:
+            latest_analytics = sorted(analytics_files)[-1]
+            with open(os.path.join(ANALYTICS_DIR, latest_analytics), 'r') as f:
+                analytics = json.load(f)
         
-        print(f"\n📈 Latest Analytics ({latest_analytics}):")
-        print(json.dumps(analytics, indent=2))
-else:
-    print("No analytics generated yet (need 5+ sessions)")
+            print(f"\n📈 Latest Analytics ({latest_analytics}):")
+            print(json.dumps(analytics, indent=2))
+    else:
+        print("No analytics generated yet (need 5+ sessions)")
 
-# Summary
-print("\n" + "="*50)
-print("🎯 Summary")
-print("=" * 50)
+    # Summary
+    print("\n" + "="*50)
+    print("🎯 Summary")
+    print("=" * 50)
 
-all_sessions = [f for f in os.listdir(OUTPUT_DIR) if f.startswith('session_')]
-print(f"Total sessions saved: {len(all_sessions)}")
-print(f"Analytics files: {len(analytics_files)}")
+    all_sessions = [f for f in os.listdir(OUTPUT_DIR) if f.endswith('.json')]
+    print(f"Total sessions saved: {len(all_sessions)}")
+    print(f"Analytics files: {len(analytics_files)}")
 
-if len(all_sessions) >= 5:
-    print("\n✅ You now have enough data for analytics!")
-    print("Each new session will generate an analytics report.")
-else:
-    print(f"\n📊 Need {5 - len(all_sessions)} more sessions for analytics to start.")
+    if len(all_sessions) >= 5:
+        print("\n✅ You now have enough data for analytics!")
+        print("Each new session will generate an analytics report.")
+    else:
+        print(f"\n📊 Need {5 - len(all_sessions)} more sessions for analytics to start.")
 
-print("\n💡 Next steps:")
-print("1. Run 'python daily_learning_loop.py' daily")
-print("2. After 5+ sessions, analytics will be generated automatically")
-print("3. Check output/sessions/ for all saved data")
-print("4. Consider upgrading to resilience_mode.py for advanced features")
\ No newline at end of file
+    print("\n💡 Next steps:")
+    print("1. Run 'python daily_learning_loop.py' daily")
+    print("2. After 5+ sessions, analytics will be generated automatically")
+    print(f"3. Check {OUTPUT_DIR} for all saved data")
+    print("4. Consider upgrading to resilience_mode.py for advanced features")
\ No newline at end of file
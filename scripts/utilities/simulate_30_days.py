@@ -1,26 +1,21 @@
-from datetime import datetime, timedelta
 import os
-from resilience_mode import (
-    initialize_marcus_systems,
-    run_daily_learning_loop
-)
+import sys
+from datetime import date
 
-# Initialize Marcus systems
-memory_system, curriculum_system, reflection_system = initialize_marcus_systems()
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.learning.simulation_runner import SimulationRunner
 
 # Set start date (1 day after your last saved session)
-start_date = datetime.strptime("2025-08-02", "%Y-%m-%d")
+start_date = date(2025, 8, 2)
+end_date = date(2025, 8, 31)
+
+if __name__ == "__main__":
+    runner = SimulationRunner(seed=0, start_date=start_date, end_date=end_date,
+                              learners=1, output_root="output/simulations/30_days")
 
-# Loop over 30 days
-for i in range(30):
-    current_date = start_date + timedelta(days=i)
-    date_str = current_date.strftime('%Y-%m-%d')
-    print(f"\n📅 Running session for: {date_str}")
+    # Days stream back as each session finishes
+    for result in runner.iter_results():
+        print(f"📅 {result.day}: {result.concepts_learned} concepts, {result.reviews_completed} reviews")
 
-    run_daily_learning_loop(
-        memory_system,
-        curriculum_system,
-        reflection_system,
-        output_dir="output/sessions",
-        today=date_str  # <- ensure your function accepts this arg
-    )
+    print(f"✅ Sessions saved under {runner.output_root}")
@@ -1,15 +1,46 @@
-from datetime import date, timedelta
+#!/usr/bin/env python3
+"""
+Simulate a cohort of independent learners over a range of days in parallel
+
+Usage:
+    python scripts/utilities/simulate_multiple_days.py --days 10 --learners 4 --seed 42
+"""
+
+import os
 import sys
-sys.path.insert(0, '/workspaces/MarcusAGI')
-from core.learning.daily_learning_loop import run_daily_learning_loop
+import json
+import argparse
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.learning.simulation_runner import SimulationRunner, merge_summaries
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel multi-day learning simulation")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--start", type=date.fromisoformat, default=None,
+                        help="first simulated day (default: DAYS-1 days ago)")
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--learners", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default="output/simulations")
+    args = parser.parse_args()
+
+    start_date = args.start or date.today() - timedelta(days=args.days - 1)
+    end_date = start_date + timedelta(days=args.days - 1)
+    runner = SimulationRunner(args.seed, start_date, end_date, args.learners, args.output, args.workers)
 
-# Set how many days to simulate
-days_to_run = 10
+    print(f"🗓️ Simulating {args.learners} learner(s) from {start_date} to {end_date} (seed {args.seed})")
+    for result in runner.iter_results():
+        print(f"  ✅ {result.learner_id} {result.day}: {result.concepts_learned} concepts, "
+              f"{result.reviews_completed} reviews")
 
-# Start date for simulation (e.g., 10 days ago)
-start_date = date.today() - timedelta(days=days_to_run - 1)
+    summary = merge_summaries(runner.summaries)
+    with open(os.path.join(runner.output_root, "cohort_summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+    print(f"📊 {summary['learner_days']} learner-days, {summary['total_concepts']} concepts, "
+          f"{summary['total_reviews']} reviews -> {runner.output_root}")
 
-for i in range(days_to_run):
-    run_date = start_date + timedelta(days=i)
-    print(f"\n🗓️ Running session for {run_date}")
-    run_daily_learning_loop(run_date)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for indexed autobiographical recall
+"""
+
+import os
+import json
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+
+from core.memory.autobiographical_memory_system import AutobiographicalMemorySystem
+from core.memory.connection_manager import close_connection_manager
+
+class TestAutobiographicalRecall(unittest.TestCase):
+    """Test recall filters use exact markers, emotions, concepts and full-text search"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "state.db")
+        self.memory = AutobiographicalMemorySystem(self.db_path)
+        store = self.memory.store_autobiographical_memory
+        self.ids = {
+            "tower": store("physical", "Earlier today I built a tall tower",
+                           {"primary_emotion": "proud", "triggers": ["happy ending"]}, ["balance"], 0.9),
+            "tag": store("social", "Played tag today with my friends",
+                         {"primary_emotion": "happy"}, ["taking turns"], 0.7),
+            "count": store("learning", "Yesterday I learned to count to twenty",
+                           {"primary_emotion": "curious"}, ["counting", "balance"], 0.5),
+        }
+
+    def tearDown(self):
+        self.memory.close()
+        close_connection_manager(self.db_path)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _recall(self, **filters):
+        return [m.memory_id for m in self.memory.recall_autobiographical_memories(**filters)]
+
+    def test_filters_match_whole_values(self):
+        """Markers match whole, and emotions only match the primary emotion, not other JSON values"""
+        self.assertEqual(self._recall(temporal_context="today"), [self.ids["tower"], self.ids["tag"]])
+        self.assertEqual(self._recall(temporal_context="Earlier Today"), [self.ids["tower"]])
+        self.assertEqual(self._recall(temporal_context="earlier"), [])
+        self.assertEqual(self._recall(emotion_filter="happy"), [self.ids["tag"]])
+        self.assertEqual(self._recall(concept="balance"), [self.ids["tower"], self.ids["count"]])
+        self.assertEqual(self._recall(text_query="physical world"), [self.ids["tower"]])
+        self.assertEqual(self._recall(text_query='proud "physical'), [self.ids["tower"]])
+        self.assertEqual(self._recall(concept="balance", experience_type="learning"), [self.ids["count"]])
+
+        today = datetime.now().strftime("%Y-%m-%d")
+        self.assertEqual(len(self._recall(temporal_context=today)), 3)
+        self.assertEqual(self._recall(temporal_context="1999-01-01"), [])
+
+    def test_recall_orders_and_counts_retrievals(self):
+        first = self.memory.recall_autobiographical_memories(limit=2)
+        self.assertEqual([m.memory_id for m in first], [self.ids["tower"], self.ids["tag"]])
+        self.assertEqual([m.retrieval_count for m in first], [0, 0])
+        again = self.memory.recall_autobiographical_memories(limit=3)
+        self.assertEqual([m.retrieval_count for m in again], [1, 1, 0])
+        self.assertEqual(self.memory.get_memory_statistics()['temporal_marker_usage'],
+                         {"earlier today": 1, "today": 2, "yesterday": 1})
+
+    def test_version_one_database_is_indexed(self):
+        """Memories stored before the side tables existed are backfilled on open"""
+        self.memory.close()
+        close_connection_manager(self.db_path)
+        conn = sqlite3.connect(self.db_path)
+        for statement in ("DROP TRIGGER autobiographical_memories_ai", "DROP TRIGGER autobiographical_memories_ad",
+                          "DROP TRIGGER autobiographical_memories_au", "DROP TABLE autobiographical_memories_fts",
+                          "DROP TABLE autobiographical_memory_markers", "DROP TABLE autobiographical_memory_concepts",
+                          "DROP INDEX idx_autobiographical_emotion_importance",
+                          "ALTER TABLE autobiographical_memories DROP COLUMN primary_emotion",
+                          "UPDATE schema_versions SET version = 1 WHERE subsystem = 'autobiographical_memory'"):
+            conn.execute(statement)
+        conn.execute("""
+            INSERT INTO autobiographical_memories
+            (memory_id, timestamp, experience_type, self_reference_context, temporal_markers,
+             emotional_context, narrative_summary, related_concepts)
+            VALUES ('old', '2024-05-01T09:00:00', 'learning', 'I learned shapes', ?, ?, 'Shapes lesson', ?)
+        """, (json.dumps(["yesterday"]), json.dumps({"primary_emotion": "calm"}), json.dumps(["shapes"])))
+        conn.commit()
+        conn.close()
+
+        self.memory = AutobiographicalMemorySystem(self.db_path)
+        self.assertEqual(self._recall(emotion_filter="calm"), ["old"])
+        self.assertEqual(self._recall(concept="shapes"), ["old"])
+        self.assertEqual(self._recall(text_query="shapes lesson"), ["old"])
+        self.assertEqual(self._recall(temporal_context="yesterday"), [self.ids["count"], "old"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for write-behind persistence of autobiographical memories
+"""
+
+import os
+import time
+import shutil
+import sqlite3
+import tempfile
+import unittest
+import threading
+
+from core.memory.autobiographical_memory_system import AutobiographicalMemorySystem
+from core.memory.connection_manager import close_connection_manager, get_connection_manager
+from core.memory.state_store import state_transaction
+from core.memory.write_behind import WriteBehindBuffer
+
+JOY = {"primary_emotion": "joy", "intensity": 0.7}
+
+class TestAutobiographicalWriteBehind(unittest.TestCase):
+    """Test buffered stores flush on size, time and reads"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "state.db")
+
+    def tearDown(self):
+        close_connection_manager(self.db_path)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _stored_on_disk(self) -> int:
+        """Rows another process would see"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM autobiographical_memories").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_reads_see_unflushed_writes(self):
+        memory = AutobiographicalMemorySystem(self.db_path, max_pending=100, max_delay=60)
+        for i in range(3):
+            memory.store_autobiographical_memory("social", f"Played tag with friend {i}", JOY)
+        self.assertEqual(self._stored_on_disk(), 0)
+
+        self.assertEqual(len(memory.recall_autobiographical_memories(experience_type="social")), 3)
+        self.assertEqual(self._stored_on_disk(), 3)
+        memory.store_autobiographical_memory("learning", "Learned to count", JOY)
+        self.assertEqual(memory.get_memory_statistics()['total_memories'], 4)
+        memory.close()
+
+    def test_flushes_on_size_and_time(self):
+        memory = AutobiographicalMemorySystem(self.db_path, max_pending=5, max_delay=0.05)
+        for i in range(5):
+            memory.store_autobiographical_memory("physical", f"Stacked block {i}", JOY)
+        self.assertEqual(self._stored_on_disk(), 5)
+
+        memory.store_autobiographical_memory("physical", "Knocked the tower over", JOY)
+        deadline = time.time() + 2
+        while self._stored_on_disk() < 6 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self._stored_on_disk(), 6)
+        memory.close()
+
+    def test_timed_flushes_reuse_one_connection(self):
+        memory = AutobiographicalMemorySystem(self.db_path, max_delay=0.01)
+        manager = get_connection_manager(self.db_path)
+        for i in range(20):
+            memory.store_autobiographical_memory("social", f"Waved at neighbour {i}", JOY)
+            deadline = time.time() + 2
+            while len(memory.write_buffer) and time.time() < deadline:
+                time.sleep(0.005)
+        self.assertEqual(self._stored_on_disk(), 20)
+        # The caller's connection plus the flusher thread's, however many flushes ran
+        self.assertLessEqual(len(manager._connections), 2)
+        memory.close()
+
+    def test_store_inside_transaction_commits_with_it(self):
+        memory = AutobiographicalMemorySystem(self.db_path, max_pending=100, max_delay=60)
+        with self.assertRaises(RuntimeError):
+            with state_transaction(self.db_path):
+                memory.store_autobiographical_memory("social", "Shared my crayons", JOY)
+                raise RuntimeError("cycle failed")
+        self.assertEqual(len(memory.write_buffer), 0)
+        self.assertEqual(memory.get_memory_statistics()['total_memories'], 0)
+
+    def test_temporal_markers_match_in_table_order(self):
+        memory = AutobiographicalMemorySystem(self.db_path)
+        memory_id = memory.store_autobiographical_memory(
+            "learning", "Yesterday I used to skip numbers, but right now I count them all", JOY)
+        recalled = {m.memory_id: m for m in memory.recall_autobiographical_memories()}
+        self.assertEqual(recalled[memory_id].temporal_markers, ["yesterday", "I used to", "right now"])
+        memory.close()
+
+class TestBoundedWriteBehind(unittest.TestCase):
+    """Test the bounded buffer flushes off the caller's thread and applies backpressure"""
+
+    def test_backpressure_and_background_flush(self):
+        started, release = threading.Event(), threading.Event()
+        written, writer_threads = [], []
+
+        def write_rows(rows):
+            writer_threads.append(threading.get_ident())
+            started.set()
+            release.wait(5)
+            written.extend(rows)
+
+        buffer = WriteBehindBuffer(write_rows, max_pending=2, max_delay=60, max_queued=4)
+        for row in range(2):
+            buffer.add(row)
+        # The first batch is now held up in the background writer
+        self.assertTrue(started.wait(5))
+        for row in range(2, 6):
+            buffer.add(row)
+        self.assertEqual(len(buffer), 4)
+
+        blocked = threading.Thread(target=buffer.add, args=(6,))
+        blocked.start()
+        blocked.join(0.1)
+        self.assertTrue(blocked.is_alive())
+
+        release.set()
+        blocked.join(5)
+        self.assertFalse(blocked.is_alive())
+        buffer.close()
+        self.assertEqual(written, list(range(7)))
+        # Size-triggered batches were written by background threads
+        self.assertNotEqual(writer_threads[0], threading.get_ident())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch AV episode processor
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from collections import Counter
+from pathlib import Path
+
+from marcus_av_pipeline.batch_pipeline import BatchPipeline, Stage
+
+class FakeStages:
+    """File-to-file stages that record how often each one runs"""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.lock = threading.Lock()
+        self.ingested = []
+
+    def _write(self, episode, name, text):
+        path = episode.output_dir(name) / f"{episode.episode_id}.{name}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        return str(path)
+
+    def _step(self, name, source, transform):
+        def run(episode, inputs):
+            with self.lock:
+                self.calls[name] += 1
+            return self._write(episode, name, transform(Path(inputs[source]).read_text()))
+        return run
+
+    def stages(self):
+        def ingest(episode, inputs):
+            with self.lock:
+                self.calls["ingest"] += 1
+                self.ingested.append(episode.episode_id)
+            return None
+
+        def metadata(episode, inputs):
+            with self.lock:
+                self.calls["metadata"] += 1
+            if "broken" in episode.episode_id:
+                raise RuntimeError("unreadable container")
+            return self._write(episode, "metadata", str(len(Path(inputs["video"]).read_text())))
+
+        return [
+            Stage("ingest", ("annotate", "metadata"), ingest),
+            Stage("annotate", ("transcribe",), self._step("annotate", "transcribe", str.title)),
+            Stage("transcribe", ("extract",), self._step("transcribe", "extract", lambda s: s.split("|")[0])),
+            Stage("extract", ("video",), self._step("extract", "video", str.lower)),
+            Stage("metadata", ("video",), metadata),
+        ]
+
+class TestBatchPipeline(unittest.TestCase):
+    """Test the stage DAG, its content-hash cache and parallel episodes"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.episode_dir = Path(self.temp_dir) / "episodes"
+        self.episode_dir.mkdir()
+        for i in range(6):
+            (self.episode_dir / f"ep{i}.mp4").write_text(f"EPISODE {i} SPEECH|VIDEO FRAMES")
+        self.output = os.path.join(self.temp_dir, "output")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _run(self, fakes):
+        pipeline = BatchPipeline(fakes.stages(), self.output, max_workers=3)
+        return pipeline.run(pipeline.discover(str(self.episode_dir)))
+
+    def test_stages_run_in_dependency_order_then_cache(self):
+        """A rerun skips everything, and only stages whose input content changed run again"""
+        fakes = FakeStages()
+        results = self._run(fakes)
+        self.assertEqual(len(results), 6)
+        self.assertEqual(set(fakes.calls.values()), {6})
+        annotated = Path(results["ep2"]["annotate"].output).read_text()
+        self.assertEqual(annotated, "Episode 2 Speech")
+
+        rerun = FakeStages()
+        results = self._run(rerun)
+        self.assertEqual(sum(rerun.calls.values()), 0)
+        self.assertEqual({r.status for ep in results.values() for r in ep.values()}, {"cached"})
+
+        # Changing only the video frames reruns extract, metadata and transcribe, but
+        # their outputs come out identical so annotate and ingest stay cached
+        (self.episode_dir / "ep1.mp4").write_text("EPISODE 1 SPEECH|VIDEO FRAMEZ")
+        (self.episode_dir / "ep4.mp4").write_text("EPISODE 4 NEW SPEECH|VIDEO FRAMES")
+        edited = FakeStages()
+        results = self._run(edited)
+        self.assertEqual(edited.calls, Counter(extract=2, metadata=2, transcribe=2, annotate=1, ingest=1))
+        self.assertEqual(edited.ingested, ["ep4"])
+        self.assertEqual(results["ep1"]["annotate"].status, "cached")
+
+    def test_failed_stage_only_blocks_its_dependents(self):
+        """A failure skips downstream stages of that episode and is retried next run"""
+        (self.episode_dir / "broken.mp4").write_text("BROKEN|FRAMES")
+        fakes = FakeStages()
+        results = self._run(fakes)
+        self.assertEqual(results["broken"]["metadata"].status, "failed")
+        self.assertEqual(results["broken"]["annotate"].status, "ran")
+        self.assertEqual(results["broken"]["ingest"].status, "failed")
+        self.assertNotIn("broken", fakes.ingested)
+
+        rerun = FakeStages()
+        self._run(rerun)
+        self.assertEqual(rerun.calls, Counter(metadata=1))
+
+    def test_same_named_episodes_in_other_directories_keep_their_cache(self):
+        """Episodes are cached by source path, so a same-named episode elsewhere neither evicts nor shadows them"""
+        other_dir = Path(self.temp_dir) / "season2"
+        other_dir.mkdir()
+        (other_dir / "ep2.mp4").write_text("SEASON TWO SPEECH|OTHER FRAMES")
+        manifest = os.path.join(self.temp_dir, "manifest.json")
+
+        def run(episode_dir, output):
+            fakes = FakeStages()
+            pipeline = BatchPipeline(fakes.stages(), output, max_workers=3, manifest_path=manifest)
+            return fakes, pipeline.run(pipeline.discover(str(episode_dir)))
+
+        run(self.episode_dir, self.output)
+        run(other_dir, os.path.join(self.temp_dir, "output2"))
+        fakes, results = run(self.episode_dir, self.output)
+        self.assertEqual(sum(fakes.calls.values()), 0)
+
+        # Sharing an output directory overwrites ep2's files, which then rerun rather than being served stale
+        (other_dir / "ep2.mp4").write_text("SEASON TWO RECUT|OTHER FRAMES")
+        run(other_dir, self.output)
+        fakes, results = run(self.episode_dir, self.output)
+        self.assertEqual(Path(results["ep2"]["annotate"].output).read_text(), "Episode 2 Speech")
+        self.assertEqual(fakes.calls["annotate"], 1)
+
+    def test_unknown_dependency_is_rejected(self):
+        with self.assertRaises(ValueError):
+            BatchPipeline([Stage("annotate", ("transcribe",), lambda e, i: None)], self.output)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared SQLite connection manager used by the memory systems
+"""
+
+import os
+import shutil
+import datetime
+import tempfile
+import threading
+import unittest
+
+from core.memory.connection_manager import get_connection_manager, close_connection_manager
+from core.memory.memory_system import MarcusMemorySystem, Concept
+from core.reasoning.reflection_engine import RetentionEngine
+
+class TestConnectionManager(unittest.TestCase):
+    """Test pooled connections shared across memory subsystems"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "memory.db")
+        self.memory = MarcusMemorySystem(self.db_path)
+
+    def tearDown(self):
+        self.memory.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_shared_manager_per_path(self):
+        """Subsystems using the same db_path share one manager"""
+        self.assertIs(get_connection_manager(self.db_path), self.memory.connections)
+
+    def test_retention_engine_shares_pool_and_due_queue(self):
+        """RetentionEngine writes through the pool and keeps the memory system's due queue current"""
+        self.assertEqual(self.memory.count_due_reviews(), 0)
+        engine = RetentionEngine(self.db_path)
+        self.assertIs(engine.connections, self.memory.connections)
+        memory, _ = engine.learn_new_concept("Plants need water to grow", "science")
+        later = memory.next_review + datetime.timedelta(minutes=1)
+        self.assertEqual(self.memory.count_due_reviews(before=later), 1)
+
+    def test_connection_reused_within_thread(self):
+        """The same connection is returned on every call from one thread"""
+        manager = self.memory.connections
+        self.assertIs(manager.get_connection(), manager.get_connection())
+
+    def test_connections_are_per_thread(self):
+        """Each thread gets its own connection"""
+        manager = self.memory.connections
+        main_conn = manager.get_connection()
+        other = []
+        thread = threading.Thread(target=lambda: other.append(manager.get_connection()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(main_conn, other[0])
+
+    def test_exited_thread_connection_is_closed(self):
+        """Connections of finished threads do not pile up in the pool"""
+        manager = self.memory.connections
+        manager.get_connection()
+        for _ in range(10):
+            thread = threading.Thread(target=lambda: manager.get_connection().execute("SELECT 1"))
+            thread.start()
+            thread.join()
+        self.assertEqual(len(manager._connections), 1)
+
+    def test_wal_mode_enabled(self):
+        """Pooled connections run in WAL journal mode"""
+        mode = self.memory.connections.get_connection().execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode.lower(), "wal")
+
+    def test_nested_transaction_rolls_back_outer(self):
+        """An error in a nested block rolls back the whole transaction"""
+        manager = self.memory.connections
+        with self.assertRaises(RuntimeError):
+            with manager.transaction():
+                self.memory.learn_concept(Concept("nested", "Nested concept"))
+                raise RuntimeError("abort")
+        self.assertIsNone(self.memory.recall_concept("nested"))
+
+    def test_swallowed_nested_failure_rolls_back_only_its_writes(self):
+        """A failed nested block loses its own writes even when the outer block commits"""
+        manager = self.memory.connections
+        with manager.transaction():
+            self.memory.learn_concept(Concept("kept", "Kept concept"))
+            try:
+                with manager.transaction():
+                    self.memory.learn_concept(Concept("dropped", "Dropped concept"))
+                    raise RuntimeError("inner failure")
+            except RuntimeError:
+                pass
+            with manager.transaction():
+                self.memory.learn_concept(Concept("later", "Later concept"))
+        self.assertIsNotNone(self.memory.recall_concept("kept"))
+        self.assertIsNone(self.memory.recall_concept("dropped"))
+        self.assertIsNotNone(self.memory.recall_concept("later"))
+        self.assertFalse(manager.in_transaction)
+
+    def test_after_commit_hooks_follow_the_outer_transaction(self):
+        """Hooks run after the outermost commit, minus those of rolled-back blocks"""
+        manager = self.memory.connections
+        ran = []
+        with manager.transaction():
+            manager.after_commit(lambda: ran.append("outer"))
+            try:
+                with manager.transaction():
+                    manager.after_commit(lambda: ran.append("dropped"))
+                    raise RuntimeError("inner failure")
+            except RuntimeError:
+                pass
+            with manager.transaction():
+                manager.after_commit(lambda: ran.append("inner"))
+            self.assertEqual(ran, [])
+        self.assertEqual(ran, ["outer", "inner"])
+
+        with self.assertRaises(RuntimeError):
+            with manager.transaction():
+                manager.after_commit(lambda: ran.append("rolled back"))
+                raise RuntimeError("abort")
+        manager.after_commit(lambda: ran.append("immediate"))
+        self.assertEqual(ran, ["outer", "inner", "immediate"])
+
+    def test_review_round_trip(self):
+        """Learn, review and recall through the pooled connections"""
+        self.assertTrue(self.memory.learn_concept(Concept("kindness", "Being kind", "social")))
+        self.assertTrue(self.memory.review_concept("kindness", success=True))
+        recalled = self.memory.recall_concept("kindness")
+        self.assertEqual(recalled['mastery_level'], 1)
+        self.assertEqual(recalled['success_streak'], 1)
+
+    def test_close_reopens_lazily(self):
+        """Closing the manager does not break later calls"""
+        close_connection_manager(self.db_path)
+        memory = MarcusMemorySystem(self.db_path)
+        self.assertEqual(memory.get_learning_stats()['total_concepts'], 0)
+        memory.close()
+
+if __name__ == '__main__':
+    unittest.main()
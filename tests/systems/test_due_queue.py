@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the due-review priority queue
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+import datetime
+
+from core.memory.due_queue import DueReviewQueue, to_epoch, SECONDS_PER_DAY
+from core.memory.memory_system import MarcusMemorySystem, Concept
+from core.memory.state_store import state_transaction
+
+class TestDueReviewQueue(unittest.TestCase):
+    """Test heap ordering, updates and due counts"""
+
+    def setUp(self):
+        self.now = to_epoch(datetime.datetime.now())
+        self.queue = DueReviewQueue([
+            ("a", self.now - 3 * SECONDS_PER_DAY),
+            ("b", self.now - 60),
+            ("c", self.now + SECONDS_PER_DAY),
+            ("d", self.now + 30 * SECONDS_PER_DAY),
+            ("e", None)
+        ])
+
+    def test_next_due_is_ordered_and_bounded(self):
+        """Only due items are returned, earliest first, up to the limit"""
+        self.assertEqual([cid for cid, _ in self.queue.next_due(10, before=self.now)], ["a", "b"])
+        self.assertEqual([cid for cid, _ in self.queue.next_due(1, before=self.now)], ["a"])
+        self.assertEqual(len(self.queue), 4)
+
+    def test_update_moves_concept(self):
+        """Rescheduling replaces the old entry instead of duplicating it"""
+        self.queue.update("a", self.now + 2 * SECONDS_PER_DAY)
+        self.queue.update("d", self.now - 10)
+        self.assertEqual([cid for cid, _ in self.queue.next_due(10, before=self.now)], ["b", "d"])
+        self.assertEqual([cid for cid, _ in self.queue.next_due(10)], ["b", "d", "c", "a"])
+
+    def test_count_due_matches_scan(self):
+        """Counts agree with a brute-force scan after many updates"""
+        for i in range(500):
+            self.queue.update(f"x{i % 97}", self.now + (i * 7919 % 4000 - 2000) * 3600)
+        self.queue.remove("c")
+        entries = dict(self.queue._current)
+        for offset in (-10 * SECONDS_PER_DAY, -1, 0, 3600, 40 * SECONDS_PER_DAY, 400 * SECONDS_PER_DAY):
+            before = self.now + offset
+            expected = sum(1 for epoch in entries.values() if epoch <= before)
+            self.assertEqual(self.queue.count_due(before), expected)
+
+class TestMemorySystemDueQueue(unittest.TestCase):
+    """Test the memory system keeps the due queue and next_review_ts in sync"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "memory.db")
+        self.memory = MarcusMemorySystem(self.db_path)
+
+    def tearDown(self):
+        self.memory.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_reviews_leave_the_due_queue(self):
+        """Reviewed concepts are no longer due; new concepts are"""
+        self.memory.learn_concepts_bulk(Concept(f"c_{i}", f"Concept {i}") for i in range(5))
+        self.assertEqual(self.memory.count_due_reviews(), 5)
+        self.memory.review_concepts_batch([("c_0", 5), ("c_1", 5)])
+        self.memory.learn_concept(Concept("c_5", "Concept 5"))
+        due = [c['id'] for c in self.memory.get_due_reviews(limit=10)]
+        self.assertEqual(sorted(due), ["c_2", "c_3", "c_4", "c_5"])
+        self.assertEqual(self.memory.get_learning_stats()['due_for_review'], 4)
+
+    def test_rolled_back_writes_leave_the_due_queue(self):
+        """Writes nested in a caller's transaction reach the queue only if it commits"""
+        self.memory.learn_concept(Concept("kept", "Kept concept"))
+        self.assertEqual(self.memory.count_due_reviews(), 1)
+        with self.assertRaises(RuntimeError):
+            with state_transaction(self.db_path):
+                self.assertTrue(self.memory.learn_concept(Concept("lost", "Rolled back concept")))
+                self.memory.learn_concepts_bulk([Concept("lost_too", "Rolled back concept")])
+                self.memory.review_concepts_batch([("kept", 5)])
+                raise RuntimeError("cycle failed")
+        self.assertEqual([c['id'] for c in self.memory.get_due_reviews()], ["kept"])
+        self.assertEqual(self.memory.get_learning_stats()['due_for_review'], 1)
+
+        with state_transaction(self.db_path):
+            self.memory.learn_concept(Concept("added", "Committed concept"))
+        self.assertEqual(sorted(c['id'] for c in self.memory.get_due_reviews()), ["added", "kept"])
+
+    def test_legacy_database_is_backfilled(self):
+        """Databases without next_review_ts get the column filled from next_review"""
+        self.memory.learn_concept(Concept("old", "Old concept"))
+        self.memory.close()
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("DROP INDEX idx_memory_learner_next_review_ts")
+        conn.execute("ALTER TABLE memory_records DROP COLUMN next_review_ts")
+        # A database from before next_review_ts also predates the schema registry
+        conn.execute("DROP TABLE schema_versions")
+        conn.commit()
+        conn.close()
+
+        self.memory = MarcusMemorySystem(self.db_path)
+        self.assertEqual([c['id'] for c in self.memory.get_due_reviews()], ["old"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the indexed episodic store behind EpisodicMemoryModule
+"""
+
+import random
+import unittest
+from datetime import date, datetime, timedelta
+
+from core.reasoning.enhanced_cognitive_architecture import EpisodicMemoryModule, MemoryTrace
+from core.reasoning.episodic_store import words
+
+START = datetime(2025, 3, 1)
+EVENTS = ["built a block tower", "painted a purple giraffe", "counted red apples", "sang a counting song"]
+PLACES = ["classroom", "playground", "home"]
+
+def make_episode(i: int, rng: random.Random, strength: float = None) -> MemoryTrace:
+    content = {"event": rng.choice(EVENTS), "context": {"place": rng.choice(PLACES)}}
+    return MemoryTrace(
+        trace_id=f"episode_{i}",
+        content=content,
+        memory_type="episodic",
+        encoding_strength=rng.uniform(0.3, 1.0) if strength is None else strength,
+        emotional_valence=rng.uniform(-1, 1),
+        temporal_context={"timestamp": START + timedelta(minutes=rng.randrange(30 * 24 * 60)),
+                          "context": content["context"]}
+    )
+
+class TestEpisodicStore(unittest.TestCase):
+    """Test indexed queries against scans over every episode"""
+
+    def setUp(self):
+        rng = random.Random(11)
+        self.module = EpisodicMemoryModule()
+        # Out of time order, as a replay from the database may be
+        self.assertEqual(self.module.restore_episodes([make_episode(i, rng) for i in range(300)]), 300)
+
+    def test_time_range_matches_scan(self):
+        store = self.module.store
+        for start, end in [(date(2025, 3, 5), date(2025, 3, 9)), (None, date(2025, 3, 2)),
+                           (date(2025, 3, 28), None), (START + timedelta(hours=30), START + timedelta(days=3))]:
+            expected = set()
+            for episode_id, episode in store.episodes.items():
+                timestamp = episode.temporal_context["timestamp"]
+                moment = timestamp if isinstance(start or end, datetime) else timestamp.date()
+                if (start is None or moment >= start) and (end is None or moment <= end):
+                    expected.add(episode_id)
+            found = store.between(start, end)
+            self.assertEqual(set(found), expected)
+            times = [store.episodes[i].temporal_context["timestamp"] for i in found]
+            self.assertEqual(times, sorted(times))
+
+    def test_keywords_match_scan(self):
+        store = self.module.store
+        keywords = [words("purple giraffe"), words("apples")]
+        expected = {episode_id for episode_id, episode in store.episodes.items()
+                    if "purple giraffe" in episode.content["event"] or "apples" in episode.content["event"]}
+        self.assertEqual(store.with_keywords(keywords), expected)
+        self.assertEqual(store.with_keywords([words("unknown words")]), set())
+
+    def test_retrieve_returns_top_ranked(self):
+        query = {"context": {"place": "playground"}, "content_keywords": ["block tower", "song"], "limit": 5}
+        keywords = [words(k) for k in query["content_keywords"]]
+        now = datetime.now()
+        candidates = [e for e in self.module.episodes.values() if e.content["context"]["place"] == "playground"
+                      and ("block tower" in e.content["event"] or "song" in e.content["event"])]
+        ranked = sorted(candidates, reverse=True, key=lambda e: (
+            self.module._calculate_episode_relevance(e, query, None, keywords, now), e.encoding_strength))
+
+        result = self.module._retrieve_episodes(query)
+        self.assertEqual(result["total_found"], len(candidates))
+        self.assertEqual([e.trace_id for e in result["episodes"]], [e.trace_id for e in ranked[:5]])
+        # Only the returned episodes count as retrieved
+        self.assertEqual(sum(e.retrieval_count for e in self.module.episodes.values()), 5)
+
+    def test_consolidation_is_incremental(self):
+        module = self.module
+        # Restored episodes are not consolidated again
+        self.assertEqual(module._consolidate_memories()["consolidated_episodes"], 0)
+
+        target = next(iter(module.episodes.values()))
+        strength = target.encoding_strength
+        for _ in range(4):
+            module.store.mark_changed(target)
+            target.retrieval_count += 1
+        self.assertEqual(module._consolidate_memories()["consolidated_episodes"], 1)
+        self.assertAlmostEqual(target.encoding_strength, min(1.0, strength * 1.1))
+        self.assertEqual(module._consolidate_memories()["consolidated_episodes"], 0)
+
+        # A newly stored weak episode is weakened on the next pass only
+        weak = module._store_episode({"event": "dropped the crayons", "importance": 0.2})["episode_id"]
+        module._consolidate_memories()
+        module._consolidate_memories()
+        self.assertAlmostEqual(module.episodes[weak].encoding_strength, 0.2 * 0.9)
+
+if __name__ == '__main__':
+    unittest.main()
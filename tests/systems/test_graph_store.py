@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for the array-backed knowledge graph store
+"""
+
+import random
+import unittest
+
+import numpy as np
+
+from core.reasoning.graph_store import GraphStore, spmm
+from core.reasoning.advanced_cognitive_modules import GraphNeuralNetworkModule
+
+def reference_relationships(edges, node, max_depth):
+    """Relationship walk over an adjacency dict, as the module did before the graph store"""
+    relationships, visited, queue = [], set(), [(node, 0)]
+    while queue:
+        current, depth = queue.pop(0)
+        if current in visited or depth > max_depth:
+            continue
+        visited.add(current)
+        for target, edge_type in edges.get(current, []):
+            relationships.append({"source": current, "target": target, "type": edge_type, "depth": depth})
+            if depth < max_depth:
+                queue.append((target, depth + 1))
+    return relationships
+
+def reference_path(edges, source, target, max_length):
+    if source == target:
+        return [source]
+    queue, visited = [(source, [source])], set()
+    while queue:
+        current, path = queue.pop(0)
+        if current in visited or len(path) > max_length:
+            continue
+        visited.add(current)
+        for next_node, _ in edges.get(current, []):
+            if next_node == target:
+                return path + [next_node]
+            if next_node not in visited:
+                queue.append((next_node, path + [next_node]))
+    return None
+
+class TestGraphStore(unittest.TestCase):
+    """Test the store against the dict-of-lists graph it replaces"""
+
+    def setUp(self):
+        rng = random.Random(5)
+        self.graph = GraphStore(embedding_dim=8, capacity=2, rng=np.random.default_rng(0))
+        self.edges = {}
+        names = [f"n{i}" for i in range(40)]
+        for _ in range(150):
+            source, target, edge_type = rng.choice(names), rng.choice(names), rng.choice(["causes", "is_a", "requires"])
+            added = self.graph.add_edge(source, target, edge_type)
+            self.assertEqual(added, (target, edge_type) not in self.edges.get(source, []))
+            if added:
+                self.edges.setdefault(source, []).append((target, edge_type))
+
+    def test_duplicates_and_counts(self):
+        self.assertEqual(self.graph.num_edges, sum(len(e) for e in self.edges.values()))
+        source, (target, edge_type) = next((s, e[0]) for s, e in self.edges.items() if e)
+        self.assertTrue(self.graph.has_edge(source, target, edge_type))
+        self.assertFalse(self.graph.add_edge(source, target, edge_type))
+        self.assertTrue(self.graph.add_edge(source, target, "new_type"))
+        self.assertFalse(self.graph.add_node(source))
+
+    def test_traversal_matches_reference(self):
+        for node in self.graph.node_names:
+            for depth in (0, 1, 3):
+                self.assertEqual(self.graph.relationships(node, depth),
+                                 reference_relationships(self.edges, node, depth))
+            for other in self.graph.node_names[:10]:
+                for length in (1, 2, 5):
+                    self.assertEqual(self.graph.shortest_path(node, other, length),
+                                     reference_path(self.edges, node, other, length))
+
+    def test_iter_edges_by_type(self):
+        expected = [(s, t, k) for s in self.graph.node_names for t, k in self.edges.get(s, []) if k == "causes"]
+        self.assertEqual(list(self.graph.iter_edges(["causes", "unknown"])), expected)
+
+    def test_propagate_matches_neighbor_mean(self):
+        before = self.graph.embeddings[:len(self.graph)].copy()
+        expected = before.copy()
+        for source, targets in self.edges.items():
+            node = self.graph.node_ids[source]
+            mean = np.mean([before[self.graph.node_ids[t]] for t, _ in targets], axis=0)
+            expected[node] = 0.8 * before[node] + 0.2 * mean
+        self.assertEqual(self.graph.propagate(0.8), sum(1 for targets in self.edges.values() if targets))
+        np.testing.assert_allclose(self.graph.embeddings[:len(self.graph)], expected)
+
+    def test_spmm_matches_dense_product(self):
+        """Sparse product equals the dense product, including empty rows"""
+        indptr = np.array([0, 2, 2, 5, 6])
+        indices = np.array([1, 3, 0, 0, 2, 3])
+        weights = np.array([0.5, 1.0, 2.0, 1.0, 1.0, 3.0])
+        dense = np.arange(12, dtype=float).reshape(4, 3)
+        matrix, counts = np.zeros((4, 4)), np.zeros((4, 4))
+        for row in range(4):
+            for edge in range(indptr[row], indptr[row + 1]):
+                matrix[row, indices[edge]] += weights[edge]
+                counts[row, indices[edge]] += 1
+        np.testing.assert_allclose(spmm(indptr, indices, dense, weights), matrix @ dense)
+        np.testing.assert_allclose(spmm(indptr, indices, dense), counts @ dense)
+
+    def test_module_views(self):
+        module = GraphNeuralNetworkModule()
+        self.assertIn("opposite_of", module.edge_types)
+        self.assertEqual(module.knowledge_graph["learning"], [{"target": "memory", "type": "requires", "weight": 1.0}])
+        self.assertEqual(module.adjacency_matrix["symbolic_logic"], {"reasoning"})
+        module.update_state({'node_importance_updates': {'learning': 0.9}})
+        self.assertEqual(module.node_features["learning"]["importance"], 0.9)
+
+if __name__ == '__main__':
+    unittest.main()
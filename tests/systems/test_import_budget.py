@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests that starting a daily session does not import or build every subsystem
+"""
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+import subprocess
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Ceiling for gross regressions on slow machines; the import benchmark enforces a tighter budget
+IMPORT_BUDGET_MS = 150
+
+# Modules the daily learning loop only needs once a session reaches them
+DEFERRED_MODULES = [
+    "numpy",
+    "core.reasoning.advanced_reasoning_engine",
+    "core.reasoning.reflection_journal_system",
+    "core.consciousness.consciousness_integration_framework",
+    "core.social.marcus_embodied_social_integration",
+]
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import core.learning.daily_learning_loop
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({"ms": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+"""
+
+class TestImportBudget(unittest.TestCase):
+    """Test the daily learning loop imports lazily and within budget"""
+
+    def _probe(self, code):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = subprocess.run([sys.executable, "-c", code], cwd=tmp, capture_output=True, text=True,
+                                    env=dict(os.environ, PYTHONPATH=REPO_ROOT), check=True).stdout
+        return json.loads(output.strip().splitlines()[-1])
+
+    def test_daily_learning_loop_import_is_lazy_and_within_budget(self):
+        """Heavy subsystems stay unloaded and the import stays under budget"""
+        result = min((self._probe(PROBE % DEFERRED_MODULES) for _ in range(3)), key=lambda r: r["ms"])
+        self.assertEqual(result["loaded"], [])
+        self.assertLess(result["ms"], IMPORT_BUDGET_MS)
+
+    def test_core_exports_load_on_first_access(self):
+        """core resolves subpackages and entry points only when they are used"""
+        result = self._probe(
+            "import sys, json, logging\n"
+            "logging.disable(logging.CRITICAL)\n"
+            "import core\n"
+            "before = 'core.memory.sm2_scheduler' in sys.modules\n"
+            "from core import SM2Scheduler, NeuralSymbolicIntegration\n"
+            "nsi = NeuralSymbolicIntegration()\n"
+            "built = 'reasoning_engine' in vars(nsi)\n"
+            "rules = len(nsi.symbolic_rules)\n"
+            "print(json.dumps({'before': before, 'memory': core.memory.__name__, 'built': built,\n"
+            "                  'after': 'reasoning_engine' in vars(nsi), 'rules': rules}))"
+        )
+        self.assertGreater(result.pop("rules"), 0)
+        self.assertEqual(result, {"before": False, "memory": "core.memory", "built": False, "after": True})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled multi-phrase keyword matcher
+"""
+
+import random
+import unittest
+
+from core.reasoning.keyword_matcher import KeywordMatcher, compile_keywords
+
+PHRASES = ["he", "she", "his", "hers", "being kind", "kind", "I like you", "you"]
+
+def brute_force(phrases, text):
+    lowered = text.lower()
+    return sorted((i, p.lower()) for p in phrases for i in range(len(lowered)) if lowered.startswith(p.lower(), i))
+
+class TestKeywordMatcher(unittest.TestCase):
+    """Test both matching engines agree with per-phrase substring search"""
+
+    def setUp(self):
+        self.engines = [KeywordMatcher(PHRASES), KeywordMatcher(PHRASES, direct_scan_limit=0)]
+
+    def test_engines_match_substring_search(self):
+        """Overlapping, nested and repeated hits are all reported"""
+        rng = random.Random(7)
+        words = ["he", "she", "hers", "ushers", "being", "kind", "kindness", "I", "like", "you", "x"]
+        texts = ["ushers", "She said I LIKE YOU for being kind", ""]
+        texts += [" ".join(rng.choice(words) for _ in range(rng.randint(1, 20))) for _ in range(300)]
+        self.assertTrue(self.engines[1].uses_automaton)
+        for text in texts:
+            expected = brute_force(PHRASES, text)
+            for matcher in self.engines:
+                self.assertEqual(matcher.find_all(text), expected)
+                self.assertEqual(matcher.found(text), {p for _, p in expected})
+                self.assertEqual(matcher.contains_any(text), bool(expected))
+
+    def test_compiled_matchers_are_shared(self):
+        """The same keyword set compiles to one matcher"""
+        self.assertIs(compile_keywords(["a", "b"]), compile_keywords(("a", "b")))
+        self.assertEqual(compile_keywords([]).found("anything"), set())
+
+if __name__ == '__main__':
+    unittest.main()
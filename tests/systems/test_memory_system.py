@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for MarcusMemorySystem storage APIs
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from core.memory.memory_system import MarcusMemorySystem, Concept
+
+class TestBulkConceptIngestion(unittest.TestCase):
+    """Test learn_concepts_bulk batching and reporting"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.memory = MarcusMemorySystem(os.path.join(self.temp_dir, "memory.db"))
+
+    def tearDown(self):
+        self.memory.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _concepts(self, n, prefix="c"):
+        return (Concept(f"{prefix}_{i}", f"Concept {i}", "math") for i in range(n))
+
+    def test_bulk_insert_counts(self):
+        """All new concepts are reported as inserted across batches"""
+        result = self.memory.learn_concepts_bulk(self._concepts(25), batch_size=10)
+        self.assertEqual(result, {'inserted': 25, 'replaced': 0, 'skipped': 0})
+        self.assertEqual(self.memory.get_learning_stats()['total_concepts'], 25)
+        self.assertIsNotNone(self.memory.recall_concept("c_24"))
+
+    def test_bulk_replace_and_skip(self):
+        """Existing ids are replaced, invalid concepts are skipped"""
+        self.memory.learn_concepts_bulk(self._concepts(5))
+        concepts = list(self._concepts(8)) + [Concept("", "no id"), Concept("empty", "")]
+        result = self.memory.learn_concepts_bulk(concepts, batch_size=3)
+        self.assertEqual(result, {'inserted': 3, 'replaced': 5, 'skipped': 2})
+
+    def test_bulk_no_replace(self):
+        """With replace=False existing concepts are left untouched"""
+        self.memory.learn_concept(Concept("c_0", "Original", "math"))
+        self.memory.review_concept("c_0", success=True)
+        result = self.memory.learn_concepts_bulk(self._concepts(3), replace=False)
+        self.assertEqual(result, {'inserted': 2, 'replaced': 0, 'skipped': 1})
+        recalled = self.memory.recall_concept("c_0")
+        self.assertEqual(recalled['content'], "Original")
+        self.assertEqual(recalled['mastery_level'], 1)
+
+    def test_duplicate_ids_within_call(self):
+        """A repeated id within one call counts as a replacement"""
+        concepts = [Concept("dup", "First"), Concept("dup", "Second")]
+        result = self.memory.learn_concepts_bulk(concepts, batch_size=1)
+        self.assertEqual(result, {'inserted': 1, 'replaced': 1, 'skipped': 0})
+        self.assertEqual(self.memory.recall_concept("dup")['content'], "Second")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for learner-partitioned memory, progression and social storage
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from core.memory.learners import DEFAULT_LEARNER_ID
+from core.memory.memory_system import MarcusMemorySystem, Concept
+from core.reasoning.reflection_engine import RetentionEngine
+from core.social.peer_interaction_simulation import (
+    PeerInteractionSimulator, InteractionContext, ConversationTopic
+)
+
+class TestLearnerPartitionedMemory(unittest.TestCase):
+    """Test learners sharing one memory database stay isolated"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "memory.db")
+        self.memory = MarcusMemorySystem(self.db_path)
+
+    def tearDown(self):
+        self.memory.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_learners_are_isolated(self):
+        """The same concept id is tracked separately for each learner"""
+        alice = self.memory.for_learner("alice")
+        bob = self.memory.for_learner("bob")
+        alice.learn_concepts_bulk(Concept(f"c_{i}", f"Concept {i}", "math") for i in range(3))
+        bob.learn_concept(Concept("c_0", "Bob's own concept 0", "art"))
+        alice.review_concepts_batch([("c_0", 5), ("c_0", 5)])
+
+        self.assertEqual(alice.recall_concept("c_0")['mastery_level'], 2)
+        self.assertEqual(bob.recall_concept("c_0")['mastery_level'], 0)
+        self.assertEqual(bob.recall_concept("c_0")['content'], "Bob's own concept 0")
+        self.assertIsNone(bob.recall_concept("c_1"))
+        self.assertEqual(alice.count_due_reviews(), 2)
+        self.assertEqual([c['id'] for c in bob.get_due_reviews()], ["c_0"])
+        self.assertEqual(alice.get_learning_stats()['subject_breakdown'], {'math': 3})
+        self.assertEqual(bob.get_learning_stats()['total_concepts'], 1)
+        self.assertEqual(self.memory.get_learning_stats()['total_concepts'], 0)
+        self.assertEqual(self.memory.learner_ids(), ["alice", "bob"])
+
+    def test_legacy_database_belongs_to_default_learner(self):
+        """Tables from before learners existed are rebuilt under the default learner"""
+        self.memory.close()
+        os.remove(self.db_path)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("""
+            CREATE TABLE concepts (
+                id TEXT PRIMARY KEY, content TEXT NOT NULL, subject TEXT NOT NULL DEFAULT 'general',
+                grade_level TEXT NOT NULL DEFAULT 'kindergarten', emotional_context TEXT DEFAULT 'neutral',
+                created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE memory_records (
+                concept_id TEXT PRIMARY KEY, memory_type TEXT NOT NULL DEFAULT 'semantic',
+                mastery_level INTEGER NOT NULL DEFAULT 0, ease_factor REAL NOT NULL DEFAULT 2.5,
+                interval_days INTEGER NOT NULL DEFAULT 1, repetitions INTEGER NOT NULL DEFAULT 0,
+                last_reviewed TEXT, next_review TEXT,
+                FOREIGN KEY (concept_id) REFERENCES concepts (id) ON DELETE CASCADE
+            )
+        """)
+        conn.execute("INSERT INTO concepts (id, content, subject) VALUES ('old', 'Old concept', 'science')")
+        conn.execute("""
+            INSERT INTO memory_records (concept_id, mastery_level, next_review)
+            VALUES ('old', 3, '2020-01-01T00:00:00')
+        """)
+        conn.commit()
+        conn.close()
+
+        self.memory = MarcusMemorySystem(self.db_path)
+        recalled = self.memory.recall_concept("old")
+        self.assertEqual(recalled['subject'], "science")
+        self.assertEqual(recalled['mastery_level'], 3)
+        self.assertEqual([c['id'] for c in self.memory.get_due_reviews()], ["old"])
+        self.assertEqual(self.memory.learner_ids(), [DEFAULT_LEARNER_ID])
+        schema = self.memory.connections.get_connection().execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'memory_records'").fetchone()[0]
+        self.assertNotIn("_partitioned", schema)
+
+    def test_retention_engine_shares_partitioned_tables(self):
+        """RetentionEngine writes and reads only its own learner's rows"""
+        self.memory.for_learner("alice").learn_concept(Concept("c_0", "Alice's concept", "math"))
+        engine = RetentionEngine(self.db_path, learner_id="bob")
+        memory, concept = engine.learn_new_concept("Plants need water to grow", "science")
+        engine.review_concept(concept.id, 3)
+
+        self.assertEqual(engine._load_memory_record(concept.id).total_attempts, 1)
+        self.assertIsNone(RetentionEngine(self.db_path, learner_id="alice")._load_memory_record(concept.id))
+        self.assertEqual(engine.get_concept_statistics()['total_concepts'], 1)
+        self.assertEqual(engine.get_due_reviews(memory.next_review), [])
+        self.assertEqual(self.memory.for_learner("bob").recall_concept(concept.id)['subject'], "science")
+        self.assertEqual(self.memory.learner_ids(), ["alice", "bob"])
+
+class TestLearnerPartitionedSocial(unittest.TestCase):
+    """Test peer interaction progress is kept per learner"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "peers.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_social_progress_is_per_learner(self):
+        """One learner's interactions do not show up in another's progress"""
+        alice = PeerInteractionSimulator(db_path=self.db_path, learner_id="alice")
+        bob = PeerInteractionSimulator(db_path=self.db_path, learner_id="bob")
+        peer_id = next(iter(alice.peers))
+        session = alice.simulate_peer_interaction([peer_id], InteractionContext.PLAYGROUND,
+                                                  ConversationTopic.SHARING_INTERESTS)
+
+        self.assertEqual(session.marcus_id, "alice")
+        self.assertGreater(alice.get_peer_relationship_status(peer_id)['interaction_count'], 0)
+        self.assertEqual(bob.get_peer_relationship_status(peer_id)['status'], "new_relationship")
+
+if __name__ == '__main__':
+    unittest.main()
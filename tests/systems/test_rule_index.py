@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled rule and pattern index behind NeuralSymbolicIntegration
+"""
+
+import random
+import unittest
+
+from core.reasoning.neural_symbolic_integration import (
+    CONCEPT_MAPPINGS, PATTERN_CONCEPT_MAPPINGS, NeuralPattern, NeuralSymbolicIntegration, SymbolicRule
+)
+from core.reasoning.rule_index import FeatureIndex
+
+VOCABULARY = (list(CONCEPT_MAPPINGS) + [s for synonyms in CONCEPT_MAPPINGS.values() for s in synonyms]
+              + list(PATTERN_CONCEPT_MAPPINGS) + [s for synonyms in PATTERN_CONCEPT_MAPPINGS.values() for s in synonyms]
+              + ["apple", "tower", "box", "the", "and", "creative_thinking", "solving"])
+
+def phrase(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.sample(VOCABULARY, rng.randint(low, high)))
+
+class TestFeatureIndex(unittest.TestCase):
+    """Test the mapping protocol and postings upkeep"""
+
+    def setUp(self):
+        self.index = FeatureIndex(lambda text: (text.split(), len(text.split())))
+        self.index["a"] = "red apple"
+        self.index["b"] = "green apple"
+        self.index["c"] = "red box"
+
+    def test_shared_counts(self):
+        self.assertEqual(dict(self.index.shared_counts(["red", "apple", "red"])), {"a": 2, "b": 1, "c": 1})
+        self.assertEqual(dict(self.index.shared_counts(["blue"])), {})
+        self.assertEqual(self.index.compiled("c"), 2)
+
+    def test_reassign_and_delete_reindex(self):
+        self.index["a"] = "blue sky"
+        del self.index["b"]
+        self.assertEqual(dict(self.index.shared_counts(["apple", "blue"])), {"a": 1})
+        self.assertNotIn("b", self.index)
+        # Reassigning keeps the original position
+        self.assertEqual(list(self.index), ["a", "c"])
+        self.assertEqual(self.index.in_order(["c", "a"]), ["a", "c"])
+
+class TestCompiledMatching(unittest.TestCase):
+    """Test indexed candidate scoring against scoring every rule and pattern"""
+
+    def setUp(self):
+        rng = random.Random(5)
+        self.rng = rng
+        self.system = NeuralSymbolicIntegration(db_path=":memory:")
+        for i in range(500):
+            self.system.symbolic_rules[f"rule_{i}"] = SymbolicRule(
+                rule_id=f"rule_{i}", condition=phrase(rng, 0, 4), conclusion=phrase(rng, 0, 3),
+                confidence=rng.random(), evidence_count=rng.randint(1, 5),
+                rule_type="causal", context_domain="general")
+            self.system.neural_patterns[f"pattern_{i}"] = NeuralPattern(
+                pattern_id=f"pattern_{i}", pattern_type="generated", input_features=phrase(rng, 0, 4).split(),
+                output_prediction="try_it", confidence=rng.random(), success_rate=rng.random() * 0.9,
+                context_tags=phrase(rng, 0, 2).split())
+
+    def test_rules_match_scan(self):
+        system = self.system
+        for _ in range(50):
+            description, goal = phrase(self.rng, 1, 6), phrase(self.rng, 0, 3)
+            expected = [rule for rule in system.symbolic_rules.values()
+                        if system._rule_matches_problem(rule, description, goal)]
+            self.assertEqual(system._matching_rules(description, goal), expected)
+
+    def test_patterns_match_scan(self):
+        system = self.system
+        for _ in range(50):
+            features = system._extract_problem_features(phrase(self.rng, 1, 6), phrase(self.rng, 0, 3))
+            expected = [(pattern, score) for pattern in system.neural_patterns.values()
+                        for score in [system._calculate_pattern_match(pattern, features)] if score > 0.3]
+            self.assertEqual(system._matching_patterns(features), expected)
+
+if __name__ == '__main__':
+    unittest.main()
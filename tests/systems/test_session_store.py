@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Tests for the indexed session store
+"""
+
+import os
+import json
+import random
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from core.learning.session_store import SessionStore, import_session_files
+from core.learning.mastery_aggregate import MasteryAggregate
+
+def make_session(day, reviews=(), **extra):
+    session = {
+        'date': day,
+        'timestamp': f"{day}T09:00:00",
+        'review_results': [
+            {'concept_id': cid, 'content': f"about {cid}", 'interval_days': 1,
+             'ease_factor': 2.5, 'repetitions': 1, 'next_review': next_review}
+            for cid, next_review in reviews
+        ]
+    }
+    session.update(extra)
+    return session
+
+class TestSessionStore(unittest.TestCase):
+    """Test session ordering, due-review indexing and the file importer"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = SessionStore(os.path.join(self.temp_dir, "sessions.db"))
+
+    def tearDown(self):
+        self.store.connections.close_all()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_recent_sessions_in_order(self):
+        """Recent sessions come back oldest first and limited"""
+        for day in ["2025-08-03", "2025-08-01", "2025-08-02"]:
+            self.store.save_session(make_session(day, session_id=f"s_{day}"))
+        self.assertEqual(self.store.count_sessions(), 3)
+        self.assertEqual([s['date'] for s in self.store.recent_sessions(2)], ["2025-08-02", "2025-08-03"])
+        self.assertEqual(len(self.store.sessions_on("2025-08-01")), 1)
+
+    def test_due_reviews_use_latest_schedule(self):
+        """Only each concept's latest review decides whether it is due"""
+        self.store.save_session(make_session("2025-08-01", [("math_1", "2025-08-02"), ("art_1", "2025-08-02")]))
+        self.store.save_session(make_session("2025-08-02", [("math_1", "2025-08-08")]))
+        self.store.save_session(make_session("2025-07-30", [("art_1", "2025-07-31"), ("bad", "soon")]))
+
+        due = self.store.get_due_reviews("2025-08-03")
+        self.assertEqual([r['id'] for r in due], ["art_1"])
+        self.assertEqual(due[0]['content'], "about art_1")
+        self.assertEqual(len(self.store.get_due_reviews("2025-08-08")), 2)
+
+    def test_import_session_files(self):
+        """Legacy single-session and list files are imported once"""
+        sessions_dir = os.path.join(self.temp_dir, "sessions")
+        os.makedirs(sessions_dir)
+        with open(os.path.join(sessions_dir, "marcus_session_a.json"), "w") as f:
+            json.dump(make_session("2025-08-01", session_id="a"), f)
+        with open(os.path.join(sessions_dir, "session_history.json"), "w") as f:
+            json.dump([make_session("2025-08-02"), make_session("2025-08-03")], f)
+        with open(os.path.join(sessions_dir, "notes.json"), "w") as f:
+            f.write("{}")
+
+        self.assertEqual(import_session_files(self.store, sessions_dir), 3)
+        import_session_files(self.store, sessions_dir)
+        self.assertEqual(self.store.count_sessions(), 3)
+
+def reference_mastery(session_history, total_sessions):
+    """The original full rescan over the last ten sessions"""
+    subject_scores = {s: [] for s in ['math', 'reading', 'science', 'social', 'art']}
+    for session in session_history[-10:]:
+        for review in session.get('review_results', []):
+            for subject in subject_scores:
+                if subject in str(review.get('concept_id', '')).lower():
+                    subject_scores[subject].append(1.0 if review.get('success', False) else 0.5)
+        for concept in session.get('concepts_learned', []):
+            for subject in subject_scores:
+                if subject in concept.lower():
+                    subject_scores[subject].append(0.1)
+    return {
+        subject: min(sum(scores) / len(scores) + total_sessions * 0.01, 1.0) if scores else 0.2
+        for subject, scores in subject_scores.items()
+    }
+
+def random_session(rng, day):
+    subjects = ['math', 'reading', 'science', 'social', 'art', 'music']
+    return {
+        'session_id': f"s_{day:03d}",
+        'timestamp': f"2025-01-01T00:00:{day:03d}",
+        'review_results': [
+            {'concept_id': f"{rng.choice(subjects)}_{i}", 'success': rng.random() < 0.7}
+            for i in range(rng.randint(0, 6))
+        ],
+        'concepts_learned': [f"Advanced {rng.choice(subjects)} concept" for _ in range(rng.randint(0, 5))]
+    }
+
+class TestMasteryAggregate(unittest.TestCase):
+    """Test running mastery statistics against a full rescan"""
+
+    def assertMasteryEqual(self, actual, expected):
+        self.assertEqual(actual.keys(), expected.keys())
+        for subject, value in expected.items():
+            self.assertAlmostEqual(actual[subject], value)
+
+    def test_matches_rescan_over_sliding_window(self):
+        """Mastery and trend equal the rescan after every session, with and without a pending one"""
+        rng = random.Random(3)
+        history, aggregate = [], MasteryAggregate()
+        for day in range(30):
+            pending = random_session(rng, day)
+            expected = reference_mastery(history + [pending], len(history) + 1)
+            self.assertMasteryEqual(aggregate.mastery_levels(pending=pending), expected)
+            recent = (history + [pending])[-5:]
+            self.assertAlmostEqual(aggregate.learning_trend(pending=pending),
+                                   sum(len(s['concepts_learned']) for s in recent) / len(recent))
+
+            aggregate.record_session(pending, pending['session_id'], pending['timestamp'])
+            history.append(pending)
+            self.assertMasteryEqual(aggregate.mastery_levels(), reference_mastery(history, len(history)))
+
+        restored = MasteryAggregate.from_dict(json.loads(json.dumps(aggregate.to_dict())))
+        self.assertEqual(restored.mastery_levels(), aggregate.mastery_levels())
+        self.assertEqual(restored.learning_trend(), aggregate.learning_trend())
+
+    def test_store_persists_and_rebuilds(self):
+        """The store keeps its aggregate across reopen and rebuilds on out-of-order saves"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            db_path = os.path.join(temp_dir, "sessions.db")
+            rng = random.Random(5)
+            sessions = [random_session(rng, day) for day in range(15)]
+            store = SessionStore(db_path)
+            for session in sessions[1:]:
+                store.save_session(session)
+            store.save_session(sessions[-1])      # re-saving the latest session
+            store.save_session(sessions[0])       # an older session arriving late
+            store.connections.close_all()
+
+            reopened = SessionStore(db_path)
+            self.assertEqual(reopened.aggregate.total_sessions, 15)
+            self.assertMasteryEqual(reopened.aggregate.mastery_levels(), reference_mastery(sessions, 15))
+            reopened.connections.close_all()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_failed_save_leaves_aggregate_unchanged(self):
+        """Sessions rolled back with their transaction never reach the cached aggregate"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            store = SessionStore(os.path.join(temp_dir, "sessions.db"))
+            rng = random.Random(7)
+            first, second = random_session(rng, 0), random_session(rng, 1)
+            store.save_session(first)
+            store.connections.get_connection().execute("DROP TABLE session_aggregates")
+            with self.assertRaises(sqlite3.OperationalError):
+                store.save_session(second)
+            self.assertEqual(store.aggregate.total_sessions, 1)
+            self.assertEqual(store.count_sessions(), 1)
+            self.assertMasteryEqual(store.aggregate.mastery_levels(), reference_mastery([first], 1))
+            store.connections.close_all()
+
+            # Saved inside a caller's transaction that then rolls back
+            store = SessionStore(os.path.join(temp_dir, "nested.db"))
+            store.save_session(first)
+            with self.assertRaises(RuntimeError):
+                with store.connections.transaction():
+                    store.save_session(second)
+                    raise RuntimeError("cycle failed")
+            self.assertEqual(store.aggregate.total_sessions, 1)
+            self.assertEqual(store.count_sessions(), 1)
+            store.connections.close_all()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    unittest.main()
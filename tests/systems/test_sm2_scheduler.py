@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized SM-2 scheduler
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from core.memory.sm2_scheduler import SM2Scheduler, SM2State, SM2Policy
+from core.memory.memory_system import MarcusMemorySystem, Concept
+
+def scalar_sm2(ease, interval, repetitions, quality):
+    """Reference textbook SM-2 for a single concept"""
+    new_ease = max(1.3, ease + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)))
+    if quality < 3:
+        return 1, new_ease, 0
+    repetitions += 1
+    if repetitions == 1:
+        return 1, new_ease, repetitions
+    if repetitions == 2:
+        return 6, new_ease, repetitions
+    return int(interval * new_ease), new_ease, repetitions
+
+class TestSM2Scheduler(unittest.TestCase):
+    """Test vectorized scheduling against the scalar algorithm"""
+
+    def test_matches_scalar_reference(self):
+        """Every row of a batch matches the one-at-a-time algorithm"""
+        rng = np.random.default_rng(7)
+        n = 1000
+        ease = rng.uniform(1.3, 2.8, n)
+        interval = rng.integers(1, 60, n).astype(float)
+        reps = rng.integers(0, 6, n)
+        quality = rng.integers(0, 6, n)
+
+        result = SM2Scheduler().schedule(SM2State(ease, interval, reps, np.zeros(n)), quality)
+
+        for i in range(n):
+            exp_interval, exp_ease, exp_reps = scalar_sm2(ease[i], interval[i], reps[i], quality[i])
+            self.assertEqual(result.interval_days[i], exp_interval)
+            self.assertAlmostEqual(result.ease_factor[i], exp_ease)
+            self.assertEqual(result.repetitions[i], exp_reps)
+
+    def test_streak_and_mastery(self):
+        """Streak and mastery follow pass/fail outcomes and stay clamped"""
+        state = SM2State([2.5, 2.5], [1, 1], [0, 3], [2, 5], [10, 0])
+        result = SM2Scheduler().schedule(state, [5, 1])
+        self.assertEqual(result.success_streak.tolist(), [3, 0])
+        self.assertEqual(result.mastery_level.tolist(), [10, 0])
+
+    def test_fixed_fail_penalty_and_first_intervals(self):
+        """Policy options change failure handling and first-review intervals"""
+        policy = SM2Policy(max_quality=3, pass_threshold=2, max_ease=2.5, fail_ease_penalty=0.2,
+                           reset_repetitions_on_fail=False, first_intervals=(1, 1, 3, 7))
+        state = SM2State([2.5, 2.5, 2.0], [1, 1, 10], [0, 0, 4], [0, 0, 3])
+        result = SM2Scheduler(policy).schedule(state, [3, 0, 1])
+        self.assertEqual(result.interval_days.tolist(), [7, 1, 1])
+        self.assertAlmostEqual(result.ease_factor[2], 1.8)
+        self.assertEqual(result.repetitions.tolist(), [1, 1, 5])
+
+    def test_rejects_out_of_range_quality(self):
+        """Qualities outside the policy scale are rejected"""
+        with self.assertRaises(ValueError):
+            SM2Scheduler().schedule(SM2State([2.5], [1], [0], [0]), [6])
+
+class TestMemorySystemBatchReview(unittest.TestCase):
+    """Test MarcusMemorySystem.review_concepts_batch"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.memory = MarcusMemorySystem(os.path.join(self.temp_dir, "memory.db"))
+        self.memory.learn_concepts_bulk(Concept(f"c_{i}", f"Concept {i}") for i in range(5))
+
+    def tearDown(self):
+        self.memory.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_batch_matches_single_reviews(self):
+        """A batch review gives the same result as reviewing one by one"""
+        for _ in range(3):
+            self.memory.review_concept("c_0", success=True)
+        self.memory.review_concepts_batch([("c_1", 4), ("c_1", 4), ("c_1", 4)])
+        self.assertEqual(self.memory.recall_concept("c_0")['mastery_level'],
+                         self.memory.recall_concept("c_1")['mastery_level'])
+        self.assertEqual(self.memory.recall_concept("c_1")['success_streak'], 3)
+
+    def test_batch_skips_unknown_concepts(self):
+        """Unknown concept ids are ignored and not counted"""
+        updated = self.memory.review_concepts_batch([("c_2", 5), ("missing", 5), ("c_3", 1)])
+        self.assertEqual(updated, 2)
+        self.assertFalse(self.memory.review_concept("missing", success=True))
+
+if __name__ == '__main__':
+    unittest.main()
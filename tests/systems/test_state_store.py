@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared state database and its schema registry
+"""
+
+import os
+import sys
+import shutil
+import hashlib
+import sqlite3
+import tempfile
+import unittest
+
+from core.memory.connection_manager import get_connection_manager, close_connection_manager
+from core.memory.state_store import (
+    SubsystemSchema, SchemaVersionError, configure_state_db, ensure_schema,
+    state_db_path, state_transaction
+)
+from core.memory.memory_system import MarcusMemorySystem, Concept
+from core.consciousness.value_learning_system import ValueLearningSystem
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts', 'migration'))
+from migrate_to_state_db import migrate_to_state_db
+
+class TestStateStore(unittest.TestCase):
+    """Test schemas apply once, migrate in order and share one transaction"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "state.db")
+
+    def tearDown(self):
+        configure_state_db(None)
+        close_connection_manager(self.db_path)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _reopen(self):
+        """Drop the cached manager, as a new process would start without one"""
+        close_connection_manager(self.db_path)
+
+    def test_schema_applied_once_and_recorded(self):
+        runs = []
+        schema = SubsystemSchema("notes", 1, [
+            "CREATE TABLE IF NOT EXISTS notes (id INTEGER PRIMARY KEY, body TEXT)",
+            lambda cursor: runs.append(1),
+        ])
+        self.assertTrue(ensure_schema(self.db_path, schema))
+        self.assertFalse(ensure_schema(self.db_path, schema))
+        self._reopen()
+        self.assertFalse(ensure_schema(self.db_path, schema))
+        self.assertEqual(runs, [1])
+
+        versions = dict(get_connection_manager(self.db_path).get_connection().execute(
+            "SELECT subsystem, version FROM schema_versions"))
+        self.assertEqual(versions, {"notes": 1})
+
+    def test_migrations_upgrade_older_versions(self):
+        v1 = SubsystemSchema("notes", 1, ["CREATE TABLE IF NOT EXISTS notes (id INTEGER PRIMARY KEY)"])
+        ensure_schema(self.db_path, v1)
+        with state_transaction(self.db_path) as conn:
+            conn.execute("INSERT INTO notes (id) VALUES (7)")
+        self._reopen()
+
+        v2 = SubsystemSchema(
+            "notes", 2, ["CREATE TABLE IF NOT EXISTS notes (id INTEGER PRIMARY KEY, body TEXT DEFAULT '')"],
+            migrations={1: ["ALTER TABLE notes ADD COLUMN body TEXT DEFAULT ''"]}
+        )
+        self.assertTrue(ensure_schema(self.db_path, v2))
+        with state_transaction(self.db_path) as conn:
+            self.assertEqual(conn.execute("SELECT id, body FROM notes").fetchall(), [(7, '')])
+
+        # Code older than the database refuses to touch it
+        self._reopen()
+        with self.assertRaises(SchemaVersionError):
+            ensure_schema(self.db_path, v1)
+
+    def test_subsystems_share_one_database_and_transaction(self):
+        """Writes from several subsystems inside one state_transaction roll back together"""
+        configure_state_db(self.db_path)
+        self.assertEqual(state_db_path(), self.db_path)
+        memory = MarcusMemorySystem()
+        values = ValueLearningSystem()
+        self.assertEqual(values.memory_system.db_path, self.db_path)
+        before = values.memory_system.get_memory_statistics()
+
+        with self.assertRaises(RuntimeError):
+            with state_transaction():
+                memory.learn_concept(Concept("sharing", "Sharing toys"))
+                values.memory_system.store_autobiographical_memory(
+                    "social", "I shared my blocks", {"primary_emotion": "joy"})
+                raise RuntimeError("cycle failed")
+
+        self.assertIsNone(memory.recall_concept("sharing"))
+        self.assertEqual(values.memory_system.get_memory_statistics(), before)
+        self.assertTrue(all(name.startswith("state.db") for name in os.listdir(self.temp_dir)))
+
+    def test_migration_leaves_legacy_files_untouched(self):
+        """Legacy tables are upgraded in a copy; the legacy file keeps its bytes and schema"""
+        legacy_dir = os.path.join(self.temp_dir, "legacy")
+        os.mkdir(legacy_dir)
+        legacy_path = os.path.join(legacy_dir, "marcus_memory.db")
+        conn = sqlite3.connect(legacy_path)
+        conn.execute("""
+            CREATE TABLE concepts (
+                id TEXT PRIMARY KEY, content TEXT NOT NULL, subject TEXT NOT NULL,
+                grade_level TEXT NOT NULL, emotional_context TEXT, created_at TEXT NOT NULL
+            )
+        """)
+        conn.execute("INSERT INTO concepts VALUES ('old', 'Old concept', 'art', 'K', 'neutral', '2024-01-01')")
+        conn.commit()
+        conn.close()
+        with open(legacy_path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+
+        migrate_to_state_db(self.db_path, legacy_dir)
+
+        with open(legacy_path, 'rb') as f:
+            self.assertEqual(hashlib.sha256(f.read()).hexdigest(), digest)
+        self.assertEqual(os.listdir(legacy_dir), ["marcus_memory.db"])
+        rows = get_connection_manager(self.db_path).get_connection().execute(
+            "SELECT learner_id, id, subject FROM concepts").fetchall()
+        self.assertEqual([tuple(row) for row in rows], [("marcus", "old", "art")])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming transcript annotation pipeline
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from core.memory.memory_system import MarcusMemorySystem
+from marcus_av_pipeline.transcript_stream import read_transcript_chunks, stream_episode, stream_episodes
+
+# Simple annotators so the tests do not depend on sentiment models
+ANNOTATORS = [
+    ("emotion", lambda text: "joy" if "happy" in text else "neutral"),
+    ("teaching_moment", lambda text: "kind" in text),
+]
+
+def make_chunks(n):
+    return [
+        {"chunk": i, "start_time_sec": i * 30, "end_time_sec": (i + 1) * 30,
+         "text": f"chunk {i} is about being kind" if i % 3 == 0 else f"chunk {i} [is] happy, plain"}
+        for i in range(n)
+    ]
+
+class TestTranscriptStream(unittest.TestCase):
+    """Test transcripts are parsed once and annotated as a stream"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.memory = MarcusMemorySystem(os.path.join(self.temp_dir, "memory.db"))
+
+    def tearDown(self):
+        self.memory.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, name, chunks, jsonl=False):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "w") as f:
+            if jsonl:
+                f.writelines(json.dumps(chunk) + "\n" for chunk in chunks)
+            else:
+                json.dump(chunks, f, indent=2)
+        return path
+
+    def test_reads_json_arrays_and_jsonl(self):
+        """Legacy JSON arrays split across read blocks and JSONL both stream back intact"""
+        chunks = make_chunks(50)
+        array_path = self._write("episode.json", chunks)
+        jsonl_path = self._write("episode.jsonl", chunks, jsonl=True)
+        self.assertEqual(list(read_transcript_chunks(array_path, block_size=7)), chunks)
+        self.assertEqual(list(read_transcript_chunks(jsonl_path)), chunks)
+        self.assertEqual(list(read_transcript_chunks(self._write("empty.json", []))), [])
+
+    def test_episode_batch_annotates_and_ingests(self):
+        """Every chunk lands in the JSONL output and teaching moments reach memory"""
+        first = self._write("first.json", make_chunks(10))
+        second = self._write("second.jsonl", make_chunks(4), jsonl=True)
+        output = os.path.join(self.temp_dir, "analysis", "batch.jsonl")
+
+        totals = stream_episodes([(first, "ep1"), (second, "ep2")], output, self.memory, ANNOTATORS)
+
+        self.assertEqual(totals['chunks'], 14)
+        self.assertEqual(totals['inserted'], 6)
+        annotated = list(read_transcript_chunks(output))
+        self.assertEqual([c['episode'] for c in annotated], ["ep1"] * 10 + ["ep2"] * 4)
+        self.assertEqual(annotated[1]['emotion'], "joy")
+        self.assertTrue(annotated[3]['teaching_moment'])
+        recalled = self.memory.recall_concept("ep2_chunk3")
+        self.assertEqual(recalled['content'], "chunk 3 is about being kind")
+
+        # Without memory the stream still runs to the end
+        result = stream_episode(first, "ep1", os.path.join(self.temp_dir, "only.jsonl"), annotators=ANNOTATORS)
+        self.assertEqual(result, {'chunks': 10})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the concurrent chunked transcription engine
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from marcus_av_pipeline.transcription_engine import (
+    PCMAudio, StubRecognizer, TranscriptionEngine, TranscriptionError
+)
+
+RATE = 1000   # samples per second; the stub hears one word per 500 samples
+
+def make_audio(values):
+    """Half-second 16-bit words, one per value (0 is silence)"""
+    data = b"".join(v.to_bytes(2, "little", signed=True) * (RATE // 2) for v in values)
+    return PCMAudio(data, RATE, 2)
+
+class TestTranscriptionEngine(unittest.TestCase):
+    """Test chunks are recognized concurrently, reassembled in order and resumable"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.checkpoint = os.path.join(self.temp_dir, "episode.checkpoint.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_chunks_reassemble_in_order_without_overlap_repeats(self):
+        """Words heard in the padding of two chunks appear once in the transcript"""
+        values = list(range(1, 41)) + [0] * 10 + [41]   # 25.5 seconds, one silent chunk
+        engine = TranscriptionEngine(StubRecognizer(), chunk_seconds=2, overlap_ms=500, max_workers=3)
+
+        chunks = list(engine.slice(make_audio(values)))
+        self.assertEqual(len(chunks), 13)
+        self.assertIsInstance(chunks[1].audio.data, memoryview)
+        self.assertEqual((chunks[1].start_ms, chunks[1].end_ms), (2000, 4000))
+
+        records = engine.transcribe(make_audio(values))
+        self.assertEqual([r["chunk"] for r in records], list(range(13)))
+        self.assertEqual(records[1]["start_time_sec"], 2)
+        self.assertEqual(records[11]["text"], "[Unintelligible]")
+        spoken = " ".join(r["text"] for r in records if r["text"] != "[Unintelligible]")
+        self.assertEqual(spoken.split(), [f"word{v}" for v in values if v])
+
+    def test_resumes_from_checkpoint_after_failure(self):
+        """A failed run keeps finished chunks and a rerun only recognizes the rest"""
+        audio = make_audio(range(1, 61))
+        recognizer = StubRecognizer(fail_on="word10")
+        engine = TranscriptionEngine(recognizer, chunk_seconds=2, overlap_ms=500, max_workers=2)
+
+        with self.assertRaises(TranscriptionError):
+            engine.transcribe(audio, checkpoint_path=self.checkpoint)
+        first_calls = recognizer.calls
+        self.assertLess(first_calls, 15)
+
+        records = engine.transcribe(audio, checkpoint_path=self.checkpoint)
+        self.assertEqual(len(records), 15)
+        self.assertLess(recognizer.calls - first_calls, 15)
+        self.assertEqual(" ".join(r["text"] for r in records).split(), [f"word{v}" for v in range(1, 61)])
+
+        # A checkpoint for different chunking is not reused
+        regrouped = TranscriptionEngine(StubRecognizer(), chunk_seconds=3, overlap_ms=500)
+        self.assertEqual(len(regrouped.transcribe(audio, checkpoint_path=self.checkpoint)), 10)
+
+    def test_checkpoint_for_different_audio_of_same_length_is_not_reused(self):
+        """Another recording with the same length and format starts over"""
+        engine = TranscriptionEngine(StubRecognizer(), chunk_seconds=2, overlap_ms=500)
+        engine.transcribe(make_audio(range(1, 21)), checkpoint_path=self.checkpoint)
+
+        recognizer = StubRecognizer()
+        other = TranscriptionEngine(recognizer, chunk_seconds=2, overlap_ms=500)
+        records = other.transcribe(make_audio(range(101, 121)), checkpoint_path=self.checkpoint)
+        self.assertEqual(recognizer.calls, 5)
+        self.assertEqual(" ".join(r["text"] for r in records).split(), [f"word{v}" for v in range(101, 121)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests for the vector similarity index
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from core.memory.vector_index import VectorIndex, embed_texts
+from core.memory.autobiographical_memory_system import AutobiographicalMemorySystem
+from core.memory.connection_manager import close_connection_manager
+from core.memory.memory_system import MarcusMemorySystem, Concept
+from core.reasoning.enhanced_cognitive_architecture import EpisodicMemoryModule
+
+def brute_force(vectors, ids, query, k):
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normed @ (query / np.linalg.norm(query))
+    return [ids[i] for i in np.argsort(-scores, kind='stable')[:k]]
+
+class TestVectorIndex(unittest.TestCase):
+    """Test exact and probed search, updates and persistence"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(3)
+        self.vectors = rng.normal(size=(3000, 32)).astype(np.float32)
+        self.ids = [f"v{i}" for i in range(len(self.vectors))]
+        self.queries = rng.normal(size=(6, 32)).astype(np.float32)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_exact_search_matches_brute_force(self):
+        index = VectorIndex(32, capacity=8)
+        index.add(self.ids, self.vectors)
+        results = index.search(self.queries, k=5)
+        self.assertEqual(len(results), len(self.queries))
+        for query, found in zip(self.queries, results):
+            self.assertEqual([item_id for item_id, _ in found], brute_force(self.vectors, self.ids, query, 5))
+
+    def test_delete_and_replace(self):
+        """Deleted ids never come back, re-added ids get their new vector"""
+        index = VectorIndex(32)
+        index.add(self.ids[:10], self.vectors[:10])
+        self.assertEqual(index.delete(["v0", "v0", "missing"]), 1)
+        self.assertNotIn("v0", index)
+        self.assertNotIn("v0", [item_id for item_id, _ in index.search(self.vectors[0], k=10)[0]])
+        index.add(["v1"], self.vectors[0])
+        self.assertEqual(index.search(self.vectors[0], k=1)[0][0][0], "v1")
+        index.add(["v0"], self.vectors[5])
+        self.assertEqual(len(index), 10)
+
+    def test_quantizer_recall_and_later_adds(self):
+        """Probing every group is exact; rows added after training are found"""
+        index = VectorIndex(32)
+        index.add(self.ids, self.vectors)
+        index.train_quantizer(16, seed=1)
+        for query, found in zip(self.queries, index.search(self.queries, k=5, nprobe=16)):
+            self.assertEqual([item_id for item_id, _ in found], brute_force(self.vectors, self.ids, query, 5))
+
+        index.delete(["v7"])
+        index.add(["late", "v3"], self.queries[:2])
+        for query, name in zip(self.queries[:2], ["late", "v3"]):
+            self.assertEqual(index.search(query, k=1, nprobe=1)[0][0][0], name)
+        self.assertNotIn("v7", [item_id for item_id, _ in index.search(self.vectors[7], k=5, nprobe=16)[0]])
+
+    def test_memory_mapped_round_trip(self):
+        path = os.path.join(self.temp_dir, "vectors")
+        index = VectorIndex(32, path=path, capacity=4)
+        index.add(self.ids[:100], self.vectors[:100])
+        index.train_quantizer(4)
+        index.metadata['last_rowid'] = 100
+        index.save()
+
+        reopened = VectorIndex(32, path=path)
+        self.assertEqual(len(reopened), 100)
+        self.assertTrue(reopened.trained)
+        self.assertEqual(reopened.metadata, {'last_rowid': 100})
+        self.assertEqual(reopened.search(self.vectors[42], k=1, nprobe=4)[0][0][0], "v42")
+        with self.assertRaises(ValueError):
+            VectorIndex(16, path=path)
+
+    def test_text_embeddings(self):
+        """Related wording scores higher than unrelated wording"""
+        vectors = embed_texts(["I built a tall block tower", "the block tower fell", "we sang a song", ""])
+        self.assertEqual(vectors.shape, (4, 256))
+        self.assertAlmostEqual(float(np.linalg.norm(vectors[0])), 1.0, places=5)
+        self.assertGreater(vectors[0] @ vectors[1], vectors[0] @ vectors[2])
+        self.assertFalse(vectors[3].any())
+
+class TestMemoryRecallBySimilarity(unittest.TestCase):
+    """Test the memory modules' similarity recall"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "state.db")
+
+    def tearDown(self):
+        close_connection_manager(self.db_path)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_autobiographical_recall_similar(self):
+        memory = AutobiographicalMemorySystem(self.db_path)
+        tower = memory.store_autobiographical_memory(
+            "physical", "I stacked blocks into a tall tower", {"primary_emotion": "proud"}, ["block towers"])
+        memory.store_autobiographical_memory(
+            "social", "Sang songs with friends at circle time", {"primary_emotion": "happy"}, ["singing"])
+        found = memory.recall_similar_memories("block towers", limit=2)
+        self.assertEqual(found[0].memory_id, tower)
+        self.assertEqual(found[0].retrieval_count, 0)
+        memory.close()
+
+        # Memories stored after reopening are indexed on the next recall
+        memory = AutobiographicalMemorySystem(self.db_path)
+        songs = memory.store_autobiographical_memory(
+            "social", "Learned a new counting song", {"primary_emotion": "joy"}, ["counting songs"])
+        self.assertEqual(memory.recall_similar_memories("counting songs", limit=1)[0].memory_id, songs)
+        self.assertEqual(len(memory.vector_index), 3)
+        memory.close()
+
+    def test_concept_recall_similar(self):
+        memory = MarcusMemorySystem(self.db_path)
+        alice, bob = memory.for_learner("alice"), memory.for_learner("bob")
+        alice.learn_concepts_bulk([Concept("colors", "Red and blue make purple", "art"),
+                                   Concept("plants", "Plants need water to grow", "science")])
+        bob.learn_concept(Concept("purple", "Purple grapes taste sweet", "science"))
+        found = alice.recall_similar_concepts("mixing red and blue paint", limit=2)
+        self.assertEqual(found[0]['id'], "colors")
+        self.assertGreater(found[0]['similarity'], found[1]['similarity'])
+        self.assertEqual({c['id'] for c in bob.recall_similar_concepts("purple", limit=5)}, {"purple"})
+
+        # Concepts learned after reopening are indexed on the next recall
+        close_connection_manager(self.db_path)
+        memory = MarcusMemorySystem(self.db_path, learner_id="alice")
+        memory.learn_concept(Concept("counting", "Counting to ten on fingers", "math"))
+        self.assertEqual(memory.recall_similar_concepts("counting fingers", limit=1)[0]['id'], "counting")
+        self.assertEqual(len(memory.concept_index), 3)
+
+    def test_episodic_similar_to_query(self):
+        module = EpisodicMemoryModule()
+        module._store_episode({"event": "built a block tower", "importance": 0.5})
+        target = module._store_episode({"event": "painted a purple giraffe", "importance": 0.5})["episode_id"]
+        result = module._retrieve_episodes({"similar_to": "purple giraffe painting"})
+        self.assertEqual(result["episodes"][0].trace_id, target)
+
+if __name__ == '__main__':
+    unittest.main()
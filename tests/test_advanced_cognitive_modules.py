@@ -189,9 +189,32 @@ class TestTransformerNLPModule(unittest.TestCase):
         
         result_dissimilar = self.nlp_module.process(task_dissimilar)
         self.assertTrue(result_dissimilar['success'])
-        self.assertLess(result_dissimilar['combined_similarity'], 
+        self.assertLess(result_dissimilar['combined_similarity'],
                        result_similar['combined_similarity'])
 
+    def test_attention_matches_pairwise_similarity(self):
+        """Test matrix attention equals the mean pairwise token similarity."""
+        tokens = self.nlp_module._tokenize("neural neural networks learn xyzzy from data abc patterns")
+        attention = self.nlp_module._compute_attention(tokens)
+
+        for i, token in enumerate(tokens):
+            pairwise = [self.nlp_module._token_similarity(token, other)
+                        for j, other in enumerate(tokens) if i != j]
+            self.assertAlmostEqual(attention[token], sum(pairwise) / len(pairwise), places=9)
+        self.assertEqual(self.nlp_module._compute_attention(["alone"]), {"alone": 0.0})
+
+    def test_text_embedding_cache(self):
+        """Test text embeddings are cached and refreshed when vocabulary grows."""
+        first = self.nlp_module._get_text_embedding("neural learning zebra")
+        self.assertIs(self.nlp_module._get_text_embedding("neural learning zebra"), first)
+        self.assertFalse(first.flags.writeable)
+
+        self.nlp_module.update_state({'new_vocabulary': ['zebra']})
+        updated = self.nlp_module._get_text_embedding("neural learning zebra")
+        self.assertIsNot(updated, first)
+        self.assertEqual(self.nlp_module.embedding_matrix.shape[0], len(self.nlp_module.vocabulary))
+        self.assertAlmostEqual(float(np.linalg.norm(self.nlp_module.semantic_embeddings['zebra'])), 1.0)
+
 
 class TestGraphNeuralNetworkModule(unittest.TestCase):
     """Test the GraphNeuralNetworkModule."""
@@ -479,6 +502,63 @@ class TestProbabilisticReasoningModule(unittest.TestCase):
         self.assertIn('empirical_distribution', result)
         self.assertGreater(result['num_samples'], 0)
 
+    def test_batched_sampler_matches_exact_posterior(self):
+        """Test the batched sampler converges on the exact marginals, with and without evidence."""
+        for evidence in ({}, {'attention_level': 'distracted'}, {'prior_knowledge': 'limited'}):
+            result = self.prob_module._monte_carlo_simulation({
+                'query_variable': 'learning_success', 'num_samples': 200000,
+                'evidence': evidence, 'seed': 7
+            })
+            exact = self.prob_module._compute_learning_success_posterior(evidence)
+            for state, probability in exact.items():
+                self.assertAlmostEqual(result['empirical_distribution'][state], probability, delta=0.01)
+
+        # Likelihood weighting on a child: P(focused | high) = 0.455 / 0.539
+        result = self.prob_module._monte_carlo_simulation({
+            'query_variable': 'attention_level', 'num_samples': 200000,
+            'evidence': {'learning_success': 'high'}, 'seed': 7
+        })
+        self.assertAlmostEqual(result['empirical_distribution']['focused'], 0.455 / 0.539, delta=0.01)
+
+        unknown = self.prob_module._monte_carlo_simulation({
+            'query_variable': 'learning_success', 'evidence': {'attention_level': 'asleep'}
+        })
+        self.assertFalse(unknown['success'])
+
+    def test_sampler_skips_missing_cpt_rows(self):
+        """Test samples whose parent configuration has no CPT row do not count."""
+        del self.prob_module.conditional_probabilities['learning_success'][('distracted', 'limited')]
+        result = self.prob_module._monte_carlo_simulation({
+            'query_variable': 'learning_success', 'num_samples': 100000, 'seed': 3
+        })
+        # 0.3 * 0.3 of the samples have the missing configuration
+        self.assertAlmostEqual(result['num_samples'] / 100000, 0.91, delta=0.01)
+
+    def test_sampler_handles_missing_middle_cpt_row(self):
+        """Test a missing CPT row before other rows leaves the later rows' sampling intact."""
+        cpt = self.prob_module.conditional_probabilities['learning_success']
+        del cpt[('focused', 'moderate')]
+        result = self.prob_module._monte_carlo_simulation({
+            'query_variable': 'learning_success', 'num_samples': 100000,
+            'evidence': {'attention_level': 'focused', 'prior_knowledge': 'limited'}, 'seed': 3
+        })
+        self.assertEqual(result['num_samples'], 100000)
+        for state, probability in cpt[('focused', 'limited')].items():
+            self.assertAlmostEqual(result['empirical_distribution'][state], probability, delta=0.01)
+
+        # Marginal over the configurations that still have a row
+        attention = self.prob_module.conditional_probabilities['attention_level']
+        knowledge = self.prob_module.conditional_probabilities['prior_knowledge']
+        weights = {key: attention[key[0]] * knowledge[key[1]] for key in cpt}
+        expected = {state: sum(weights[key] * cpt[key][state] for key in cpt) / sum(weights.values())
+                    for state in ('high', 'medium', 'low')}
+        result = self.prob_module._monte_carlo_simulation({
+            'query_variable': 'learning_success', 'num_samples': 200000, 'seed': 3
+        })
+        self.assertAlmostEqual(result['num_samples'] / 200000, 1 - 0.7 * 0.5, delta=0.01)
+        for state, probability in expected.items():
+            self.assertAlmostEqual(result['empirical_distribution'][state], probability, delta=0.01)
+
 
 class TestModuleFactory(unittest.TestCase):
     """Test the module factory function."""
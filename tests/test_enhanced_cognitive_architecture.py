@@ -16,6 +16,9 @@ from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime, timedelta
 import json
 import uuid
+import time
+import sqlite3
+import threading
 
 # Add the core directory to the path for testing
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
@@ -26,8 +29,9 @@ try:
         EnhancedCognitiveArchitecture, CognitiveTask, CognitiveModuleType,
         ProcessingPriority, WorkingMemoryModule, EpisodicMemoryModule,
         MetacognitiveMonitor, ExecutiveController, MemoryTrace, AttentionState,
-        demonstrate_enhanced_cognitive_architecture
+        ResultCache, demonstrate_enhanced_cognitive_architecture
     )
+    from core.memory.connection_manager import get_connection_manager
     ARCHITECTURE_AVAILABLE = True
 except ImportError as e:
     print(f"Warning: Enhanced cognitive architecture not available for testing: {e}")
@@ -438,6 +442,82 @@ class TestExecutiveController(unittest.TestCase):
         self.assertIn('recent_success_rate', status)
         self.assertIn('average_processing_time', status)
         self.assertGreater(status['total_coordinations'], 0)
+    
+    def test_modules_run_concurrently(self):
+        """Test that a task's modules run side by side and slow ones time out."""
+        def slow_process(task):
+            time.sleep(0.2)
+            return {'success': True, 'result': 'slow_result'}
+        
+        for module in self.mock_modules.values():
+            module.process.side_effect = slow_process
+        task = CognitiveTask(
+            task_id="exec_parallel_test",
+            task_type="multi_module_task",
+            input_data={},
+            priority=ProcessingPriority.HIGH,
+            required_modules=list(self.mock_modules)
+        )
+        
+        start = time.perf_counter()
+        result = self.controller.coordinate_processing(task)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(result['coordination_success_rate'], 1.0)
+        self.assertEqual(list(result['module_contributions']), [m.value for m in self.mock_modules])
+        
+        self.controller.module_timeout = 0.05
+        result = self.controller.coordinate_processing(task)
+        self.assertFalse(result['success'])
+        self.assertIn('timed out', result['module_contributions']['working_memory']['error'])
+    
+    def test_module_errors_are_isolated(self):
+        """Test that one failing module does not fail the others."""
+        self.mock_modules[CognitiveModuleType.EPISODIC_MEMORY].process.side_effect = RuntimeError("boom")
+        task = CognitiveTask(
+            task_id="exec_error_test",
+            task_type="multi_module_task",
+            input_data={},
+            priority=ProcessingPriority.HIGH,
+            required_modules=[CognitiveModuleType.WORKING_MEMORY, CognitiveModuleType.EPISODIC_MEMORY]
+        )
+        
+        result = self.controller.coordinate_processing(task)
+        
+        self.assertTrue(result['success'])
+        self.assertEqual(result['coordination_success_rate'], 0.5)
+        self.assertIn('boom', result['module_contributions']['episodic_memory']['error'])
+
+
+class TestResultCache(unittest.TestCase):
+    """Test the task result cache."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        if not ARCHITECTURE_AVAILABLE:
+            self.skipTest("Enhanced cognitive architecture not available")
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = ResultCache(max_entries=2)
+        cache.put('a', {'value': 1})
+        cache.put('b', {'value': 2})
+        self.assertEqual(cache.get('a'), {'value': 1})
+        cache.put('c', {'value': 3})
+        
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), {'value': 3})
+        stats = cache.get_stats()
+        self.assertEqual((stats['entries'], stats['hits'], stats['misses'], stats['evictions']), (2, 2, 1, 1))
+    
+    def test_ttl_expiry(self):
+        """Test that entries older than the TTL are dropped."""
+        cache = ResultCache(ttl=0.05)
+        cache.put('a', {'value': 1})
+        self.assertIsNotNone(cache.get('a'))
+        time.sleep(0.06)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get_stats()['expirations'], 1)
+        self.assertEqual(len(cache), 0)
 
 
 class TestEnhancedCognitiveArchitecture(unittest.TestCase):
@@ -453,12 +533,12 @@ class TestEnhancedCognitiveArchitecture(unittest.TestCase):
         self.test_db_path = os.path.join(self.temp_dir, "test_cognitive.db")
         
         # Initialize architecture
-        self.architecture = EnhancedCognitiveArchitecture()
-        self.architecture.db_path = self.test_db_path
-        self.architecture.setup_database()
+        self.architecture = EnhancedCognitiveArchitecture(db_path=self.test_db_path)
     
     def tearDown(self):
         """Clean up test fixtures."""
+        if hasattr(self, 'architecture'):
+            self.architecture.close()
         if hasattr(self, 'temp_dir') and os.path.exists(self.temp_dir):
             shutil.rmtree(self.temp_dir)
     
@@ -489,6 +569,148 @@ class TestEnhancedCognitiveArchitecture(unittest.TestCase):
         self.assertIsNotNone(task.completed)
         self.assertIsNotNone(task.result)
     
+    def test_scheduler_drains_by_priority(self):
+        """Test that queued tasks are processed most urgent first."""
+        release = threading.Event()
+        processed = []
+        
+        def record(task):
+            if task.task_id == "blocker":
+                release.wait(5)
+            processed.append(task.task_id)
+            return {'success': True}
+        
+        def make_task(task_id, priority):
+            return CognitiveTask(task_id=task_id, task_type="scheduling_test", input_data={},
+                                 priority=priority, required_modules=[])
+        
+        with patch.object(self.architecture, 'process_cognitive_task', side_effect=record):
+            self.architecture.start(num_workers=1)
+            blocker = self.architecture.submit_task(make_task("blocker", ProcessingPriority.CRITICAL))
+            while not self.architecture.task_queue.empty():
+                time.sleep(0.01)
+            futures = [self.architecture.submit_task(make_task(task_id, priority)) for task_id, priority in [
+                ("low", ProcessingPriority.LOW),
+                ("critical", ProcessingPriority.CRITICAL),
+                ("background", ProcessingPriority.BACKGROUND),
+                ("medium", ProcessingPriority.MEDIUM)
+            ]]
+            release.set()
+            for future in [blocker] + futures:
+                self.assertEqual(future.result(timeout=5), {'success': True})
+            self.architecture.stop()
+        
+        self.assertEqual(processed, ["blocker", "critical", "medium", "low", "background"])
+        self.assertFalse(self.architecture.is_running)
+        self.assertEqual(self.architecture.processing_threads, {})
+    
+    def test_result_cache(self):
+        """Test that pure tasks are cached until a module's state changes."""
+        def make_task(operation='analyze_sentiment'):
+            return CognitiveTask(
+                task_id=str(uuid.uuid4()),
+                task_type="text_sentiment",
+                input_data={'operation': operation, 'text': 'I love learning about reasoning'},
+                priority=ProcessingPriority.MEDIUM,
+                required_modules=[CognitiveModuleType.TRANSFORMER_NLP]
+            )
+        
+        if CognitiveModuleType.TRANSFORMER_NLP not in self.architecture.cognitive_modules:
+            self.skipTest("Transformer NLP module not available")
+        nlp = self.architecture.cognitive_modules[CognitiveModuleType.TRANSFORMER_NLP]
+        
+        first = self.architecture.process_cognitive_task(make_task())
+        with patch.object(self.architecture.executive_control, 'coordinate_processing') as coordinate:
+            second = self.architecture.process_cognitive_task(make_task())
+            coordinate.assert_not_called()
+        self.assertEqual(first, second)
+        
+        # Operations that change the module are not cached and invalidate it
+        self.architecture.process_cognitive_task(make_task('understand'))
+        self.architecture.process_cognitive_task(make_task('understand'))
+        nlp.update_state({'new_vocabulary': ['sentiment']})
+        self.architecture.process_cognitive_task(make_task())
+        
+        stats = self.architecture.get_system_status()['result_cache']
+        self.assertEqual((stats['hits'], stats['misses']), (1, 2))
+    
+    def test_persistence_survives_restart(self):
+        """Test that finished tasks and episodes are written and replayed on startup."""
+        store_task = CognitiveTask(
+            task_id="persist_store",
+            task_type="memory_store",
+            input_data={'operation': 'store', 'episode': {
+                'event': 'built a block tower', 'context': {'place': 'classroom'}, 'importance': 0.9
+            }},
+            priority=ProcessingPriority.MEDIUM,
+            required_modules=[CognitiveModuleType.EPISODIC_MEMORY]
+        )
+        episode_id = self.architecture.process_cognitive_task(store_task)['episode_id']
+        self.architecture.close()
+        
+        with sqlite3.connect(self.test_db_path) as conn:
+            stored = conn.execute("SELECT task_type, priority, result FROM cognitive_tasks "
+                                  "WHERE task_id = 'persist_store'").fetchone()
+        self.assertEqual(stored[:2], ('memory_store', ProcessingPriority.MEDIUM.value))
+        self.assertEqual(json.loads(stored[2])['episode_id'], episode_id)
+        
+        self.architecture = EnhancedCognitiveArchitecture(db_path=self.test_db_path)
+        episodic = self.architecture.cognitive_modules[CognitiveModuleType.EPISODIC_MEMORY]
+        self.assertIn(episode_id, episodic.episodes)
+        restored = episodic.episodes[episode_id]
+        self.assertEqual(restored.content['event'], 'built a block tower')
+        self.assertIsInstance(restored.temporal_context['timestamp'], datetime)
+        
+        retrieve_task = CognitiveTask(
+            task_id="persist_retrieve",
+            task_type="memory_recall",
+            input_data={'operation': 'retrieve', 'query': {'context': {'place': 'classroom'}}},
+            priority=ProcessingPriority.MEDIUM,
+            required_modules=[CognitiveModuleType.EPISODIC_MEMORY]
+        )
+        result = self.architecture.process_cognitive_task(retrieve_task)
+        self.assertIn(episode_id, [episode.trace_id for episode in result['episodes']])
+        self.architecture.flush()
+        with sqlite3.connect(self.test_db_path) as conn:
+            retrievals = conn.execute("SELECT retrieval_count FROM memory_traces WHERE trace_id = ?",
+                                      (episode_id,)).fetchone()[0]
+        self.assertEqual(retrievals, 1)
+        
+        # Rows are serialized when queued, so a caller changing its result later does not leak in
+        result = self.architecture.process_cognitive_task(CognitiveTask(
+            task_id="persist_snapshot",
+            task_type="memory_store",
+            input_data={'operation': 'store', 'episode': {'event': 'sang a song', 'importance': 0.5}},
+            priority=ProcessingPriority.LOW,
+            required_modules=[CognitiveModuleType.EPISODIC_MEMORY]
+        ))
+        result['caller_note'] = 'added after return'
+        self.architecture.flush()
+        with sqlite3.connect(self.test_db_path) as conn:
+            stored = conn.execute("SELECT result FROM cognitive_tasks WHERE task_id = 'persist_snapshot'").fetchone()
+        self.assertNotIn('caller_note', json.loads(stored[0]))
+    
+    def test_background_writes_reuse_pooled_connections(self):
+        """Test that timed flushes of tasks and traces do not open a connection each."""
+        for writer in (self.architecture.task_writer, self.architecture.trace_writer):
+            writer.max_delay = 0.01
+        manager = get_connection_manager(self.test_db_path)
+        for i in range(15):
+            self.architecture.process_cognitive_task(CognitiveTask(
+                task_id=f"flush_{i}",
+                task_type="memory_store",
+                input_data={'operation': 'store', 'episode': {'event': f'stacked block {i}', 'importance': 0.5}},
+                priority=ProcessingPriority.LOW,
+                required_modules=[CognitiveModuleType.EPISODIC_MEMORY]
+            ))
+            time.sleep(0.03)
+        # The caller's connection plus one per writer's flusher thread
+        self.assertLessEqual(len(manager._connections), 3)
+        self.architecture.close()
+        with sqlite3.connect(self.test_db_path) as conn:
+            stored = conn.execute("SELECT COUNT(*) FROM cognitive_tasks WHERE task_id LIKE 'flush_%'").fetchone()[0]
+        self.assertEqual(stored, 15)
+    
     def test_determine_required_modules(self):
         """Test automatic determination of required modules."""
         # Memory task
@@ -721,6 +943,7 @@ def run_enhanced_cognitive_tests():
         TestEpisodicMemoryModule,
         TestMetacognitiveMonitor,
         TestExecutiveController,
+        TestResultCache,
         TestEnhancedCognitiveArchitecture,
         TestDemonstration,
         TestIntegrationScenarios